@@ -14,6 +14,8 @@ Features:
 ---------
 * AI analysis of bank statement lines to identify payment purposes
 * Intelligent invoice/bill matching suggestions with confidence scores
+* Rule-first matching (reference + amount, partner + amount) on an in-memory
+  index of open items; only ambiguous lines go to the AI, with a shortlist
 * Automatic partner detection from payment labels
 * Reconciliation dashboard with real-time AI analytics
 * Batch analysis of all unreconciled statement lines
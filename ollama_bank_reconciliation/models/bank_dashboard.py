@@ -95,14 +95,15 @@ class BankReconciliationDashboard(models.TransientModel):
     # Actions
     # ------------------------------------------------------------------
     def action_analyze_all(self):
-        """Analyze all unreconciled, un-analyzed statement lines with AI."""
+        """Match all unreconciled, un-analyzed statement lines by rules and
+        queue AI analysis of the ones that stay ambiguous."""
         self.ensure_one()
         Line = self.env['account.bank.statement.line']
 
         unanalyzed = Line.search([
             ('is_reconciled', '=', False),
             ('ai_analysis_date', '=', False),
-        ], limit=50)
+        ])
 
         if not unanalyzed:
             return {
@@ -116,24 +117,34 @@ class BankReconciliationDashboard(models.TransientModel):
                 },
             }
 
-        success = 0
-        errors = 0
+        # One index of the open items for the whole run
+        index = unanalyzed._build_match_index()
+        taken = set()
+        matched = 0
+        jobs = self.env['ollama.job']
         for line in unanalyzed:
-            try:
-                line.action_analyze_line()
-                success += 1
-            except Exception as e:
-                _logger.warning("Failed to analyze statement line %s: %s", line.id, e)
-                errors += 1
+            result = line._rule_match(index, exclude=taken)
+            if result.decided:
+                line._apply_rule_match(result)
+                taken.add(result.item['id'])
+                matched += 1
+            else:
+                jobs |= line._ollama_enqueue('action_analyze_line', params={
+                    'candidate_ids': [item['id'] for item, __, __ in result.shortlist],
+                })
+        _logger.info("Bank reconciliation: %d lines matched by rules, %d queued for AI "
+                     "(%d open items indexed).", matched, len(jobs), len(index))
 
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
-                'title': _('Batch Analysis Complete'),
-                'message': _('Analyzed %d lines. Errors: %d.') % (success, errors),
-                'type': 'success' if errors == 0 else 'warning',
-                'sticky': True,
+                'title': _('Batch Analysis'),
+                'message': _('%(matched)d lines matched by rules. %(queued)d ambiguous '
+                             'lines queued for AI analysis.',
+                             matched=matched, queued=len(jobs)),
+                'type': 'success',
+                'sticky': False,
             },
         }
 
@@ -3,6 +3,8 @@ import logging
 
 from odoo import models, fields, api, _
 
+from ..services import bank_matcher
+
 _logger = logging.getLogger(__name__)
 
 
@@ -33,45 +35,136 @@ class BankStatementLineAI(models.Model):
         string='AI Analysis Date',
         help='Date and time when the AI last analyzed this statement line.',
     )
+    ai_match_line_id = fields.Many2one(
+        'account.move.line', string='Suggested Journal Item',
+        help='Open receivable/payable item suggested for this statement line.',
+        readonly=True, ondelete='set null', copy=False,
+    )
+    ai_match_method = fields.Selection([
+        ('rule', 'Rule'),
+        ('ai', 'AI'),
+    ], string='Matched By', readonly=True, copy=False,
+        help='Rule: exact reference/amount or partner/amount match, no AI call. '
+             'AI: chosen by the AI among the shortlisted candidates.',
+    )
+
+    # ------------------------------------------------------------------
+    # Rule-based matching
+    # ------------------------------------------------------------------
+    @api.model
+    def _get_open_items(self, companies, domain=None):
+        """Open receivable/payable items of ``companies`` as plain dicts
+        for ``services.bank_matcher``."""
+        move_lines = self.env['account.move.line'].search_fetch([
+            ('company_id', 'in', companies.ids),
+            ('parent_state', '=', 'posted'),
+            ('account_id.account_type', 'in', ('asset_receivable', 'liability_payable')),
+            ('reconciled', '=', False),
+            ('amount_residual_currency', '!=', 0),
+        ] + (domain or []), [
+            'move_id', 'move_name', 'ref', 'partner_id', 'currency_id',
+            'amount_residual_currency', 'date', 'date_maturity',
+        ])
+        return [{
+            'id': ml.id,
+            'move_name': ml.move_name or '',
+            'partner_id': ml.partner_id.id,
+            'partner_name': ml.partner_id.display_name or '',
+            'currency_id': ml.currency_id.id,
+            'amount': ml.amount_residual_currency,
+            'date': ml.date_maturity or ml.date,
+            'references': [ml.move_name, ml.ref, ml.move_id.payment_reference],
+        } for ml in move_lines]
+
+    def _build_match_index(self):
+        """In-memory index of the open items these lines may pay."""
+        return bank_matcher.MatchIndex(self._get_open_items(self.company_id))
+
+    def _rule_match(self, index, exclude=()):
+        """Match this line against ``index`` (see ``services.bank_matcher``)."""
+        self.ensure_one()
+        if self.foreign_currency_id:
+            currency, amount = self.foreign_currency_id, self.amount_currency
+        else:
+            currency, amount = self.currency_id, self.amount
+        return index.match(
+            self.payment_ref or '', amount, currency.id,
+            partner_id=self.partner_id.id, exclude=exclude,
+        )
+
+    def _apply_rule_match(self, result):
+        self.ensure_one()
+        item = result.item
+        self.write({
+            'ai_match_suggestion': item['move_name'][:255],
+            'ai_match_confidence': result.confidence,
+            'ai_label_analysis': _('Matched by rule: %s.') % result.reason,
+            'ai_partner_suggestion': item['partner_name'][:255],
+            'ai_match_line_id': item['id'],
+            'ai_match_method': 'rule',
+            'ai_analysis_date': fields.Datetime.now(),
+        })
+
+    @api.model
+    def _format_candidates(self, candidates):
+        """Prompt lines for ``[(item, score, reasons)]``."""
+        lines = []
+        for item, __, reasons in candidates:
+            kind = _('Invoice') if item['amount'] > 0 else _('Bill')
+            due = fields.Date.to_string(item['date']) if item.get('date') else 'N/A'
+            hints = f", matches: {', '.join(reasons)}" if reasons else ''
+            lines.append(
+                f"  - [{item['id']}] {kind} {item['move_name']}: "
+                f"partner={item['partner_name'] or 'Unknown'}, "
+                f"open amount={abs(item['amount']):.2f}, due={due}{hints}"
+            )
+        return '\n'.join(lines)
 
     # ------------------------------------------------------------------
     # Analyze a single statement line with AI
     # ------------------------------------------------------------------
-    def action_analyze_line(self):
-        """Analyze this bank statement line using AI.
+    def action_analyze_line(self, candidate_ids=None):
+        """Match this bank statement line, with AI only when rules cannot.
 
-        Builds a prompt with the statement line details, open invoices,
-        and known partners, then asks the AI for a JSON response with
-        match_suggestion, confidence, label_analysis, and partner_suggestion.
+        Exact matches (reference + amount, or partner + amount) are settled
+        by ``services.bank_matcher`` without calling the AI. Otherwise the
+        AI receives the shortlisted open items and answers with a JSON
+        object: match_line_id, match_suggestion, confidence,
+        label_analysis and partner_suggestion.
+
+        :param candidate_ids: shortlist already computed by a batch run
+            (open journal item ids); computed here when not given
         """
         self.ensure_one()
 
+        # -- Rules first, then the candidates for the AI --
+        if candidate_ids is None:
+            result = self._rule_match(self._build_match_index())
+            if result.decided:
+                self._apply_rule_match(result)
+                return {
+                    'type': 'ir.actions.client',
+                    'tag': 'display_notification',
+                    'params': {
+                        'title': _('Match Found'),
+                        'message': _('Match: %s (%s, no AI call needed)') % (
+                            self.ai_match_suggestion, result.reason),
+                        'type': 'success',
+                        'sticky': False,
+                    },
+                }
+            candidates = result.shortlist
+        else:
+            candidates = [(item, 0, []) for item in self._get_open_items(
+                self.company_id, [('id', 'in', candidate_ids)])]
+
         # -- Build context from statement line --
         line_label = self.payment_ref or ''
         line_amount = self.amount or 0.0
         line_date = fields.Date.to_string(self.date) if self.date else 'N/A'
         line_partner = self.partner_id.name if self.partner_id else 'Unknown'
 
-        # -- Gather open invoices for matching context --
-        open_invoices = self.env['account.move'].search([
-            ('state', '=', 'posted'),
-            ('payment_state', '!=', 'paid'),
-            ('move_type', 'in', ['out_invoice', 'in_invoice']),
-        ], limit=50, order='invoice_date desc')
-
-        invoice_lines = []
-        for inv in open_invoices:
-            inv_ref = inv.name or inv.ref or 'N/A'
-            inv_partner = inv.partner_id.name if inv.partner_id else 'Unknown'
-            inv_amount = inv.amount_residual or inv.amount_total or 0.0
-            inv_date = fields.Date.to_string(inv.invoice_date) if inv.invoice_date else 'N/A'
-            inv_type = 'Invoice' if inv.move_type == 'out_invoice' else 'Bill'
-            invoice_lines.append(
-                f"  - {inv_type} {inv_ref}: partner={inv_partner}, "
-                f"amount={inv_amount:.2f}, date={inv_date}"
-            )
-
-        invoices_text = '\n'.join(invoice_lines) if invoice_lines else '  (none)'
+        invoices_text = self._format_candidates(candidates) or '  (none)'
 
         # -- Gather known partners --
         partners = self.env['res.partner'].search([
@@ -89,11 +182,13 @@ class BankStatementLineAI(models.Model):
             f"- Amount: {line_amount:.2f}\n"
             f"- Date: {line_date}\n"
             f"- Current Partner: {line_partner}\n\n"
-            "Open Invoices/Bills:\n"
+            "Candidate Open Invoices/Bills ([id] reference):\n"
             f"{invoices_text}\n\n"
             "Known Partners:\n"
             f"{partner_names}\n\n"
             "Return ONLY a valid JSON object with these keys:\n"
+            "- \"match_line_id\": integer — the id in brackets of the best "
+            "matching candidate, or 0 if none matches\n"
             "- \"match_suggestion\": string — reference of the best matching "
             "invoice/bill (e.g. 'INV/2024/0042'), or 'No match found'\n"
             "- \"confidence\": float 0-100 — your confidence in this match\n"
@@ -159,11 +254,22 @@ class BankStatementLineAI(models.Model):
         label_analysis = data.get('label_analysis', '') or ''
         partner_suggestion = data.get('partner_suggestion', '') or ''
 
+        # Only a shortlisted candidate can be linked
+        try:
+            match_line_id = int(data.get('match_line_id') or 0)
+        except (TypeError, ValueError):
+            match_line_id = 0
+        chosen = next((item for item, __, __ in candidates if item['id'] == match_line_id), None)
+        if chosen:
+            match_suggestion = chosen['move_name']
+
         self.write({
             'ai_match_suggestion': match_suggestion[:255],
             'ai_match_confidence': confidence,
             'ai_label_analysis': label_analysis,
             'ai_partner_suggestion': partner_suggestion[:255],
+            'ai_match_line_id': chosen['id'] if chosen else False,
+            'ai_match_method': 'ai',
             'ai_analysis_date': fields.Datetime.now(),
         })
 
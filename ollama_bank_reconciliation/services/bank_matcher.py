@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Deterministic matching of bank statement lines to open items (no ORM).
+
+An open item is a receivable or payable journal item still to reconcile,
+given as a dict::
+
+    {'id', 'move_name', 'partner_id', 'partner_name', 'currency_id',
+     'amount', 'date', 'references': [...]}
+
+``amount`` is the signed residual in the item's currency: positive for a
+customer invoice (money comes in), negative for a vendor bill, i.e. the
+same sign as the bank line that pays it. ``references`` are the move
+name, the move reference and the payment reference.
+
+``MatchIndex`` keys the items by (currency, amount in cents), by partner
+and by normalized reference, so matching a line costs a few dictionary
+lookups. A line is *decided* when:
+
+* one item has a reference found in the line's label and the same amount;
+* or, the line having a partner, exactly one item of that partner has the
+  same amount.
+
+Every other line is ambiguous and gets a shortlist of scored candidates
+(reference, amount and partner hits first, then the nearest amounts) to
+hand to the AI.
+"""
+import bisect
+import re
+from collections import defaultdict
+
+SHORTLIST_SIZE = 10
+MIN_REFERENCE_LENGTH = 4
+# Reference tokens of the label joined to rebuild "INV/2024/0042"
+MAX_REFERENCE_TOKENS = 5
+
+SCORE_REFERENCE = 50
+SCORE_AMOUNT = 35
+SCORE_PARTNER = 15
+
+_TOKEN_RE = re.compile(r'[A-Za-z0-9]+')
+
+
+def normalize_reference(value):
+    """'INV/2024/0042 ' -> 'INV20240042'; empty for values too short or
+    too generic to identify a document."""
+    normalized = ''.join(_TOKEN_RE.findall(value or '')).upper()
+    if len(normalized) < MIN_REFERENCE_LENGTH or (normalized.isdigit() and len(normalized) < 5):
+        return ''
+    return normalized
+
+
+def _cents(amount):
+    return int(round((amount or 0.0) * 100))
+
+
+class MatchResult:
+    __slots__ = ('item', 'confidence', 'reason', 'shortlist')
+
+    def __init__(self, item=None, confidence=0.0, reason='', shortlist=()):
+        self.item = item                # the decided item, or None
+        self.confidence = confidence
+        self.reason = reason
+        self.shortlist = list(shortlist)  # [(item, score, reasons)] best first
+
+    @property
+    def decided(self):
+        return self.item is not None
+
+
+class MatchIndex:
+
+    def __init__(self, items):
+        self.items = {item['id']: item for item in items}
+        self._by_amount = defaultdict(list)
+        self._by_partner = defaultdict(list)
+        self._by_reference = defaultdict(list)
+        self._sorted_amounts = defaultdict(list)    # currency -> sorted [(cents, id)]
+        for item in self.items.values():
+            key = (item['currency_id'], _cents(item['amount']))
+            self._by_amount[key].append(item)
+            if item.get('partner_id'):
+                self._by_partner[item['partner_id']].append(item)
+            for reference in {normalize_reference(r) for r in item.get('references') or ()}:
+                if reference:
+                    self._by_reference[reference].append(item)
+            self._sorted_amounts[item['currency_id']].append(key[1:] + (item['id'],))
+        for amounts in self._sorted_amounts.values():
+            amounts.sort()
+
+    def __len__(self):
+        return len(self.items)
+
+    def _references_in(self, label):
+        """Items whose reference appears in ``label``, as one token or as
+        consecutive tokens (the separators of the reference being lost)."""
+        tokens = [t.upper() for t in _TOKEN_RE.findall(label or '')]
+        found = {}
+        for start in range(len(tokens)):
+            joined = ''
+            for token in tokens[start:start + MAX_REFERENCE_TOKENS]:
+                joined += token
+                for item in self._by_reference.get(joined, ()):
+                    found[item['id']] = item
+        return found
+
+    def match(self, label, amount, currency_id, partner_id=None, exclude=()):
+        """Match one bank line.
+
+        :param exclude: ids of items already taken by other lines of the
+            same run; they are never decided again
+        """
+        cents = _cents(amount)
+        same_amount = {item['id']: item for item in self._by_amount.get((currency_id, cents), ())}
+        by_reference = self._references_in(label)
+        same_partner = {item['id']: item for item in self._by_partner.get(partner_id, ())} \
+            if partner_id else {}
+
+        # Rule 1: reference in the label and same amount
+        exact = [item for item_id, item in by_reference.items()
+                 if item_id in same_amount and item_id not in exclude]
+        if len(exact) == 1:
+            return MatchResult(exact[0], 100.0, 'reference and amount')
+        # Rule 2: the only open item of the line's partner with this amount
+        if partner_id:
+            exact = [item for item_id, item in same_partner.items()
+                     if item_id in same_amount and item_id not in exclude]
+            if len(exact) == 1 and not by_reference:
+                return MatchResult(exact[0], 95.0, 'partner and amount')
+
+        scores = defaultdict(lambda: [0, []])
+        for hits, score, reason in ((by_reference, SCORE_REFERENCE, 'reference'),
+                                    (same_amount, SCORE_AMOUNT, 'amount'),
+                                    (same_partner, SCORE_PARTNER, 'partner')):
+            for item_id in hits:
+                scores[item_id][0] += score
+                scores[item_id][1].append(reason)
+        ranked = sorted(((self.items[i], s, r) for i, (s, r) in scores.items()),
+                        key=lambda entry: (-entry[1], abs(_cents(entry[0]['amount']) - cents)))
+        shortlist = ranked[:SHORTLIST_SIZE]
+        if len(shortlist) < SHORTLIST_SIZE:
+            taken = {entry[0]['id'] for entry in shortlist}
+            for item in self._nearest_amounts(currency_id, cents, SHORTLIST_SIZE, taken):
+                shortlist.append((item, 0, ['close amount']))
+                if len(shortlist) >= SHORTLIST_SIZE:
+                    break
+        return MatchResult(shortlist=shortlist)
+
+    def _nearest_amounts(self, currency_id, cents, limit, taken):
+        """Items of ``currency_id`` with the same sign, nearest amount first."""
+        amounts = self._sorted_amounts.get(currency_id) or []
+        right = bisect.bisect_left(amounts, (cents,))
+        left = right - 1
+        result = []
+        while len(result) < limit and (left >= 0 or right < len(amounts)):
+            if right >= len(amounts) or (left >= 0 and cents - amounts[left][0] <= amounts[right][0] - cents):
+                candidate, left = amounts[left], left - 1
+            else:
+                candidate, right = amounts[right], right + 1
+            if candidate[1] not in taken and (candidate[0] > 0) == (cents > 0):
+                result.append(self.items[candidate[1]])
+        return result
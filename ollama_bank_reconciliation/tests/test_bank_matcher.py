@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_bank_reconciliation.services import bank_matcher
+
+EUR = 1
+
+
+def _item(item_id, move_name, amount, partner_id=None, references=None):
+    return {
+        'id': item_id,
+        'move_name': move_name,
+        'partner_id': partner_id,
+        'partner_name': partner_id and f'Partner {partner_id}',
+        'currency_id': EUR,
+        'amount': amount,
+        'date': '2024-03-01',
+        'references': references or [move_name],
+    }
+
+
+class TestBankMatcher(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        self.items = [
+            _item(1, 'INV/2024/0042', 1200.0, partner_id=10),
+            _item(2, 'INV/2024/0043', 1200.0, partner_id=11),
+            _item(3, 'INV/2024/0044', 350.0, partner_id=11),
+            _item(4, 'INV/2024/0045', 350.0, partner_id=11),
+            _item(5, 'BILL/2024/0007', -350.0, partner_id=12),
+            _item(6, 'INV/2024/0046', 80.5, partner_id=13),
+        ]
+        self.index = bank_matcher.MatchIndex(self.items)
+
+    def test_normalize_reference(self):
+        self.assertEqual(bank_matcher.normalize_reference('INV/2024/0042 '), 'INV20240042')
+        self.assertEqual(bank_matcher.normalize_reference('AB'), '')
+        self.assertEqual(bank_matcher.normalize_reference('1234'), '')
+        self.assertEqual(bank_matcher.normalize_reference(None), '')
+
+    def test_rule_reference_and_amount(self):
+        # The separators of the reference are lost in the bank label
+        result = self.index.match('VIR SEPA INV 2024 0042 ACME', 1200.0, EUR)
+        self.assertTrue(result.decided)
+        self.assertEqual(result.item['id'], 1)
+        self.assertEqual(result.confidence, 100.0)
+        self.assertEqual(result.reason, 'reference and amount')
+
+    def test_rule_reference_with_another_amount_is_ambiguous(self):
+        result = self.index.match('INV/2024/0042', 1000.0, EUR)
+        self.assertFalse(result.decided)
+        self.assertEqual(result.shortlist[0][0]['id'], 1)
+        self.assertIn('reference', result.shortlist[0][2])
+
+    def test_rule_partner_and_amount(self):
+        result = self.index.match('Transfer', 80.5, EUR, partner_id=13)
+        self.assertTrue(result.decided)
+        self.assertEqual(result.item['id'], 6)
+        self.assertEqual(result.confidence, 95.0)
+        self.assertEqual(result.reason, 'partner and amount')
+
+    def test_partner_with_two_items_of_the_amount_is_ambiguous(self):
+        result = self.index.match('Transfer', 350.0, EUR, partner_id=11)
+        self.assertFalse(result.decided)
+        top = {entry[0]['id'] for entry in result.shortlist[:2]}
+        self.assertEqual(top, {3, 4})
+        for __, score, reasons in result.shortlist[:2]:
+            self.assertEqual(score, bank_matcher.SCORE_AMOUNT + bank_matcher.SCORE_PARTNER)
+            self.assertEqual(reasons, ['amount', 'partner'])
+
+    def test_excluded_item_is_not_decided_again(self):
+        result = self.index.match('INV 2024 0042', 1200.0, EUR, exclude={1})
+        self.assertFalse(result.decided)
+
+    def test_shortlist_size_and_order(self):
+        result = self.index.match('Transfer', 1200.0, EUR)
+        self.assertFalse(result.decided)
+        self.assertLessEqual(len(result.shortlist), bank_matcher.SHORTLIST_SIZE)
+        self.assertEqual({entry[0]['id'] for entry in result.shortlist[:2]}, {1, 2})
+        scores = [entry[1] for entry in result.shortlist]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_sign(self):
+        # An outgoing payment of 350 is the vendor bill, not the invoices
+        result = self.index.match('Payment', -350.0, EUR, partner_id=12)
+        self.assertTrue(result.decided)
+        self.assertEqual(result.item['id'], 5)
+        # Close amounts are only offered with the sign of the line
+        result = self.index.match('Payment', -300.0, EUR)
+        self.assertFalse(result.decided)
+        self.assertEqual([entry[0]['id'] for entry in result.shortlist], [5])
+        result = self.index.match('Payment', 300.0, EUR)
+        self.assertNotIn(5, [entry[0]['id'] for entry in result.shortlist])
+        self.assertEqual(result.shortlist[0][2], ['close amount'])
+
+    def test_other_currency_does_not_match(self):
+        result = self.index.match('INV 2024 0042', 1200.0, EUR + 1)
+        self.assertFalse(result.decided)
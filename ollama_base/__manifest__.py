@@ -18,8 +18,15 @@ Features:
 * Ollama-specific tuning: context window, GPU layers, keep-alive, timeout
 * Model auto-discovery for Ollama and Llama.cpp
 * Connection testing and diagnostics
-* AI call logging with automatic cleanup
+* AI call logging with per-module retention (batched SQL cleanup, compressed or metrics-only texts)
+* Buffered bulk logging of latency, tokens and endpoint; p50/p95 metrics per model and module
+* Text embeddings (Ollama /api/embed, OpenAI-compatible /v1/embeddings)
+* Persistent response cache (TTL, size-bounded, per-call bypass)
 * Thread-safe HTTP caller for parallel processing
+* Pooled keep-alive connections with retry and backoff on 429/5xx
+* Load balancing and failover over several Ollama hosts
+* Background AI job queue with parallel workers, priorities and retries
+* Token streaming (Ollama, OpenAI-compatible SSE) over an HTTP endpoint, with a form button showing the answer as it is generated
 * Reusable mixin for all downstream modules
 
 Requirements:
@@ -33,13 +40,20 @@ Requirements:
     'license': 'LGPL-3',
     'price': 0,
     'currency': 'EUR',
-    'depends': ['base'],
+    'depends': ['base', 'web'],
     'data': [
         'security/ir.model.access.csv',
         'data/ollama_config_data.xml',
         'data/ir_cron_data.xml',
         'views/ollama_config_views.xml',
     ],
+    'assets': {
+        'web.assets_backend': [
+            'ollama_base/static/src/js/ollama_stream.js',
+            'ollama_base/static/src/js/ollama_stream_button.js',
+            'ollama_base/static/src/xml/ollama_stream_button.xml',
+        ],
+    },
     'images': ['static/description/icon.png'],
     'installable': True,
     'application': False,
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import time
+
+import odoo
+from odoo import http, _
+from odoo.exceptions import UserError, AccessError
+from odoo.http import request
+
+from ..services import ollama_stream
+
+_logger = logging.getLogger(__name__)
+
+
+def stream_record(record, purpose, params=None):
+    """Stream the answer of ``record._ollama_stream_prepare(purpose)`` as NDJSON.
+
+    Each line is a JSON object: ``{"token": "..."}`` while the model
+    generates, then ``{"done": true, "error": ..., ...}`` where the extra
+    keys come from ``record._ollama_stream_finish()``. The finish hook, the
+    response cache and the AI log are written in a new cursor since the
+    request cursor is closed while the response streams.
+    """
+    params = params or {}
+    req = record._ollama_stream_prepare(purpose, params)
+    config = record._get_ollama_config()
+    spec = config._prepare_stream(
+        req['prompt'],
+        system_prompt=req.get('system_prompt'),
+        max_tokens=req.get('max_tokens'),
+        temperature=req.get('temperature'),
+    )
+    finish_params = req.get('params', params)
+    log_vals = req.get('log_vals') or {}
+    db_name = request.env.cr.dbname
+    uid, su = record.env.uid, record.env.su
+    context = dict(record.env.context)
+    res_model, res_ids = record._name, record.ids
+    module = record._ollama_method_module('_ollama_stream_prepare')
+
+    def _finish(text, error, duration):
+        with odoo.registry(db_name).cursor() as cr:
+            env = odoo.api.Environment(cr, uid, context, su=su)
+            config = env['ollama.config'].sudo().browse(spec['config_id'])
+            if text and not error:
+                config._finish_stream(spec, text)
+            usage = spec.get('usage') or {}
+            env['ollama.log']._log_call(dict({
+                'config_id': config.id,
+                'provider': config.provider,
+                'model_name': config._get_model_name(),
+                'prompt_preview': (spec.get('prompt') or '')[:500],
+                'response_preview': (text or '')[:500],
+                'res_model': res_model,
+                'res_id': res_ids[0] if res_ids else 0,
+                'module': module,
+                'status': 'success' if text and not error else 'error',
+                'duration': round(duration, 3),
+                'tokens_in': usage.get('tokens_in') or 0,
+                'tokens_out': usage.get('tokens_out') or 0,
+                'endpoint': usage.get('endpoint') or False,
+                'cache_hit': bool(usage.get('cache_hit')),
+                'streamed': True,
+                'error_class': error and env['ollama.log']._classify_error(error) or False,
+            }, **log_vals), prompt=spec.get('prompt'), response=text)
+            rec = env[res_model].browse(res_ids)
+            return rec._ollama_stream_finish(purpose, text, finish_params) or {}
+
+    def _generate():
+        chunks = []
+        error = None
+        start = time.monotonic()
+        try:
+            for chunk in ollama_stream.iter_stream(spec):
+                chunks.append(chunk)
+                yield json.dumps({'token': chunk}, ensure_ascii=False) + '\n'
+        except Exception as e:
+            _logger.error("AI stream failed for %s,%s: %s", res_model, res_ids, e)
+            error = e
+        duration = time.monotonic() - start
+        text = config._format_response(''.join(chunks))
+        try:
+            extra = _finish(text, error, duration)
+        except Exception as e:
+            _logger.exception("AI stream finish failed for %s,%s", res_model, res_ids)
+            extra = {}
+            error = error or e
+        error = str(error)[:500] if error else None
+        yield json.dumps(dict(extra, done=True, error=error), ensure_ascii=False, default=str) + '\n'
+
+    return request.make_response(_generate(), headers=[
+        ('Content-Type', 'application/x-ndjson; charset=utf-8'),
+        ('Cache-Control', 'no-cache'),
+        # Disable proxy buffering (nginx) so tokens reach the browser at once
+        ('X-Accel-Buffering', 'no'),
+    ])
+
+
+class OllamaStreamController(http.Controller):
+    """HTTP streaming of AI answers for models using ``ollama.mixin``.
+
+    Usage (see ``static/src/js/ollama_stream.js``)::
+
+        POST /ollama/stream
+        res_model=helpdesk.ticket&res_id=42&purpose=response&csrf_token=...
+
+    The record must implement ``_ollama_stream_prepare`` for ``purpose``.
+    """
+
+    @http.route('/ollama/stream', type='http', auth='user', methods=['POST'])
+    def stream(self, res_model, purpose, res_id=0, params='{}', **kwargs):
+        if res_model not in request.env or not hasattr(
+                request.env[res_model], '_ollama_stream_prepare'):
+            raise UserError(_("Model %s does not support AI streaming.") % res_model)
+        record = request.env[res_model]
+        if int(res_id or 0):
+            record = record.browse(int(res_id)).exists()
+            if not record:
+                raise UserError(_("Record not found."))
+            record.check_access('write')
+        try:
+            params = json.loads(params or '{}')
+        except ValueError:
+            params = {}
+        try:
+            return stream_record(record, purpose, params)
+        except (UserError, AccessError) as e:
+            return request.make_response(
+                json.dumps({'done': True, 'error': str(e)}) + '\n',
+                headers=[('Content-Type', 'application/x-ndjson; charset=utf-8')],
+            )
@@ -1,3 +1,7 @@
 from . import ollama_config
+from . import ollama_endpoint
 from . import ollama_mixin
 from . import ollama_log
+from . import ollama_log_retention
+from . import ollama_cache
+from . import ollama_job
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+
+class OllamaCache(models.Model):
+    """Persistent AI response cache.
+
+    Entries are content-addressed: the key is a SHA-256 of everything that
+    determines the completion (provider, model, prompts, temperature,
+    max tokens), so identical requests are answered from the database.
+    """
+    _name = 'ollama.cache'
+    _description = 'AI Response Cache'
+    _order = 'last_hit_date desc'
+    _rec_name = 'key'
+
+    key = fields.Char(string='Key', required=True, index=True, readonly=True)
+    config_id = fields.Many2one('ollama.config', string='Config', ondelete='cascade')
+    provider = fields.Char(string='Provider', readonly=True)
+    model_name = fields.Char(string='Model', readonly=True)
+    prompt_preview = fields.Text(string='Prompt (preview)', readonly=True)
+    response = fields.Text(string='Response', readonly=True)
+    hit_count = fields.Integer(string='Hits', default=0, readonly=True)
+    last_hit_date = fields.Datetime(
+        string='Last Used', default=fields.Datetime.now, readonly=True,
+    )
+    expire_date = fields.Datetime(string='Expires', index=True, readonly=True)
+
+    _sql_constraints = [
+        ('key_unique', 'unique(key)', 'Cache key must be unique!'),
+    ]
+
+    # Trim to max size every N inserts (autovacuum also trims daily)
+    _TRIM_EVERY = 100
+    _inserts_since_trim = 0
+    # Hits are counted in memory and written at most once per entry every
+    # _HIT_WRITE_INTERVAL seconds, so hot entries do not rewrite their row
+    # (and contend on its lock) on every lookup
+    _HIT_WRITE_INTERVAL = 600
+    _pending_hits = {}
+
+    @api.model
+    def _make_key(self, provider, model, system_prompt, prompt, temperature, max_tokens):
+        """Build the content hash for a request."""
+        payload = json.dumps(
+            [provider or '', model or '', system_prompt or '', prompt or '',
+             round(float(temperature or 0.0), 4), int(max_tokens or 0)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @api.model
+    def _lookup(self, key):
+        """Return the cached response for ``key``, or None if missing/expired."""
+        entry = self.sudo().search([('key', '=', key)], limit=1)
+        if not entry:
+            return None
+        now = fields.Datetime.now()
+        if entry.expire_date and entry.expire_date < now:
+            return None
+        pending = type(self)._pending_hits
+        hits = pending.pop(entry.id, 0) + 1
+        if entry.last_hit_date and \
+                now - entry.last_hit_date < timedelta(seconds=self._HIT_WRITE_INTERVAL):
+            pending[entry.id] = hits
+            return entry.response
+        entry.write({
+            'hit_count': entry.hit_count + hits,
+            'last_hit_date': now,
+        })
+        return entry.response
+
+    @api.model
+    def _store(self, key, response, config, prompt=''):
+        """Insert or refresh a cache entry. Never raises."""
+        if not response:
+            return
+        ttl = config.response_cache_ttl_hours
+        now = fields.Datetime.now()
+        vals = {
+            'response': response,
+            'last_hit_date': now,
+            'expire_date': fields.Datetime.add(now, hours=ttl) if ttl > 0 else False,
+        }
+        Cache = self.sudo()
+        try:
+            with self.env.cr.savepoint():
+                entry = Cache.search([('key', '=', key)], limit=1)
+                if entry:
+                    entry.write(vals)
+                else:
+                    vals.update({
+                        'key': key,
+                        'config_id': config.id,
+                        'provider': config.provider,
+                        'model_name': config._get_model_name(),
+                        'prompt_preview': (prompt or '')[:500],
+                    })
+                    Cache.create(vals)
+        except Exception as e:
+            # A concurrent worker stored the same key first: nothing to do
+            _logger.debug("AI cache store skipped: %s", e)
+            return
+
+        cls = type(self)
+        cls._inserts_since_trim += 1
+        if cls._inserts_since_trim >= self._TRIM_EVERY:
+            cls._inserts_since_trim = 0
+            self._trim(config.response_cache_max_entries)
+
+    @api.model
+    def _trim(self, max_entries):
+        """Evict least-recently-used entries beyond ``max_entries``."""
+        if not max_entries or max_entries <= 0:
+            return 0
+        self.env.cr.execute("""
+            DELETE FROM ollama_cache
+             WHERE id IN (
+                SELECT id FROM ollama_cache
+                 ORDER BY last_hit_date DESC NULLS LAST, id DESC
+                OFFSET %s
+             )
+        """, (max_entries,))
+        return self.env.cr.rowcount
+
+    @api.autovacuum
+    def _gc_cache(self):
+        """Drop expired entries and trim to the largest configured size."""
+        self.env.cr.execute(
+            "DELETE FROM ollama_cache WHERE expire_date < (now() at time zone 'UTC')"
+        )
+        expired = self.env.cr.rowcount
+        # Bound the in-memory counters: entries deleted meanwhile never
+        # flush theirs (live entries lose at most one interval of hits)
+        type(self)._pending_hits.clear()
+        configs = self.env['ollama.config'].sudo().search([])
+        max_entries = max(configs.mapped('response_cache_max_entries') or [0])
+        trimmed = self._trim(max_entries)
+        if expired or trimmed:
+            _logger.info("AI cache cleanup: %d expired, %d evicted.", expired, trimmed)
@@ -4,8 +4,19 @@ from odoo.exceptions import UserError
 import requests
 import logging
 
+from ..services import ai_log_buffer, endpoint_router, http_transport, ollama_stream
+
 _logger = logging.getLogger(__name__)
 
+
+class AITimeoutError(UserError):
+    """The server accepted the request but the model did not answer in time.
+
+    Not an endpoint failure: another host would take as long, so routing
+    neither fails over nor takes the endpoint out of rotation.
+    """
+
+
 PROVIDER_DEFAULTS = {
     'openai': {'base_url': 'https://api.openai.com', 'endpoint': '/v1/chat/completions', 'model': 'gpt-4o-mini'},
     'gemini': {'base_url': 'https://generativelanguage.googleapis.com', 'endpoint': '', 'model': 'gemini-2.0-flash'},
@@ -93,6 +104,73 @@ class OllamaConfig(models.Model):
         help="Parallel threads for batch AI calls.",
     )
 
+    # Load balancing (several Ollama hosts)
+    endpoint_ids = fields.One2many(
+        'ollama.endpoint', 'config_id', string='Endpoints',
+        help="When set, Ollama calls are spread over these hosts instead of "
+             "the Base URL.",
+    )
+    endpoint_strategy = fields.Selection([
+        ('least_loaded', 'Least Loaded'),
+        ('round_robin', 'Weighted Round-Robin'),
+    ], string='Routing', default='least_loaded', required=True)
+
+    # HTTP transport
+    http_pool_size = fields.Integer(
+        string='Connection Pool Size', default=10,
+        help="Keep-alive connections kept open per server. Should be at "
+             "least the number of parallel workers.",
+    )
+    http_max_retries = fields.Integer(
+        string='Max Retries', default=2,
+        help="Retries with exponential backoff on connection errors, "
+             "HTTP 429 and 5xx. 0 = no retry.",
+    )
+    http_connect_timeout = fields.Integer(
+        string='Connect Timeout (s)', default=10,
+        help="Timeout to open a connection. The read timeout is the "
+             "request timeout above.",
+    )
+
+    # Background jobs
+    job_workers = fields.Integer(
+        string='Job Workers', default=0,
+        help="AI jobs run in parallel by the job runner. "
+             "0 = total endpoint capacity, or Parallel Workers.",
+    )
+    job_max_attempts = fields.Integer(
+        string='Job Max Attempts', default=3,
+        help="A failed job is retried with exponential backoff until "
+             "it reaches this number of attempts.",
+    )
+
+    # Embeddings
+    embedding_model = fields.Char(
+        string='Embedding Model', default='nomic-embed-text',
+        help="Model used to embed texts for semantic search "
+             "(e.g. nomic-embed-text, mxbai-embed-large, text-embedding-3-small).",
+    )
+    embedding_batch_size = fields.Integer(
+        string='Embedding Batch Size', default=32,
+        help="Texts sent per embedding request.",
+    )
+
+    # Response cache
+    response_cache_enabled = fields.Boolean(
+        string='Cache Responses', default=True,
+        help="Answer identical requests (same provider, model, prompts, "
+             "temperature and max tokens) from the database instead of "
+             "calling the AI again.",
+    )
+    response_cache_ttl_hours = fields.Integer(
+        string='Cache TTL (hours)', default=168,
+        help="How long a cached response stays valid. 0 = never expires.",
+    )
+    response_cache_max_entries = fields.Integer(
+        string='Cache Max Entries', default=5000,
+        help="Least recently used entries are evicted beyond this size.",
+    )
+
     last_test_result = fields.Text(string='Last Test Result', readonly=True)
 
     # -------------------------------------------------------
@@ -193,6 +271,62 @@ class OllamaConfig(models.Model):
             headers['Authorization'] = f'Bearer {self.api_key}'
         return headers
 
+    def _get_transport_options(self):
+        """Pool settings for ``services.http_transport`` (plain dict, thread-safe)."""
+        return {
+            'pool_size': max(self.http_pool_size or 0, self.ollama_parallel_workers or 0) or None,
+            'max_retries': self.http_max_retries,
+            'connect_timeout': self.http_connect_timeout or None,
+        }
+
+    def _http_post(self, url, timeout, **kwargs):
+        """POST through the pooled transport of this config."""
+        return http_transport.post(
+            url, credentials=self.api_key, timeout=timeout,
+            **self._get_transport_options(), **kwargs,
+        )
+
+    def _get_endpoint_router(self):
+        """Router over the active endpoints, or None for a single-host config."""
+        if self.provider != 'ollama' or not self.endpoint_ids:
+            return None
+        return endpoint_router.get_router(
+            ('ollama.config', self.id), self.endpoint_ids._get_router_specs())
+
+    def _get_endpoint_capacity(self):
+        """Useful parallelism: sum of endpoint capacities, else the worker setting."""
+        router = self._get_endpoint_router()
+        if router:
+            return router.capacity()
+        return max(1, self.ollama_parallel_workers or 1)
+
+    def _route_ollama(self, router, send):
+        """Run ``send(base_url)`` on a leased endpoint, failing over to the next
+        one on error. Raises the last error when every endpoint failed.
+
+        A read timeout is raised at once: the endpoint is alive, only slow.
+        """
+        last_error = timed_out = None
+        for _attempt in range(router.size()):
+            try:
+                with router.lease(self.endpoint_strategy,
+                                  self.ollama_request_timeout or 180) as lease:
+                    try:
+                        return send(lease.url)
+                    except AITimeoutError as e:
+                        timed_out = e
+                    except UserError as e:
+                        lease.failed()
+                        last_error = e
+                        _logger.warning("Ollama endpoint %s failed, trying next: %s",
+                                        lease.url, str(e)[:200])
+            except TimeoutError:
+                raise UserError(_("All Ollama endpoints are busy, try again later."))
+            if timed_out:
+                # Raised outside the lease so the endpoint is not counted as failed
+                raise timed_out
+        raise last_error
+
     # -------------------------------------------------------
     # Connection test
     # -------------------------------------------------------
@@ -211,7 +345,8 @@ class OllamaConfig(models.Model):
                 model_names = [m.get('name', '?') for m in models_list]
                 _logger.info("Ollama OK - %d models: %s", len(models_list), model_names)
 
-            res = self.call_ai_api("Say 'Hello from Odoo!' in one sentence.", max_tokens=50)
+            res = self.call_ai_api("Say 'Hello from Odoo!' in one sentence.", max_tokens=50,
+                                   use_cache=False)
             self.last_test_result = f"OK: {res[:200]}" if res else "OK (empty)"
 
             return {
@@ -322,16 +457,145 @@ class OllamaConfig(models.Model):
     # -------------------------------------------------------
     # Main AI dispatcher
     # -------------------------------------------------------
-    def call_ai_api(self, prompt, system_prompt=None, max_tokens=None, temperature=None):
+    def call_ai_api(self, prompt, system_prompt=None, max_tokens=None, temperature=None,
+                    use_cache=True):
         """Unified AI call dispatcher. Works with all providers.
 
         :param prompt: User message / prompt text
         :param system_prompt: Optional system prompt (default: generic assistant)
         :param max_tokens: Override max tokens
         :param temperature: Override temperature
+        :param use_cache: Set to False to bypass the response cache
         :returns: AI response text (str)
         """
         self.ensure_one()
+        # Web search results are time-sensitive: never cached
+        if not (use_cache and self.response_cache_enabled) or (
+                self.provider == 'ollama' and self.ollama_web_search):
+            return self._dispatch_ai_call(prompt, system_prompt, max_tokens, temperature)
+
+        Cache = self.env['ollama.cache']
+        key = Cache._make_key(
+            self.provider, self._get_model_name(), system_prompt, prompt,
+            temperature if temperature is not None else self.temperature,
+            max_tokens or self.max_tokens,
+        )
+        cached = Cache._lookup(key)
+        if cached is not None:
+            _logger.info("AI call [%s] served from cache", self.provider)
+            ai_log_buffer.note_usage(cache_hit=True)
+            return cached
+        result = self._dispatch_ai_call(prompt, system_prompt, max_tokens, temperature)
+        Cache._store(key, result, self, prompt)
+        return result
+
+    # -------------------------------------------------------
+    # Streaming
+    # -------------------------------------------------------
+    def stream_ai_api(self, prompt, system_prompt=None, max_tokens=None, temperature=None,
+                      use_cache=True):
+        """Like :meth:`call_ai_api` but yields the answer chunk by chunk.
+
+        Ollama (native and OpenAI mode), OpenAI, Perplexity and Llama.cpp
+        stream tokens; other providers and cache hits yield the whole
+        answer at once. The complete answer is cached at the end.
+        """
+        spec = self._prepare_stream(prompt, system_prompt, max_tokens, temperature, use_cache)
+        chunks = []
+        for chunk in ollama_stream.iter_stream(spec):
+            chunks.append(chunk)
+            yield chunk
+        self._finish_stream(spec, ''.join(chunks))
+
+    def _prepare_stream(self, prompt, system_prompt=None, max_tokens=None, temperature=None,
+                        use_cache=True):
+        """Resolve everything a stream needs into a plain dict.
+
+        The result is consumed by ``services.ollama_stream.iter_stream`` and
+        may outlive the current cursor (HTTP streaming responses).
+        """
+        self.ensure_one()
+        spec = {
+            'config_id': self.id,
+            'prompt': prompt,
+            'timeout': self.ollama_request_timeout or 180,
+            'transport': self._get_transport_options(),
+            'credentials': self.api_key,
+            'text': None,
+            'cache_key': None,
+        }
+        web_search = self.provider == 'ollama' and self.ollama_web_search
+        if use_cache and self.response_cache_enabled and not web_search:
+            Cache = self.env['ollama.cache']
+            key = Cache._make_key(
+                self.provider, self._get_model_name(), system_prompt, prompt,
+                temperature if temperature is not None else self.temperature,
+                max_tokens or self.max_tokens,
+            )
+            cached = Cache._lookup(key)
+            if cached is not None:
+                spec['text'] = cached
+                spec['usage'] = {'cache_hit': True}
+                return spec
+            spec['cache_key'] = key
+
+        router = self._get_endpoint_router()
+        if web_search or self.provider not in ('ollama', 'openai', 'perplexity', 'llamacpp'):
+            # No token stream for this provider: answer in one chunk
+            ai_log_buffer.take_usage()
+            spec['text'] = self._dispatch_ai_call(prompt, system_prompt, max_tokens, temperature)
+            spec['usage'] = ai_log_buffer.take_usage()
+        elif self.provider == 'ollama' and self.ollama_api_mode == 'native':
+            spec.update({
+                'kind': 'ollama',
+                'base_url': self._get_base_url(),
+                'path': '/api/chat',
+                'data': self._build_ollama_chat_payload(
+                    prompt, system_prompt, max_tokens, temperature, stream=True),
+            })
+        else:
+            if self.provider == 'perplexity':
+                base_url, path = 'https://api.perplexity.ai', '/chat/completions'
+            elif router:
+                base_url, path = self._get_base_url(), self.api_endpoint or '/v1/chat/completions'
+            else:
+                base_url, path = self._get_full_url(), ''
+            spec.update({
+                'kind': 'openai',
+                'base_url': base_url,
+                'path': path,
+                'headers': self._get_headers(),
+                'data': self._build_openai_payload(
+                    prompt, system_prompt, max_tokens, temperature, stream=True),
+            })
+        if router and spec['text'] is None:
+            spec.update({'router': router, 'strategy': self.endpoint_strategy})
+        return spec
+
+    def _finish_stream(self, spec, text):
+        """Store a completed stream in the response cache."""
+        if spec.get('cache_key') and text:
+            self.env['ollama.cache']._store(
+                spec['cache_key'], self._format_response(text), self, spec.get('prompt'))
+
+    def action_clear_response_cache(self):
+        """Delete all cached responses of this configuration."""
+        self.ensure_one()
+        count = self.env['ollama.cache'].sudo().search_count([('config_id', '=', self.id)])
+        self.env['ollama.cache'].sudo().search([('config_id', '=', self.id)]).unlink()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Cache Cleared'),
+                'message': _('%d cached responses removed.') % count,
+                'type': 'success',
+                'sticky': False,
+            }
+        }
+
+    def _dispatch_ai_call(self, prompt, system_prompt=None, max_tokens=None, temperature=None):
+        """Send the request to the configured provider (no caching)."""
         effective_model = self._get_model_name()
         _logger.info("AI call [%s] model=%s url=%s", self.provider, effective_model, self._get_base_url())
 
@@ -363,26 +627,138 @@ class OllamaConfig(models.Model):
             return self._call_openai_compatible(prompt, system_prompt, max_tokens, temperature)
         return ''
 
+    # -------------------------------------------------------
+    # Embeddings
+    # -------------------------------------------------------
+    def embed_texts(self, texts):
+        """Embed ``texts`` with the embedding model.
+
+        Ollama uses ``/api/embed`` (batched; falls back to the legacy
+        ``/api/embeddings`` one text at a time), OpenAI-compatible providers
+        use ``/v1/embeddings``. Requests are split by
+        ``embedding_batch_size`` and routed over the endpoints, if any.
+
+        :param texts: list of strings
+        :returns: list of vectors (lists of floats), in the order of ``texts``
+        """
+        self.ensure_one()
+        if not texts:
+            return []
+        if self.provider in ('gemini', 'anthropic'):
+            raise UserError(_("Embeddings are not supported with %s.") % self.get_provider_display())
+        batch_size = max(1, self.embedding_batch_size or 32)
+        router = self._get_endpoint_router()
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            if self.provider != 'ollama':
+                vectors.extend(self._openai_embed(self._get_base_url(), batch))
+            elif router:
+                vectors.extend(self._route_ollama(router, lambda base: self._ollama_embed(base, batch)))
+            else:
+                vectors.extend(self._ollama_embed(self._get_base_url(), batch))
+        return vectors
+
+    def _get_embedding_model(self):
+        return self.embedding_model or 'nomic-embed-text'
+
+    def _ollama_embed(self, base, texts):
+        url = f"{base}/api/embed"
+        timeout = self.ollama_request_timeout or 180
+        data = {'model': self._get_embedding_model(), 'input': texts}
+        if self.ollama_keep_alive:
+            data['keep_alive'] = self.ollama_keep_alive
+        try:
+            resp = self._http_post(url, timeout, json=data)
+            if resp.status_code == 404 and 'model' not in resp.text.lower():
+                # Ollama < 0.3.4: no batch endpoint
+                return [self._ollama_embed_legacy(base, text) for text in texts]
+            if resp.status_code != 200:
+                raise UserError(_(
+                    "Ollama embedding error.\nURL: %s\nStatus: %s\nResponse: %s"
+                ) % (url, resp.status_code, resp.text[:500]))
+            embeddings = resp.json().get('embeddings') or []
+            if len(embeddings) != len(texts):
+                raise UserError(_("Ollama returned %s embeddings for %s texts.") % (
+                    len(embeddings), len(texts)))
+            return embeddings
+        except UserError:
+            raise
+        except requests.exceptions.ReadTimeout:
+            raise AITimeoutError(_(
+                "Ollama at %(url)s timed out after %(timeout)s s.",
+                url=base, timeout=timeout))
+        except requests.exceptions.ConnectionError:
+            raise UserError(_(
+                "Cannot connect to Ollama at %s\nMake sure Ollama is running (ollama serve)."
+            ) % base)
+        except Exception as e:
+            raise UserError(_("Ollama embedding failed: %s") % str(e))
+
+    def _ollama_embed_legacy(self, base, text):
+        url = f"{base}/api/embeddings"
+        resp = self._http_post(url, self.ollama_request_timeout or 180, json={
+            'model': self._get_embedding_model(), 'prompt': text,
+        })
+        if resp.status_code != 200:
+            raise UserError(_(
+                "Ollama embedding error.\nURL: %s\nStatus: %s\nResponse: %s"
+            ) % (url, resp.status_code, resp.text[:500]))
+        return resp.json().get('embedding') or []
+
+    def _openai_embed(self, base, texts):
+        url = f"{base}/v1/embeddings"
+        timeout = 120
+        try:
+            resp = self._http_post(url, timeout, headers=self._get_headers(), json={
+                'model': self._get_embedding_model(), 'input': texts,
+            })
+            if resp.status_code != 200:
+                raise UserError(_(
+                    "%s embedding error.\nURL: %s\nStatus: %s\nResponse: %s"
+                ) % (self.provider, url, resp.status_code, resp.text[:500]))
+            rows = sorted(resp.json()['data'], key=lambda r: r.get('index', 0))
+            return [row['embedding'] for row in rows]
+        except UserError:
+            raise
+        except requests.exceptions.ReadTimeout:
+            raise AITimeoutError(_(
+                "%(provider)s at %(url)s timed out after %(timeout)s s.",
+                provider=self.provider, url=url, timeout=timeout))
+        except requests.exceptions.ConnectionError:
+            raise UserError(_("Cannot connect to %s at %s") % (self.provider, url))
+        except (KeyError, TypeError, ValueError) as e:
+            raise UserError(_("Invalid embedding response from %s: %s") % (self.provider, str(e)))
+
     # -------------------------------------------------------
     # Provider implementations
     # -------------------------------------------------------
     def _call_ollama(self, prompt, system_prompt=None, max_tokens=None, temperature=None):
         """Call Ollama using native /api/chat or OpenAI-compatible mode."""
+        router = self._get_endpoint_router()
         if self.ollama_api_mode == 'openai':
-            return self._call_openai_compatible(prompt, system_prompt, max_tokens, temperature)
+            if not router:
+                return self._call_openai_compatible(prompt, system_prompt, max_tokens, temperature)
+            return self._route_ollama(router, lambda base: self._call_openai_compatible(
+                prompt, system_prompt, max_tokens, temperature,
+                base_url=base, endpoint=self.api_endpoint or None,
+            ))
 
-        base = self._get_base_url()
-        url = f"{base}/api/chat"
-        model = self._get_model_name()
-        sys_prompt = system_prompt or 'You are a helpful AI assistant.'
+        data = self._build_ollama_chat_payload(prompt, system_prompt, max_tokens, temperature)
+        if router:
+            return self._route_ollama(router, lambda base: self._ollama_chat(base, data))
+        return self._ollama_chat(self._get_base_url(), data)
 
+    def _build_ollama_chat_payload(self, prompt, system_prompt=None, max_tokens=None,
+                                   temperature=None, stream=False):
+        """Request body for Ollama native /api/chat."""
         data = {
-            'model': model,
+            'model': self._get_model_name(),
             'messages': [
-                {'role': 'system', 'content': sys_prompt},
+                {'role': 'system', 'content': system_prompt or 'You are a helpful AI assistant.'},
                 {'role': 'user', 'content': prompt},
             ],
-            'stream': False,
+            'stream': stream,
             'options': {
                 'num_predict': max_tokens or self.max_tokens,
                 'temperature': temperature if temperature is not None else self.temperature,
@@ -392,10 +768,30 @@ class OllamaConfig(models.Model):
         }
         if self.ollama_keep_alive:
             data['keep_alive'] = self.ollama_keep_alive
+        return data
+
+    def _build_openai_payload(self, prompt, system_prompt=None, max_tokens=None,
+                              temperature=None, stream=False):
+        """Request body for OpenAI-compatible /chat/completions."""
+        data = {
+            'model': self._get_model_name(),
+            'messages': [
+                {'role': 'system', 'content': system_prompt or 'You are a helpful AI assistant.'},
+                {'role': 'user', 'content': prompt},
+            ],
+            'max_tokens': max_tokens or self.max_tokens,
+            'temperature': temperature if temperature is not None else self.temperature,
+        }
+        if stream:
+            data['stream'] = True
+        return data
 
+    def _ollama_chat(self, base, data):
+        """POST a native /api/chat payload to ``base`` and return the text."""
+        url = f"{base}/api/chat"
         timeout = self.ollama_request_timeout or 180
         try:
-            resp = requests.post(url, json=data, timeout=timeout)
+            resp = self._http_post(url, timeout, json=data)
             if resp.status_code != 200:
                 raise UserError(_(
                     "Ollama error.\nURL: %s\nStatus: %s\nResponse: %s"
@@ -403,6 +799,8 @@ class OllamaConfig(models.Model):
             res = resp.json()
             if 'error' in res:
                 raise UserError(_("Ollama Error: %s") % res.get('error', 'Unknown'))
+            ai_log_buffer.note_usage(endpoint=base, tokens_in=res.get('prompt_eval_count'),
+                                     tokens_out=res.get('eval_count'))
             msg = res.get('message', {})
             content = msg.get('content', '') if isinstance(msg, dict) else ''
             if not content:
@@ -410,6 +808,10 @@ class OllamaConfig(models.Model):
             return self._format_response(content)
         except UserError:
             raise
+        except requests.exceptions.ReadTimeout:
+            raise AITimeoutError(_(
+                "Ollama at %(url)s timed out after %(timeout)s s.",
+                url=base, timeout=timeout))
         except requests.exceptions.ConnectionError:
             raise UserError(_(
                 "Cannot connect to Ollama at %s\nMake sure Ollama is running (ollama serve)."
@@ -425,19 +827,11 @@ class OllamaConfig(models.Model):
         else:
             url = self._get_full_url(endpoint)
 
-        sys_prompt = system_prompt or 'You are a helpful AI assistant.'
         headers = self._get_headers()
-        data = {
-            'model': self._get_model_name(),
-            'messages': [
-                {'role': 'system', 'content': sys_prompt},
-                {'role': 'user', 'content': prompt},
-            ],
-            'max_tokens': max_tokens or self.max_tokens,
-            'temperature': temperature if temperature is not None else self.temperature,
-        }
+        data = self._build_openai_payload(prompt, system_prompt, max_tokens, temperature)
+        timeout = 120
         try:
-            resp = requests.post(url, headers=headers, json=data, timeout=120)
+            resp = self._http_post(url, timeout, headers=headers, json=data)
             if resp.status_code != 200:
                 raise UserError(_(
                     "%s API error.\nURL: %s\nStatus: %s\nResponse: %s"
@@ -445,9 +839,16 @@ class OllamaConfig(models.Model):
             res = resp.json()
             if 'error' in res:
                 raise UserError(_("%s Error: %s") % (self.provider, res['error'].get('message', str(res['error']))))
+            usage = res.get('usage') or {}
+            ai_log_buffer.note_usage(endpoint=url, tokens_in=usage.get('prompt_tokens'),
+                                     tokens_out=usage.get('completion_tokens'))
             return self._format_response(res['choices'][0]['message']['content'])
         except UserError:
             raise
+        except requests.exceptions.ReadTimeout:
+            raise AITimeoutError(_(
+                "%(provider)s at %(url)s timed out after %(timeout)s s.",
+                provider=self.provider, url=url, timeout=timeout))
         except requests.exceptions.ConnectionError:
             raise UserError(_("Cannot connect to %s at %s") % (self.provider, url))
         except (KeyError, IndexError) as e:
@@ -466,10 +867,14 @@ class OllamaConfig(models.Model):
             }
         }
         try:
-            resp = requests.post(url, json=data, timeout=60)
+            resp = self._http_post(url, 60, json=data)
             if resp.status_code != 200:
                 raise UserError(_("Gemini error. Status: %s") % resp.status_code)
             res = resp.json()
+            usage = res.get('usageMetadata') or {}
+            ai_log_buffer.note_usage(endpoint='generativelanguage.googleapis.com',
+                                     tokens_in=usage.get('promptTokenCount'),
+                                     tokens_out=usage.get('candidatesTokenCount'))
             return self._format_response(res['candidates'][0]['content']['parts'][0]['text'])
         except UserError:
             raise
@@ -488,10 +893,13 @@ class OllamaConfig(models.Model):
         if system_prompt:
             data['system'] = system_prompt
         try:
-            resp = requests.post(url, headers=headers, json=data, timeout=60)
+            resp = self._http_post(url, 60, headers=headers, json=data)
             if resp.status_code != 200:
                 raise UserError(_("Anthropic error. Status: %s") % resp.status_code)
             res = resp.json()
+            usage = res.get('usage') or {}
+            ai_log_buffer.note_usage(endpoint=url, tokens_in=usage.get('input_tokens'),
+                                     tokens_out=usage.get('output_tokens'))
             return self._format_response(res['content'][0]['text'])
         except UserError:
             raise
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+
+from odoo import models, fields, api, _
+
+from ..services import endpoint_router, http_transport
+
+_logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_TIMEOUT = 5
+LIVE_STATS_HELP = ("Counted by the Odoo process serving this page since it started. "
+                   "Other worker processes keep their own counters.")
+
+
+class OllamaEndpoint(models.Model):
+    """One Ollama inference host of a load-balanced configuration.
+
+    When a config has active endpoints, AI calls are spread over them by the
+    in-process router (``services.endpoint_router``) instead of going to
+    the config's single Base URL.
+    """
+    _name = 'ollama.endpoint'
+    _description = 'AI Endpoint'
+    _order = 'sequence, id'
+
+    config_id = fields.Many2one(
+        'ollama.config', string='Config', required=True, ondelete='cascade',
+    )
+    sequence = fields.Integer(default=10)
+    name = fields.Char(string='Name')
+    base_url = fields.Char(
+        string='URL', required=True,
+        help="Ollama server, e.g. http://192.168.1.20:11434",
+    )
+    weight = fields.Integer(
+        string='Weight', default=1,
+        help="Relative share of the traffic. A host twice as fast gets 2.",
+    )
+    max_inflight = fields.Integer(
+        string='Max In-Flight', default=2,
+        help="Concurrent requests sent to this host (per Odoo worker). "
+             "Match it to OLLAMA_NUM_PARALLEL on the server.",
+    )
+    active = fields.Boolean(default=True)
+
+    state = fields.Selection([
+        ('unknown', 'Unknown'),
+        ('up', 'Up'),
+        ('down', 'Down'),
+    ], string='Health', default='unknown', readonly=True)
+    last_check_date = fields.Datetime(string='Last Check', readonly=True)
+    last_check_ms = fields.Float(string='Check Latency (ms)', digits=(10, 0), readonly=True)
+    last_error = fields.Char(string='Last Error', readonly=True)
+
+    # Live counters of this Odoo process (not stored): every worker process
+    # routes its own requests and keeps its own counters
+    inflight = fields.Integer(
+        string='In Flight (this process)', compute='_compute_live_stats',
+        help=LIVE_STATS_HELP,
+    )
+    avg_latency_ms = fields.Float(
+        string='Avg Latency (ms, this process)', digits=(10, 0),
+        compute='_compute_live_stats', help=LIVE_STATS_HELP,
+    )
+    request_count = fields.Integer(
+        string='Requests (this process)', compute='_compute_live_stats',
+        help=LIVE_STATS_HELP,
+    )
+    error_count = fields.Integer(
+        string='Errors (this process)', compute='_compute_live_stats',
+        help=LIVE_STATS_HELP,
+    )
+
+    def _get_url(self):
+        return (self.base_url or '').strip().rstrip('/')
+
+    def _get_router_specs(self):
+        """Plain dicts for ``EndpointRouter.configure``."""
+        return [{
+            'url': ep._get_url(),
+            'weight': ep.weight,
+            'max_inflight': ep.max_inflight,
+            'up': ep.state != 'down',
+        } for ep in self if ep.base_url]
+
+    @api.depends('base_url', 'config_id')
+    def _compute_live_stats(self):
+        snapshots = {}
+        for ep in self:
+            key = ep.config_id.id
+            if key not in snapshots:
+                snapshots[key] = endpoint_router.get_router(
+                    ('ollama.config', key)).snapshot() if key else {}
+            stats = snapshots[key].get(ep._get_url(), {})
+            ep.inflight = stats.get('inflight', 0)
+            ep.avg_latency_ms = stats.get('latency_ms') or 0.0
+            ep.request_count = stats.get('requests', 0)
+            ep.error_count = stats.get('errors', 0)
+
+    # -------------------------------------------------------
+    # Health checks
+    # -------------------------------------------------------
+    def _check_health(self):
+        """Ping /api/tags on each endpoint and update router rotation."""
+        now = fields.Datetime.now()
+        for ep in self:
+            url = ep._get_url()
+            t0 = time.monotonic()
+            error = False
+            try:
+                resp = http_transport.get(
+                    f"{url}/api/tags", timeout=HEALTH_CHECK_TIMEOUT,
+                    connect_timeout=HEALTH_CHECK_TIMEOUT, max_retries=0,
+                )
+                if resp.status_code != 200:
+                    error = f"HTTP {resp.status_code}"
+            except Exception as e:
+                error = str(e)[:200]
+            elapsed_ms = (time.monotonic() - t0) * 1000.0
+            healthy = not error
+            router = endpoint_router.get_router(
+                ('ollama.config', ep.config_id.id), ep.config_id.endpoint_ids._get_router_specs())
+            router.set_health(url, healthy)
+            if not healthy and ep.state != 'down':
+                _logger.warning("AI endpoint %s is down: %s", url, error)
+            ep.write({
+                'state': 'up' if healthy else 'down',
+                'last_check_date': now,
+                'last_check_ms': elapsed_ms if healthy else 0.0,
+                'last_error': error,
+            })
+
+    def action_check_health(self):
+        self._check_health()
+        down = self.filtered(lambda ep: ep.state == 'down')
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Endpoint Health'),
+                'message': _('%d up, %d down.') % (len(self) - len(down), len(down)),
+                'type': 'warning' if down else 'success',
+                'sticky': False,
+            },
+        }
+
+    @api.model
+    def _cron_check_endpoints(self):
+        endpoints = self.search([('config_id.active', '=', True)])
+        if endpoints:
+            endpoints._check_health()
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import timedelta
+
+import odoo
+from odoo import models, fields, api, _, SUPERUSER_ID
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Seconds a cron run keeps claiming new jobs; it re-triggers itself when
+# jobs remain, so a run stays well below limit_time_real_cron
+RUN_BUDGET = 60
+# A job still 'running' after this long belongs to a dead worker
+STALE_AFTER = timedelta(hours=1)
+# Retry delay: RETRY_DELAY * 2 ** (attempt - 1) seconds
+RETRY_DELAY = 30
+
+
+class OllamaJob(models.Model):
+    """Background AI job.
+
+    A job calls ``method(**params)`` on ``res_model.browse(res_id)`` (or on
+    the empty model when ``res_id`` is 0), as the user who enqueued it.
+    Jobs are run by the ``Ollama AI: Run Jobs`` cron, several at a time,
+    each in its own cursor, and retried with exponential backoff.
+
+    Enqueue from any record through the mixin::
+
+        jobs = records._ollama_enqueue('action_generate_seo')
+        return jobs._notify_enqueued(_('SEO generation'))
+    """
+    _name = 'ollama.job'
+    _description = 'AI Background Job'
+    _order = 'priority desc, id'
+
+    name = fields.Char(string='Description', required=True)
+    res_model = fields.Char(string='Model', required=True, index=True)
+    res_id = fields.Integer(string='Record ID', index=True)
+    method = fields.Char(string='Method', required=True)
+    params = fields.Text(string='Parameters (JSON)', default='{}')
+    priority = fields.Integer(
+        string='Priority', default=10,
+        help="Higher priorities run first.",
+    )
+    batch_ref = fields.Char(string='Batch', index=True, readonly=True)
+    user_id = fields.Many2one(
+        'res.users', string='Run As', default=lambda self: self.env.uid,
+        ondelete='set null',
+    )
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ], string='State', default='pending', required=True, index=True)
+    attempt_count = fields.Integer(string='Attempts', default=0, readonly=True)
+    max_attempts = fields.Integer(string='Max Attempts', default=3)
+    eta = fields.Datetime(
+        string='Not Before', index=True,
+        help="Retries wait until this date.",
+    )
+    date_started = fields.Datetime(string='Started', readonly=True)
+    date_done = fields.Datetime(string='Finished', readonly=True)
+    duration = fields.Float(string='Duration (s)', digits=(10, 2), readonly=True)
+    result = fields.Text(string='Result', readonly=True)
+    error_message = fields.Text(string='Error', readonly=True)
+
+    # -------------------------------------------------------
+    # Enqueue
+    # -------------------------------------------------------
+    @api.model
+    def _enqueue(self, records, method, params=None, priority=10,
+                 max_attempts=None, batch_ref=None, description=None):
+        """Create one job per record of ``records`` (or one model-level job
+        for an empty recordset). Records that already have a pending or
+        running job for the same method are skipped; a model-level job is
+        skipped when one with the same method and ``params`` is queued, so
+        batch jobs (``params`` naming their records) never shadow each other.
+
+        :returns: the created ``ollama.job`` records
+        """
+        if not hasattr(records, method):
+            raise UserError(_("Model %s has no method %s.") % (records._name, method))
+        params_json = json.dumps(params or {}, default=str)
+        if max_attempts is None:
+            max_attempts = self._get_default_max_attempts()
+
+        res_ids = records.ids or [0]
+        domain = [
+            ('res_model', '=', records._name),
+            ('res_id', 'in', res_ids),
+            ('method', '=', method),
+            ('state', 'in', ('pending', 'running')),
+        ]
+        if not records:
+            domain.append(('params', '=', params_json))
+        busy = set(self.sudo().search(domain).mapped('res_id'))
+
+        names = {rec.id: rec.display_name for rec in records if rec.id not in busy}
+        vals_list = [{
+            'name': description or '%s: %s' % (method, names.get(res_id, records._description)),
+            'res_model': records._name,
+            'res_id': res_id,
+            'method': method,
+            'params': params_json,
+            'priority': priority,
+            'max_attempts': max_attempts,
+            'batch_ref': batch_ref,
+            'user_id': self.env.uid,
+        } for res_id in res_ids if res_id not in busy]
+        jobs = self.sudo().create(vals_list) if vals_list else self.sudo()
+        if jobs:
+            self._trigger_runner()
+        return jobs
+
+    @api.model
+    def _queued_params(self, res_model, method):
+        """``params`` of the pending or running jobs of ``method``, e.g. to
+        leave out the records a batch job already covers."""
+        jobs = self.sudo().search([
+            ('res_model', '=', res_model),
+            ('method', '=', method),
+            ('state', 'in', ('pending', 'running')),
+        ])
+        return [json.loads(job.params or '{}') for job in jobs]
+
+    @api.model
+    def _get_default_max_attempts(self):
+        try:
+            return self.env['ollama.config'].get_active_config().job_max_attempts or 1
+        except UserError:
+            return 3
+
+    @api.model
+    def _trigger_runner(self):
+        cron = self.env.ref('ollama_base.ir_cron_run_ollama_jobs', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+
+    def _notify_enqueued(self, title):
+        """Client notification returned by batch buttons after enqueueing."""
+        if self:
+            message = _('%d jobs queued. They run in the background; '
+                        'see Settings > Technical > Ollama AI > AI Jobs.') % len(self)
+        else:
+            message = _('Everything is already queued.')
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': title,
+                'message': message,
+                'type': 'info' if self else 'warning',
+                'sticky': False,
+            },
+        }
+
+    # -------------------------------------------------------
+    # Runner
+    # -------------------------------------------------------
+    @api.model
+    def _get_worker_count(self):
+        try:
+            config = self.env['ollama.config'].get_active_config()
+        except UserError:
+            return 1
+        return max(1, config.job_workers or config._get_endpoint_capacity())
+
+    @api.model
+    def _claim_jobs(self, limit):
+        """Atomically move up to ``limit`` runnable jobs to 'running'."""
+        self.env.cr.execute("""
+            UPDATE ollama_job
+               SET state = 'running',
+                   date_started = (now() at time zone 'UTC'),
+                   attempt_count = attempt_count + 1
+             WHERE id IN (
+                SELECT id FROM ollama_job
+                 WHERE state = 'pending'
+                   AND (eta IS NULL OR eta <= (now() at time zone 'UTC'))
+                 ORDER BY priority DESC, id
+                 LIMIT %s
+                 FOR UPDATE SKIP LOCKED
+             )
+         RETURNING id
+        """, (limit,))
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_model(['state', 'date_started', 'attempt_count'])
+        return ids
+
+    @api.model
+    def _requeue_stale_jobs(self):
+        stale = self.search([
+            ('state', '=', 'running'),
+            ('date_started', '<', fields.Datetime.now() - STALE_AFTER),
+        ])
+        for job in stale:
+            job._handle_failure(_("Worker died while running the job."))
+
+    @api.model
+    def _cron_run_jobs(self):
+        """Run pending jobs with a bounded thread pool until the time budget
+        is spent. Each thread uses its own cursor."""
+        self._requeue_stale_jobs()
+        self.env.cr.commit()
+
+        workers = self._get_worker_count()
+        db_name = self.env.cr.dbname
+        deadline = time.monotonic() + RUN_BUDGET
+        done = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = set()
+            while True:
+                free = workers - len(running)
+                if free > 0 and time.monotonic() < deadline:
+                    job_ids = self._claim_jobs(free)
+                    self.env.cr.commit()
+                    running |= {executor.submit(self._run_job_thread, db_name, job_id)
+                                for job_id in job_ids}
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                done += len(finished)
+        if done:
+            _logger.info("AI jobs: %d processed with %d workers.", done, workers)
+        if time.monotonic() >= deadline and self.search_count([('state', '=', 'pending')]):
+            self._trigger_runner()
+
+    @staticmethod
+    def _run_job_thread(db_name, job_id):
+        try:
+            with odoo.registry(db_name).cursor() as cr:
+                env = odoo.api.Environment(cr, SUPERUSER_ID, {})
+                env['ollama.job'].browse(job_id)._execute()
+        except Exception:
+            _logger.exception("AI job %s: runner error", job_id)
+
+    def _execute(self):
+        """Run one claimed job and record its outcome (commits)."""
+        self.ensure_one()
+        t0 = time.time()
+        try:
+            params = json.loads(self.params or '{}')
+            env = self.env(user=self.user_id.id or SUPERUSER_ID)
+            records = env[self.res_model]
+            if self.res_id:
+                records = records.browse(self.res_id).exists()
+                if not records:
+                    raise UserError(_("Record %s,%s no longer exists.") % (self.res_model, self.res_id))
+            with self.env.cr.savepoint():
+                result = getattr(records, self.method)(**params)
+            self.write({
+                'state': 'done',
+                'date_done': fields.Datetime.now(),
+                'duration': time.time() - t0,
+                'result': self._format_result(result),
+                'error_message': False,
+            })
+        except Exception as e:
+            _logger.warning("AI job %s (%s.%s) failed: %s",
+                            self.id, self.res_model, self.method, e)
+            self._handle_failure(str(e), duration=time.time() - t0)
+        self.env.cr.commit()
+
+    @staticmethod
+    def _format_result(result):
+        if result is None or result is True:
+            return False
+        if isinstance(result, dict) and result.get('type', '').startswith('ir.actions'):
+            params = result.get('params') or {}
+            return params.get('message') or False
+        if isinstance(result, models.BaseModel):
+            return '%s%s' % (result._name, result.ids)
+        try:
+            return json.dumps(result, ensure_ascii=False, default=str)[:5000]
+        except (TypeError, ValueError):
+            return str(result)[:5000]
+
+    def _handle_failure(self, error, duration=0.0):
+        for job in self:
+            vals = {
+                'error_message': (error or '')[:5000],
+                'duration': duration,
+            }
+            if job.attempt_count < job.max_attempts:
+                delay = RETRY_DELAY * 2 ** max(0, job.attempt_count - 1)
+                vals.update({
+                    'state': 'pending',
+                    'eta': fields.Datetime.now() + timedelta(seconds=delay),
+                })
+            else:
+                vals.update({'state': 'failed', 'date_done': fields.Datetime.now()})
+            job.write(vals)
+
+    # -------------------------------------------------------
+    # Buttons
+    # -------------------------------------------------------
+    def action_retry(self):
+        self.filtered(lambda j: j.state in ('failed', 'cancelled')).write({
+            'state': 'pending',
+            'attempt_count': 0,
+            'eta': False,
+            'error_message': False,
+        })
+        self._trigger_runner()
+        return True
+
+    def action_cancel(self):
+        self.filtered(lambda j: j.state == 'pending').write({
+            'state': 'cancelled',
+            'date_done': fields.Datetime.now(),
+        })
+        return True
+
+    def action_open_record(self):
+        self.ensure_one()
+        if not self.res_id:
+            return False
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self.res_model,
+            'res_id': self.res_id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    @api.autovacuum
+    def _gc_done_jobs(self):
+        """Drop finished jobs older than a week."""
+        limit = fields.Datetime.now() - timedelta(days=7)
+        self.search([
+            ('state', 'in', ('done', 'cancelled')),
+            ('date_done', '<', limit),
+        ]).unlink()
@@ -1,9 +1,33 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+import base64
 import logging
+import time
+import zlib
+
+import odoo
+from odoo import models, fields, api, tools, SUPERUSER_ID
+from odoo.tools import SQL
+
+from ..services import ai_log_buffer
 
 _logger = logging.getLogger(__name__)
 
+PREVIEW_SIZE = 500
+# Rows deleted (or stripped of their texts) per statement by the retention
+# engine, and seconds a cleanup run may last; the next run resumes
+RETENTION_BATCH = 5000
+RETENTION_BUDGET = 300
+
+
+def _write_log_rows(dbname, rows):
+    """Bulk-insert buffered log rows (called by ``services.ai_log_buffer``)."""
+    with odoo.registry(dbname).cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        env['ollama.log'].create(rows)
+
+
+ai_log_buffer.set_writer(_write_log_rows)
+
 
 class OllamaLog(models.Model):
     _name = 'ollama.log'
@@ -18,17 +42,246 @@ class OllamaLog(models.Model):
     response_preview = fields.Text(string='Response (preview)')
     res_model = fields.Char(string='Source Model')
     res_id = fields.Integer(string='Source Record ID')
+    module = fields.Char(string='Module', help="Odoo module of the calling model.")
     status = fields.Selection([
         ('success', 'Success'),
         ('error', 'Error'),
     ], string='Status', default='success')
+    duration = fields.Float(string='Duration (s)', digits=(10, 3))
+    tokens_in = fields.Integer(string='Prompt Tokens')
+    tokens_out = fields.Integer(string='Completion Tokens')
+    endpoint = fields.Char(string='Endpoint')
+    cache_hit = fields.Boolean(string='Cache Hit')
+    streamed = fields.Boolean(string='Streamed')
+    error_class = fields.Char(string='Error Class')
+    # zlib-compressed full texts, see ollama.log.retention.body_storage
+    prompt_body = fields.Binary(string='Prompt (compressed)', attachment=False)
+    response_body = fields.Binary(string='Response (compressed)', attachment=False)
+    prompt_text = fields.Text(string='Prompt', compute='_compute_texts')
+    response_text = fields.Text(string='Response', compute='_compute_texts')
+
+    def init(self):
+        # The retention engine looks up the newest expired row by date
+        tools.create_index(self.env.cr, 'ollama_log_create_date_idx',
+                           self._table, ['create_date'])
+
+    @api.depends('prompt_body', 'response_body', 'prompt_preview', 'response_preview')
+    def _compute_texts(self):
+        for log in self:
+            log.prompt_text = self._decompress(log.prompt_body) or log.prompt_preview
+            log.response_text = self._decompress(log.response_body) or log.response_preview
+
+    @staticmethod
+    def _compress(text):
+        return base64.b64encode(zlib.compress(text.encode('utf-8'), 6))
+
+    @staticmethod
+    def _decompress(value):
+        if not value:
+            return False
+        try:
+            return zlib.decompress(base64.b64decode(value)).decode('utf-8')
+        except (ValueError, zlib.error):
+            return False
+
+    @api.model
+    def _log_call(self, vals, prompt=None, response=None):
+        """Queue a log row; it is inserted later, in bulk and in its own
+        cursor (see ``services.ai_log_buffer``). Tests write it directly
+        since they cannot see rows committed by another cursor.
+
+        ``prompt`` and ``response`` are the full texts, stored according to
+        the retention rule of ``vals['module']``.
+        """
+        vals = self._apply_body_storage(vals, prompt, response)
+        if self.env.registry.in_test_mode():
+            return self.sudo().create(vals)
+        ai_log_buffer.add(self.env.cr.dbname, vals)
+        return self.browse()
 
+    @api.model
+    def _apply_body_storage(self, vals, prompt=None, response=None):
+        storage = self.env['ollama.log.retention']._get_body_storage(vals.get('module') or False)
+        if storage == 'none':
+            return dict(vals, prompt_preview=False, response_preview=False)
+        if storage == 'compressed':
+            vals = dict(vals)
+            # Texts that fit in the preview are not stored twice
+            if prompt and len(prompt) > PREVIEW_SIZE:
+                vals['prompt_body'] = self._compress(prompt)
+            if response and len(response) > PREVIEW_SIZE:
+                vals['response_body'] = self._compress(response)
+        return vals
+
+    @api.model
+    def _flush_buffer(self):
+        """Write the rows buffered by this process now."""
+        return ai_log_buffer.flush(self.env.cr.dbname)
+
+    @api.model
+    def _classify_error(self, error):
+        """Short, groupable error class for ``error`` (an exception)."""
+        message = str(error).lower()
+        if 'timed out' in message or 'timeout' in message:
+            return 'timeout'
+        if 'cannot connect' in message or 'connection' in message:
+            return 'connection'
+        if 'busy' in message:
+            return 'overloaded'
+        if 'status' in message or 'http' in message:
+            return 'http_error'
+        if 'invalid' in message:
+            return 'invalid_response'
+        return type(error).__name__
+
+    # -------------------------------------------------------
+    # Retention
+    # -------------------------------------------------------
     @api.autovacuum
     def _gc_old_logs(self):
-        """Remove AI logs older than 30 days (called by autovacuum)."""
-        limit_date = fields.Datetime.subtract(fields.Datetime.now(), days=30)
-        old = self.search([('create_date', '<', limit_date)])
-        count = len(old)
-        if count:
-            old.unlink()
-            _logger.info("Cleaned up %d old AI logs.", count)
+        """Apply the log retention rules (autovacuum and daily cron)."""
+        self._run_retention()
+
+    @api.model
+    def _run_retention(self, batch_size=RETENTION_BATCH, time_budget=RETENTION_BUDGET):
+        """Delete expired logs and strip old texts, rule by rule.
+
+        Work is done in plain SQL over id ranges of ``batch_size`` rows,
+        committed one by one: rows are never loaded through the ORM and
+        the table is never locked for long. Ids grow with ``create_date``,
+        so the newest expired row gives the upper bound of each range.
+        Stops after ``time_budget`` seconds; the next run continues.
+        """
+        rules = self.env['ollama.log.retention'].sudo().search([])
+        modules = tuple(rules.filtered('module').mapped('module'))
+        deadline = time.monotonic() + time_budget
+        now = fields.Datetime.now()
+        deleted = stripped = 0
+        for rule in rules:
+            if rule.module:
+                condition = SQL("module = %s", rule.module)
+            elif modules:
+                condition = SQL("(module IS NULL OR module NOT IN %s)", modules)
+            else:
+                condition = SQL("TRUE")
+            if rule.retention_days > 0:
+                deleted += self._retention_batches(
+                    fields.Datetime.subtract(now, days=rule.retention_days),
+                    lambda lo, hi, cond=condition: SQL(
+                        "DELETE FROM ollama_log WHERE id BETWEEN %s AND %s AND %s",
+                        lo, hi, cond),
+                    batch_size, deadline)
+            if 0 < rule.body_retention_days < (rule.retention_days or float('inf')):
+                stripped += self._retention_batches(
+                    fields.Datetime.subtract(now, days=rule.body_retention_days),
+                    lambda lo, hi, cond=condition: SQL("""
+                        UPDATE ollama_log
+                           SET prompt_preview = NULL, response_preview = NULL,
+                               prompt_body = NULL, response_body = NULL
+                         WHERE id BETWEEN %s AND %s AND %s
+                           AND (prompt_preview IS NOT NULL OR response_preview IS NOT NULL
+                                OR prompt_body IS NOT NULL OR response_body IS NOT NULL)
+                    """, lo, hi, cond),
+                    batch_size, deadline)
+            if time.monotonic() > deadline:
+                _logger.info("AI log retention: time budget reached, continuing next run.")
+                break
+        if deleted or stripped:
+            self.invalidate_model()
+            _logger.info("AI log retention: %d logs deleted, %d stripped of their texts.",
+                         deleted, stripped)
+        return {'deleted': deleted, 'stripped': stripped}
+
+    @api.model
+    def _retention_batches(self, cutoff, make_query, batch_size, deadline):
+        """Run ``make_query(lo, hi)`` over the id ranges of rows older than
+        ``cutoff``. Returns the number of rows affected."""
+        cr = self.env.cr
+        cr.execute(SQL(
+            "SELECT id FROM ollama_log WHERE create_date < %s ORDER BY create_date DESC LIMIT 1",
+            cutoff))
+        row = cr.fetchone()
+        if not row:
+            return 0
+        upper = row[0]
+        cr.execute("SELECT min(id) FROM ollama_log")
+        lower = cr.fetchone()[0]
+        count = 0
+        while lower is not None and lower <= upper:
+            high = min(lower + batch_size - 1, upper)
+            cr.execute(make_query(lower, high))
+            count += cr.rowcount
+            if not self.env.registry.in_test_mode():
+                cr.commit()
+            lower = high + 1
+            if time.monotonic() > deadline:
+                break
+        return count
+
+
+class OllamaLogMetrics(models.Model):
+    """Latency and throughput of the logged AI calls.
+
+    One line per (provider, model, calling module), plus one line per
+    model over all modules (module ``(all)``). Latencies only count calls
+    that reached the model: cache hits and errors are excluded. Tokens per
+    second is the completion rate of the calls reporting token counts.
+    """
+    _name = 'ollama.log.metrics'
+    _description = 'AI Call Metrics'
+    _auto = False
+    _order = 'provider, model_name, module'
+
+    provider = fields.Char(string='Provider', readonly=True)
+    model_name = fields.Char(string='Model', readonly=True)
+    module = fields.Char(string='Module', readonly=True)
+    call_count = fields.Integer(string='Calls', readonly=True)
+    error_count = fields.Integer(string='Errors', readonly=True)
+    cache_hits = fields.Integer(string='Cache Hits', readonly=True)
+    latency_p50 = fields.Float(string='Latency p50 (s)', digits=(10, 2), readonly=True)
+    latency_p95 = fields.Float(string='Latency p95 (s)', digits=(10, 2), readonly=True)
+    latency_avg = fields.Float(string='Latency avg (s)', digits=(10, 2), readonly=True)
+    tokens_in = fields.Integer(string='Prompt Tokens', readonly=True)
+    tokens_out = fields.Integer(string='Completion Tokens', readonly=True)
+    tokens_per_second = fields.Float(string='Tokens / s', digits=(10, 1), readonly=True)
+    first_call = fields.Datetime(string='First Call', readonly=True)
+    last_call = fields.Datetime(string='Last Call', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute(SQL("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT row_number() OVER (ORDER BY m.provider, m.model_name, m.module) AS id, m.*
+                FROM (
+                    SELECT l.provider,
+                           l.model_name,
+                           CASE WHEN GROUPING(l.module) = 1 THEN '(all)'
+                                ELSE COALESCE(l.module, '') END AS module,
+                           count(*) AS call_count,
+                           count(*) FILTER (WHERE l.status = 'error') AS error_count,
+                           count(*) FILTER (WHERE l.cache_hit) AS cache_hits,
+                           percentile_cont(0.5) WITHIN GROUP (ORDER BY l.duration::float)
+                               FILTER (WHERE %s) AS latency_p50,
+                           percentile_cont(0.95) WITHIN GROUP (ORDER BY l.duration::float)
+                               FILTER (WHERE %s) AS latency_p95,
+                           avg(l.duration) FILTER (WHERE %s) AS latency_avg,
+                           COALESCE(sum(l.tokens_in), 0) AS tokens_in,
+                           COALESCE(sum(l.tokens_out), 0) AS tokens_out,
+                           sum(l.tokens_out) FILTER (WHERE %s AND l.tokens_out > 0)
+                               / NULLIF(sum(l.duration) FILTER (WHERE %s AND l.tokens_out > 0), 0)
+                               AS tokens_per_second,
+                           min(l.create_date) AS first_call,
+                           max(l.create_date) AS last_call
+                    FROM ollama_log l
+                    GROUP BY GROUPING SETS (
+                        (l.provider, l.model_name, l.module),
+                        (l.provider, l.model_name)
+                    )
+                ) m
+            )
+        """, SQL.identifier(self._table), *[self._live_call_condition()] * 5))
+
+    @api.model
+    def _live_call_condition(self):
+        """Calls answered by the model itself, with a measured duration."""
+        return SQL("l.status = 'success' AND l.cache_hit IS NOT TRUE AND l.duration > 0")
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError
+
+
+class OllamaLogRetention(models.Model):
+    """How long ``ollama.log`` rows of a module are kept, and how their
+    prompt and response texts are stored.
+
+    The rule without module applies to every module without a rule of its
+    own. Rules are applied by the daily log cleanup (see
+    ``ollama.log._run_retention``).
+    """
+    _name = 'ollama.log.retention'
+    _description = 'AI Log Retention Rule'
+    _order = 'module nulls first'
+    _rec_name = 'module'
+
+    module = fields.Selection(
+        selection='_selection_module', string='Module',
+        help="AI module whose logs the rule applies to (the Module column of "
+             "the AI logs). Leave empty for the default rule.",
+    )
+    retention_days = fields.Integer(
+        string='Keep Logs (days)', default=30,
+        help="Logs older than this are deleted. 0 = keep forever.",
+    )
+    body_retention_days = fields.Integer(
+        string='Keep Texts (days)', default=0,
+        help="After this many days the prompt and response texts are removed; "
+             "durations, tokens and status stay for the metrics. "
+             "0 = keep the texts as long as the log.",
+    )
+    body_storage = fields.Selection([
+        ('preview', 'Previews (500 characters)'),
+        ('compressed', 'Full texts, compressed'),
+        ('none', 'No texts (metrics only)'),
+    ], string='Texts', default='preview', required=True,
+        help="Previews: the first 500 characters of the prompt and response.\n"
+             "Full texts, compressed: previews plus the complete texts, zlib-compressed.\n"
+             "No texts: only durations, tokens and status are logged.")
+
+    _sql_constraints = [
+        ('module_unique', 'unique(module)', 'There is already a retention rule for this module!'),
+    ]
+
+    def init(self):
+        # unique(module) does not apply to NULL: one default rule only
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ollama_log_retention_default_uniq
+                ON ollama_log_retention ((module IS NULL))
+             WHERE module IS NULL
+        """)
+
+    @api.model
+    def _selection_module(self):
+        """ollama_base and the installed modules depending on it: the
+        values ``ollama.log.module`` takes."""
+        deps = self.env['ir.module.module.dependency'].sudo().search([
+            ('name', '=', 'ollama_base'),
+            ('module_id.state', 'in', ('installed', 'to upgrade')),
+        ])
+        names = sorted({'ollama_base', *deps.module_id.mapped('name')})
+        return [(name, name) for name in names]
+
+    @api.constrains('module')
+    def _check_single_default(self):
+        if self.filtered(lambda rule: not rule.module) and self.search_count(
+                [('module', '=', False)]) > 1:
+            raise UserError(_("There is already a default retention rule (without module)."))
+
+    @api.model
+    @tools.ormcache('module')
+    def _get_body_storage(self, module):
+        """Text storage mode for logs of ``module``."""
+        rules = self.sudo().search([('module', 'in', [module or False, False])])
+        rule = rules.filtered('module')[:1] or rules[:1]
+        return rule.body_storage or 'preview'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        self.env.registry.clear_cache()
+        return super().create(vals_list)
+
+    def write(self, vals):
+        self.env.registry.clear_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self.env.registry.clear_cache()
+        return super().unlink()
@@ -2,13 +2,25 @@
 import json
 import logging
 import re
+import sys
+import time
 
 from odoo import models, api, _
 from odoo.exceptions import UserError
 
+from ..services import ai_log_buffer
+
 _logger = logging.getLogger(__name__)
 
 
+def _addon_name(python_module):
+    """'odoo.addons.ollama_seo_generator.models.x' -> 'ollama_seo_generator'."""
+    parts = (python_module or '').split('.')
+    if len(parts) > 2 and parts[0] == 'odoo' and parts[1] == 'addons':
+        return parts[2]
+    return None
+
+
 class OllamaMixin(models.AbstractModel):
     """Mixin providing AI call helpers for all downstream modules.
 
@@ -28,13 +40,40 @@ class OllamaMixin(models.AbstractModel):
         """Return the active ``ollama.config`` record."""
         return self.env['ollama.config'].get_active_config()
 
+    def _ollama_caller_module(self):
+        """Technical name of the addon whose code called into ollama_base.
+
+        ``_original_module`` names the module defining the model (e.g.
+        ``product`` for ``product.template``), and several AI modules extend
+        the same model, so the calling code is what tells them apart.
+        """
+        frame = sys._getframe(1)
+        while frame is not None:
+            addon = _addon_name(frame.f_globals.get('__name__'))
+            if addon != 'ollama_base':
+                return addon or 'ollama_base'
+            frame = frame.f_back
+        return 'ollama_base'
+
+    def _ollama_method_module(self, method):
+        """Technical name of the addon defining the override of ``method``
+        this record resolves to."""
+        for cls in type(self).__mro__:
+            if method in vars(cls):
+                return _addon_name(cls.__module__) or self._original_module
+        return self._original_module
+
     # --------------------------------------------------
     # Safe AI call
     # --------------------------------------------------
     def _call_ollama_safe(self, prompt, system_prompt=None, max_tokens=None,
                           temperature=None, config=None, log_model=None,
-                          log_res_id=None):
-        """Call the AI API with error handling and optional logging.
+                          log_res_id=None, use_cache=True, log_vals=None):
+        """Call the AI API with error handling and logging.
+
+        Every call is logged in ``ollama.log`` with its duration, token
+        counts and endpoint. Rows are buffered and inserted in bulk outside
+        the current transaction, so they appear a few seconds later.
 
         :param prompt: User prompt text
         :param system_prompt: Optional system prompt
@@ -42,7 +81,11 @@ class OllamaMixin(models.AbstractModel):
         :param temperature: Override temperature
         :param config: Specific ``ollama.config`` record (default: active)
         :param log_model: ``_name`` of the calling model for logging
+            (default: this model)
         :param log_res_id: Record ID for logging
+        :param use_cache: Set to False to force a fresh completion
+            (e.g. "regenerate" buttons)
+        :param log_vals: Extra ``ollama.log`` values (e.g. a tagged preview)
         :returns: AI response text, or empty string on error
         """
         if not config:
@@ -52,38 +95,83 @@ class OllamaMixin(models.AbstractModel):
                 _logger.warning("No active AI config found.")
                 return ''
 
+        module = self._ollama_caller_module()
+        error = None
+        ai_log_buffer.take_usage()  # drop leftovers of an unlogged call
+        start = time.monotonic()
         try:
             result = config.call_ai_api(
                 prompt,
                 system_prompt=system_prompt,
                 max_tokens=max_tokens,
                 temperature=temperature,
+                use_cache=use_cache,
             )
         except UserError as e:
             _logger.error("AI call error: %s", e)
-            result = ''
+            result, error = '', e
         except Exception as e:
             _logger.exception("Unexpected AI error: %s", e)
-            result = ''
+            result, error = '', e
+        duration = time.monotonic() - start
 
-        # Log the call
-        if log_model or log_res_id:
-            try:
-                self.env['ollama.log'].sudo().create({
-                    'config_id': config.id,
-                    'provider': config.provider,
-                    'model_name': config._get_model_name(),
-                    'prompt_preview': (prompt or '')[:500],
-                    'response_preview': (result or '')[:500],
-                    'res_model': log_model or '',
-                    'res_id': log_res_id or 0,
-                    'status': 'success' if result else 'error',
-                })
-            except Exception:
-                pass  # logging should never break the main flow
+        try:
+            usage = ai_log_buffer.take_usage()
+            self.env['ollama.log']._log_call(dict({
+                'config_id': config.id,
+                'provider': config.provider,
+                'model_name': config._get_model_name(),
+                'prompt_preview': (prompt or '')[:500],
+                'response_preview': (result or '')[:500],
+                'res_model': log_model or self._name,
+                'res_id': log_res_id or 0,
+                'module': module,
+                'status': 'success' if result else 'error',
+                'duration': round(duration, 3),
+                'tokens_in': usage.get('tokens_in') or 0,
+                'tokens_out': usage.get('tokens_out') or 0,
+                'endpoint': usage.get('endpoint') or False,
+                'cache_hit': bool(usage.get('cache_hit')),
+                'error_class': error and self.env['ollama.log']._classify_error(error) or (
+                    False if result else 'empty_response'),
+            }, **(log_vals or {})), prompt=prompt, response=result)
+        except Exception:
+            _logger.debug("AI call logging failed", exc_info=True)  # never break the main flow
 
         return result or ''
 
+    # --------------------------------------------------
+    # Streaming hooks (used by the /ollama/stream controller)
+    # --------------------------------------------------
+    def _ollama_stream_prepare(self, purpose, params):
+        """Return the AI request to stream for ``purpose``.
+
+        Override in models offering streaming; return a dict with
+        ``prompt`` and optionally ``system_prompt``, ``max_tokens``,
+        ``temperature``, ``params`` (passed on to
+        :meth:`_ollama_stream_finish` instead of the request params) and
+        ``log_vals`` (extra ``ollama.log`` values).
+        """
+        raise UserError(_("AI streaming is not available for %s.") % self._description)
+
+    def _ollama_stream_finish(self, purpose, text, params):
+        """Store the streamed answer. Runs in a new cursor once the stream
+        ended; the returned dict is sent to the client in the final event."""
+        return {}
+
+    # --------------------------------------------------
+    # Background jobs
+    # --------------------------------------------------
+    def _ollama_enqueue(self, method, params=None, priority=10, batch_ref=None):
+        """Queue ``method(**params)`` on each record as an ``ollama.job``.
+
+        :returns: the created jobs; ``jobs._notify_enqueued(title)`` gives
+            the client notification for a batch button
+        """
+        return self.env['ollama.job']._enqueue(
+            self, method, params=params, priority=priority, batch_ref=batch_ref,
+        )
+
     # --------------------------------------------------
     # JSON parsing
     # --------------------------------------------------
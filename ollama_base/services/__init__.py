@@ -1 +1,6 @@
+from . import ai_log_buffer
+from . import endpoint_router
+from . import http_transport
 from . import ollama_caller
+from . import ollama_stream
+from . import vector_index
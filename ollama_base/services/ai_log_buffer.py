@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Buffered writer for ``ollama.log`` (no ORM).
+
+AI calls append a plain dict to a per-database buffer instead of creating
+the log row in the caller's transaction. The rows are inserted in bulk, in
+a cursor of their own, once ``FLUSH_SIZE`` rows are waiting or
+``FLUSH_INTERVAL`` seconds after the first one, whichever comes first.
+A rolled-back business transaction therefore keeps its log rows, and a
+batch action of a few hundred calls costs a handful of INSERTs.
+
+The writer is registered by the ``ollama.log`` model (``set_writer``) so
+that this module stays ORM-free. Rows still buffered when the process is
+killed are lost: the log is meant for metrics, not for audit.
+
+Provider implementations report what only they know (token counts,
+endpoint) through ``note_usage``; the logger collects it with
+``take_usage``. Both run in the calling thread.
+"""
+import atexit
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+FLUSH_SIZE = 100
+FLUSH_INTERVAL = 10.0       # seconds
+
+_writer = None
+_buffers = {}               # dbname -> [row, ...]
+_timers = {}                # dbname -> threading.Timer
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def set_writer(writer):
+    """Register ``writer(dbname, rows)``, which inserts the rows."""
+    global _writer
+    _writer = writer
+
+
+def add(dbname, row):
+    """Queue one log row (a dict of ``ollama.log`` values) for ``dbname``."""
+    with _lock:
+        rows = _buffers.setdefault(dbname, [])
+        rows.append(row)
+        full = len(rows) >= FLUSH_SIZE
+        if not full and dbname not in _timers:
+            timer = threading.Timer(FLUSH_INTERVAL, flush, args=(dbname,))
+            timer.daemon = True
+            _timers[dbname] = timer
+            timer.start()
+    if full:
+        flush(dbname)
+
+
+def flush(dbname):
+    """Write the rows waiting for ``dbname``. Returns the number written."""
+    with _lock:
+        rows = _buffers.pop(dbname, None)
+        timer = _timers.pop(dbname, None)
+    if timer is not None:
+        timer.cancel()
+    if not rows or _writer is None:
+        return 0
+    try:
+        _writer(dbname, rows)
+    except Exception:
+        _logger.exception("AI log: could not write %d buffered rows", len(rows))
+        return 0
+    return len(rows)
+
+
+def flush_all():
+    for dbname in list(_buffers):
+        flush(dbname)
+
+
+def pending(dbname):
+    """Number of rows waiting for ``dbname``."""
+    with _lock:
+        return len(_buffers.get(dbname) or ())
+
+
+def note_usage(**values):
+    """Record metadata of the provider call in progress (this thread)."""
+    usage = getattr(_local, 'usage', None)
+    if usage is None:
+        usage = _local.usage = {}
+    usage.update({k: v for k, v in values.items() if v is not None})
+
+
+def take_usage():
+    """Return and forget the metadata noted since the last call."""
+    usage = getattr(_local, 'usage', None) or {}
+    _local.usage = None
+    return usage
+
+
+atexit.register(flush_all)
@@ -3,22 +3,34 @@
 
 Used by ``ThreadPoolExecutor`` workers that cannot access the ORM.
 All parameters are plain Python values (no Odoo recordsets).
+
+``transport`` is an optional dict of pool settings (``pool_size``,
+``max_retries``, ``connect_timeout``), as returned by
+``ollama.config._get_transport_options()``.
 """
-import json
 import logging
+
 import requests
 
+from . import http_transport
+
 _logger = logging.getLogger(__name__)
 
 
 def call_ollama_http(base_url, model, prompt, system_prompt=None,
                      max_tokens=2000, temperature=0.7, num_ctx=4096,
-                     num_gpu=99, keep_alive='10m', timeout=180):
+                     num_gpu=99, keep_alive='10m', timeout=180,
+                     transport=None, router=None, strategy='least_loaded'):
     """Call Ollama native ``/api/chat`` without ORM.
 
+    When ``router`` (an ``endpoint_router.EndpointRouter``, see
+    ``ollama.config._get_endpoint_router()``) is given, ``base_url`` is
+    ignored: the call is routed to the least loaded endpoint and fails
+    over to the next one on error. A read timeout is a slow model, not a
+    dead host: it neither fails over nor marks the endpoint down.
+
     :returns: Response text (str) or empty string on error.
     """
-    url = f"{base_url.rstrip('/')}/api/chat"
     sys_prompt = system_prompt or 'You are a helpful AI assistant.'
     data = {
         'model': model,
@@ -37,27 +49,65 @@ def call_ollama_http(base_url, model, prompt, system_prompt=None,
     if keep_alive:
         data['keep_alive'] = keep_alive
 
+    if router is None:
+        try:
+            return _ollama_chat(base_url, data, timeout, transport)[0]
+        except requests.exceptions.ReadTimeout:
+            _logger.error("Ollama at %s timed out after %ss", base_url, timeout)
+            return ''
+    for _attempt in range(router.size()):
+        timed_out = None
+        try:
+            with router.lease(strategy, timeout) as lease:
+                try:
+                    content, ok = _ollama_chat(lease.url, data, timeout, transport)
+                except requests.exceptions.ReadTimeout:
+                    timed_out = lease.url
+                else:
+                    if ok:
+                        return content
+                    lease.failed()
+        except TimeoutError:
+            _logger.error("Ollama: all endpoints busy for %ss", timeout)
+            return ''
+        if timed_out:
+            # Another host would only run the same slow generation again
+            _logger.error("Ollama at %s timed out after %ss", timed_out, timeout)
+            return ''
+    return ''
+
+
+def _ollama_chat(base_url, data, timeout, transport):
+    """POST to ``/api/chat``. Returns ``(content, ok)``.
+
+    :raises requests.exceptions.ReadTimeout: when the model did not answer
+        within ``timeout``
+    """
+    url = f"{base_url.rstrip('/')}/api/chat"
     try:
-        resp = requests.post(url, json=data, timeout=timeout)
+        resp = http_transport.post(url, json=data, timeout=timeout, **(transport or {}))
         if resp.status_code != 200:
             _logger.error("Ollama HTTP %s — %s", resp.status_code, resp.text[:300])
-            return ''
+            return '', False
         res = resp.json()
         if 'error' in res:
             _logger.error("Ollama error: %s", res['error'])
-            return ''
+            return '', False
         msg = res.get('message', {})
         content = msg.get('content', '') if isinstance(msg, dict) else ''
         if not content:
             content = res.get('response', '')
-        return _clean(content)
+        return _clean(content), True
+    except requests.exceptions.ReadTimeout:
+        raise
     except Exception as e:
-        _logger.error("Ollama HTTP call failed: %s", e)
-        return ''
+        _logger.error("Ollama HTTP call failed (%s): %s", url, e)
+        return '', False
 
 
 def call_openai_http(url, api_key, model, prompt, system_prompt=None,
-                     max_tokens=2000, temperature=0.7, timeout=120):
+                     max_tokens=2000, temperature=0.7, timeout=120,
+                     transport=None):
     """Call any OpenAI-compatible endpoint without ORM.
 
     Works for OpenAI, Perplexity, Llama.cpp, Ollama (openai mode).
@@ -78,7 +128,8 @@ def call_openai_http(url, api_key, model, prompt, system_prompt=None,
     }
 
     try:
-        resp = requests.post(url, headers=headers, json=data, timeout=timeout)
+        resp = http_transport.post(url, credentials=api_key, headers=headers, json=data,
+                                   timeout=timeout, **(transport or {}))
         if resp.status_code != 200:
             _logger.error("OpenAI-compat HTTP %s — %s", resp.status_code, resp.text[:300])
             return ''
@@ -90,7 +141,8 @@ def call_openai_http(url, api_key, model, prompt, system_prompt=None,
 
 
 def call_anthropic_http(api_key, model, prompt, system_prompt=None,
-                        max_tokens=2000, temperature=0.7, timeout=60):
+                        max_tokens=2000, temperature=0.7, timeout=60,
+                        transport=None):
     """Call Anthropic Claude API without ORM."""
     url = 'https://api.anthropic.com/v1/messages'
     headers = {
@@ -108,7 +160,8 @@ def call_anthropic_http(api_key, model, prompt, system_prompt=None,
         data['system'] = system_prompt
 
     try:
-        resp = requests.post(url, headers=headers, json=data, timeout=timeout)
+        resp = http_transport.post(url, credentials=api_key, headers=headers, json=data,
+                                   timeout=timeout, **(transport or {}))
         if resp.status_code != 200:
             _logger.error("Anthropic HTTP %s — %s", resp.status_code, resp.text[:300])
             return ''
@@ -120,7 +173,7 @@ def call_anthropic_http(api_key, model, prompt, system_prompt=None,
 
 
 def call_gemini_http(api_key, model, prompt, max_tokens=2000,
-                     temperature=0.7, timeout=60):
+                     temperature=0.7, timeout=60, transport=None):
     """Call Google Gemini API without ORM."""
     if '/' not in model:
         model = f"models/{model}"
@@ -136,7 +189,8 @@ def call_gemini_http(api_key, model, prompt, max_tokens=2000,
         },
     }
     try:
-        resp = requests.post(url, json=data, timeout=timeout)
+        resp = http_transport.post(url, credentials=api_key, json=data,
+                                   timeout=timeout, **(transport or {}))
         if resp.status_code != 200:
             _logger.error("Gemini HTTP %s — %s", resp.status_code, resp.text[:300])
             return ''
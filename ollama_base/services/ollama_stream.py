@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Token streaming for AI providers (no ORM).
+
+``iter_stream(spec)`` yields text chunks as the model produces them. The
+``spec`` is a plain dict built by ``ollama.config._prepare_stream()`` while
+the ORM is still available, so the generator can be consumed after the
+request cursor is closed (e.g. by an HTTP streaming response):
+
+* ``kind='ollama'``: native ``/api/chat`` with ``stream: true``
+  (one JSON object per line)
+* ``kind='openai'``: OpenAI-compatible Server-Sent Events
+  (``data: {...}`` lines, terminated by ``data: [DONE]``)
+* ``text`` set: the answer is already known (cache hit, or a provider
+  without token streaming) and is yielded in one chunk
+
+Once the stream is consumed, ``spec['usage']`` holds the endpoint and,
+when the provider reports them, the token counts (for ``ollama.log``).
+"""
+import json
+import logging
+
+import requests
+
+from . import http_transport
+
+_logger = logging.getLogger(__name__)
+
+
+class AIStreamError(Exception):
+    """The provider refused or broke the stream."""
+
+
+def iter_stream(spec):
+    """Yield text chunks for ``spec``."""
+    if spec.get('text') is not None:
+        if spec['text']:
+            yield spec['text']
+        return
+    router = spec.get('router')
+    if router is None:
+        yield from _iter_kind(spec, spec['base_url'])
+        return
+    timed_out = None
+    with router.lease(spec.get('strategy', 'least_loaded'), spec['timeout']) as lease:
+        try:
+            yield from _iter_kind(spec, lease.url)
+        except requests.exceptions.ReadTimeout as e:
+            # A slow model, not a dead host: keep the endpoint in rotation
+            timed_out = e
+    if timed_out:
+        raise timed_out
+
+
+def _iter_kind(spec, base_url):
+    url = base_url.rstrip('/') + (spec.get('path') or '')
+    usage = spec.setdefault('usage', {})
+    usage['endpoint'] = base_url
+    resp = http_transport.post(
+        url, credentials=spec.get('credentials'), json=spec['data'],
+        headers=spec.get('headers'), timeout=spec['timeout'], stream=True,
+        **(spec.get('transport') or {}),
+    )
+    try:
+        if resp.status_code != 200:
+            raise AIStreamError("HTTP %s from %s: %s" % (
+                resp.status_code, url, resp.text[:300]))
+        if spec['kind'] == 'ollama':
+            yield from _iter_ollama_lines(resp, usage)
+        else:
+            yield from _iter_openai_sse(resp)
+    finally:
+        resp.close()
+
+
+def _iter_ollama_lines(resp, usage):
+    for line in resp.iter_lines():
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if event.get('error'):
+            raise AIStreamError(event['error'])
+        msg = event.get('message') or {}
+        token = msg.get('content', '') if isinstance(msg, dict) else ''
+        if not token:
+            token = event.get('response', '')
+        if token:
+            yield token
+        if event.get('done'):
+            usage['tokens_in'] = event.get('prompt_eval_count')
+            usage['tokens_out'] = event.get('eval_count')
+            break
+
+
+def _iter_openai_sse(resp):
+    for line in resp.iter_lines():
+        # SSE responses often carry no charset: decode ourselves
+        line = line.decode('utf-8', 'replace') if isinstance(line, bytes) else line
+        if not line or not line.startswith('data:'):
+            continue
+        payload = line[5:].strip()
+        if payload == '[DONE]':
+            break
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            continue
+        if event.get('error'):
+            err = event['error']
+            raise AIStreamError(err.get('message', str(err)) if isinstance(err, dict) else err)
+        for choice in event.get('choices') or []:
+            token = (choice.get('delta') or {}).get('content')
+            if token:
+                yield token
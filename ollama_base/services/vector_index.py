@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""In-memory cosine search over stored embeddings (no ORM).
+
+Vectors are stored in binary columns as packed float32 (``pack_vector``),
+e.g. ``product_rag_index.embedding``. A search loads every vector of a
+table once into a normalized NumPy matrix, cached per process under a key
+chosen by the caller and reloaded when the signature of the table (e.g.
+row count + last indexing date) changes, so a query costs one matrix
+product instead of a table scan.
+
+NumPy is optional: without it ``available()`` is False and callers fall
+back to their non-vector search.
+"""
+import logging
+import threading
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+_logger = logging.getLogger(__name__)
+
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def available():
+    return numpy is not None
+
+
+def pack_vector(vector):
+    """float list -> float32 bytes."""
+    return array('f', vector).tobytes()
+
+
+class VectorMatrix:
+    """Normalized vectors of one table: ``index_ids[i]`` <-> ``matrix[i]``.
+
+    Rows are ``(row id, record id, bytes)``; the record id is what the row
+    describes (e.g. the product of a RAG index entry).
+    """
+    __slots__ = ('signature', 'index_ids', 'record_ids', 'matrix', 'positions')
+
+    def __init__(self, signature, rows):
+        self.signature = signature
+        rows = [r for r in rows if r[2]]
+        dim = len(rows[0][2]) // 4 if rows else 0
+        # Vectors of another size come from a previous embedding model
+        rows = [r for r in rows if len(r[2]) == dim * 4]
+        self.index_ids = [r[0] for r in rows]
+        self.record_ids = [r[1] for r in rows]
+        self.positions = {index_id: i for i, index_id in enumerate(self.index_ids)}
+        if rows:
+            matrix = numpy.frombuffer(b''.join(bytes(r[2]) for r in rows),
+                                      dtype=numpy.float32).reshape(len(rows), dim)
+            norms = numpy.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.matrix = matrix / norms
+        else:
+            self.matrix = numpy.zeros((0, 0), dtype=numpy.float32)
+
+    @property
+    def dim(self):
+        return self.matrix.shape[1] if self.matrix.size else 0
+
+    def top_k(self, query_vector, k, index_ids=None):
+        """Return [(index_id, record_id, score)] best first.
+
+        :param index_ids: optional pre-filter (e.g. full-text candidates)
+        """
+        if not self.index_ids:
+            return []
+        query = numpy.asarray(query_vector, dtype=numpy.float32)
+        if query.shape[0] != self.dim:
+            _logger.warning("Vector index: query vector has %d dimensions, index has %d; "
+                            "reindex after changing the embedding model.",
+                            query.shape[0], self.dim)
+            return []
+        norm = numpy.linalg.norm(query)
+        if not norm:
+            return []
+        query = query / norm
+        if index_ids is not None:
+            rows = numpy.array([self.positions[i] for i in index_ids if i in self.positions],
+                               dtype=numpy.int64)
+            if not rows.size:
+                return []
+            scores = self.matrix[rows] @ query
+        else:
+            rows = None
+            scores = self.matrix @ query
+        k = min(k, scores.shape[0])
+        best = numpy.argpartition(-scores, k - 1)[:k]
+        best = best[numpy.argsort(-scores[best])]
+        result = []
+        for i in best:
+            pos = int(rows[i]) if rows is not None else int(i)
+            result.append((self.index_ids[pos], self.record_ids[pos], float(scores[i])))
+        return result
+
+
+def group_similar(vectors, threshold=0.9, max_group=10):
+    """Greedily group ``vectors`` by cosine similarity.
+
+    Each group starts from the first ungrouped vector and takes the
+    ungrouped vectors at least ``threshold`` similar to it, most similar
+    first, up to ``max_group``.
+
+    :returns: list of lists of positions in ``vectors``
+    """
+    if not vectors:
+        return []
+    matrix = numpy.asarray(vectors, dtype=numpy.float32)
+    norms = numpy.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix = matrix / norms
+    free = numpy.ones(len(vectors), dtype=bool)
+    groups = []
+    for seed in range(len(vectors)):
+        if not free[seed]:
+            continue
+        scores = matrix @ matrix[seed]
+        scores[~free] = -1.0
+        members = [int(i) for i in numpy.argsort(-scores)
+                   if scores[i] >= threshold][:max_group]
+        if seed not in members:
+            members = [seed] + members[:max_group - 1]
+        free[members] = False
+        groups.append(members)
+    return groups
+
+
+def get_matrix(key, signature, load_rows):
+    """Return the cached matrix for ``key``, reloading it through
+    ``load_rows()`` -> [(index_id, record_id, bytes)] when ``signature``
+    changed."""
+    cached = _CACHE.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is None or cached.signature != signature:
+            cached = VectorMatrix(signature, load_rows())
+            _CACHE[key] = cached
+            _logger.info("Vector index %s: loaded %d vectors (%d dimensions).",
+                         key, len(cached.index_ids), cached.dim)
+    return cached
@@ -0,0 +1,58 @@
+/** @odoo-module **/
+
+/**
+ * Read an NDJSON AI stream (see controllers/stream.py).
+ *
+ *     import { streamOllama } from "@ollama_base/js/ollama_stream";
+ *     const result = await streamOllama("/ollama/stream", {
+ *         res_model: "helpdesk.ticket", res_id: 42, purpose: "response",
+ *     }, (token, text) => { el.textContent = text; });
+ *
+ * @param {string} url
+ * @param {Object} params form fields; objects are JSON-encoded
+ * @param {(token: string, text: string) => void} onToken
+ * @returns {Promise<Object>} the final event ({done, error, ...})
+ */
+export async function streamOllama(url, params, onToken) {
+    const body = new FormData();
+    for (const [key, value] of Object.entries(params || {})) {
+        body.append(key, typeof value === "object" ? JSON.stringify(value) : value);
+    }
+    if (odoo.csrf_token && !body.has("csrf_token")) {
+        body.append("csrf_token", odoo.csrf_token);
+    }
+    const response = await fetch(url, { method: "POST", body });
+    if (!response.ok) {
+        return { done: true, error: `HTTP ${response.status}` };
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let text = "";
+    let final = { done: true, error: null };
+    const handleLine = (line) => {
+        if (!line.trim()) {
+            return;
+        }
+        const event = JSON.parse(line);
+        if (event.token) {
+            text += event.token;
+            onToken?.(event.token, text);
+        }
+        if (event.done) {
+            final = Object.assign({ text }, event);
+        }
+    };
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+    }
+    handleLine(buffer);
+    return final;
+}
@@ -0,0 +1,92 @@
+/** @odoo-module **/
+
+import { Component, useState } from "@odoo/owl";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { standardWidgetProps } from "@web/views/widgets/standard_widget_props";
+import { streamOllama } from "./ollama_stream";
+
+/**
+ * Form button streaming an AI answer into a field as it is generated.
+ *
+ * Record mode: the record implements ``_ollama_stream_prepare(purpose)``;
+ * it is saved, streamed through /ollama/stream, then reloaded once the
+ * finish hook stored the answer::
+ *
+ *     <widget name="ollama_stream_button" purpose="response"
+ *             target="ai_draft_response" title="AI Generate Response"/>
+ *
+ * RAG mode (``question_field`` set): the question is sent to
+ * /ollama/rag/ask_stream and the answer is written into ``target``.
+ */
+export class OllamaStreamButton extends Component {
+    static template = "ollama_base.OllamaStreamButton";
+    static props = {
+        ...standardWidgetProps,
+        title: { type: String, optional: true },
+        icon: { type: String, optional: true },
+        buttonClass: { type: String, optional: true },
+        purpose: { type: String, optional: true },
+        target: { type: String, optional: true },
+        questionField: { type: String, optional: true },
+        sessionId: { type: String, optional: true },
+    };
+    static defaultProps = {
+        icon: "fa-magic",
+        buttonClass: "btn btn-primary",
+    };
+
+    setup() {
+        this.notification = useService("notification");
+        this.state = useState({ running: false });
+    }
+
+    async showToken(text) {
+        if (this.props.target) {
+            await this.props.record.update({ [this.props.target]: text });
+        }
+    }
+
+    async onClick() {
+        const record = this.props.record;
+        this.state.running = true;
+        try {
+            if (this.props.questionField) {
+                const result = await streamOllama("/ollama/rag/ask_stream", {
+                    question: record.data[this.props.questionField] || "",
+                    session_id: this.props.sessionId || "",
+                }, (token, text) => this.showToken(text));
+                await this.showToken(result.answer || result.error || result.text || "");
+                return;
+            }
+            if (!(await record.save())) {
+                return;
+            }
+            const result = await streamOllama("/ollama/stream", {
+                res_model: record.resModel,
+                res_id: record.resId,
+                purpose: this.props.purpose,
+            }, (token, text) => this.showToken(text));
+            if (result.error) {
+                this.notification.add(result.error, { type: "danger" });
+            }
+            // The finish hook stored the formatted answer: show it
+            await record.model.load();
+        } finally {
+            this.state.running = false;
+        }
+    }
+}
+
+registry.category("view_widgets").add("ollama_stream_button", {
+    component: OllamaStreamButton,
+    extractProps: ({ attrs }) => ({
+        title: attrs.title,
+        icon: attrs.icon,
+        buttonClass: attrs.button_class,
+        purpose: attrs.purpose,
+        target: attrs.target,
+        questionField: attrs.question_field,
+        sessionId: attrs.session_id,
+    }),
+});
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+from . import test_endpoint_router
+from . import test_http_transport
+from . import test_ollama_caller
+from . import test_vector_index
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import threading
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_base.services import endpoint_router
+from odoo.addons.ollama_base.services.endpoint_router import EndpointRouter
+
+A = 'http://gpu-a:11434'
+B = 'http://gpu-b:11434'
+
+
+class TestEndpointRouter(BaseCase):
+
+    def _router(self, *specs):
+        router = EndpointRouter()
+        router.configure(list(specs))
+        return router
+
+    def test_least_loaded(self):
+        router = self._router({'url': A, 'max_inflight': 2}, {'url': B, 'max_inflight': 2})
+        first = router.acquire()
+        second = router.acquire()
+        self.assertEqual({first, second}, {A, B})
+        router.release(first, 0.1)
+        self.assertEqual(router.acquire(), first)
+
+    def test_weighted_round_robin(self):
+        router = self._router({'url': A, 'weight': 2, 'max_inflight': 10},
+                              {'url': B, 'weight': 1, 'max_inflight': 10})
+        picks = [router.acquire('round_robin') for __ in range(6)]
+        self.assertEqual(picks.count(A), 4)
+        self.assertEqual(picks.count(B), 2)
+
+    def test_capacity_blocks_then_times_out(self):
+        router = self._router({'url': A, 'max_inflight': 1})
+        self.assertEqual(router.capacity(), 1)
+        router.acquire()
+        with self.assertRaises(TimeoutError):
+            router.acquire(timeout=0.05)
+        # A release wakes a waiting caller
+        threading.Timer(0.05, router.release, (A, 0.1)).start()
+        self.assertEqual(router.acquire(timeout=5), A)
+
+    def test_failures_take_endpoint_out_of_rotation(self):
+        router = self._router({'url': A, 'max_inflight': 5}, {'url': B, 'max_inflight': 5})
+        for __ in range(endpoint_router.FAILURES_BEFORE_DOWN):
+            router.acquire()
+            router.release(A, 0.1, ok=False)
+        self.assertFalse(router.snapshot()[A]['up'])
+        self.assertEqual(router.acquire(), B)
+        self.assertEqual(router.acquire(), B)
+        # The health check puts it back
+        router.set_health(A, True)
+        self.assertTrue(router.snapshot()[A]['up'])
+        self.assertEqual(router.acquire(), A)
+
+    def test_lease_fails_on_exception(self):
+        router = self._router({'url': A, 'max_inflight': 1})
+        with self.assertRaises(ValueError):
+            with router.lease():
+                raise ValueError()
+        self.assertEqual(router.snapshot()[A]['errors'], 1)
+
+    def test_lease_records_failure_and_latency(self):
+        router = self._router({'url': A, 'max_inflight': 1})
+        with router.lease() as lease:
+            lease.failed()
+        with router.lease():
+            pass
+        stats = router.snapshot()[A]
+        self.assertEqual((stats['requests'], stats['errors'], stats['inflight']), (2, 1, 0))
+        self.assertIsNotNone(stats['latency_ms'])
+
+    def test_configure_keeps_counters_and_reads_up(self):
+        router = self._router({'url': A + '/', 'max_inflight': 1})
+        with router.lease():
+            pass
+        router.configure([{'url': A, 'max_inflight': 3}, {'url': B, 'up': False}])
+        stats = router.snapshot()
+        self.assertEqual(stats[A]['requests'], 1)
+        self.assertEqual(router.capacity(), 4)
+        self.assertFalse(stats[B]['up'])
+        self.assertEqual(router.acquire(), A)
+
+    def test_all_down_fails_open(self):
+        router = self._router({'url': A, 'up': False})
+        self.assertEqual(router.acquire(timeout=0.05), A)
+
+    def test_no_endpoint(self):
+        with self.assertRaises(RuntimeError):
+            EndpointRouter().acquire()
+
+    def test_get_router_is_shared(self):
+        key = ('test_endpoint_router', id(self))
+        self.addCleanup(endpoint_router._ROUTERS.pop, key, None)
+        router = endpoint_router.get_router(key, [{'url': A}])
+        self.assertIs(endpoint_router.get_router(key), router)
+        self.assertEqual(router.size(), 1)
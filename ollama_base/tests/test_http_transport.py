@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import socket
+import threading
+
+import requests
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_base.services import http_transport
+
+
+class SilentServer:
+    """TCP server accepting connections and never answering."""
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(5)
+        self.sock.settimeout(5)
+        self.url = 'http://127.0.0.1:%d' % self.sock.getsockname()[1]
+        self.connections = []
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, __ = self.sock.accept()
+            except OSError:
+                return
+            self.connections.append(conn)
+
+    def close(self):
+        self.sock.close()
+        for conn in self.connections:
+            conn.close()
+
+
+class TestHttpTransport(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(http_transport.close_all)
+
+    def test_session_shared_per_origin_and_credentials(self):
+        session = http_transport.get_session('http://host:11434/api/chat')
+        self.assertIs(http_transport.get_session('http://HOST:11434/api/embed'), session)
+        self.assertIsNot(http_transport.get_session('http://host:11434', credentials='key'), session)
+        self.assertIsNot(http_transport.get_session('http://host:11435'), session)
+
+    def test_read_timeout_is_not_retried(self):
+        server = SilentServer()
+        self.addCleanup(server.close)
+        with self.assertRaises(requests.exceptions.ReadTimeout) as catch:
+            http_transport.post(server.url + '/api/chat', json={}, timeout=0.2, max_retries=2)
+        # A slow model is not a connection error...
+        self.assertNotIsInstance(catch.exception, requests.exceptions.ConnectionError)
+        # ...and is not sent again
+        self.assertEqual(len(server.connections), 1)
+
+    def test_refused_connection_is_a_connection_error(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        url = 'http://127.0.0.1:%d' % sock.getsockname()[1]
+        sock.close()
+        with self.assertRaises(requests.exceptions.ConnectionError) as catch:
+            http_transport.post(url + '/api/chat', json={}, timeout=1, max_retries=0)
+        self.assertNotIsInstance(catch.exception, requests.exceptions.ReadTimeout)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_base.services import http_transport, ollama_caller
+from odoo.addons.ollama_base.services.endpoint_router import EndpointRouter
+
+from .test_http_transport import SilentServer
+
+
+class TestOllamaCaller(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(http_transport.close_all)
+
+    def test_read_timeout_does_not_fail_over(self):
+        servers = [SilentServer(), SilentServer()]
+        for server in servers:
+            self.addCleanup(server.close)
+        router = EndpointRouter()
+        router.configure([{'url': server.url, 'max_inflight': 1} for server in servers])
+
+        result = ollama_caller.call_ollama_http(
+            None, 'llama3', 'Hello', timeout=0.2, router=router,
+            transport={'max_retries': 0},
+        )
+        self.assertEqual(result, '')
+        # One host was tried, and it stays in rotation
+        self.assertEqual(sum(len(server.connections) for server in servers), 1)
+        stats = router.snapshot()
+        self.assertTrue(all(values['up'] and not values['errors'] for values in stats.values()))
+
+    def test_read_timeout_without_router(self):
+        server = SilentServer()
+        self.addCleanup(server.close)
+        self.assertEqual(ollama_caller.call_ollama_http(server.url, 'llama3', 'Hello', timeout=0.2), '')
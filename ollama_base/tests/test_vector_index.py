@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_base.services import vector_index
+from odoo.addons.ollama_base.services.vector_index import VectorMatrix, pack_vector
+
+
+@unittest.skipUnless(vector_index.available(), "NumPy is not installed")
+class TestVectorIndex(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        # (row id, record id, packed vector)
+        self.rows = [
+            (1, 101, pack_vector([1.0, 0.0, 0.0])),
+            (2, 102, pack_vector([0.0, 2.0, 0.0])),
+            (3, 103, pack_vector([1.0, 1.0, 0.0])),
+            (4, 104, pack_vector([1.0, 0.0])),      # previous embedding model
+            (5, 105, None),
+        ]
+
+    def test_pack_vector(self):
+        self.assertEqual(len(pack_vector([0.5] * 8)), 32)
+
+    def test_top_k(self):
+        matrix = VectorMatrix('sig', self.rows)
+        self.assertEqual(matrix.dim, 3)
+        self.assertEqual(matrix.index_ids, [1, 2, 3])
+        result = matrix.top_k([3.0, 0.2, 0.0], 2)
+        self.assertEqual([(index_id, record_id) for index_id, record_id, __ in result],
+                         [(1, 101), (3, 103)])
+        self.assertAlmostEqual(matrix.top_k([0.0, 5.0, 0.0], 1)[0][2], 1.0, places=5)
+        self.assertEqual(len(matrix.top_k([1.0, 1.0, 1.0], 10)), 3)
+
+    def test_top_k_prefiltered(self):
+        matrix = VectorMatrix('sig', self.rows)
+        result = matrix.top_k([1.0, 0.0, 0.0], 5, index_ids=[2, 3, 99])
+        self.assertEqual([index_id for index_id, __, __ in result], [3, 2])
+        self.assertEqual(matrix.top_k([1.0, 0.0, 0.0], 5, index_ids=[99]), [])
+
+    def test_unusable_queries(self):
+        matrix = VectorMatrix('sig', self.rows)
+        self.assertEqual(matrix.top_k([1.0, 0.0], 2), [])
+        self.assertEqual(matrix.top_k([0.0, 0.0, 0.0], 2), [])
+        self.assertEqual(VectorMatrix('sig', []).top_k([1.0, 0.0, 0.0], 2), [])
+
+    def test_group_similar(self):
+        vectors = [[1.0, 0.0], [0.0, 1.0], [0.99, 0.05], [0.05, 0.99], [0.98, 0.1]]
+        self.assertEqual(vector_index.group_similar(vectors, threshold=0.95),
+                         [[0, 2, 4], [1, 3]])
+        self.assertEqual(vector_index.group_similar(vectors, threshold=0.95, max_group=2),
+                         [[0, 2], [1, 3], [4]])
+        self.assertEqual(vector_index.group_similar([]), [])
+
+    def test_get_matrix_reloads_on_new_signature(self):
+        key = ('test_vector_index', id(self))
+        self.addCleanup(vector_index._CACHE.pop, key, None)
+        loads = []
+
+        def load_rows():
+            loads.append(1)
+            return self.rows[:2]
+
+        first = vector_index.get_matrix(key, (2, 'a'), load_rows)
+        self.assertIs(vector_index.get_matrix(key, (2, 'a'), load_rows), first)
+        self.assertEqual(len(loads), 1)
+        second = vector_index.get_matrix(key, (3, 'b'), load_rows)
+        self.assertIsNot(second, first)
+        self.assertEqual(len(loads), 2)
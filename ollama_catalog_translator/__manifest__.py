@@ -14,6 +14,8 @@ Features
 --------
 * Translate product names and descriptions to English, German, Spanish, Italian
 * Batch translation wizard for bulk operations
+* Several products per AI call; unchanged products (same source hash) are skipped
+* Optional update of the Odoo translations of name and description
 * Dashboard with translation coverage statistics
 * Works with all AI providers via ollama_base (Ollama, OpenAI, Gemini, Anthropic, etc.)
 * Per-product translation status tracking
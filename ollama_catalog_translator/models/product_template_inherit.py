@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import json
 import logging
 
@@ -14,6 +15,24 @@ LANG_MAP = {
     'it': 'Italian',
 }
 
+FIELD_MAP = {
+    'en': 'ai_translation_en',
+    'de': 'ai_translation_de',
+    'es': 'ai_translation_es',
+    'it': 'ai_translation_it',
+}
+
+# Products packed into one batch prompt, bounded by their source length
+BATCH_SIZE = 10
+BATCH_MAX_CHARS = 6000
+BATCH_MAX_TOKENS = 8000
+
+SYSTEM_PROMPT = (
+    "You are a professional product catalog translator. "
+    "You translate product information accurately and naturally. "
+    "Always respond with valid JSON only, no extra text."
+)
+
 
 class ProductTemplateTranslation(models.Model):
     _name = 'product.template'
@@ -49,6 +68,12 @@ class ProductTemplateTranslation(models.Model):
         string='Last Translation Date',
         readonly=True,
     )
+    ai_translation_source_hash = fields.Char(
+        string='Translated Source Hash',
+        readonly=True, copy=False,
+        help='Hash of the name and description last translated; unchanged '
+             'products are skipped by batch translations.',
+    )
 
     # ------------------------------------------------------------------
     # Translation logic
@@ -80,11 +105,7 @@ class ProductTemplateTranslation(models.Model):
 
         lang_list_str = ', '.join(lang_labels)
 
-        system_prompt = (
-            "You are a professional product catalog translator. "
-            "You translate product information accurately and naturally. "
-            "Always respond with valid JSON only, no extra text."
-        )
+        system_prompt = SYSTEM_PROMPT
 
         prompt = (
             f"Translate the following product information into these languages: {lang_list_str}.\n\n"
@@ -130,17 +151,144 @@ class ProductTemplateTranslation(models.Model):
             ) % raw_response[:500])
 
         # Write translations
-        vals = {}
-        translated_count = 0
-        field_map = {
-            'en': 'ai_translation_en',
-            'de': 'ai_translation_de',
-            'es': 'ai_translation_es',
-            'it': 'ai_translation_it',
+        vals = self._prepare_translation_vals(parsed, target_langs)
+        translated_count = vals.pop('translated_count')
+        self.write(vals)
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Translation Complete'),
+                'message': _('Product "%s" translated to %d language(s).') % (
+                    product_name, translated_count,
+                ),
+                'type': 'success',
+                'sticky': False,
+            }
         }
 
+    def action_translate_product_button(self):
+        """Button action: translate to default languages (en, de, es)."""
+        return self.action_translate_product()
+
+    # ------------------------------------------------------------------
+    # Batch translation engine
+    # ------------------------------------------------------------------
+    def _with_source_lang(self, source_lang):
+        """``self`` reading its fields in ``source_lang`` ('fr', 'en'...).
+
+        The source text and its hash must not depend on the language of
+        the user or job running the translation; without ``source_lang``
+        the current context language is kept.
+        """
+        if not source_lang:
+            return self
+        code = self._get_odoo_lang_codes([source_lang]).get(source_lang, 'en_US')
+        return self.with_context(lang=code)
+
+    def _get_translation_source(self):
+        """Return (name, description) to translate, in the context language
+        (see ``_with_source_lang``)."""
+        self.ensure_one()
+        return self.name or '', self.description_sale or self.description or ''
+
+    def _get_translation_hash(self):
+        self.ensure_one()
+        payload = json.dumps(self._get_translation_source(), ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _filter_translation_needed(self, target_langs, force=False, source_lang=None):
+        """Products with a name whose source changed since the last
+        translation, or missing one of ``target_langs``."""
+        products = self._with_source_lang(source_lang)
+        todo = products.browse()
+        for product in products:
+            if not product.name:
+                continue
+            if not force and product.ai_translation_source_hash == product._get_translation_hash() \
+                    and all(product[FIELD_MAP[lc]] for lc in target_langs if lc in FIELD_MAP):
+                continue
+            todo |= product
+        return todo
+
+    def _split_translation_batches(self, batch_size=BATCH_SIZE, max_chars=BATCH_MAX_CHARS):
+        """Split ``self`` into recordsets fitting one batch prompt."""
+        batches, batch, chars = [], self.browse(), 0
+        for product in self:
+            size = sum(len(text) for text in product._get_translation_source())
+            if batch and (len(batch) >= batch_size or chars + size > max_chars):
+                batches.append(batch)
+                batch, chars = self.browse(), 0
+            batch |= product
+            chars += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _build_translation_batch_prompt(self, target_langs):
+        """Return (prompt, max_tokens) translating all of ``self`` at once."""
+        items, chars = [], 0
+        for product in self:
+            name, description = product._get_translation_source()
+            items.append({'id': product.id, 'name': name, 'description': description})
+            chars += len(name) + len(description)
+        lang_list_str = ', '.join(
+            f'{lc} ({LANG_MAP.get(lc, lc.upper())})' for lc in target_langs)
+        prompt = (
+            f"Translate each of the following products into these languages: {lang_list_str}.\n\n"
+            f"Products (JSON):\n{json.dumps(items, ensure_ascii=False)}\n\n"
+            "Return a JSON object with one key per product id. Each value must be an "
+            "object with one key per language code, whose value is an object with "
+            "'name' and 'description' keys.\n"
+            "Example format:\n"
+            '{\n'
+            '  "12": {"en": {"name": "...", "description": "..."}, '
+            '"de": {"name": "...", "description": "..."}}\n'
+            '}\n'
+            "Translate every product. If a product has no description, set description "
+            "to an empty string.\n"
+            "Respond ONLY with the JSON, no markdown, no extra text."
+        )
+        # About 3 characters per token, plus the JSON overhead per item
+        max_tokens = int(chars / 3 * len(target_langs) * 1.3) + 60 * len(items) * len(target_langs)
+        return prompt, min(BATCH_MAX_TOKENS, max(1000, max_tokens))
+
+    @api.model
+    def _validate_translation_item(self, item, target_langs):
+        """Return {lang: {'name', 'description'}} for the languages of
+        ``item`` that are usable, or None when there is none."""
+        if not isinstance(item, dict):
+            return None
+        result = {}
         for lc in target_langs:
-            field_name = field_map.get(lc)
+            lang_data = item.get(lc)
+            if not isinstance(lang_data, dict):
+                continue
+            name = lang_data.get('name')
+            description = lang_data.get('description') or ''
+            if not isinstance(name, str) or not name.strip() or not isinstance(description, str):
+                continue
+            result[lc] = {'name': name.strip(), 'description': description.strip()}
+        return result or None
+
+    @api.model
+    def _index_batch_response(self, parsed):
+        """Map product id -> item for both ``{"12": {...}}`` and
+        ``[{"id": 12, ...}]`` answers."""
+        if isinstance(parsed, list):
+            parsed = {str(item.get('id')): item for item in parsed if isinstance(item, dict)}
+        if not isinstance(parsed, dict):
+            return {}
+        return {str(key): value for key, value in parsed.items()}
+
+    def _prepare_translation_vals(self, parsed, target_langs):
+        """Values to write for the translations in ``parsed``; the number of
+        languages translated is returned under ``translated_count``."""
+        vals = {}
+        translated_count = 0
+        for lc in target_langs:
+            field_name = FIELD_MAP.get(lc)
             if not field_name:
                 continue
 
@@ -171,21 +319,112 @@ class ProductTemplateTranslation(models.Model):
             vals['ai_translation_status'] = 'partial'
 
         vals['ai_translation_date'] = fields.Datetime.now()
-        self.write(vals)
+        vals['ai_translation_source_hash'] = self._get_translation_hash()
+        vals['translated_count'] = translated_count
+        return vals
 
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Translation Complete'),
-                'message': _('Product "%s" translated to %d language(s).') % (
-                    product_name, translated_count,
-                ),
-                'type': 'success',
-                'sticky': False,
-            }
-        }
+    @api.model
+    def _get_odoo_lang_codes(self, target_langs):
+        """Map our language codes to the active Odoo languages (en -> en_US)."""
+        codes = {}
+        for lang in self.env['res.lang'].search([('active', '=', True)]):
+            short = lang.code.split('_')[0]
+            if short not in target_langs:
+                continue
+            preferred = 'en_US' if short == 'en' else f'{short}_{short.upper()}'
+            if short not in codes or lang.code == preferred:
+                codes[short] = lang.code
+        return codes
 
-    def action_translate_product_button(self):
-        """Button action: translate to default languages (en, de, es)."""
-        return self.action_translate_product()
+    def _apply_field_translations(self, parsed, lang_codes):
+        """Write ``parsed`` into the Odoo translations of name/description."""
+        self.ensure_one()
+        desc_field = 'description_sale' if self.description_sale else (
+            'description' if self.description else None)
+        names, descriptions = {}, {}
+        for lc, code in lang_codes.items():
+            lang_data = parsed.get(lc)
+            if not lang_data:
+                continue
+            names[code] = lang_data['name']
+            if desc_field and lang_data.get('description'):
+                descriptions[code] = lang_data['description']
+        if names:
+            self.update_field_translations('name', names)
+        if descriptions:
+            self.update_field_translations(desc_field, descriptions)
+
+    def _ai_translate_batch(self, target_langs=None, force=False, apply_translations=False,
+                            batch_size=BATCH_SIZE, source_lang=None):
+        """Translate ``self`` packing several products per AI call.
+
+        Products whose source hash matches the last translation (and which
+        already have every target language) are skipped unless ``force``.
+        Items the model left out or answered badly are retried one by one.
+
+        :param apply_translations: also write the Odoo field translations
+            of name and description (active languages only, never the
+            source language)
+        :param source_lang: language code the source is read in
+        :returns: dict with ``translated`` (ids), ``skipped`` (count) and
+            ``errors`` ({product id: message})
+        """
+        target_langs = target_langs or ['en', 'de', 'es']
+        todo = self._filter_translation_needed(target_langs, force=force, source_lang=source_lang)
+        result = {'translated': [], 'skipped': len(self) - len(todo), 'errors': {}}
+        lang_codes = self._get_odoo_lang_codes(target_langs) if apply_translations else {}
+        # Overwriting the source text would change the hash of every product
+        lang_codes.pop(source_lang, None)
+
+        retry = self.browse()
+        for batch in todo._split_translation_batches(batch_size=batch_size):
+            failed = batch._translate_one_batch(target_langs, lang_codes, result)
+            if len(batch) > 1:
+                # One bad item should not cost its neighbours: retry alone
+                retry |= failed
+            else:
+                result['errors'].update(dict.fromkeys(failed.ids, _('Invalid AI response.')))
+        for product in retry:
+            failed = product._translate_one_batch(target_langs, lang_codes, result)
+            result['errors'].update(dict.fromkeys(failed.ids, _('Invalid AI response.')))
+
+        _logger.info("Batch translation: %d translated, %d unchanged, %d errors.",
+                     len(result['translated']), result['skipped'], len(result['errors']))
+        return result
+
+    def _translate_one_batch(self, target_langs, lang_codes, result):
+        """One AI call for ``self``; returns the products left untranslated."""
+        prompt, max_tokens = self._build_translation_batch_prompt(target_langs)
+        raw_response = self._call_ollama_safe(
+            prompt,
+            system_prompt=SYSTEM_PROMPT,
+            max_tokens=max_tokens,
+            temperature=0.3,
+            log_model=self._name,
+            log_res_id=self[:1].id,
+        )
+        items = self._index_batch_response(self._parse_json_response(raw_response)) \
+            if raw_response else {}
+        failed = self.browse()
+        for product in self:
+            parsed = self._validate_translation_item(items.get(str(product.id)), target_langs)
+            if not parsed:
+                failed |= product
+                continue
+            vals = product._prepare_translation_vals(parsed, target_langs)
+            vals.pop('translated_count')
+            product.write(vals)
+            if lang_codes:
+                product._apply_field_translations(parsed, lang_codes)
+            result['translated'].append(product.id)
+        return failed
+
+    def _job_translate_batch(self, product_ids, target_langs, force=False,
+                             apply_translations=False, source_lang=None):
+        """``ollama.job`` entry point: translate one pack of products."""
+        products = self.browse(product_ids).exists()
+        result = products._ai_translate_batch(
+            target_langs, force=force, apply_translations=apply_translations,
+            source_lang=source_lang)
+        return _('%d translated, %d unchanged, %d errors') % (
+            len(result['translated']), result['skipped'], len(result['errors']))
@@ -7,6 +7,9 @@ from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
+# Above this many products to translate, the batches run as background jobs
+BACKGROUND_THRESHOLD = 100
+
 
 class CatalogTranslationWizard(models.TransientModel):
     _name = 'catalog.translation.wizard'
@@ -36,6 +39,16 @@ class CatalogTranslationWizard(models.TransientModel):
 
     include_name = fields.Boolean(string='Translate Product Name', default=True)
     include_description = fields.Boolean(string='Translate Description', default=True)
+    force_retranslate = fields.Boolean(
+        string='Re-translate Unchanged Products',
+        help='By default, products whose name and description did not change '
+             'since their last translation are skipped.',
+    )
+    apply_to_odoo_translations = fields.Boolean(
+        string='Update Odoo Translations',
+        help='Also write the translated name and description as the Odoo '
+             'translations of the product (installed languages only).',
+    )
 
     state = fields.Selection(
         selection=[
@@ -95,10 +108,13 @@ class CatalogTranslationWizard(models.TransientModel):
         if not products:
             raise UserError(_('No products found to translate.'))
 
+        todo = products._filter_translation_needed(
+            target_langs, force=self.force_retranslate, source_lang=self.source_lang)
+        if len(todo) > BACKGROUND_THRESHOLD:
+            return self._enqueue_batches(todo, target_langs, skipped=len(products) - len(todo))
+
         self.write({'state': 'running'})
 
-        success_count = 0
-        error_count = 0
         log_lines = []
         start_time = datetime.now()
 
@@ -109,27 +125,39 @@ class CatalogTranslationWizard(models.TransientModel):
             f'</div>'
         )
 
-        for idx, product in enumerate(products, 1):
-            try:
-                product.action_translate_product(target_langs=target_langs)
-                success_count += 1
-                log_lines.append(
-                    f'<div style="padding:4px 8px; color:#2E7D32;">'
-                    f'[{idx}/{len(products)}] {product.name} - OK'
-                    f'</div>'
-                )
-            except Exception as e:
-                error_count += 1
-                error_msg = str(e)[:200]
-                log_lines.append(
-                    f'<div style="padding:4px 8px; color:#C62828;">'
-                    f'[{idx}/{len(products)}] {product.name} - ERROR: {error_msg}'
-                    f'</div>'
-                )
-                _logger.error(
-                    "Translation error for product %s (ID %s): %s",
-                    product.name, product.id, e,
-                )
+        result = todo._ai_translate_batch(
+            target_langs,
+            force=True,  # already filtered
+            apply_translations=self.apply_to_odoo_translations,
+            source_lang=self.source_lang,
+        )
+        result['skipped'] = len(products) - len(todo)
+        success_count = len(result['translated'])
+        error_count = len(result['errors'])
+
+        names = {product.id: product.name for product in todo}
+        for idx, product_id in enumerate(result['translated'], 1):
+            log_lines.append(
+                f'<div style="padding:4px 8px; color:#2E7D32;">'
+                f'[{idx}/{len(todo)}] {names.get(product_id)} - OK'
+                f'</div>'
+            )
+        for product_id, error_msg in result['errors'].items():
+            log_lines.append(
+                f'<div style="padding:4px 8px; color:#C62828;">'
+                f'{names.get(product_id)} - ERROR: {str(error_msg)[:200]}'
+                f'</div>'
+            )
+            _logger.error(
+                "Translation error for product %s (ID %s): %s",
+                names.get(product_id), product_id, error_msg,
+            )
+        if result['skipped']:
+            log_lines.append(
+                f'<div style="padding:4px 8px; color:#616161;">'
+                f'{result["skipped"]} product(s) unchanged since their last translation - skipped'
+                f'</div>'
+            )
 
         elapsed = (datetime.now() - start_time).total_seconds()
         log_lines.append(
@@ -152,3 +180,49 @@ class CatalogTranslationWizard(models.TransientModel):
             'view_mode': 'form',
             'target': 'new',
         }
+
+    def _enqueue_batches(self, products, target_langs, skipped=0):
+        """Queue one model-level background job per batch of ``products``.
+
+        Products already queued for the same languages are left out, so a
+        second run while the first is pending adds no duplicate work.
+        """
+        Product = self.env['product.template']
+        queued = {
+            product_id
+            for params in self.env['ollama.job']._queued_params(Product._name, '_job_translate_batch')
+            if params.get('target_langs') == target_langs
+            and params.get('source_lang') == self.source_lang
+            for product_id in params.get('product_ids') or ()
+        }
+        already_queued = products.filtered(lambda p: p.id in queued)
+        products -= already_queued
+        batch_ref = 'catalog-translation-%d' % self.id
+        jobs = self.env['ollama.job']
+        for batch in products._split_translation_batches():
+            jobs |= Product._ollama_enqueue('_job_translate_batch', params={
+                'product_ids': batch.ids,
+                'target_langs': target_langs,
+                'force': True,
+                'apply_translations': self.apply_to_odoo_translations,
+                'source_lang': self.source_lang,
+            }, batch_ref=batch_ref)
+        self.write({
+            'state': 'done',
+            'log': (
+                f'<div style="padding:8px; background:#E3F2FD; border-radius:4px;">'
+                f'<strong>Batch Translation Queued</strong><br/>'
+                f'Products: {len(products)} in {len(jobs)} background job(s) | '
+                f'Already queued: {len(already_queued)} | '
+                f'Unchanged (skipped): {skipped} | Languages: {", ".join(target_langs)}<br/>'
+                f'Follow progress in Settings &gt; Technical &gt; Ollama AI &gt; AI Jobs.'
+                f'</div>'
+            ),
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
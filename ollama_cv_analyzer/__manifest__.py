@@ -13,6 +13,8 @@ AI-powered CV/resume analysis for recruitment.
 Features:
 ---------
 * AI-driven CV scoring (0-100) for job applicants
+* Built-in text extraction from PDF (compressed streams, embedded fonts)
+  and DOCX CVs, cached per file so re-analysis skips parsing
 * Automatic strengths and weaknesses extraction
 * Interview question generation based on CV content
 * Recruitment dashboard with AI analytics
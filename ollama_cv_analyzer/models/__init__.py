@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
+from . import cv_text_cache
 from . import hr_applicant_inherit
 from . import cv_dashboard
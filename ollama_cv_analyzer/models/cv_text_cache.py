@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+from ..services import document_text
+
+_logger = logging.getLogger(__name__)
+
+# Entries not used for this many days are removed by the autovacuum
+CACHE_DAYS = 180
+
+
+class CvTextCache(models.Model):
+    """Text extracted from CV attachments, keyed by the attachment checksum.
+
+    The same file attached twice (or re-analyzed) is parsed once. Entries
+    of an older ``document_text.EXTRACTOR_VERSION`` are ignored and
+    replaced; entries whose file no longer exists in any attachment are
+    removed by the autovacuum, like unused ones.
+    """
+    _name = 'cv.analyzer.text.cache'
+    _description = 'Extracted CV Text'
+    _order = 'last_used desc'
+    _rec_name = 'checksum'
+
+    checksum = fields.Char(string='Checksum', required=True, index=True, readonly=True)
+    version = fields.Integer(string='Extractor Version', readonly=True)
+    file_type = fields.Selection([
+        ('pdf', 'PDF'),
+        ('docx', 'Word (DOCX)'),
+        ('text', 'Text'),
+        ('binary', 'Other'),
+    ], string='File Type', readonly=True)
+    text = fields.Text(string='Text', readonly=True)
+    char_count = fields.Integer(string='Characters', readonly=True)
+    last_used = fields.Datetime(string='Last Used', default=fields.Datetime.now, readonly=True)
+
+    _sql_constraints = [
+        ('checksum_unique', 'unique(checksum)', 'There is already an extracted text for this file!'),
+    ]
+
+    @api.model
+    def _get_texts(self, attachments):
+        """Return ``{attachment id: (file type, text)}``, parsing only the
+        files not extracted yet (one query for the cached ones)."""
+        Cache = self.sudo()
+        checksums = {att.checksum for att in attachments if att.checksum}
+        entries = Cache.search([
+            ('checksum', 'in', list(checksums)),
+            ('version', '=', document_text.EXTRACTOR_VERSION),
+        ])
+        by_checksum = {entry.checksum: entry for entry in entries}
+        # The eviction works in days: refresh only the entries a day old,
+        # not every row on every analysis
+        now = fields.Datetime.now()
+        stale = entries.filtered(
+            lambda e: not e.last_used or e.last_used < now - timedelta(days=1))
+        if stale:
+            stale.write({'last_used': now})
+
+        result = {}
+        for att in attachments:
+            entry = by_checksum.get(att.checksum)
+            if entry:
+                result[att.id] = (entry.file_type, entry.text or '')
+                continue
+            file_type, text = document_text.extract_text(att.raw or b'', att.name or '')
+            result[att.id] = (file_type, text)
+            if att.checksum:
+                by_checksum[att.checksum] = self._store(att.checksum, file_type, text)
+        return result
+
+    @api.model
+    def _store(self, checksum, file_type, text):
+        """Insert or refresh the entry of ``checksum``. Never raises."""
+        vals = {
+            'version': document_text.EXTRACTOR_VERSION,
+            'file_type': file_type,
+            'text': text,
+            'char_count': len(text),
+            'last_used': fields.Datetime.now(),
+        }
+        Cache = self.sudo()
+        try:
+            with self.env.cr.savepoint():
+                entry = Cache.search([('checksum', '=', checksum)], limit=1)
+                if entry:
+                    entry.write(vals)
+                else:
+                    entry = Cache.create(dict(vals, checksum=checksum))
+            return entry
+        except Exception as e:
+            # A concurrent analysis stored the same file first
+            _logger.debug("CV text cache store skipped: %s", e)
+            return Cache.browse()
+
+    @api.autovacuum
+    def _gc_text_cache(self):
+        """Drop unused entries and entries of deleted files."""
+        self.env.cr.execute("""
+            DELETE FROM cv_analyzer_text_cache c
+             WHERE c.last_used < (now() at time zone 'UTC') - make_interval(days => %s)
+                OR NOT EXISTS (SELECT 1 FROM ir_attachment a WHERE a.checksum = c.checksum)
+        """, (CACHE_DAYS,))
+        if self.env.cr.rowcount:
+            _logger.info("CV text cache cleanup: %d entries removed.", self.env.cr.rowcount)
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import base64
 import json
 import logging
 import re
@@ -54,8 +53,9 @@ class HrApplicantInherit(models.Model):
     def _extract_text_from_attachments(self):
         """Extract text content from applicant attachments.
 
-        Tries to decode base64 attachment data as plain text.
-        For binary files (PDF, DOCX), returns the filename as context.
+        PDF, DOCX and text files are parsed by ``services.document_text``;
+        the result is cached per file checksum (``cv.analyzer.text.cache``)
+        so re-analysis and batch screening do not parse again.
         """
         self.ensure_one()
         attachments = self.env['ir.attachment'].search([
@@ -66,127 +66,29 @@ class HrApplicantInherit(models.Model):
         if not attachments:
             return ''
 
+        texts = self.env['cv.analyzer.text.cache']._get_texts(attachments)
         text_parts = []
         for att in attachments:
             filename = att.name or 'unknown'
             text_parts.append(f"\n--- File: {filename} ---")
-
-            if not att.datas:
+            file_type, text = texts.get(att.id, ('binary', ''))
+            if not att.file_size:
                 text_parts.append("[Empty attachment]")
-                continue
-
-            try:
-                raw = base64.b64decode(att.datas)
-            except Exception:
-                text_parts.append(f"[Could not decode attachment: {filename}]")
-                continue
-
-            # Try plain text decoding first
-            try:
-                decoded_text = raw.decode('utf-8')
-                text_parts.append(decoded_text)
-                continue
-            except (UnicodeDecodeError, ValueError):
-                pass
-
-            try:
-                decoded_text = raw.decode('latin-1')
-                text_parts.append(decoded_text)
-                continue
-            except (UnicodeDecodeError, ValueError):
-                pass
-
-            # For binary files (PDF, DOCX, etc.), extract printable strings
-            # This is a best-effort approach without external libraries
-            if filename.lower().endswith('.pdf'):
-                text_parts.append(self._extract_text_from_pdf_bytes(raw, filename))
+            elif text:
+                text_parts.append(text)
+            elif file_type == 'pdf':
+                text_parts.append(
+                    f"[PDF file: {filename} - no text layer (scanned document?). "
+                    f"The AI will analyze based on available context.]"
+                )
             else:
-                # Extract any readable ASCII/UTF-8 strings from binary
-                printable = self._extract_printable_strings(raw)
-                if printable:
-                    text_parts.append(printable)
-                else:
-                    text_parts.append(
-                        f"[Binary file: {filename} - "
-                        f"{len(raw)} bytes, content not directly readable]"
-                    )
+                text_parts.append(
+                    f"[Binary file: {filename} - "
+                    f"{att.file_size} bytes, content not directly readable]"
+                )
 
         return '\n'.join(text_parts)
 
-    @staticmethod
-    def _extract_text_from_pdf_bytes(raw_bytes, filename):
-        """Extract readable text from raw PDF bytes without PyPDF2.
-
-        Uses regex to find text between BT/ET markers and parenthesized strings
-        common in PDF text streams.
-        """
-        text_chunks = []
-
-        # Method 1: Extract text from PDF stream objects (Tj, TJ operators)
-        try:
-            # Find text in parentheses used by Tj operator
-            paren_texts = re.findall(rb'\(([^)]{2,})\)', raw_bytes)
-            for chunk in paren_texts:
-                try:
-                    decoded = chunk.decode('utf-8', errors='ignore')
-                    # Filter out control sequences and very short fragments
-                    cleaned = re.sub(r'[^\x20-\x7E\xC0-\xFF]', '', decoded)
-                    if len(cleaned) > 2:
-                        text_chunks.append(cleaned)
-                except Exception:
-                    continue
-        except Exception:
-            pass
-
-        # Method 2: Extract readable ASCII strings (4+ chars)
-        try:
-            ascii_strings = re.findall(rb'[\x20-\x7E]{4,}', raw_bytes)
-            for s in ascii_strings:
-                decoded = s.decode('ascii', errors='ignore')
-                # Skip PDF structural keywords
-                skip_keywords = [
-                    '/Type', '/Font', '/Page', 'endobj', 'endstream',
-                    'xref', 'trailer', '/Length', '/Filter', '/Resources',
-                    '/MediaBox', '/Contents', '/Parent', 'stream', 'obj',
-                    '/Encoding', '/BaseFont', '/Subtype',
-                ]
-                if not any(kw in decoded for kw in skip_keywords):
-                    if len(decoded.strip()) > 3:
-                        text_chunks.append(decoded.strip())
-        except Exception:
-            pass
-
-        if text_chunks:
-            # Deduplicate while preserving order
-            seen = set()
-            unique = []
-            for chunk in text_chunks:
-                if chunk not in seen:
-                    seen.add(chunk)
-                    unique.append(chunk)
-            return f"[PDF content from {filename}]:\n" + '\n'.join(unique[:200])
-
-        return (
-            f"[PDF file: {filename} - text extraction limited. "
-            f"The AI will analyze based on available context.]"
-        )
-
-    @staticmethod
-    def _extract_printable_strings(raw_bytes, min_length=4):
-        """Extract printable ASCII strings from binary data."""
-        strings = re.findall(
-            rb'[\x20-\x7E]{%d,}' % min_length, raw_bytes
-        )
-        if not strings:
-            return ''
-        decoded = []
-        for s in strings[:100]:
-            try:
-                decoded.append(s.decode('ascii', errors='ignore'))
-            except Exception:
-                continue
-        return '\n'.join(decoded) if decoded else ''
-
     # ------------------------------------------------------------------
     # AI Actions
     # ------------------------------------------------------------------
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""Plain-text extraction from CV documents (no ORM, standard library only).
+
+* PDF: objects are read from the file and from compressed object streams,
+  ``FlateDecode`` streams are inflated with ``zlib``, and the text shown by
+  the ``Tj``/``TJ``/``'``/``"`` operators of the content streams is
+  decoded through the font's ``ToUnicode`` map when it has one (fonts
+  embedded as ``Identity-H`` subsets are unreadable without it).
+  Scanned PDFs have no text layer and give an empty result.
+* DOCX: ``word/document.xml`` is read from the archive, one line per
+  paragraph.
+* Anything else is decoded as text when it looks like text, otherwise the
+  printable strings are kept.
+
+``extract_text(raw, filename)`` returns ``(kind, text)``. Extraction
+never raises: a damaged document gives what could be read.
+``EXTRACTOR_VERSION`` is part of the cache key of callers, bump it when
+the output changes.
+"""
+import io
+import logging
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+_logger = logging.getLogger(__name__)
+
+EXTRACTOR_VERSION = 1
+MAX_CHARS = 50000               # text kept per document
+MAX_INFLATED = 20 * 1024 * 1024  # bytes inflated per stream / read per archive member
+
+# ----------------------------------------------------------------------
+# PDF
+# ----------------------------------------------------------------------
+_OBJ_RE = re.compile(rb'(\d+)\s+(\d+)\s+obj\b')
+_STREAM_RE = re.compile(rb'stream(?:\r\n|\n|\r)')
+_TOKEN_RE = re.compile(rb"""
+      \((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)     # literal string (one nesting level)
+    | <[0-9A-Fa-f\s]*>                            # hex string
+    | [\[\]]
+    | [-+]?(?:\d+\.?\d*|\.\d+)                     # number
+    | /[^\s/\[\]()<>{}%]*                          # name
+    | [A-Za-z'"*]+                                 # operator
+""", re.X | re.S)
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+            b'(': b'(', b')': b')', b'\\': b'\\'}
+_ESCAPE_RE = re.compile(rb'\\([0-7]{1,3}|\r\n|[\s\S])')
+# TJ displacement (thousandths of an em) read as a word space
+TJ_SPACE = 200
+_UNREADABLE = ({}, 0)
+
+
+def _inflate(data):
+    try:
+        return zlib.decompressobj().decompress(data, MAX_INFLATED)
+    except zlib.error:
+        return None
+
+
+def _read_objects(raw):
+    """{object number: (dictionary bytes, decoded stream or None)}."""
+    objects = {}
+    pos = 0
+    while True:
+        match = _OBJ_RE.search(raw, pos)
+        if not match:
+            break
+        start = match.end()
+        end = raw.find(b'endobj', start)
+        if end < 0:
+            end = len(raw)
+        pos = end
+        body = raw[start:end]
+        stream = None
+        stream_match = _STREAM_RE.search(body)
+        if stream_match:
+            head = body[:stream_match.start()]
+            data = body[stream_match.end():]
+            data_end = data.rfind(b'endstream')
+            if data_end >= 0:
+                data = data[:data_end]
+            stream = _decode_stream(head, data)
+            body = head
+        objects[int(match.group(1))] = (body, stream)
+
+    # PDF 1.5+: most dictionaries (fonts, resources) live in object streams
+    for body, stream in list(objects.values()):
+        if stream and b'/ObjStm' in body:
+            first = re.search(rb'/First\s+(\d+)', body)
+            if not first:
+                continue
+            first = int(first.group(1))
+            numbers = [int(n) for n in stream[:first].split()]
+            pairs = list(zip(numbers[::2], numbers[1::2]))
+            for i, (number, offset) in enumerate(pairs):
+                end = pairs[i + 1][1] if i + 1 < len(pairs) else len(stream) - first
+                objects.setdefault(number, (stream[first + offset:first + end], None))
+    return objects
+
+
+def _decode_stream(head, data):
+    if b'/Subtype/Image' in head.replace(b' ', b'') or b'/Length1' in head:
+        return None  # images and embedded font programs
+    if b'/Filter' not in head:
+        return data
+    filters = re.findall(rb'/(\w+Decode|Fl|AHx)\b', head.split(b'/Filter', 1)[1])
+    if filters and all(f in (b'FlateDecode', b'Fl') for f in filters):
+        return _inflate(data)
+    return None  # DCT, JBIG2, LZW...: not text
+
+
+def _unescape(literal):
+    def _sub(match):
+        value = match.group(1)
+        if value[:1].isdigit():
+            return bytes([int(value, 8) & 0xFF])
+        if value in (b'\r\n', b'\n', b'\r'):
+            return b''  # line continuation
+        return _ESCAPES.get(value, value)
+    return _ESCAPE_RE.sub(_sub, literal)
+
+
+def _parse_cmap(data):
+    """ToUnicode CMap -> ({code bytes: text}, code length)."""
+    mapping = {}
+
+    def _text(hex_value):
+        try:
+            return bytes.fromhex(hex_value.decode()).decode('utf-16-be', errors='ignore')
+        except ValueError:
+            return ''
+
+    for block in re.findall(rb'beginbfchar(.*?)endbfchar', data, re.S):
+        for src, dst in re.findall(rb'<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]*)>', block):
+            mapping[bytes.fromhex(src.decode())] = _text(dst)
+    for block in re.findall(rb'beginbfrange(.*?)endbfrange', data, re.S):
+        for lo, hi, dst in re.findall(
+                rb'<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]*>|\[[^\]]*\])', block):
+            size = len(lo) // 2
+            lo, hi = int(lo, 16), int(hi, 16)
+            if hi - lo > 0xFFFF:
+                continue
+            if dst.startswith(b'['):
+                targets = [_text(t) for t in re.findall(rb'<([0-9A-Fa-f]*)>', dst)]
+            else:
+                base = dst[1:-1]
+                start = int(base, 16) if base else 0
+                width = len(base)
+                targets = [_text(b'%0*X' % (width, start + i)) for i in range(hi - lo + 1)]
+            for i, target in enumerate(targets[:hi - lo + 1]):
+                mapping[(lo + i).to_bytes(size, 'big')] = target
+    code_length = max((len(k) for k in mapping), default=1)
+    return mapping, code_length
+
+
+def _font_maps(objects):
+    """{font resource name: (cmap, code length)} over the whole document.
+
+    Resource names (``/F1``) are resolved through every ``/Font``
+    dictionary; producers reuse a name for the same font on each page, the
+    first binding wins otherwise.
+    """
+    def _resolve(body):
+        ref = re.fullmatch(rb'\s*(\d+)\s+\d+\s+R\s*', body)
+        return objects.get(int(ref.group(1)), (b'', None))[0] if ref else body
+
+    cmaps = {}
+    fonts = {}
+    for body, __ in objects.values():
+        for match in re.finditer(rb'/Font\s*(<<.*?>>|\d+\s+\d+\s+R)', body, re.S):
+            font_dict = _resolve(match.group(1))
+            for name, number in re.findall(rb'/([^\s/<>\[\]()]+)\s*(\d+)\s+\d+\s+R', font_dict):
+                number = int(number)
+                if name in fonts:
+                    continue
+                font_body = objects.get(number, (b'', None))[0]
+                to_unicode = re.search(rb'/ToUnicode\s+(\d+)\s+\d+\s+R', font_body)
+                if not to_unicode:
+                    # Two-byte glyph ids mean nothing without the map
+                    fonts[name] = _UNREADABLE if b'/Type0' in font_body else None
+                    continue
+                cmap_number = int(to_unicode.group(1))
+                if cmap_number not in cmaps:
+                    stream = objects.get(cmap_number, (b'', None))[1]
+                    cmaps[cmap_number] = _parse_cmap(stream) if stream else None
+                fonts[name] = cmaps[cmap_number]
+    return fonts
+
+
+def _decode_string(data, font):
+    if font is _UNREADABLE:
+        return ''
+    if font and font[0]:
+        mapping, size = font
+        chars = []
+        i = 0
+        while i < len(data):
+            code = data[i:i + size]
+            if code in mapping:
+                chars.append(mapping[code])
+                i += size
+            elif data[i:i + 1] in mapping:
+                chars.append(mapping[data[i:i + 1]])
+                i += 1
+            else:
+                i += size
+        return ''.join(chars)
+    if data.startswith(b'\xfe\xff'):
+        return data[2:].decode('utf-16-be', errors='ignore')
+    return data.decode('cp1252', errors='ignore')
+
+
+def _content_text(content, fonts):
+    """Text drawn by one content stream, with line breaks where the text
+    position moves to another line."""
+    out = []
+    operands = []
+    array = None
+    font = None
+    for match in _TOKEN_RE.finditer(content):
+        token = match.group()
+        head = token[:1]
+        if head == b'(' or head == b'<':
+            if head == b'(':
+                value = _unescape(token[1:-1])
+            else:
+                hex_value = re.sub(rb'\s', b'', token[1:-1])
+                value = bytes.fromhex((hex_value + b'0' * (len(hex_value) % 2)).decode())
+            (array if array is not None else operands).append(_decode_string(value, font))
+        elif token == b'[':
+            array = []
+        elif token == b']':
+            operands.append(array or [])
+            array = None
+        elif head in b'+-.0123456789':
+            number = float(token)
+            if array is not None:
+                if number < -TJ_SPACE:
+                    array.append(' ')
+            else:
+                operands.append(number)
+        elif head == b'/':
+            operands.append(token[1:])
+        else:
+            if token == b'Tf' and operands and isinstance(operands[0], bytes):
+                font = fonts.get(operands[0])
+            elif token == b'Tj' or token in (b"'", b'"'):
+                if token != b'Tj':
+                    out.append('\n')
+                out.extend(o for o in operands if isinstance(o, str))
+            elif token == b'TJ':
+                for item in operands:
+                    if isinstance(item, list):
+                        out.extend(item)
+            elif token in (b'Td', b'TD'):
+                numbers = [o for o in operands if isinstance(o, float)]
+                out.append('\n' if len(numbers) == 2 and numbers[1] else ' ')
+            elif token in (b'T*', b'Tm', b'ET'):
+                out.append('\n')
+            operands = []
+    return ''.join(out)
+
+
+def extract_pdf(raw):
+    objects = _read_objects(raw)
+    fonts = _font_maps(objects)
+    parts = []
+    for number in sorted(objects):
+        stream = objects[number][1]
+        if stream and b'BT' in stream and (b'Tj' in stream or b'TJ' in stream):
+            parts.append(_content_text(stream, fonts))
+    return _tidy('\n'.join(parts))
+
+
+# ----------------------------------------------------------------------
+# DOCX
+# ----------------------------------------------------------------------
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def extract_docx(raw):
+    """Text of a DOCX file, or ``None`` for another kind of ZIP archive."""
+    with zipfile.ZipFile(io.BytesIO(raw)) as archive:
+        try:
+            info = archive.getinfo('word/document.xml')
+        except KeyError:
+            return None
+        if info.file_size > MAX_INFLATED:
+            return ''
+        xml = archive.read(info)
+    lines = []
+    line = []
+    for event, element in ElementTree.iterparse(io.BytesIO(xml), events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            continue
+        if tag == _W + 't':
+            line.append(element.text or '')
+        elif tag == _W + 'tab':
+            line.append('\t')
+        elif tag in (_W + 'br', _W + 'cr'):
+            line.append('\n')
+        elif tag == _W + 'p':
+            lines.append(''.join(line))
+            line = []
+            element.clear()
+    return _tidy('\n'.join(lines))
+
+
+# ----------------------------------------------------------------------
+# Other files
+# ----------------------------------------------------------------------
+def extract_plain(raw):
+    """Text files as they are; binary files as their printable strings."""
+    try:
+        return 'text', _tidy(raw.decode('utf-8'))
+    except UnicodeDecodeError:
+        pass
+    sample = raw[:4096]
+    controls = sum(1 for b in sample if b < 32 and b not in (9, 10, 13))
+    if sample and controls / len(sample) < 0.01:
+        return 'text', _tidy(raw.decode('cp1252', errors='replace'))
+    strings = re.findall(rb'[\x20-\x7E]{4,}', raw)[:200]
+    return 'binary', _tidy('\n'.join(s.decode('ascii') for s in strings))
+
+
+def _tidy(text):
+    text = re.sub(r'[\x00-\x08\x0b\x0e-\x1f]', '', text)
+    text = re.sub(r'[ \t\r\f\v]+', ' ', text)
+    text = re.sub(r' ?\n[ \n]*', '\n', text)
+    return text.strip()[:MAX_CHARS]
+
+
+def extract_text(raw, filename=''):
+    """Return ``(kind, text)`` for the document ``raw`` (bytes).
+
+    ``kind`` is ``pdf``, ``docx``, ``text`` or ``binary``.
+    """
+    if not raw:
+        return 'binary', ''
+    try:
+        if b'%PDF-' in raw[:1024]:
+            return 'pdf', extract_pdf(raw)
+        if raw[:4] == b'PK\x03\x04':
+            text = extract_docx(raw)
+            if text is not None:
+                return 'docx', text
+    except Exception as e:
+        # Damaged or hostile file: what could not be parsed is simply missing
+        _logger.info("CV text extraction failed for %s: %s", filename, e)
+        return 'binary', ''
+    return extract_plain(raw)
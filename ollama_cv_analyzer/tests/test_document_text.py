@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+import io
+import zipfile
+import zlib
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_cv_analyzer.services import document_text
+
+CMAP = b"""/CIDInit /ProcSet findresource begin
+begincmap
+1 begincodespacerange <0000> <FFFF> endcodespacerange
+2 beginbfchar
+<0001> <004A>
+<0002> <00E9>
+endbfchar
+1 beginbfrange
+<0010> <0012> <0061>
+endbfrange
+endcmap"""
+
+
+def _pdf(*objects):
+    """Minimal PDF made of ``objects`` (bytes), numbered from 1."""
+    parts = [b'%PDF-1.4\n']
+    for number, body in enumerate(objects, 1):
+        parts.append(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+    parts.append(b'trailer\n<< /Root 1 0 R >>\n%%EOF\n')
+    return b''.join(parts)
+
+
+def _stream(data, compress=False):
+    if compress:
+        data = zlib.compress(data)
+        return b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(data), data)
+    return b'<< /Length %d >>\nstream\n%s\nendstream' % (len(data), data)
+
+
+class TestDocumentText(BaseCase):
+
+    def test_pdf_flate_content(self):
+        content = b'BT /F1 12 Tf 72 700 Td (Jane Doe) Tj 0 -14 Td [(Python) -250 (developer)] TJ ET'
+        raw = _pdf(
+            b'<< /Type /Page /Resources << /Font << /F1 3 0 R >> >> /Contents 2 0 R >>',
+            _stream(content, compress=True),
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+        )
+        kind, text = document_text.extract_text(raw, 'cv.pdf')
+        self.assertEqual(kind, 'pdf')
+        self.assertEqual(text, 'Jane Doe\nPython developer')
+
+    def test_pdf_to_unicode(self):
+        # Identity-H font: two-byte glyph ids, readable through ToUnicode only
+        content = b'BT /F1 12 Tf <000100020010001100120012> Tj ET'
+        font = b'<< /Type /Font /Subtype /Type0 /Encoding /Identity-H /ToUnicode %d 0 R >>'
+        raw = _pdf(
+            b'<< /Type /Page /Resources << /Font << /F1 3 0 R >> >> /Contents 2 0 R >>',
+            _stream(content, compress=True),
+            font % 4,
+            _stream(CMAP, compress=True),
+        )
+        self.assertEqual(document_text.extract_text(raw)[1], 'Jéabcc')
+
+    def test_pdf_type0_without_to_unicode(self):
+        content = b'BT /F1 12 Tf <00010002> Tj ET'
+        raw = _pdf(
+            b'<< /Type /Page /Resources << /Font << /F1 3 0 R >> >> /Contents 2 0 R >>',
+            _stream(content),
+            b'<< /Type /Font /Subtype /Type0 /Encoding /Identity-H >>',
+        )
+        self.assertEqual(document_text.extract_text(raw), ('pdf', ''))
+
+    def test_docx(self):
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            '<w:body>'
+            '<w:p><w:r><w:t>Jane</w:t></w:r><w:r><w:t xml:space="preserve"> Doé</w:t></w:r></w:p>'
+            '<w:p><w:r><w:t>Skills:</w:t><w:tab/><w:t>Odoo</w:t></w:r></w:p>'
+            '</w:body></w:document>'
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', xml.encode('utf-8'))
+        self.assertEqual(
+            document_text.extract_text(buffer.getvalue(), 'cv.docx'),
+            ('docx', 'Jane Doé\nSkills: Odoo'),
+        )
+
+    def test_zip_without_document(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('readme.txt', 'hello')
+        self.assertEqual(document_text.extract_text(buffer.getvalue())[0], 'binary')
+
+    def test_plain_text_and_empty(self):
+        self.assertEqual(document_text.extract_text('Jane  Doe\n\n\nCV'.encode('utf-8')),
+                         ('text', 'Jane Doe\nCV'))
+        self.assertEqual(document_text.extract_text(b''), ('binary', ''))
+
+    def test_damaged_pdf_does_not_raise(self):
+        raw = _pdf(_stream(b'\x00garbage', compress=False).replace(b'>>', b'/Filter /FlateDecode >>', 1))
+        self.assertEqual(document_text.extract_text(raw)[0], 'pdf')
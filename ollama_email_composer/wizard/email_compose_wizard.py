@@ -52,11 +52,38 @@ class EmailComposeAIWizard(models.TransientModel):
     def action_generate(self):
         """Generate email using AI."""
         self.ensure_one()
+        prompt, system_prompt = self._build_email_prompt()
+        config = self._get_ollama_config()
+
+        result = self._call_ollama_safe(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            log_model='email.compose.ai.wizard',
+            log_res_id=self.id,
+            log_vals=self._get_log_vals(),
+            config=config,
+        )
+
+        if not result:
+            raise UserError(_("AI did not return a response. Check your AI configuration."))
+
+        self._store_generated_email(result)
+
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('AI Email Result'),
+            'res_model': 'email.compose.ai.wizard',
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def _build_email_prompt(self):
+        """Return (prompt, system_prompt) for the email."""
+        self.ensure_one()
         if not self.instruction:
             raise UserError(_("Please provide instructions for the email."))
 
-        config = self._get_ollama_config()
-
         # Build system prompt from template or default
         if self.template_id and self.template_id.system_prompt:
             system_prompt = self.template_id.system_prompt
@@ -71,19 +98,14 @@ class EmailComposeAIWizard(models.TransientModel):
         if self.context_info:
             parts.append(f"Context:\n{self.context_info}")
 
-        prompt = '\n'.join(parts)
-
-        result = self._call_ollama_safe(
-            prompt=prompt,
-            system_prompt=system_prompt,
-            log_model='email.compose.ai.wizard',
-            log_res_id=self.id,
-            config=config,
-        )
+        return '\n'.join(parts), system_prompt
 
-        if not result:
-            raise UserError(_("AI did not return a response. Check your AI configuration."))
+    def _get_log_vals(self):
+        """Tag the AI log with the tone, for the dashboard stats."""
+        return {'prompt_preview': f'[{self.tone}] {(self.instruction or "")[:400]}'}
 
+    def _store_generated_email(self, result):
+        """Split the AI answer into subject and body and store them."""
         # Try to extract subject from response
         subject = ''
         body = result
@@ -98,14 +120,6 @@ class EmailComposeAIWizard(models.TransientModel):
                 if subject:
                     break
 
-        # Store tone in log for dashboard stats
-        self.env['ollama.log'].sudo().search([
-            ('res_model', '=', 'email.compose.ai.wizard'),
-            ('res_id', '=', self.id),
-        ], limit=1, order='id desc').write({
-            'prompt_preview': f'[{self.tone}] {(self.instruction or "")[:400]}',
-        })
-
         # Convert newlines to HTML
         body_html = body.replace('\n', '<br/>')
 
@@ -115,13 +129,25 @@ class EmailComposeAIWizard(models.TransientModel):
             'state': 'done',
         })
 
+    # ------------------------------------------------------------------
+    # Streaming (see ollama_base /ollama/stream)
+    # ------------------------------------------------------------------
+    def _ollama_stream_prepare(self, purpose, params):
+        if purpose != 'email':
+            return super()._ollama_stream_prepare(purpose, params)
+        prompt, system_prompt = self._build_email_prompt()
+        return {'prompt': prompt, 'system_prompt': system_prompt,
+                'log_vals': self._get_log_vals()}
+
+    def _ollama_stream_finish(self, purpose, text, params):
+        if purpose != 'email':
+            return super()._ollama_stream_finish(purpose, text, params)
+        if not text:
+            return {}
+        self._store_generated_email(text)
         return {
-            'type': 'ir.actions.act_window',
-            'name': _('AI Email Result'),
-            'res_model': 'email.compose.ai.wizard',
-            'res_id': self.id,
-            'view_mode': 'form',
-            'target': 'new',
+            'generated_subject': self.generated_subject,
+            'generated_body': self.generated_body,
         }
 
     def action_copy_to_clipboard(self):
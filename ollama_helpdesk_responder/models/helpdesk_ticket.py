@@ -203,6 +203,37 @@ class HelpdeskTicket(models.Model):
         """Use AI to draft a helpful customer response."""
         self.ensure_one()
 
+        prompt, system_prompt = self._build_response_prompt()
+
+        result = self._call_ollama_safe(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=0.7,
+            max_tokens=1500,
+            log_model=self._name,
+            log_res_id=self.id,
+        )
+
+        if not result:
+            raise UserError(_("AI did not return a response. Check your AI configuration."))
+
+        self._store_draft_response(result)
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('AI Response Generated'),
+                'message': _('A draft response has been generated. Review it in the AI Draft Response tab.'),
+                'type': 'success',
+                'sticky': False,
+            }
+        }
+
+    def _build_response_prompt(self):
+        """Return (prompt, system_prompt) for the draft response."""
+        self.ensure_one()
+
         description_text = ''
         if self.description:
             description_text = re.sub(r'<[^>]+>', ' ', self.description)
@@ -250,18 +281,9 @@ class HelpdeskTicket(models.Model):
             "Respond with the HTML body only."
         )
 
-        result = self._call_ollama_safe(
-            prompt,
-            system_prompt=system_prompt,
-            temperature=0.7,
-            max_tokens=1500,
-            log_model=self._name,
-            log_res_id=self.id,
-        )
-
-        if not result:
-            raise UserError(_("AI did not return a response. Check your AI configuration."))
+        return prompt, system_prompt
 
+    def _store_draft_response(self, result):
         # Ensure result is wrapped in HTML paragraph tags if not already
         result_clean = result.strip()
         if not result_clean.startswith('<'):
@@ -272,17 +294,28 @@ class HelpdeskTicket(models.Model):
             'ai_analysis_date': fields.Datetime.now(),
         })
 
+    # ------------------------------------------------------------------
+    # Streaming (see ollama_base /ollama/stream)
+    # ------------------------------------------------------------------
+    def _ollama_stream_prepare(self, purpose, params):
+        if purpose != 'response':
+            return super()._ollama_stream_prepare(purpose, params)
+        prompt, system_prompt = self._build_response_prompt()
         return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('AI Response Generated'),
-                'message': _('A draft response has been generated. Review it in the AI Draft Response tab.'),
-                'type': 'success',
-                'sticky': False,
-            }
+            'prompt': prompt,
+            'system_prompt': system_prompt,
+            'temperature': 0.7,
+            'max_tokens': 1500,
         }
 
+    def _ollama_stream_finish(self, purpose, text, params):
+        if purpose != 'response':
+            return super()._ollama_stream_finish(purpose, text, params)
+        if not text:
+            return {}
+        self._store_draft_response(text)
+        return {'ai_draft_response': self.ai_draft_response}
+
     # ------------------------------------------------------------------
     # AI: Send AI response
     # ------------------------------------------------------------------
@@ -15,6 +15,9 @@ Features:
 * AI-powered product categorization (Google / Amazon / Custom taxonomy)
 * Confidence scoring (0-100%) with color-coded indicators
 * Category mapping: link AI categories to Odoo product categories
+* Odoo Categories taxonomy: embedding shortlist of the nearest categories
+  per product instead of the whole tree, and bulk categorization of
+  similar products in shared prompts
 * Batch categorization for entire catalogs
 * Dashboard with real-time statistics
 * Works with all AI providers: Ollama, OpenAI, Gemini, Anthropic, etc.
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from . import product_category
 from . import product_template_inherit
 from . import category_mapping
 from . import categorizer_dashboard
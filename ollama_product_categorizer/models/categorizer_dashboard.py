@@ -5,6 +5,9 @@ from odoo import models, fields, api, _
 
 _logger = logging.getLogger(__name__)
 
+# Products per bulk job of the Odoo Categories taxonomy
+BULK_JOB_SIZE = 200
+
 
 class ProductCategorizerDashboard(models.TransientModel):
     _name = 'product.categorizer.dashboard'
@@ -80,7 +83,7 @@ class ProductCategorizerDashboard(models.TransientModel):
     # Dashboard Actions
     # ------------------------------------------------------------------
     def action_categorize_all(self):
-        """Batch categorize all products that lack an AI category suggestion."""
+        """Queue AI categorization of all products that lack a category suggestion."""
         products = self.env['product.template'].search([
             '|',
             ('ai_category_suggestion', '=', False),
@@ -98,43 +101,30 @@ class ProductCategorizerDashboard(models.TransientModel):
                 },
             }
 
-        success = 0
-        errors = 0
-        for product in products:
-            try:
-                product.action_categorize_product()
-                if product.ai_category_suggestion:
-                    success += 1
-                    # Auto-apply mapping if configured
-                    mapping = self.env['product.ai.category.mapping'].search([
-                        ('name', '=', product.ai_category_suggestion),
-                        ('auto_apply', '=', True),
-                    ], limit=1)
-                    if mapping and mapping.odoo_category_id:
-                        product.categ_id = mapping.odoo_category_id.id
-                        mapping.sudo().write({
-                            'match_count': mapping.match_count + 1,
-                        })
-                else:
-                    errors += 1
-            except Exception as e:
-                _logger.error("Batch categorization error for product %s: %s", product.id, e)
-                errors += 1
-
-        msg = _('%d products categorized successfully.') % success
-        if errors:
-            msg += _(' %d errors.') % errors
-
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Batch Categorization Complete'),
-                'message': msg,
-                'type': 'success' if not errors else 'warning',
-                'sticky': True,
-            },
+        # Odoo Categories: similar products share prompts, see
+        # product.template._ai_categorize_bulk
+        bulk = products.filtered(lambda p: p.ai_category_taxonomy == 'odoo')
+        jobs = (products - bulk)._ollama_enqueue('_job_categorize_product')
+        # One model-level job per chunk; products of a queued chunk are not
+        # queued again, so a rerun only adds the products left out
+        Product = self.env['product.template']
+        queued = {
+            product_id
+            for params in self.env['ollama.job']._queued_params(Product._name, '_job_categorize_bulk')
+            for product_id in params.get('product_ids') or ()
         }
+        bulk = bulk.filtered(lambda p: p.id not in queued)
+        batch_ref = 'categorize-%s' % fields.Datetime.to_string(fields.Datetime.now())
+        for start in range(0, len(bulk), BULK_JOB_SIZE):
+            chunk = bulk[start:start + BULK_JOB_SIZE]
+            jobs |= Product._ollama_enqueue('_job_categorize_bulk', params={
+                'product_ids': chunk.ids,
+            }, batch_ref=batch_ref)
+        return jobs._notify_enqueued(_('Batch Categorization Queued'))
+
+    def action_rebuild_category_index(self):
+        """Re-embed all product category paths."""
+        return self.env['product.category'].sudo().action_ai_rebuild_index()
 
     def action_open_uncategorized(self):
         """Open list of products without AI categorization."""
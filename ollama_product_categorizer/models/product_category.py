@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import logging
+
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+from odoo.addons.ollama_base.services import vector_index
+
+_logger = logging.getLogger(__name__)
+
+
+class ProductCategory(models.Model):
+    """Embedding index of the category paths, used to shortlist the
+    candidate categories of a product before asking the AI."""
+    _inherit = 'product.category'
+
+    ai_embedding = fields.Binary(
+        string='AI Embedding', attachment=False, prefetch=False, copy=False,
+    )
+    ai_embedding_key = fields.Char(
+        string='AI Embedding Key', readonly=True, copy=False,
+        help='Hash of the embedded path and embedding model; the category is '
+             're-embedded when it changes.',
+    )
+
+    # Per database: signature of the categories at the last index check
+    # (see _ai_index_signature); while it holds, nothing needs embedding
+    _ai_index_state = {}
+
+    def _get_ai_embedding_key(self, model_name):
+        self.ensure_one()
+        return hashlib.sha1(f'{model_name}\n{self.complete_name}'.encode('utf-8')).hexdigest()
+
+    @api.model
+    def _ai_index_signature(self, model_name):
+        """(embedding model, category count, last category write): any
+        creation, rename, deletion or embedding changes it."""
+        self.env.cr.execute("SELECT COUNT(*), MAX(write_date) FROM product_category")
+        return (model_name,) + tuple(self.env.cr.fetchone())
+
+    @api.model
+    def _ai_index_categories(self, force=False):
+        """Embed the paths of new, renamed or never embedded categories.
+
+        The categories are only scanned when their signature changed since
+        the last check of this process, so calling this before every
+        categorization costs one aggregate query.
+
+        :returns: number of categories embedded
+        :raises UserError: when the provider cannot embed
+        """
+        config = self.env['ollama.config'].get_active_config()
+        model_name = config._get_embedding_model()
+        dbname = self.env.cr.dbname
+        signature = self._ai_index_signature(model_name)
+        if not force and self._ai_index_state.get(dbname) == signature:
+            return 0
+        categories = self.search([])
+        todo = categories if force else categories.filtered(
+            lambda c: c.ai_embedding_key != c._get_ai_embedding_key(model_name))
+        if todo:
+            vectors = config.embed_texts([c.complete_name or c.name for c in todo])
+            # Raw SQL: the ORM would base64 the bytes of a Binary field. The
+            # write_date bump changes the signature seen by other workers.
+            self.env.cr.executemany("""
+                UPDATE product_category
+                   SET ai_embedding = %s, ai_embedding_key = %s,
+                       write_date = (now() at time zone 'UTC')
+                 WHERE id = %s
+            """, [(vector_index.pack_vector(vector) if vector else None,
+                   category._get_ai_embedding_key(model_name), category.id)
+                  for category, vector in zip(todo, vectors)])
+            todo.invalidate_recordset(['ai_embedding', 'ai_embedding_key', 'write_date'])
+            _logger.info("AI categorizer: embedded %d category paths.", len(todo))
+            signature = self._ai_index_signature(model_name)
+        self._ai_index_state[dbname] = signature
+        return len(todo)
+
+    @api.model
+    def _ai_category_matrix(self):
+        """Process-wide matrix of the category vectors, reloaded when a
+        category was (re-)embedded.
+
+        Uses the signature of the last ``_ai_index_categories`` check,
+        which runs before each categorization, rather than querying it
+        again for every product.
+        """
+        cr = self.env.cr
+        signature = self._ai_index_state.get(cr.dbname) or self._ai_index_signature(None)
+
+        def _load_rows():
+            cr.execute("""
+                SELECT id, id, ai_embedding
+                  FROM product_category
+                 WHERE ai_embedding IS NOT NULL
+              ORDER BY id
+            """)
+            return cr.fetchall()
+
+        return vector_index.get_matrix((cr.dbname, self._name), signature, _load_rows)
+
+    @api.model
+    def _ai_shortlist(self, vector, limit):
+        """The ``limit`` categories nearest to ``vector``, best first."""
+        ranked = self._ai_category_matrix().top_k(vector, limit)
+        return self.browse([category_id for __, category_id, __ in ranked])
+
+    def action_ai_rebuild_index(self):
+        """Re-embed every category path."""
+        if not vector_index.available():
+            raise UserError(_("The category index needs the NumPy Python library."))
+        count = self._ai_index_categories(force=True)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Category Index Rebuilt'),
+                'message': _('%d category paths embedded.') % count,
+                'type': 'success',
+                'sticky': False,
+            },
+        }
@@ -2,9 +2,28 @@
 import logging
 
 from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+from odoo.addons.ollama_base.services import vector_index
 
 _logger = logging.getLogger(__name__)
 
+# Candidate categories sent to the model for the Odoo taxonomy
+SHORTLIST_SIZE = 15
+# Candidates sent when no embedding index is available (no NumPy, or a
+# provider without embeddings)
+FALLBACK_CANDIDATES = 200
+# Bulk mode: products sharing one prompt and one shortlist, and how
+# similar (cosine) their texts must be to share it
+BULK_GROUP_SIZE = 10
+BULK_SIMILARITY = 0.85
+
+CATEGORY_SYSTEM_PROMPT = (
+    "You are an expert product categorization engine. "
+    "You classify products into the category tree of an online shop. "
+    "Always respond with valid JSON only, no extra text."
+)
+
 
 class ProductTemplate(models.Model):
     _inherit = ['product.template', 'ollama.mixin']
@@ -27,6 +46,7 @@ class ProductTemplate(models.Model):
         ('google', 'Google Product Taxonomy'),
         ('amazon', 'Amazon Browse Node'),
         ('custom', 'Custom Taxonomy'),
+        ('odoo', 'Odoo Categories'),
     ], string='Taxonomy', default='google',
         help='Category taxonomy used for AI categorization.',
     )
@@ -39,6 +59,11 @@ class ProductTemplate(models.Model):
         help='Date and time of the last AI categorization.',
         readonly=True,
     )
+    ai_category_id = fields.Many2one(
+        'product.category', string='AI Odoo Category',
+        help='Odoo product category chosen by the AI (Odoo Categories taxonomy).',
+        readonly=True, ondelete='set null',
+    )
 
     # ------------------------------------------------------------------
     # Actions
@@ -46,6 +71,8 @@ class ProductTemplate(models.Model):
     def action_categorize_product(self):
         """Ask the AI to categorize this product."""
         self.ensure_one()
+        if self.ai_category_taxonomy == 'odoo':
+            return self._categorize_into_odoo_categories()
         config = self._get_ollama_config()
 
         # Build taxonomy label
@@ -135,6 +162,7 @@ class ProductTemplate(models.Model):
             'ai_category_suggestion': category_path,
             'ai_category_confidence': confidence,
             'ai_category_path': category_path,
+            'ai_category_id': False,
             'ai_category_date': fields.Datetime.now(),
         })
 
@@ -152,6 +180,248 @@ class ProductTemplate(models.Model):
             },
         }
 
+    # ------------------------------------------------------------------
+    # Odoo Categories taxonomy: embedding shortlist
+    # ------------------------------------------------------------------
+    def _get_categorization_text(self):
+        self.ensure_one()
+        description = self.description_sale or self.description or ''
+        return f"{self.name or ''}\n{str(description)[:500]}".strip()
+
+    def _embed_for_categorization(self, config):
+        """Refresh the category index and embed the products' texts.
+
+        :returns: one vector per product, or ``None`` when the shortlist
+            cannot be used (no NumPy, no embeddings from the provider)
+        """
+        if not vector_index.available():
+            return None
+        try:
+            self.env['product.category'].sudo()._ai_index_categories()
+            return config.embed_texts([p._get_categorization_text() for p in self])
+        except UserError as e:
+            _logger.warning("AI categorization: no category shortlist (%s), "
+                            "sending the first %d categories instead.",
+                            e, FALLBACK_CANDIDATES)
+            return None
+
+    @api.model
+    def _get_category_candidates(self, vector=None):
+        """Categories offered to the model: the ``SHORTLIST_SIZE``
+        nearest to ``vector``, else the first ``FALLBACK_CANDIDATES``."""
+        Category = self.env['product.category'].sudo()
+        if vector:
+            shortlist = Category._ai_shortlist(vector, SHORTLIST_SIZE)
+            if shortlist:
+                return shortlist
+        return Category.search([], limit=FALLBACK_CANDIDATES, order='complete_name')
+
+    @api.model
+    def _format_category_candidates(self, categories):
+        return '\n'.join(f"[{c.id}] {c.complete_name}" for c in categories)
+
+    def _set_ai_category(self, category, confidence):
+        self.write({
+            'ai_category_id': category.id,
+            'ai_category_suggestion': category.complete_name,
+            'ai_category_path': category.complete_name,
+            'ai_category_confidence': max(0, min(100, float(confidence or 0))),
+            'ai_category_date': fields.Datetime.now(),
+        })
+
+    @staticmethod
+    def _to_int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _categorize_into_odoo_categories(self, candidates=None):
+        """Categorize this product into one of the shortlisted Odoo
+        categories (``candidates``, computed when not given)."""
+        self.ensure_one()
+        config = self._get_ollama_config()
+        if candidates is None:
+            vectors = self._embed_for_categorization(config)
+            candidates = self._get_category_candidates(vectors[0] if vectors else None)
+        if not candidates:
+            raise UserError(_('There is no product category to choose from.'))
+
+        description = self.description_sale or self.description or ''
+        prompt = (
+            "Classify the following product into ONE of the candidate categories.\n\n"
+            f"Product name: {self.name or ''}\n"
+            f"Description: {str(description)[:500] or 'N/A'}\n\n"
+            "Candidate categories ([id] path):\n"
+            f"{self._format_category_candidates(candidates)}\n\n"
+            "Respond ONLY with a JSON object in this exact format:\n"
+            '{"category_id": 12, "confidence": 85, '
+            '"reasoning": "Brief explanation of why this category was chosen"}\n\n'
+            "Rules:\n"
+            "- category_id must be one of the ids in brackets above\n"
+            "- confidence must be an integer from 0 to 100"
+        )
+        response = self._call_ollama_safe(
+            prompt,
+            system_prompt=CATEGORY_SYSTEM_PROMPT,
+            temperature=0.3,
+            config=config,
+            log_model=self._name,
+            log_res_id=self.id,
+        )
+        data = self._parse_json_response(response)
+        category = candidates.filtered(
+            lambda c: c.id == self._to_int(data.get('category_id'))
+        ) if isinstance(data, dict) else candidates.browse()
+        if not category:
+            _logger.warning(
+                "AI categorization: no valid category for product %s: %s",
+                self.id, (response or '')[:200],
+            )
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _('Categorization Failed'),
+                    'message': _('The AI did not choose one of the candidate categories. Try again.'),
+                    'type': 'warning',
+                    'sticky': False,
+                },
+            }
+
+        self._set_ai_category(category, data.get('confidence'))
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Product Categorized'),
+                'message': _('Category: %s (%.0f%% confidence)\n%s') % (
+                    category.complete_name, self.ai_category_confidence,
+                    data.get('reasoning', '')),
+                'type': 'success',
+                'sticky': True,
+            },
+        }
+
+    def _ai_categorize_bulk(self):
+        """Categorize these products into Odoo categories, several per
+        prompt.
+
+        Products whose texts are close (cosine >= ``BULK_SIMILARITY``)
+        share one prompt and the shortlist of their centroid, so a large
+        import costs about one call per ``BULK_GROUP_SIZE`` similar
+        products. Products the model skipped are retried one by one.
+
+        :returns: number of products categorized
+        """
+        config = self._get_ollama_config()
+        products = self.exists()
+        vectors = products._embed_for_categorization(config)
+        if vectors and all(vectors):
+            groups = vector_index.group_similar(
+                vectors, threshold=BULK_SIMILARITY, max_group=BULK_GROUP_SIZE)
+        else:
+            vectors = None
+            groups = [list(range(i, min(i + BULK_GROUP_SIZE, len(products))))
+                      for i in range(0, len(products), BULK_GROUP_SIZE)]
+
+        done = self.browse()
+        for positions in groups:
+            group = products.browse([products.ids[i] for i in positions])
+            centroid = None
+            if vectors:
+                members = [vectors[i] for i in positions]
+                centroid = [sum(column) / len(members) for column in zip(*members)]
+            candidates = self._get_category_candidates(centroid)
+            if not candidates:
+                break
+            done |= group._categorize_group(candidates, config)
+            for product in group - done:
+                result = product._categorize_into_odoo_categories(candidates)
+                if result['params']['type'] == 'success':
+                    done |= product
+        return len(done)
+
+    def _categorize_group(self, candidates, config):
+        """One prompt for these products over a shared shortlist.
+
+        :returns: the products that received a valid category
+        """
+        if len(self) == 1:
+            return self.browse()  # the single-product prompt is more precise
+        lines = []
+        for product in self:
+            description = product.description_sale or product.description or ''
+            lines.append(f"[{product.id}] {product.name or ''}"
+                         f"{' - ' + str(description)[:200] if description else ''}")
+        prompt = (
+            "Classify each of the following products into ONE of the candidate categories.\n\n"
+            "Products ([id] name - description):\n" + '\n'.join(lines) + "\n\n"
+            "Candidate categories ([id] path):\n"
+            f"{self._format_category_candidates(candidates)}\n\n"
+            "Respond ONLY with a JSON object in this exact format:\n"
+            '{"results": [{"product_id": 7, "category_id": 12, "confidence": 85}]}\n\n'
+            "Rules:\n"
+            "- one entry per product, product_id being the product id in brackets\n"
+            "- category_id must be one of the category ids in brackets above\n"
+            "- confidence must be an integer from 0 to 100"
+        )
+        response = self._call_ollama_safe(
+            prompt,
+            system_prompt=CATEGORY_SYSTEM_PROMPT,
+            temperature=0.3,
+            config=config,
+            log_model=self._name,
+            log_res_id=self[:1].id,
+        )
+        data = self._parse_json_response(response)
+        items = data.get('results') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return self.browse()
+        products = {product.id: product for product in self}
+        categories = {category.id: category for category in candidates}
+        done = self.browse()
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            product = products.get(self._to_int(item.get('product_id')))
+            category = categories.get(self._to_int(item.get('category_id')))
+            if product and category and product not in done:
+                product._set_ai_category(category, item.get('confidence'))
+                done |= product
+        return done
+
+    def _job_categorize_bulk(self, product_ids):
+        """``ollama.job`` entry point: bulk-categorize one pack of products."""
+        products = self.browse(product_ids).exists()
+        count = products._ai_categorize_bulk()
+        if products and not count:
+            raise UserError(_('The AI did not return a usable category.'))
+        return _('%d of %d products categorized') % (count, len(products))
+
+    def _job_categorize_product(self):
+        """Background job: categorize, then auto-apply a matching mapping.
+
+        Raises when the AI gave no usable answer so the job is retried.
+        """
+        self.ensure_one()
+        self.action_categorize_product()
+        if not self.ai_category_suggestion:
+            raise UserError(_('The AI did not return a usable category.'))
+        if self.ai_category_taxonomy == 'odoo':
+            # The category is only proposed; see action_apply_category
+            return self.ai_category_suggestion
+        mapping = self.env['product.ai.category.mapping'].search([
+            ('name', '=', self.ai_category_suggestion),
+            ('auto_apply', '=', True),
+        ], limit=1)
+        if mapping and mapping.odoo_category_id:
+            self.categ_id = mapping.odoo_category_id.id
+            mapping.sudo().write({
+                'match_count': mapping.match_count + 1,
+            })
+        return self.ai_category_suggestion
+
     def action_apply_category(self):
         """Look up a matching category mapping and apply the Odoo category."""
         self.ensure_one()
@@ -167,6 +437,19 @@ class ProductTemplate(models.Model):
                 },
             }
 
+        if self.ai_category_id:
+            self.categ_id = self.ai_category_id
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _('Category Applied'),
+                    'message': _('Product category set to "%s".') % self.ai_category_id.display_name,
+                    'type': 'success',
+                    'sticky': False,
+                },
+            }
+
         Mapping = self.env['product.ai.category.mapping']
 
         # Try exact match first, then partial
@@ -13,17 +13,24 @@ Retrieval-Augmented Generation for your product catalog.
 Features
 --------
 * Indexes your entire product catalog for AI-powered search
+* Relevance-ranked retrieval: PostgreSQL full-text search, embeddings
+  (cosine similarity, requires NumPy) or both
 * Conversational product assistant — customers ask questions, AI answers with real products
+* Search terms stripped of English and French stop words and stemmed, matched
+  as prefixes on the full-text index ('chargers' finds 'charger')
+* Follow-up questions reuse the products of the previous turn; long
+  conversations are summarized in the background to keep prompts short
 * Full conversation history with referenced products
 * Dashboard with indexing stats and quick actions
-* Nightly cron for automatic catalog re-indexing
-* JSON API endpoint for website chatbot integration
+* Nightly cron for incremental catalog re-indexing (modified products only)
+* JSON API endpoint for website chatbot integration, with a token-streaming variant
 * Works with all providers: Ollama, OpenAI, Gemini, Anthropic, Llama.cpp
 
 How it works
 ------------
 1. Products are indexed into a searchable text format (name, description, price, category)
-2. When a user asks a question, relevant products are retrieved via text search
+2. When a user asks a question, relevant products are retrieved via text search,
+   or reused from the previous turn for a follow-up question
 3. The AI receives the question + product context and generates a helpful answer
 4. Conversation history is maintained for multi-turn dialogues
     """,
@@ -44,6 +51,7 @@ How it works
         'views/rag_dashboard_views.xml',
         'views/rag_conversation_views.xml',
         'views/rag_index_views.xml',
+        'views/ollama_config_views.xml',
     ],
     'images': ['static/description/banner.png'],
     'installable': True,
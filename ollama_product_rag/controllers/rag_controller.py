@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
+import json
 import uuid
 import logging
 
 from odoo import http
 from odoo.http import request
 
+from odoo.addons.ollama_base.controllers.stream import stream_record
+
 _logger = logging.getLogger(__name__)
 
 
@@ -18,6 +21,15 @@ class RagController(http.Controller):
 
     Response:
         {"jsonrpc": "2.0", "result": {"session_id": "...", "answer": "..."}}
+
+    Streaming variant (form-encoded, NDJSON response, see
+    ``ollama_base/static/src/js/ollama_stream.js``):
+        POST /ollama/rag/ask_stream
+        question=...&session_id=...
+
+        {"token": "..."}
+        ...
+        {"done": true, "error": null, "session_id": "...", "answer": "..."}
     """
 
     @http.route('/ollama/rag/ask', type='json', auth='public', methods=['POST'], csrf=False)
@@ -26,9 +38,45 @@ class RagController(http.Controller):
         if not question or not question.strip():
             return {'session_id': session_id or '', 'answer': 'Please provide a question.'}
 
+        conv = self._get_conversation(session_id)
+        try:
+            answer = conv.ask_question(question)
+        except Exception as e:
+            _logger.exception("RAG API error: %s", e)
+            answer = "Sorry, an error occurred while processing your question. Please try again."
+
+        return {
+            'session_id': conv.session_id or session_id,
+            'answer': answer,
+        }
+
+    @http.route('/ollama/rag/ask_stream', type='http', auth='public', methods=['POST'], csrf=False)
+    def ask_question_stream(self, session_id=None, question='', **kwargs):
+        """Same as ``/ollama/rag/ask`` but streams the answer token by token."""
+        if not question or not question.strip():
+            return request.make_response(
+                json.dumps({'done': True, 'error': None, 'session_id': session_id or '',
+                            'answer': 'Please provide a question.'}) + '\n',
+                headers=[('Content-Type', 'application/x-ndjson; charset=utf-8')],
+            )
+        conv = self._get_conversation(session_id)
+        try:
+            return stream_record(conv, 'answer', {'question': question})
+        except Exception as e:
+            _logger.exception("RAG API error: %s", e)
+            return request.make_response(
+                json.dumps({
+                    'done': True,
+                    'error': 'Sorry, an error occurred while processing your question. Please try again.',
+                    'session_id': conv.session_id,
+                }) + '\n',
+                headers=[('Content-Type', 'application/x-ndjson; charset=utf-8')],
+            )
+
+    def _get_conversation(self, session_id):
+        """Find the conversation of ``session_id`` or start a new one."""
         Conversation = request.env['product.rag.conversation'].sudo()
 
-        # Find or create conversation by session_id
         conv = None
         if session_id:
             conv = Conversation.search([('session_id', '=', session_id)], limit=1)
@@ -40,14 +88,4 @@ class RagController(http.Controller):
                 'session_id': session_id,
                 'partner_id': request.env.user.partner_id.id if not request.env.user._is_public() else False,
             })
-
-        try:
-            answer = conv.ask_question(question)
-        except Exception as e:
-            _logger.exception("RAG API error: %s", e)
-            answer = "Sorry, an error occurred while processing your question. Please try again."
-
-        return {
-            'session_id': conv.session_id or session_id,
-            'answer': answer,
-        }
+        return conv
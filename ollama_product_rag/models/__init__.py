@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+from . import ollama_config
 from . import product_rag_index
 from . import rag_conversation
 from . import rag_dashboard
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from odoo import models, fields
+
+
+class OllamaConfig(models.Model):
+    _inherit = 'ollama.config'
+
+    rag_search_mode = fields.Selection([
+        ('keyword', 'Full-Text'),
+        ('vector', 'Semantic (Embeddings)'),
+        ('hybrid', 'Hybrid (Full-Text Pre-Filter + Embeddings)'),
+    ], string='Product Search', default='hybrid', required=True,
+        help="How the product assistant retrieves products:\n"
+             "- Full-Text: PostgreSQL full-text search ranked by relevance\n"
+             "- Semantic: cosine similarity of embeddings over the whole catalog\n"
+             "- Hybrid: embeddings ranking the full-text matches, semantic "
+             "search when there are too few of them",
+    )
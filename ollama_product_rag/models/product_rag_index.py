@@ -1,12 +1,23 @@
 # -*- coding: utf-8 -*-
 import logging
 import re
+import time
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from odoo.addons.ollama_base.services import vector_index
+
+from ..services import query_terms
 
 _logger = logging.getLogger(__name__)
 
+# Full-text candidates re-ranked by embeddings in hybrid mode
+HYBRID_CANDIDATES = 200
+# Products indexed (and embedded) per batch by the catalog reindex
+REINDEX_BATCH = 500
+
 
 class ProductRagIndex(models.Model):
     _name = 'product.rag.index'
@@ -28,6 +39,27 @@ class ProductRagIndex(models.Model):
     last_indexed = fields.Datetime(
         string='Last Indexed',
         readonly=True,
+        help='Last change of the indexed text.',
+    )
+    last_checked = fields.Datetime(
+        string='Last Checked',
+        readonly=True,
+        help='Last time the text was rebuilt from the product, changed or not.',
+    )
+    embedding = fields.Binary(
+        string='Embedding',
+        attachment=False,
+        help='Embedding of the indexed text, packed float32.',
+    )
+    embedding_model = fields.Char(
+        string='Embedding Model',
+        readonly=True,
+    )
+    embedding_date = fields.Datetime(
+        string='Embedded On',
+        readonly=True,
+        help='Last write of the embedding; the in-memory vector matrix is '
+             'reloaded when it moves.',
     )
 
     _sql_constraints = [
@@ -35,143 +67,324 @@ class ProductRagIndex(models.Model):
          'Each product can only have one index record!'),
     ]
 
+    def init(self):
+        # GIN index backing the full-text search (and the hybrid pre-filter)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS product_rag_index_fts_idx
+                ON product_rag_index
+             USING GIN (to_tsvector('simple', COALESCE(indexed_text, '')))
+        """)
+
     # ------------------------------------------------------------------
     # Indexing
     # ------------------------------------------------------------------
     def action_index_product(self):
         """Build the indexed_text from the linked product's data."""
-        for rec in self:
-            product = rec.product_id
-            if not product:
-                continue
+        self._index_records(force=True)
+        return True
 
-            parts = []
-
-            # Name
-            if product.name:
-                parts.append(f"Product: {product.name}")
-
-            # Category
-            if product.categ_id:
-                parts.append(f"Category: {product.categ_id.complete_name or product.categ_id.name}")
-
-            # Price
-            if product.list_price:
-                parts.append(f"Price: {product.list_price:.2f}")
-
-            # Sale description
-            if product.description_sale:
-                parts.append(f"Description: {product.description_sale}")
-
-            # Internal description
-            if product.description:
-                desc = product.description
-                if desc != product.description_sale:
-                    parts.append(f"Details: {desc}")
-
-            # Website description (strip HTML)
-            website_desc = getattr(product, 'website_description', None)
-            if website_desc:
-                clean = re.sub(r'<[^>]+>', ' ', str(website_desc))
-                clean = re.sub(r'\s+', ' ', clean).strip()
-                if clean and clean != (product.description_sale or ''):
-                    parts.append(f"Web description: {clean[:1000]}")
-
-            # Default code / barcode
-            if product.default_code:
-                parts.append(f"Reference: {product.default_code}")
-            if getattr(product, 'barcode', None):
-                parts.append(f"Barcode: {product.barcode}")
-
-            # Attribute values (e.g. Color: Red, Size: L)
-            if product.attribute_line_ids:
-                for line in product.attribute_line_ids:
-                    attr_name = line.attribute_id.name
-                    values = ', '.join(line.value_ids.mapped('name'))
-                    if values:
-                        parts.append(f"{attr_name}: {values}")
-
-            # Tags / labels
-            if hasattr(product, 'product_tag_ids') and product.product_tag_ids:
-                tags = ', '.join(product.product_tag_ids.mapped('name'))
-                parts.append(f"Tags: {tags}")
-
-            indexed_text = '\n'.join(parts)
-
-            rec.write({
-                'indexed_text': indexed_text,
-                'last_indexed': fields.Datetime.now(),
-            })
+    def _index_records(self, force=False):
+        """Rebuild the indexed text of these records in one pass.
 
-        return True
+        Related data (categories, attributes, tags) is prefetched for the
+        whole batch. The text, ``last_indexed`` and the embedding are only
+        written when the text changed (unless ``force``), the texts in a
+        single statement; every record gets ``last_checked``.
+
+        :returns: the records whose text changed
+        """
+        records = self.filtered('product_id')
+        if not records:
+            return self.browse()
+        self._prefetch_products(records.product_id)
+        now = fields.Datetime.now()
+        texts = {}
+        for rec in records:
+            indexed_text = self._build_indexed_text(rec.product_id)
+            if force or indexed_text != (rec.indexed_text or ''):
+                texts[rec.id] = indexed_text
+        changed = self.browse(list(texts))
+        records.write({'last_checked': now})
+        if texts:
+            self.flush_recordset(['indexed_text', 'last_indexed'])
+            self.env.cr.execute(SQL("""
+                UPDATE product_rag_index AS idx
+                   SET indexed_text = v.text, last_indexed = %s,
+                       write_date = %s, write_uid = %s
+                  FROM (VALUES %s) AS v(id, text)
+                 WHERE idx.id = v.id
+            """, now, now, self.env.uid,
+                SQL(", ").join(SQL("(%s, %s)", rid, text) for rid, text in texts.items())))
+            changed.invalidate_recordset(['indexed_text', 'last_indexed', 'write_date', 'write_uid'])
+
+        (changed | records._needs_embedding())._update_embeddings()
+        return changed
+
+    @api.model
+    def _prefetch_products(self, products):
+        """Load the fields read by ``_build_indexed_text`` for all
+        ``products`` at once instead of one product at a time."""
+        products.mapped('categ_id.complete_name')
+        products.mapped('attribute_line_ids.attribute_id.name')
+        products.mapped('attribute_line_ids.value_ids.name')
+        if 'product_tag_ids' in products._fields:
+            products.mapped('product_tag_ids.name')
+
+    @api.model
+    def _build_indexed_text(self, product):
+        """Concatenated product data used for search."""
+        parts = []
+
+        # Name
+        if product.name:
+            parts.append(f"Product: {product.name}")
+
+        # Category
+        if product.categ_id:
+            parts.append(f"Category: {product.categ_id.complete_name or product.categ_id.name}")
+
+        # Price
+        if product.list_price:
+            parts.append(f"Price: {product.list_price:.2f}")
+
+        # Sale description
+        if product.description_sale:
+            parts.append(f"Description: {product.description_sale}")
+
+        # Internal description
+        if product.description:
+            desc = product.description
+            if desc != product.description_sale:
+                parts.append(f"Details: {desc}")
+
+        # Website description (strip HTML)
+        website_desc = getattr(product, 'website_description', None)
+        if website_desc:
+            clean = re.sub(r'<[^>]+>', ' ', str(website_desc))
+            clean = re.sub(r'\s+', ' ', clean).strip()
+            if clean and clean != (product.description_sale or ''):
+                parts.append(f"Web description: {clean[:1000]}")
+
+        # Default code / barcode
+        if product.default_code:
+            parts.append(f"Reference: {product.default_code}")
+        if getattr(product, 'barcode', None):
+            parts.append(f"Barcode: {product.barcode}")
+
+        # Attribute values (e.g. Color: Red, Size: L)
+        for line in product.attribute_line_ids:
+            attr_name = line.attribute_id.name
+            values = ', '.join(line.value_ids.mapped('name'))
+            if values:
+                parts.append(f"{attr_name}: {values}")
+
+        # Tags / labels
+        if hasattr(product, 'product_tag_ids') and product.product_tag_ids:
+            tags = ', '.join(product.product_tag_ids.mapped('name'))
+            parts.append(f"Tags: {tags}")
+
+        return '\n'.join(parts)
+
+    def _needs_embedding(self):
+        """Records with text but no embedding from the current model."""
+        try:
+            config = self._get_ollama_config()
+        except UserError:
+            return self.browse()
+        if config.rag_search_mode == 'keyword':
+            return self.browse()
+        model_name = config._get_embedding_model()
+        return self.filtered(lambda r: r.indexed_text and r.embedding_model != model_name)
+
+    def _update_embeddings(self):
+        """Embed the indexed text of these records (batched API calls).
+
+        Skipped in full-text mode; errors are logged so that indexing still
+        succeeds when no embedding model is available.
+        """
+        try:
+            config = self._get_ollama_config()
+        except UserError:
+            return
+        records = self.filtered('indexed_text')
+        if config.rag_search_mode == 'keyword' or not records:
+            return
+        try:
+            vectors = config.embed_texts(records.mapped('indexed_text'))
+        except UserError as e:
+            _logger.warning("RAG: embedding failed, semantic search unavailable: %s", e)
+            return
+        model_name = config._get_embedding_model()
+        # Raw SQL: the ORM would base64 the bytes of a Binary field
+        self.flush_recordset(['indexed_text'])
+        now = fields.Datetime.now()
+        self.env.cr.executemany(
+            "UPDATE product_rag_index SET embedding = %s, embedding_model = %s,"
+            " embedding_date = %s WHERE id = %s",
+            [(vector_index.pack_vector(vector) if vector else None, model_name, now, rec.id)
+             for rec, vector in zip(records, vectors)],
+        )
+        records.invalidate_recordset(['embedding', 'embedding_model', 'embedding_date'])
 
     # ------------------------------------------------------------------
     # Catalog reindex (used by cron)
     # ------------------------------------------------------------------
     @api.model
-    def reindex_catalog(self):
-        """Create or update index records for all published products.
+    def _get_catalog_domain(self):
+        """Products to index: published products, else saleable, else all."""
+        Product = self.env['product.template']
+        if 'website_published' in Product._fields:
+            domain = [('sale_ok', '=', True), ('website_published', '=', True)]
+            if Product.search_count(domain, limit=1):
+                return domain
+        domain = [('sale_ok', '=', True)]
+        if Product.search_count(domain, limit=1):
+            return domain
+        return []
+
+    @api.model
+    def reindex_catalog(self, full=False):
+        """Create or update index records for the catalog.
+
+        Only products modified since they were last indexed (or never
+        indexed, or missing an embedding) are processed, by batches of
+        ``REINDEX_BATCH`` with prefetched related data. ``full=True``
+        reprocesses every product.
 
         Called by the scheduled action (cron).
+
+        :returns: dict with ``created``, ``updated`` and ``unchanged`` counts
         """
-        _logger.info("RAG: Starting catalog reindex...")
+        _logger.info("RAG: Starting %s catalog reindex...", 'full' if full else 'incremental')
+        t0 = time.time()
+        products_query = self.env['product.template']._search(self._get_catalog_domain())
+        dirty = self._get_dirty_products(products_query, full=full)
+        _logger.info("RAG: %d products to (re)index.", len(dirty))
+
+        created = updated = unchanged = 0
+        for start in range(0, len(dirty), REINDEX_BATCH):
+            batch = dirty[start:start + REINDEX_BATCH]
+            existing = self.browse([index_id for _pid, index_id in batch if index_id])
+            missing = [pid for pid, index_id in batch if not index_id]
+            new = self.create([{'product_id': pid} for pid in missing]) if missing else self.browse()
+            changed = (existing | new)._index_records()
+            created += len(new)
+            updated += len(changed & existing)
+            unchanged += len(existing - changed)
+            # Keep memory flat on large catalogs
+            self.env.flush_all()
+            self.env.invalidate_all()
+
+        _logger.info("RAG: Reindex done in %.1fs. Created: %d, Updated: %d, Unchanged: %d",
+                     time.time() - t0, created, updated, unchanged)
+        return {'created': created, 'updated': updated, 'unchanged': unchanged}
 
-        # Try published products first (website_sale), fall back to all
-        Product = self.env['product.template']
-        try:
-            products = Product.search([
-                ('sale_ok', '=', True),
-                ('website_published', '=', True),
-            ])
-        except Exception:
-            # website_published may not exist if website_sale is not fully loaded
-            products = Product.search([('sale_ok', '=', True)])
-
-        if not products:
-            products = Product.search([])
-
-        _logger.info("RAG: Found %d products to index.", len(products))
-
-        existing = self.search([])
-        existing_map = {rec.product_id.id: rec for rec in existing}
-
-        created = 0
-        updated = 0
-
-        for product in products:
-            if product.id in existing_map:
-                idx = existing_map[product.id]
-                idx.action_index_product()
-                updated += 1
-            else:
-                idx = self.create({'product_id': product.id})
-                idx.action_index_product()
-                created += 1
-
-        _logger.info("RAG: Reindex done. Created: %d, Updated: %d", created, updated)
-        return True
+    @api.model
+    def _get_dirty_products(self, products_query, full=False):
+        """[(product_id, index_id or None)] of the products to (re)index.
+
+        :param products_query: ``product.template._search()`` query
+        """
+        where = "TRUE"
+        params = []
+        if not full:
+            # last_checked: rows whose text did not change keep their
+            # last_indexed but must not stay dirty
+            where = """
+                idx.id IS NULL
+                OR idx.last_indexed IS NULL
+                OR pt.write_date > COALESCE(idx.last_checked, idx.last_indexed)
+            """
+            try:
+                config = self._get_ollama_config()
+            except UserError:
+                config = None
+            if config and config.rag_search_mode != 'keyword':
+                where += """
+                OR (idx.indexed_text IS NOT NULL
+                    AND idx.embedding_model IS DISTINCT FROM %s)
+                """
+                params.append(config._get_embedding_model())
+        self.env.cr.execute(SQL("""
+            SELECT pt.id, idx.id
+              FROM product_template pt
+         LEFT JOIN product_rag_index idx ON idx.product_id = pt.id
+             WHERE pt.id IN %s AND (%s)
+          ORDER BY pt.id
+        """, products_query.subselect(), SQL(where, *params)))
+        return self.env.cr.fetchall()
 
     # ------------------------------------------------------------------
     # Search
     # ------------------------------------------------------------------
     @api.model
-    def search_products(self, query, limit=5):
-        """Search the product index using SQL ILIKE.
+    def search_products(self, query, limit=5, semantic_query=None):
+        """Search the product index, most relevant first.
+
+        Depending on the AI configuration (``rag_search_mode``), products
+        are ranked by full-text relevance, by cosine similarity of their
+        embedding to the query's, or both (embeddings re-rank the full-text
+        matches). Semantic search falls back to full-text search when
+        embeddings are unavailable.
 
-        Splits the query into keywords and matches against indexed_text.
-        Returns a list of dicts: [{'product_id': int, 'product_name': str, 'snippet': str}]
+        :param query: search keywords
+        :param semantic_query: text embedded for semantic search, e.g. the
+            full question (default: ``query``)
+
+        Returns a list of dicts:
+        [{'product_id': int, 'product_name': str, 'snippet': str, 'score': float}]
         """
         if not query or not query.strip():
             return []
 
-        # Split query into meaningful keywords (3+ chars)
-        keywords = [
-            kw.strip().lower()
-            for kw in re.split(r'[\s,;.!?]+', query)
-            if len(kw.strip()) >= 3
-        ]
+        try:
+            mode = self._get_ollama_config().rag_search_mode
+        except UserError:
+            mode = 'keyword'
+
+        if mode != 'keyword' and vector_index.available():
+            ranked = self._search_vector(query, limit, hybrid=(mode == 'hybrid'),
+                                         semantic_query=semantic_query)
+            if ranked is not None:
+                return self._read_results(ranked)
+        return self._read_results(self._search_fulltext(query, limit))
+
+    @api.model
+    def _query_keywords(self, query):
+        """Stems of the meaningful words of the query (see
+        ``services.query_terms``), or all its words when it only has stop
+        words."""
+        keywords = query_terms.analyze(query)
+        return keywords or [kw.lower() for kw in re.findall(r'\w+', query)]
+
+    @api.model
+    def _search_fulltext(self, query, limit):
+        """Full-text search on the GIN index, ranked by ``ts_rank``.
+
+        Any keyword may match (prefix match of its stem, so 'chargers'
+        finds 'charger' and 'charging'); products matching more keywords
+        rank higher. When nothing matches,
+        falls back to substring matching of all the keywords.
+
+        :returns: [(index_id, product_id, score)]
+        """
+        keywords = self._query_keywords(query)
         if not keywords:
-            keywords = [query.strip().lower()]
+            return []
+        tsquery = query_terms.to_tsquery(keywords)
+        self.env.cr.execute("""
+            SELECT idx.id, idx.product_id,
+                   ts_rank(to_tsvector('simple', COALESCE(idx.indexed_text, '')),
+                           to_tsquery('simple', %s)) AS score
+              FROM product_rag_index idx
+             WHERE to_tsvector('simple', COALESCE(idx.indexed_text, ''))
+                   @@ to_tsquery('simple', %s)
+          ORDER BY score DESC, idx.id
+             LIMIT %s
+        """, (tsquery, tsquery, limit))
+        rows = self.env.cr.fetchall()
+        if rows:
+            return rows
 
         # Build WHERE clause: all keywords must appear (AND logic)
         conditions = []
@@ -179,39 +392,99 @@ class ProductRagIndex(models.Model):
         for kw in keywords:
             conditions.append("LOWER(idx.indexed_text) LIKE %s")
             params.append(f"%{kw}%")
+        params.append(limit)
+        self.env.cr.execute(f"""
+            SELECT idx.id, idx.product_id, 0.0
+              FROM product_rag_index idx
+             WHERE idx.indexed_text IS NOT NULL
+               AND {" AND ".join(conditions)}
+          ORDER BY idx.last_indexed DESC NULLS LAST
+             LIMIT %s
+        """, tuple(params))
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _search_vector(self, query, limit, hybrid=False, semantic_query=None):
+        """Top-``limit`` products by cosine similarity to the query.
 
-        where_clause = " AND ".join(conditions)
+        In hybrid mode only the full-text candidates are ranked, unless
+        there are fewer of them than ``limit``.
 
-        sql = f"""
+        :returns: [(index_id, product_id, score)], or None when semantic
+            search is unavailable (no vectors, embedding error)
+        """
+        matrix = self._get_vector_matrix()
+        if not matrix.index_ids:
+            return None
+        try:
+            query_vector = self._get_ollama_config().embed_texts([semantic_query or query])[0]
+        except (UserError, IndexError) as e:
+            _logger.warning("RAG: query embedding failed, using full-text search: %s", e)
+            return None
+
+        candidates = None
+        if hybrid:
+            candidates = [row[0] for row in self._search_fulltext(query, HYBRID_CANDIDATES)]
+            if len(candidates) < limit:
+                candidates = None
+        ranked = matrix.top_k(query_vector, limit, index_ids=candidates)
+        return ranked or None
+
+    @api.model
+    def _get_vector_matrix(self):
+        """Process-wide matrix of the stored vectors, reloaded when an
+        embedding was written or removed (text-only changes keep it)."""
+        cr = self.env.cr
+        cr.execute("""
+            SELECT COUNT(*), MAX(embedding_date), MAX(id)
+              FROM product_rag_index
+             WHERE embedding IS NOT NULL
+        """)
+        signature = tuple(cr.fetchone())
+
+        def _load_rows():
+            cr.execute("""
+                SELECT id, product_id, embedding
+                  FROM product_rag_index
+                 WHERE embedding IS NOT NULL
+              ORDER BY id
+            """)
+            return cr.fetchall()
+
+        return vector_index.get_matrix((cr.dbname, self._name), signature, _load_rows)
+
+    @api.model
+    def _read_results(self, ranked):
+        """Turn [(index_id, product_id, score)] into result dicts, keeping the order."""
+        if not ranked:
+            return []
+        index_ids = [row[0] for row in ranked]
+        self.env.cr.execute("""
             SELECT
                 idx.id AS index_id,
-                idx.product_id,
                 pt.name->>'en_US' AS product_name,
-                COALESCE(pt.name->>'en_US', '') AS fallback_name,
                 LEFT(idx.indexed_text, 300) AS snippet
             FROM product_rag_index idx
             JOIN product_template pt ON pt.id = idx.product_id
-            WHERE idx.indexed_text IS NOT NULL
-              AND {where_clause}
-            ORDER BY idx.last_indexed DESC NULLS LAST
-            LIMIT %s
-        """
-        params.append(limit)
-
-        self.env.cr.execute(sql, tuple(params))
-        rows = self.env.cr.dictfetchall()
+            WHERE idx.id IN %s
+        """, (tuple(index_ids),))
+        rows = {row['index_id']: row for row in self.env.cr.dictfetchall()}
 
         results = []
-        for row in rows:
-            name = row.get('product_name') or row.get('fallback_name') or ''
+        for index_id, product_id, score in ranked:
+            row = rows.get(index_id)
+            if not row:
+                continue
+            name = row.get('product_name') or ''
             # If JSONB returns None, get name from ORM
             if not name:
-                product = self.env['product.template'].browse(row['product_id'])
+                product = self.env['product.template'].browse(product_id)
                 name = product.name or ''
             results.append({
-                'product_id': row['product_id'],
+                'product_id': product_id,
                 'product_name': name,
                 'snippet': (row.get('snippet') or '')[:300],
+                'score': round(score or 0.0, 4),
             })
 
         return results
@@ -1,11 +1,25 @@
 # -*- coding: utf-8 -*-
 import logging
-import re
 
 from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+from ..services import query_terms
 
 _logger = logging.getLogger(__name__)
 
+# Products found for a question, and products of the previous turns kept
+# in the prompt after a search for a follow-up question
+CONTEXT_SIZE = 5
+CONTEXT_CARRY = 3
+# Estimated tokens of the messages quoted verbatim in the prompt; past it,
+# the older messages are folded into the conversation summary
+HISTORY_TOKEN_BUDGET = 1200
+# Latest messages never folded into the summary
+HISTORY_KEEP_MESSAGES = 2
+# Messages read for the prompt history at most
+HISTORY_MAX_MESSAGES = 20
+
 SYSTEM_PROMPT = """You are a helpful product assistant for an online store. Your job is to help customers find the right products based on their questions and needs.
 
 Rules:
@@ -17,6 +31,11 @@ Rules:
 - Format your response in plain text (no markdown, no HTML).
 """
 
+SUMMARY_SYSTEM_PROMPT = """You summarize conversations between a customer and the product assistant of an online store.
+Keep what matters to answer the next questions: what the customer is looking for, their constraints (budget, size, use, preferences), the products discussed with their names and prices, and what was decided or rejected.
+Write at most 8 short sentences of plain text, in the language of the conversation.
+"""
+
 
 class ProductRagConversation(models.Model):
     _name = 'product.rag.conversation'
@@ -48,6 +67,31 @@ class ProductRagConversation(models.Model):
         compute='_compute_message_count',
         store=True,
     )
+    context_keywords = fields.Char(
+        string='Context Keywords',
+        readonly=True,
+        copy=False,
+        help='Search terms of the cached product context. A follow-up '
+             'question without new terms reuses the context without searching.',
+    )
+    context_results = fields.Json(
+        string='Product Context',
+        readonly=True,
+        copy=False,
+    )
+    history_summary = fields.Text(
+        string='History Summary',
+        readonly=True,
+        copy=False,
+        help='AI summary of the messages too old to be quoted in the prompt.',
+    )
+    summary_message_id = fields.Many2one(
+        'product.rag.message',
+        string='Summarized Up To',
+        readonly=True,
+        copy=False,
+        ondelete='set null',
+    )
 
     @api.depends('message_ids')
     def _compute_message_count(self):
@@ -77,15 +121,7 @@ class ProductRagConversation(models.Model):
         if not question or not question.strip():
             return _("Please ask a question about our products.")
 
-        # Step 1: Extract search keywords from the question
-        keywords = self._extract_keywords(question)
-
-        # Step 2: Search the product index
-        RagIndex = self.env['product.rag.index']
-        search_results = RagIndex.search_products(keywords, limit=5)
-
-        # Step 3: Build the prompt with product context
-        prompt = self._build_prompt(question, search_results)
+        prompt, referenced_products = self._prepare_answer(question)
 
         # Step 4: Call AI via the mixin
         _logger.info("RAG: Calling AI for conversation %s", self.session_id or self.id)
@@ -97,64 +133,204 @@ class ProductRagConversation(models.Model):
             log_model='product.rag.conversation',
             log_res_id=self.id,
         )
+        return self._store_exchange(question, answer, referenced_products)
+
+    def _prepare_answer(self, question):
+        """Search the catalog and build the prompt.
+
+        :returns: (prompt, referenced product template ids)
+        """
+        # Steps 1-2: Products of the question, from the conversation's
+        # context or from the product index
+        search_results = self._retrieve_context(question)
+
+        # Step 3: Build the prompt with product context
+        prompt = self._build_prompt(question, search_results)
+        referenced_products = [r['product_id'] for r in search_results if r.get('product_id')]
+        return prompt, referenced_products
+
+    def _retrieve_context(self, question):
+        """Products for the prompt of ``question``.
+
+        A follow-up question without new search terms ("how much is the
+        second one?") reuses the products of the previous turn: no search,
+        no embedding call. Otherwise the catalog is searched; the matches
+        come first, followed by up to ``CONTEXT_CARRY`` products of the
+        previous turns, and become the conversation's context. A search
+        finding nothing keeps the previous context, and its terms join the
+        context keywords so the same follow-up does not search again.
+
+        :returns: [{'product_id', 'product_name', 'snippet', 'score'}]
+        """
+        keywords = self._extract_keywords(question)
+        cached = self.context_results or []
+        known = (self.context_keywords or '').split()
+        if cached and not set(keywords) - set(known):
+            return cached
+
+        results = self.env['product.rag.index'].search_products(question, limit=CONTEXT_SIZE)
+        if not results:
+            if cached:
+                self.context_keywords = ' '.join(
+                    known + [term for term in keywords if term not in known])
+            return cached
+        found = {r['product_id'] for r in results}
+        results += [r for r in cached if r.get('product_id') not in found][:CONTEXT_CARRY]
+        self.write({
+            'context_keywords': ' '.join(keywords),
+            'context_results': results,
+        })
+        return results
 
+    def _store_exchange(self, question, answer, referenced_products):
+        """Step 5: record the question and the answer; returns the answer."""
         if not answer:
             answer = _(
                 "I apologize, but I'm unable to process your request right now. "
                 "Please try again later or contact our support team."
             )
 
-        # Step 5: Create message records
-        referenced_products = [r['product_id'] for r in search_results if r.get('product_id')]
-
-        self.env['product.rag.message'].create({
+        self.env['product.rag.message'].create([{
             'conversation_id': self.id,
             'role': 'user',
             'content': question,
-        })
-        self.env['product.rag.message'].create({
+        }, {
             'conversation_id': self.id,
             'role': 'assistant',
             'content': answer,
             'referenced_product_ids': [(6, 0, referenced_products)] if referenced_products else False,
-        })
+        }])
 
+        if not self._summary_job_pending() \
+                and self._estimate_tokens(self._history_messages()) > HISTORY_TOKEN_BUDGET:
+            self._ollama_enqueue('_job_summarize_history')
         return answer
 
+    def _summary_job_pending(self):
+        """Whether a summary job of this conversation is queued or running."""
+        self.ensure_one()
+        return bool(self.env['ollama.job'].sudo().search_count([
+            ('res_model', '=', self._name),
+            ('res_id', '=', self.id),
+            ('method', '=', '_job_summarize_history'),
+            ('state', 'in', ('pending', 'running')),
+        ], limit=1))
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _estimate_tokens(messages):
+        """Rough token count of ``messages`` (4 characters per token)."""
+        return sum(len(msg.content or '') // 4 + 1 for msg in messages)
+
+    def _history_messages(self):
+        """Latest messages not folded into the summary, oldest first."""
+        self.ensure_one()
+        return self.env['product.rag.message'].search([
+            ('conversation_id', '=', self.id),
+            ('id', '>', self.summary_message_id.id or 0),
+        ], order='id desc', limit=HISTORY_MAX_MESSAGES).sorted('id')
+
+    def _prompt_history(self):
+        """Messages quoted in the prompt: the latest ones fitting in
+        ``HISTORY_TOKEN_BUDGET`` (at least the last one), oldest first.
+
+        Until the queued summary is written, older messages are left out
+        rather than making the prompt grow.
+        """
+        messages = self._history_messages()
+        kept = []
+        tokens = 0
+        for msg in reversed(messages):
+            tokens += self._estimate_tokens(msg)
+            if kept and tokens > HISTORY_TOKEN_BUDGET:
+                break
+            kept.append(msg)
+        return kept[::-1]
+
+    def _job_summarize_history(self):
+        """``ollama.job`` entry point: fold the messages before the last
+        ``HISTORY_KEEP_MESSAGES`` into ``history_summary``."""
+        self.ensure_one()
+        messages = self._history_messages()
+        to_fold = messages[:-HISTORY_KEEP_MESSAGES]
+        if not to_fold or self._estimate_tokens(messages) <= HISTORY_TOKEN_BUDGET:
+            return 0
+
+        parts = []
+        if self.history_summary:
+            parts.append("=== Summary of the earlier conversation ===")
+            parts.append(self.history_summary)
+            parts.append("")
+        parts.append("=== Conversation to add to the summary ===")
+        for msg in to_fold:
+            role_label = "Customer" if msg.role == 'user' else "Assistant"
+            parts.append(f"{role_label}: {msg.content}")
+        parts.append("")
+        parts.append("Write the updated summary of the whole conversation.")
+
+        summary = self._call_ollama_safe(
+            '\n'.join(parts),
+            system_prompt=SUMMARY_SYSTEM_PROMPT,
+            max_tokens=400,
+            temperature=0.2,
+            log_model='product.rag.conversation',
+            log_res_id=self.id,
+        )
+        if not summary:
+            raise UserError(_("The AI returned no summary for conversation %s.")
+                            % (self.session_id or self.id))
+        self.write({
+            'history_summary': summary.strip(),
+            'summary_message_id': to_fold[-1].id,
+        })
+        return len(to_fold)
+
+    # ------------------------------------------------------------------
+    # Streaming (see ollama_base /ollama/stream)
+    # ------------------------------------------------------------------
+    def _ollama_stream_prepare(self, purpose, params):
+        if purpose != 'answer':
+            return super()._ollama_stream_prepare(purpose, params)
+        self.ensure_one()
+        question = (params.get('question') or '').strip()
+        if not question:
+            raise UserError(_("Please ask a question about our products."))
+        prompt, referenced_products = self._prepare_answer(question)
+        return {
+            'prompt': prompt,
+            'system_prompt': SYSTEM_PROMPT,
+            'max_tokens': 1500,
+            'temperature': 0.3,
+            'params': {'question': question, 'product_ids': referenced_products},
+        }
+
+    def _ollama_stream_finish(self, purpose, text, params):
+        if purpose != 'answer':
+            return super()._ollama_stream_finish(purpose, text, params)
+        answer = self._store_exchange(params['question'], text, params.get('product_ids') or [])
+        return {'session_id': self.session_id, 'answer': answer}
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
     def _extract_keywords(self, question):
-        """Extract meaningful search keywords from the user's question."""
-        # Remove common stop words and short words
-        stop_words = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-            'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-            'would', 'could', 'should', 'may', 'might', 'can', 'shall',
-            'it', 'its', 'this', 'that', 'these', 'those', 'i', 'me',
-            'my', 'we', 'our', 'you', 'your', 'he', 'she', 'they',
-            'them', 'what', 'which', 'who', 'whom', 'where', 'when',
-            'why', 'how', 'not', 'no', 'nor', 'but', 'and', 'or',
-            'if', 'then', 'so', 'too', 'very', 'just', 'about',
-            'for', 'with', 'from', 'into', 'of', 'to', 'in', 'on',
-            'at', 'by', 'up', 'out', 'off', 'over', 'under', 'again',
-            'there', 'here', 'all', 'any', 'both', 'each', 'few',
-            'more', 'most', 'some', 'such', 'than', 'also', 'get',
-            'looking', 'need', 'want', 'like', 'find', 'search',
-            'show', 'tell', 'give', 'help', 'please', 'thanks',
-            'something', 'anything', 'thing', 'things',
-        }
-        words = re.split(r'[\s,;.!?\-/]+', question.lower())
-        keywords = [w for w in words if len(w) >= 3 and w not in stop_words]
-        # Return space-separated keywords, or original question if nothing left
-        return ' '.join(keywords) if keywords else question.strip()
+        """Search terms of the user's question: the stems of its words,
+        stop words removed (see ``services.query_terms``)."""
+        return query_terms.analyze(question)
 
     def _build_prompt(self, question, search_results):
         """Build the full prompt with product context and conversation history."""
         parts = []
 
-        # Conversation history (last 5 messages for context)
-        recent_messages = self.message_ids.sorted('create_date')[-5:] if self.message_ids else []
+        # Conversation history: summary of the older messages, then the
+        # latest ones verbatim
+        if self.history_summary:
+            parts.append("=== Summary of the earlier conversation ===")
+            parts.append(self.history_summary)
+            parts.append("")
+        recent_messages = self._prompt_history()
         if recent_messages:
             parts.append("=== Previous conversation ===")
             for msg in recent_messages:
@@ -15,6 +15,7 @@ class RagDashboard(models.TransientModel):
     total_indexed = fields.Integer(string='Indexed Products', readonly=True)
     total_products = fields.Integer(string='Total Products', readonly=True)
     unindexed = fields.Integer(string='Unindexed Products', readonly=True)
+    total_embedded = fields.Integer(string='Embedded Products', readonly=True)
     total_conversations = fields.Integer(string='Conversations', readonly=True)
     total_messages = fields.Integer(string='Total Messages', readonly=True)
     messages_today = fields.Integer(string='Messages Today', readonly=True)
@@ -39,6 +40,7 @@ class RagDashboard(models.TransientModel):
         Message = self.env['product.rag.message']
 
         total_indexed = RagIndex.search_count([])
+        total_embedded = RagIndex.search_count([('embedding_model', '!=', False)])
         total_products = Product.search_count([])
         total_conversations = Conversation.search_count([])
         total_messages = Message.search_count([])
@@ -56,6 +58,7 @@ class RagDashboard(models.TransientModel):
             'total_indexed': total_indexed,
             'total_products': total_products,
             'unindexed': max(0, total_products - total_indexed),
+            'total_embedded': total_embedded,
             'total_conversations': total_conversations,
             'total_messages': total_messages,
             'messages_today': messages_today,
@@ -64,15 +67,16 @@ class RagDashboard(models.TransientModel):
 
     # --- Actions ---
     def action_reindex(self):
-        """Trigger a full catalog reindex."""
+        """Reindex the products modified since the last run."""
         self.ensure_one()
-        self.env['product.rag.index'].reindex_catalog()
+        stats = self.env['product.rag.index'].reindex_catalog()
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': _('Reindex Complete'),
-                'message': _('Product catalog has been reindexed successfully.'),
+                'message': _('Product catalog reindexed: %(created)s new, %(updated)s updated, '
+                             '%(unchanged)s unchanged.') % stats,
                 'type': 'success',
                 'sticky': False,
             }
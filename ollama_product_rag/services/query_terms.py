@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Search terms of a customer question (no ORM).
+
+The question is lower-cased, split into words, stripped of English and
+French stop words, and each word is reduced to a stem by removing its
+inflection suffix: 'chargers', 'charging' and 'charger' all give 'charg'.
+Stems are matched as prefixes (``charg:*``) against the ``simple``
+full-text index of ``product.rag.index``, which stores the words as they
+are, so every inflection of a word reaches the GIN index instead of the
+substring fallback.
+
+The stemmer is deliberately light: it only needs a stem that is a prefix
+of the word's other forms, and a stem slightly too short costs a little
+precision, which the ranking absorbs.
+"""
+import re
+
+STOP_WORDS = frozenset({
+    # English
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'can', 'shall',
+    'it', 'its', 'this', 'that', 'these', 'those', 'i', 'me',
+    'my', 'we', 'our', 'you', 'your', 'he', 'she', 'they',
+    'them', 'what', 'which', 'who', 'whom', 'where', 'when',
+    'why', 'how', 'not', 'no', 'nor', 'but', 'and', 'or',
+    'if', 'then', 'so', 'too', 'very', 'just', 'about',
+    'for', 'with', 'from', 'into', 'of', 'to', 'in', 'on',
+    'at', 'by', 'up', 'out', 'off', 'over', 'under', 'again',
+    'there', 'here', 'all', 'any', 'both', 'each', 'few',
+    'more', 'most', 'some', 'such', 'than', 'also', 'get',
+    'looking', 'need', 'want', 'like', 'find', 'search',
+    'show', 'tell', 'give', 'help', 'please', 'thanks',
+    'something', 'anything', 'thing', 'things', 'one', 'ones',
+    'other', 'others', 'got', 'know', 'much', 'many',
+    # Follow-up words: they point at products already in the context
+    'first', 'second', 'third', 'fourth', 'fifth', 'last', 'previous',
+    'next', 'same', 'another', 'cost', 'costs', 'price', 'prices',
+    'stock', 'available', 'cheaper', 'cheapest', 'better', 'best',
+    'bigger', 'smaller', 'difference', 'compare', 'recommend',
+    # French
+    'le', 'la', 'les', 'un', 'une', 'des', 'du', 'de', 'au', 'aux',
+    'ce', 'cet', 'cette', 'ces', 'mon', 'ma', 'mes', 'ton', 'ta', 'tes',
+    'son', 'sa', 'ses', 'notre', 'nos', 'votre', 'vos', 'leur', 'leurs',
+    'je', 'tu', 'il', 'elle', 'on', 'nous', 'vous', 'ils', 'elles',
+    'est', 'sont', 'suis', 'être', 'avoir', 'ai', 'as', 'avez', 'ont',
+    'et', 'ou', 'mais', 'donc', 'car', 'ni', 'que', 'qui', 'quoi',
+    'quel', 'quelle', 'quels', 'quelles', 'dont', 'où', 'pour', 'par',
+    'avec', 'sans', 'dans', 'sur', 'sous', 'chez', 'entre', 'vers',
+    'pas', 'plus', 'moins', 'très', 'trop', 'aussi', 'comme', 'si',
+    'tout', 'tous', 'toute', 'toutes', 'autre', 'autres', 'même',
+    'cherche', 'recherche', 'voudrais', 'veux', 'besoin', 'faut',
+    'montrer', 'montrez', 'merci', 'bonjour', 'svp', 'chose', 'choses',
+    'combien', 'comment', 'pourquoi', 'quand',
+    'premier', 'première', 'deuxième', 'seconde', 'troisième',
+    'dernier', 'dernière', 'précédent', 'suivant', 'coûte', 'prix',
+    'disponible', 'cher', 'chère', 'meilleur', 'différence',
+})
+
+# Inflection suffixes, longest first; the first one leaving a stem of
+# MIN_STEM characters or more (one more for a single letter other than
+# the plural 's', so 'blue' and 'grey' stay whole) is removed
+SUFFIXES = (
+    'ements', 'ations', 'ement', 'ation', 'ances', 'ences', 'euses',
+    'ings', 'ance', 'ence', 'euse', 'eurs', 'ness', 'ing', 'ies', 'ied',
+    'ers', 'eur', 'ees', 'ées', 'es', 'er', 'ed', 'ly', 'ée',
+    's', 'x', 'é', 'e', 'y',
+)
+MIN_STEM = 3
+# Words kept as they are: the suffix is not an inflection there
+_KEEP_ENDINGS = ('ss', 'us', 'is', 'eed')
+# 'es' is a plural ending after these ('boxes', 'watches'); elsewhere it
+# is the 's' of a word ending in 'e' ('shoes', 'cables')
+_ES_PLURAL_AFTER = ('s', 'x', 'z', 'ch', 'sh')
+# Suffixes doubling the final consonant of the word ('running', 'stopped')
+_UNDOUBLE_AFTER = ('ings', 'ing', 'ers', 'er', 'ed')
+_DOUBLE_KEPT = 'aeiouylsfz'
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def stem(word):
+    """Light suffix-stripping stem of a lower-case word.
+
+    A word and its plural give the same stem ('shoe', 'shoes'), and so do
+    the forms doubling the final consonant ('run', 'running').
+    """
+    if any(char.isdigit() for char in word) or word.endswith(_KEEP_ENDINGS):
+        return word
+    for suffix in SUFFIXES:
+        min_stem = MIN_STEM + 1 if len(suffix) == 1 and suffix != 's' else MIN_STEM
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            base = word[:-len(suffix)]
+            if suffix == 'es' and not base.endswith(_ES_PLURAL_AFTER):
+                return stem(word[:-1])
+            if suffix in _UNDOUBLE_AFTER and len(base) > MIN_STEM \
+                    and base[-1] == base[-2] and base[-1] not in _DOUBLE_KEPT:
+                base = base[:-1]
+            return base
+    return word
+
+
+def analyze(text):
+    """Unique stems of the meaningful words of ``text``, in order.
+
+    Words of fewer than 3 characters are dropped, except the ones with a
+    digit ('4k', 'a5').
+    """
+    terms = []
+    for word in _WORD_RE.findall((text or '').lower()):
+        word = word.strip('_')
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        if len(word) < 3 and not any(char.isdigit() for char in word):
+            continue
+        term = stem(word)
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+def to_tsquery(terms):
+    """Prefix tsquery matching any of ``terms``: 'charg:* | cabl:*'."""
+    return ' | '.join(f'{term}:*' for term in terms if term)
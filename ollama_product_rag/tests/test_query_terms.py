@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ollama_product_rag.services import query_terms
+
+
+class TestQueryTerms(BaseCase):
+
+    def test_stem_inflections(self):
+        for words, expected in (
+            (('charger', 'chargers', 'charging'), 'charg'),
+            (('run', 'running', 'runner'), 'run'),
+            (('stop', 'stopped'), 'stop'),
+            (('shoe', 'shoes'), 'shoe'),
+            (('cable', 'cables'), 'cabl'),
+            (('box', 'boxes'), 'box'),
+            (('dress', 'dresses'), 'dress'),
+            (('roll', 'rolling'), 'roll'),
+        ):
+            for word in words:
+                self.assertEqual(query_terms.stem(word), expected, word)
+
+    def test_stem_keeps_short_and_non_inflected_words(self):
+        for word in ('blue', 'grey', 'glass', 'bus', 'usb3', '4k'):
+            self.assertEqual(query_terms.stem(word), word)
+
+    def test_analyze_drops_stop_words(self):
+        self.assertEqual(
+            query_terms.analyze("I'm looking for running shoes and a USB-C charger"),
+            ['run', 'shoe', 'usb', 'charg'],
+        )
+
+    def test_follow_up_has_no_terms(self):
+        self.assertEqual(query_terms.analyze('How much does the second one cost?'), [])
+        self.assertEqual(query_terms.analyze('Is the first one in stock?'), [])
+        self.assertEqual(query_terms.analyze('Quel est le prix du deuxième ?'), [])
+
+    def test_to_tsquery(self):
+        self.assertEqual(query_terms.to_tsquery(['charg', 'cabl']), 'charg:* | cabl:*')
+        self.assertEqual(query_terms.to_tsquery([]), '')
@@ -19,6 +19,9 @@ Features:
 * Bulk generation across entire catalog
 * One-click apply to website meta fields
 * SEO audit for existing content
+* Change detection: bulk generation skips products whose name, category and description are unchanged
+* Automated SQL checks (lengths, keyword, duplicate titles); only failing products get an AI audit
+* Weekly SEO refresh cron
 * Dashboard with catalog-wide SEO analytics
     """,
     'author': 'Antigravity',
@@ -1,12 +1,31 @@
 # -*- coding: utf-8 -*-
+import hashlib
 import json
 import logging
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+# Deterministic audit thresholds (characters)
+TITLE_MIN, TITLE_MAX = 20, 60
+DESCRIPTION_MIN, DESCRIPTION_MAX = 70, 160
+
+AUDIT_CHECKS = [
+    ('title_missing', 'Meta title missing'),
+    ('title_length', 'Meta title not between 20 and 60 characters'),
+    ('title_duplicate', 'Meta title used by another product'),
+    ('description_missing', 'Meta description missing'),
+    ('description_length', 'Meta description not between 70 and 160 characters'),
+    ('keyword_missing', 'Main keyword absent from meta title and description'),
+    ('no_sale_description', 'No sales description'),
+]
+
+# Fields the SEO metadata is generated from (see _get_seo_inputs)
+SEO_SOURCE_FIELDS = frozenset({'name', 'categ_id', 'description_sale', 'description'})
+
 
 class ProductTemplate(models.Model):
     _inherit = ['product.template', 'ollama.mixin']
@@ -46,25 +65,71 @@ class ProductTemplate(models.Model):
         readonly=True,
         help='Date and time of last AI SEO generation',
     )
+    ai_seo_fingerprint = fields.Char(
+        string='SEO Input Fingerprint',
+        readonly=True, copy=False,
+        help='Hash of the name, category and description the SEO metadata was '
+             'generated from; bulk generation skips products where it is unchanged.',
+    )
+    ai_seo_audit_issues = fields.Text(
+        string='SEO Check Issues',
+        readonly=True, copy=False,
+        help='Problems found by the automated (non-AI) SEO checks.',
+    )
+    ai_seo_audit_date = fields.Datetime(
+        string='Last SEO Audit',
+        readonly=True, copy=False,
+    )
+    ai_seo_audit_fingerprint = fields.Char(
+        string='SEO Audit Fingerprint',
+        readonly=True, copy=False,
+        help='Hash of the data and check issues the last AI audit saw; the '
+             'weekly refresh does not audit the product again while unchanged.',
+    )
+    ai_seo_source_date = fields.Datetime(
+        string='SEO Inputs Changed',
+        readonly=True, copy=False,
+        help='Last change of the name, category or descriptions. Unlike the '
+             'modification date, SEO and audit results do not update it.',
+    )
+
+    def write(self, vals):
+        if SEO_SOURCE_FIELDS.intersection(vals):
+            vals = dict(vals, ai_seo_source_date=fields.Datetime.now())
+        return super().write(vals)
 
     # ------------------------------------------------------------------
     # Generate SEO
     # ------------------------------------------------------------------
-    def action_generate_seo(self):
-        """Generate SEO metadata for the current product using AI."""
+    def action_generate_seo(self, skip_unchanged=False):
+        """Generate SEO metadata for the current product using AI.
+
+        :param skip_unchanged: do nothing when the product already has SEO
+            metadata generated from the same name, category and description
+            (used by the bulk actions)
+        """
         self.ensure_one()
         if not self.name:
             raise UserError(_('Product must have a name before generating SEO.'))
 
+        fingerprint = self._get_seo_fingerprint()
+        if skip_unchanged and self.ai_seo_title and self.ai_seo_fingerprint == fingerprint:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _('SEO Up to Date'),
+                    'message': _("'%s' did not change since its last SEO generation.") % self.name,
+                    'type': 'info',
+                    'sticky': False,
+                },
+            }
+
         config = self._get_ollama_config()
 
         # Build product context
-        category_name = self.categ_id.complete_name if self.categ_id else 'N/A'
-        description = ''
-        if hasattr(self, 'description_sale') and self.description_sale:
-            description = self.description_sale
-        elif hasattr(self, 'description') and self.description:
-            description = self.description
+        category_name, description = self._get_seo_inputs()[1:]
+        category_name = category_name or 'N/A'
 
         prompt = (
             "You are an expert SEO specialist for e-commerce websites. "
@@ -148,6 +213,7 @@ class ProductTemplate(models.Model):
             'ai_seo_score': seo_score,
             'ai_seo_suggestions': suggestions or '',
             'ai_seo_date': fields.Datetime.now(),
+            'ai_seo_fingerprint': fingerprint,
         })
 
         return {
@@ -203,10 +269,27 @@ class ProductTemplate(models.Model):
     # ------------------------------------------------------------------
     # Audit SEO
     # ------------------------------------------------------------------
-    def action_audit_seo(self):
-        """Audit existing SEO data and provide a score with suggestions."""
+    def action_audit_seo(self, skip_unchanged=False):
+        """Audit existing SEO data and provide a score with suggestions.
+
+        :param skip_unchanged: do nothing when the data and check issues
+            are the ones of the last audit (used by the weekly refresh)
+        """
         self.ensure_one()
 
+        audit_fingerprint = self._get_seo_audit_fingerprint()
+        if skip_unchanged and self.ai_seo_audit_fingerprint == audit_fingerprint:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': _('SEO Audit Up to Date'),
+                    'message': _("'%s' did not change since its last SEO audit.") % self.name,
+                    'type': 'info',
+                    'sticky': False,
+                },
+            }
+
         config = self._get_ollama_config()
 
         # Gather current SEO state
@@ -229,7 +312,8 @@ class ProductTemplate(models.Model):
             f"- Current Meta Title: {current_title or 'NOT SET'}\n"
             f"- Current Meta Description: {current_description or 'NOT SET'}\n"
             f"- Has Product Description: {'Yes' if self.description_sale else 'No'}\n"
-            f"- Has Images: {'Yes' if self.image_1920 else 'No'}\n\n"
+            f"- Has Images: {'Yes' if self.image_1920 else 'No'}\n"
+            f"- Automated Checks: {self.ai_seo_audit_issues or 'not run'}\n\n"
             "Respond with a JSON object:\n"
             "{\n"
             '  "seo_score": 45,\n'
@@ -295,7 +379,8 @@ class ProductTemplate(models.Model):
         self.write({
             'ai_seo_score': seo_score,
             'ai_seo_suggestions': suggestions or '',
-            'ai_seo_date': fields.Datetime.now(),
+            'ai_seo_audit_date': fields.Datetime.now(),
+            'ai_seo_audit_fingerprint': audit_fingerprint,
         })
 
         return {
@@ -309,3 +394,159 @@ class ProductTemplate(models.Model):
                 'sticky': False,
             },
         }
+
+    # ------------------------------------------------------------------
+    # Change detection and deterministic audit
+    # ------------------------------------------------------------------
+    def _get_seo_inputs(self):
+        """Return (name, category, description) the SEO is generated from.
+
+        The price is part of the prompt but left out of the fingerprint on
+        purpose: price changes do not warrant new metadata.
+        """
+        self.ensure_one()
+        category_name = self.categ_id.complete_name if self.categ_id else ''
+        description = self.description_sale or self.description or ''
+        return self.name or '', category_name, description
+
+    def _get_seo_fingerprint(self):
+        self.ensure_one()
+        payload = json.dumps(self._get_seo_inputs(), ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _get_seo_audit_fingerprint(self):
+        """Hash of what the AI audit prompt is built from, check issues included."""
+        self.ensure_one()
+        payload = json.dumps([
+            *self._get_seo_inputs(),
+            self.list_price,
+            getattr(self, 'website_meta_title', '') or '',
+            getattr(self, 'website_meta_description', '') or '',
+            bool(self.with_context(bin_size=True).image_1920),
+            self.ai_seo_audit_issues or '',
+        ], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @api.model
+    def _get_seo_generation_candidates(self):
+        """Products without SEO metadata, or whose inputs changed since it
+        was generated.
+
+        SQL narrows the catalog to products whose SEO inputs (or category)
+        changed after the last generation; only those are fingerprinted.
+        ``write_date`` is not used: the audit writes bump it every week.
+        """
+        self.flush_model(['name', 'categ_id', 'ai_seo_title', 'ai_seo_date',
+                          'ai_seo_source_date'])
+        self.env['product.category'].flush_model()
+        self.env.cr.execute(SQL("""
+            SELECT p.id, p.ai_seo_title IS NULL
+              FROM product_template p
+              LEFT JOIN product_category c ON c.id = p.categ_id
+             WHERE p.active AND p.name IS NOT NULL
+               AND (p.ai_seo_title IS NULL OR p.ai_seo_date IS NULL
+                    OR COALESCE(p.ai_seo_source_date, p.create_date) > p.ai_seo_date
+                    OR c.write_date > p.ai_seo_date)
+        """))
+        rows = self.env.cr.fetchall()
+        missing = [pid for pid, no_title in rows if no_title]
+        changed = self.browse([pid for pid, no_title in rows if not no_title]).filtered(
+            lambda p: p.ai_seo_fingerprint != p._get_seo_fingerprint())
+        return self.browse(missing) | changed
+
+    @api.model
+    def _seo_audit_prepass(self, products=None):
+        """Run the deterministic SEO checks in SQL and store their findings.
+
+        Checks meta title and description presence and length, presence of
+        the main keyword (first AI keyword, else first word of the name),
+        meta titles shared by several products, and the sales description.
+
+        :param products: restrict to these products (duplicates are still
+            looked up over the whole catalog)
+        :returns: the products failing at least one check
+        """
+        lang = self.env.lang or 'en_US'
+
+        def translated(column):
+            return SQL("COALESCE(%s->>%s, %s->>'en_US', '')",
+                       SQL.identifier('p', column), lang, SQL.identifier('p', column))
+
+        if products is not None and not products:
+            return self.browse()
+        restrict = SQL("AND checked.id IN %s", tuple(products.ids)) if products else SQL("")
+        self.flush_model()
+        self.env.cr.execute(SQL("""
+            WITH seo AS (
+                SELECT p.id,
+                       %(title)s AS title,
+                       %(description)s AS description,
+                       %(sale_description)s AS sale_description,
+                       lower(COALESCE(NULLIF(trim(split_part(p.ai_seo_keywords, ',', 1)), ''),
+                                      split_part(%(name)s, ' ', 1))) AS keyword
+                  FROM product_template p
+                 WHERE p.active AND p.name IS NOT NULL
+            ), checked AS (
+                SELECT id,
+                       title = '' AS title_missing,
+                       title <> '' AND length(title) NOT BETWEEN %(title_min)s AND %(title_max)s
+                           AS title_length,
+                       title <> '' AND count(*) OVER (PARTITION BY lower(title)) > 1
+                           AS title_duplicate,
+                       description = '' AS description_missing,
+                       description <> '' AND length(description)
+                           NOT BETWEEN %(description_min)s AND %(description_max)s
+                           AS description_length,
+                       length(keyword) >= 3
+                           AND position(keyword IN lower(title || ' ' || description)) = 0
+                           AS keyword_missing,
+                       sale_description = '' AS no_sale_description
+                  FROM seo
+            )
+            SELECT checked.*, p.ai_seo_audit_issues AS stored_issues
+              FROM checked
+              JOIN product_template p ON p.id = checked.id
+             WHERE TRUE %(restrict)s
+        """, title=translated('website_meta_title'),
+            description=translated('website_meta_description'),
+            sale_description=translated('description_sale'),
+            name=translated('name'),
+            title_min=TITLE_MIN, title_max=TITLE_MAX,
+            description_min=DESCRIPTION_MIN, description_max=DESCRIPTION_MAX,
+            restrict=restrict))
+
+        by_issues = {}
+        to_write = {}
+        passing = []
+        for row in self.env.cr.dictfetchall():
+            issues = [label for code, label in AUDIT_CHECKS if row[code]]
+            text = '\n'.join(f'- {i}' for i in issues) or False
+            if issues:
+                by_issues.setdefault(text, []).append(row['id'])
+            else:
+                passing.append(row['id'])
+            if text != (row['stored_issues'] or False):
+                to_write.setdefault(text, []).append(row['id'])
+
+        # Only the products whose findings changed, one write per finding
+        for text, ids in to_write.items():
+            self.browse(ids).write({'ai_seo_audit_issues': text})
+        failing = self.browse([pid for ids in by_issues.values() for pid in ids])
+        _logger.info("SEO checks: %d products pass, %d need an AI audit.",
+                     len(passing), len(failing))
+        return failing
+
+    @api.model
+    def _cron_refresh_seo(self):
+        """Weekly SEO refresh: regenerate changed products, then audit with
+        AI only the products failing the deterministic checks whose data or
+        findings changed since their last audit."""
+        to_generate = self._get_seo_generation_candidates()
+        if to_generate:
+            to_generate._ollama_enqueue('action_generate_seo', params={'skip_unchanged': True})
+        to_audit = (self._seo_audit_prepass() - to_generate).filtered(
+            lambda p: p.ai_seo_audit_fingerprint != p._get_seo_audit_fingerprint())
+        if to_audit:
+            to_audit._ollama_enqueue('action_audit_seo', params={'skip_unchanged': True})
+        _logger.info("SEO refresh: %d generations and %d audits queued.",
+                     len(to_generate), len(to_audit))
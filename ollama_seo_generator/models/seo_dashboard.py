@@ -91,89 +91,42 @@ class SeoGeneratorDashboard(models.TransientModel):
     # Bulk Actions
     # ------------------------------------------------------------------
     def action_generate_all(self):
-        """Generate SEO for all products that do not yet have AI SEO data."""
-        products = self.env['product.template'].search([
-            ('ai_seo_title', '=', False),
-            ('name', '!=', False),
-        ])
+        """Queue SEO generation for products without AI SEO data or whose
+        name, category or description changed since it was generated."""
+        products = self.env['product.template']._get_seo_generation_candidates()
         if not products:
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('Nothing to Generate'),
-                    'message': _('All products already have AI SEO data.'),
+                    'message': _('All products have up-to-date AI SEO data.'),
                     'type': 'info',
                     'sticky': False,
                 },
             }
 
-        success = 0
-        errors = 0
-        for product in products:
-            try:
-                product.action_generate_seo()
-                success += 1
-            except Exception as e:
-                errors += 1
-                _logger.warning(
-                    'SEO generation failed for product %s (ID %s): %s',
-                    product.name, product.id, e,
-                )
-
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Bulk SEO Generation Complete'),
-                'message': _('%d products generated, %d errors.') % (
-                    success, errors),
-                'type': 'success' if not errors else 'warning',
-                'sticky': True,
-            },
-        }
+        jobs = products._ollama_enqueue('action_generate_seo', params={'skip_unchanged': True})
+        return jobs._notify_enqueued(_('Bulk SEO Generation Queued'))
 
     def action_audit_all(self):
-        """Run SEO audit on all products that have a name."""
-        products = self.env['product.template'].search([
-            ('name', '!=', False),
-        ])
+        """Run the automated SEO checks on the catalog and queue an AI audit
+        of the products failing them."""
+        products = self.env['product.template']._seo_audit_prepass()
         if not products:
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
-                    'title': _('No Products'),
-                    'message': _('No products found to audit.'),
-                    'type': 'info',
+                    'title': _('Catalog Audit'),
+                    'message': _('All products pass the automated SEO checks.'),
+                    'type': 'success',
                     'sticky': False,
                 },
             }
 
-        success = 0
-        errors = 0
-        for product in products:
-            try:
-                product.action_audit_seo()
-                success += 1
-            except Exception as e:
-                errors += 1
-                _logger.warning(
-                    'SEO audit failed for product %s (ID %s): %s',
-                    product.name, product.id, e,
-                )
-
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Catalog Audit Complete'),
-                'message': _('%d products audited, %d errors.') % (
-                    success, errors),
-                'type': 'success' if not errors else 'warning',
-                'sticky': True,
-            },
-        }
+        jobs = products._ollama_enqueue('action_audit_seo')
+        return jobs._notify_enqueued(_('Catalog Audit Queued'))
 
     def action_apply_all(self):
         """Apply AI SEO data to website meta fields for all products."""
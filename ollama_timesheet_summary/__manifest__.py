@@ -16,7 +16,8 @@ Features:
 * Smart detection of overtime, underlogging, and anomalies
 * Project-by-project hour breakdown
 * Dashboard with team-wide statistics
-* Weekly cron job for automated generation
+* Weekly cron job for automated generation: hours aggregated in one query,
+  AI summaries generated in parallel background jobs
 * Multi-provider AI support via Ollama AI Base
 
 Requirements:
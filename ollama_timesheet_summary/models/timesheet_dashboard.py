@@ -114,82 +114,28 @@ class TimesheetSummaryDashboard(models.TransientModel):
         today = fields.Date.context_today(self)
         days_since_monday = today.weekday()
         this_monday = today - timedelta(days=days_since_monday)
+        this_sunday = this_monday + timedelta(days=6)
 
-        Summary = self.env['timesheet.ai.summary']
-
-        # Find employees with timesheets this week
-        timesheet_lines = self.env['account.analytic.line'].search([
-            ('date', '>=', this_monday),
-            ('date', '<=', today),
-            ('project_id', '!=', False),
-            ('employee_id', '!=', False),
-        ])
-
-        employee_ids = timesheet_lines.mapped('employee_id').ids
-        if not employee_ids:
+        # Hours are aggregated now; the AI texts are generated in the background
+        summaries = self.env['timesheet.ai.summary']._prepare_week_summaries(
+            this_monday, this_sunday, date_to=today, regenerate_drafts=True,
+        )
+        if not summaries:
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('No Timesheets'),
-                    'message': _('No timesheet entries found for this week.'),
+                    'message': _('No timesheet entries to summarize for this week.'),
                     'type': 'info',
                     'sticky': False,
                 },
             }
 
-        employees = self.env['hr.employee'].browse(employee_ids)
-        created = 0
-        errors = 0
-        this_sunday = this_monday + timedelta(days=6)
-
-        for employee in employees:
-            existing = Summary.search([
-                ('employee_id', '=', employee.id),
-                ('week_start', '=', this_monday),
-            ], limit=1)
-
-            if existing:
-                # Regenerate if in draft
-                if existing.state == 'draft':
-                    try:
-                        existing.action_generate_summary()
-                        created += 1
-                    except Exception as e:
-                        _logger.warning(
-                            "Failed to regenerate for %s: %s",
-                            employee.name, e,
-                        )
-                        errors += 1
-                continue
-
-            try:
-                summary = Summary.create({
-                    'employee_id': employee.id,
-                    'week_start': this_monday,
-                    'week_end': this_sunday,
-                    'state': 'draft',
-                })
-                summary.action_generate_summary()
-                created += 1
-            except Exception as e:
-                _logger.warning(
-                    "Failed to generate for %s: %s", employee.name, e,
-                )
-                errors += 1
-
-        msg_type = 'success' if errors == 0 else 'warning'
-        return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Generation Complete'),
-                'message': _('Generated %d summaries. Errors: %d.') % (
-                    created, errors),
-                'type': msg_type,
-                'sticky': True,
-            },
-        }
+        jobs = summaries._ollama_enqueue(
+            '_job_generate_summary', batch_ref='timesheet-%s' % this_monday,
+        )
+        return jobs._notify_enqueued(_('Summary Generation Queued'))
 
     def action_open_summaries(self):
         """Open the list of all AI timesheet summaries."""
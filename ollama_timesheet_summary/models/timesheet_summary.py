@@ -9,6 +9,10 @@ from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
+# Line descriptions sent to the AI per task, and their maximum length
+MAX_DESCRIPTIONS = 5
+MAX_DESCRIPTION_LENGTH = 200
+
 
 class TimesheetAiSummary(models.Model):
     _name = 'timesheet.ai.summary'
@@ -61,72 +65,152 @@ class TimesheetAiSummary(models.Model):
             week = rec.week_start or ''
             rec.display_name = f"{emp} - {week}"
 
+    # ------------------------------------------------------------------
+    # Timesheet aggregation
+    # ------------------------------------------------------------------
+    @api.model
+    def _aggregate_timesheets(self, date_from, date_to, employee_ids=None):
+        """Hours per employee, project and task over a period, in one
+        grouped query.
+
+        :param employee_ids: restrict to these employees (default: all)
+        :returns: ``{employee_id: (total_hours, breakdown)}`` where
+            ``breakdown`` is ``{project: {'total_hours', 'tasks': [...]}}``
+        """
+        domain = [
+            ('date', '>=', date_from),
+            ('date', '<=', date_to),
+            ('project_id', '!=', False),
+            ('employee_id', '!=', False),
+        ]
+        if employee_ids is not None:
+            domain.append(('employee_id', 'in', list(employee_ids)))
+        groups = self.env['account.analytic.line']._read_group(
+            domain,
+            groupby=['employee_id', 'project_id', 'task_id'],
+            aggregates=['unit_amount:sum', 'name:array_agg'],
+            order='employee_id, project_id, unit_amount:sum desc',
+        )
+        result = {}
+        for employee, project, task, hours, descriptions in groups:
+            total, breakdown = result.get(employee.id, (0.0, {}))
+            project_data = breakdown.setdefault(
+                project.name or _('Unknown Project'), {'total_hours': 0.0, 'tasks': []})
+            hours = hours or 0.0
+            project_data['total_hours'] = round(project_data['total_hours'] + hours, 2)
+            project_data['tasks'].append({
+                'name': task.name if task else _('No Task'),
+                'hours': round(hours, 2),
+                'descriptions': self._unique_descriptions(descriptions),
+            })
+            result[employee.id] = (total + hours, breakdown)
+        return result
+
+    @staticmethod
+    def _unique_descriptions(descriptions):
+        """Distinct, non-empty line descriptions of a task (prompt-sized)."""
+        unique = []
+        for description in descriptions or ():
+            description = (description or '').strip()
+            if description and description != '/' and description not in unique:
+                unique.append(description[:MAX_DESCRIPTION_LENGTH])
+        return unique[:MAX_DESCRIPTIONS]
+
+    @api.model
+    def _prepare_week_summaries(self, week_start, week_end, date_to=None,
+                                regenerate_drafts=False):
+        """Create the summaries of a week, with their hours already
+        aggregated, for every employee who logged time.
+
+        :param date_to: last day of timesheets to include (default: week end)
+        :param regenerate_drafts: also refresh and return existing drafts
+        :returns: the summaries whose AI text must be generated
+        """
+        data = self._aggregate_timesheets(week_start, date_to or week_end)
+        if not data:
+            return self.browse()
+        existing = self.search([
+            ('employee_id', 'in', list(data)),
+            ('week_start', '=', week_start),
+        ])
+        existing_employees = set(existing.employee_id.ids)
+        summaries = self.create([
+            dict(self._breakdown_vals(*data[employee_id]),
+                 employee_id=employee_id, week_start=week_start,
+                 week_end=week_end, state='draft')
+            for employee_id in data if employee_id not in existing_employees
+        ])
+        if regenerate_drafts:
+            for summary in existing.filtered(lambda s: s.state == 'draft'):
+                summary.write(self._breakdown_vals(*data[summary.employee_id.id]))
+                summaries |= summary
+        return summaries
+
+    @api.model
+    def _breakdown_vals(self, total, breakdown):
+        return {
+            'total_hours': round(total, 2),
+            'project_breakdown': json.dumps(breakdown, indent=2, ensure_ascii=False),
+        }
+
     # ------------------------------------------------------------------
     # Generate AI Summary
     # ------------------------------------------------------------------
     def action_generate_summary(self):
-        """Fetch timesheets for the employee/week and generate AI summary."""
+        """Aggregate timesheets for the employee/week and generate AI summary."""
+        weeks = defaultdict(lambda: self.browse())
         for rec in self:
-            # Fetch analytic lines (timesheets) for this employee and week
-            lines = self.env['account.analytic.line'].search([
-                ('employee_id', '=', rec.employee_id.id),
-                ('date', '>=', rec.week_start),
-                ('date', '<=', rec.week_end),
-                ('project_id', '!=', False),
-            ])
-
-            if not lines:
-                rec.write({
-                    'total_hours': 0.0,
-                    'project_breakdown': _('No timesheet entries found.'),
-                    'ai_summary': '<p>%s</p>' % _('No timesheet entries for this week.'),
-                    'ai_highlights': '',
-                    'ai_concerns': _('No timesheets logged this week.'),
-                    'state': 'generated',
-                })
-                continue
-
-            # Build project breakdown
-            breakdown = defaultdict(lambda: {'total_hours': 0.0, 'tasks': []})
-            total = 0.0
-
-            for line in lines:
-                project_name = line.project_id.name or _('Unknown Project')
-                hours = line.unit_amount or 0.0
-                task_name = line.task_id.name if line.task_id else _('No Task')
-                description = line.name or ''
-
-                breakdown[project_name]['total_hours'] += hours
-                breakdown[project_name]['tasks'].append({
-                    'name': task_name,
-                    'hours': round(hours, 2),
-                    'description': description,
-                })
-                total += hours
-
-            # Convert to serializable dict
-            breakdown_dict = {}
-            for proj, data in breakdown.items():
-                breakdown_dict[proj] = {
-                    'total_hours': round(data['total_hours'], 2),
-                    'tasks': data['tasks'],
-                }
-
-            breakdown_json = json.dumps(breakdown_dict, indent=2, ensure_ascii=False)
-
-            # Build the AI prompt
-            employee_name = rec.employee_id.name
-            week_start_str = fields.Date.to_string(rec.week_start)
-            week_end_str = fields.Date.to_string(rec.week_end)
-
-            system_prompt = (
-                "You are an expert HR assistant that analyzes employee timesheets. "
-                "You produce clear, concise weekly summaries in JSON format. "
-                "Be professional and constructive. Identify achievements and "
-                "potential issues (overtime, underlogging, scattered focus)."
-            )
-
-            prompt = f"""Analyze the following timesheet data and produce a JSON response.
+            weeks[(rec.week_start, rec.week_end)] |= rec
+        for (week_start, week_end), recs in weeks.items():
+            data = self._aggregate_timesheets(
+                week_start, week_end, employee_ids=recs.employee_id.ids)
+            for rec in recs:
+                total, breakdown = data.get(rec.employee_id.id, (0.0, {}))
+                rec._generate_summary(total, breakdown)
+        return True
+
+    def _job_generate_summary(self):
+        """``ollama.job`` entry point: generate the AI text from the hours
+        aggregated when the summary was prepared."""
+        self.ensure_one()
+        try:
+            breakdown = json.loads(self.project_breakdown or '')
+        except ValueError:
+            breakdown = None
+        if not isinstance(breakdown, dict):
+            return self.action_generate_summary()
+        self._generate_summary(self.total_hours, breakdown)
+        return self.total_hours
+
+    def _generate_summary(self, total, breakdown):
+        """Ask the AI to summarize one week of aggregated hours."""
+        self.ensure_one()
+        if not breakdown:
+            self.write({
+                'total_hours': 0.0,
+                'project_breakdown': _('No timesheet entries found.'),
+                'ai_summary': '<p>%s</p>' % _('No timesheet entries for this week.'),
+                'ai_highlights': '',
+                'ai_concerns': _('No timesheets logged this week.'),
+                'state': 'generated',
+            })
+            return
+
+        breakdown_json = json.dumps(breakdown, indent=2, ensure_ascii=False)
+
+        # Build the AI prompt
+        employee_name = self.employee_id.name
+        week_start_str = fields.Date.to_string(self.week_start)
+        week_end_str = fields.Date.to_string(self.week_end)
+
+        system_prompt = (
+            "You are an expert HR assistant that analyzes employee timesheets. "
+            "You produce clear, concise weekly summaries in JSON format. "
+            "Be professional and constructive. Identify achievements and "
+            "potential issues (overtime, underlogging, scattered focus)."
+        )
+
+        prompt = f"""Analyze the following timesheet data and produce a JSON response.
 
 Employee: {employee_name}
 Week: {week_start_str} to {week_end_str}
@@ -147,50 +231,48 @@ If total hours exceed 45, flag overtime.
 If the employee worked on more than 5 projects, note scattered focus.
 Respond ONLY with the JSON object, no additional text."""
 
-            # Call AI via the mixin
-            response = rec._call_ollama_safe(
-                prompt,
-                system_prompt=system_prompt,
-                max_tokens=1500,
-                temperature=0.3,
-                log_model=self._name,
-                log_res_id=rec.id,
-            )
-
-            # Parse the AI response
-            parsed = self._parse_json_response(response)
-
-            if parsed and isinstance(parsed, dict):
-                summary_text = parsed.get('summary', '')
-                highlights_list = parsed.get('highlights', [])
-                concerns_list = parsed.get('concerns', [])
-
-                # Format summary as HTML
-                ai_summary_html = '<p>%s</p>' % summary_text if summary_text else ''
-
-                # Format highlights and concerns as text
-                highlights_text = '\n'.join(
-                    f"- {h}" for h in highlights_list
-                ) if highlights_list else ''
-                concerns_text = '\n'.join(
-                    f"- {c}" for c in concerns_list
-                ) if concerns_list else ''
-            else:
-                # Fallback: use raw response
-                ai_summary_html = '<p>%s</p>' % (response or _('AI response could not be parsed.'))
-                highlights_text = ''
-                concerns_text = ''
-
-            rec.write({
-                'total_hours': round(total, 2),
-                'project_breakdown': breakdown_json,
-                'ai_summary': ai_summary_html,
-                'ai_highlights': highlights_text,
-                'ai_concerns': concerns_text,
-                'state': 'generated',
-            })
+        # Call AI via the mixin
+        response = self._call_ollama_safe(
+            prompt,
+            system_prompt=system_prompt,
+            max_tokens=1500,
+            temperature=0.3,
+            log_model=self._name,
+            log_res_id=self.id,
+        )
 
-        return True
+        # Parse the AI response
+        parsed = self._parse_json_response(response)
+
+        if parsed and isinstance(parsed, dict):
+            summary_text = parsed.get('summary', '')
+            highlights_list = parsed.get('highlights', [])
+            concerns_list = parsed.get('concerns', [])
+
+            # Format summary as HTML
+            ai_summary_html = '<p>%s</p>' % summary_text if summary_text else ''
+
+            # Format highlights and concerns as text
+            highlights_text = '\n'.join(
+                f"- {h}" for h in highlights_list
+            ) if highlights_list else ''
+            concerns_text = '\n'.join(
+                f"- {c}" for c in concerns_list
+            ) if concerns_list else ''
+        else:
+            # Fallback: use raw response
+            ai_summary_html = '<p>%s</p>' % (response or _('AI response could not be parsed.'))
+            highlights_text = ''
+            concerns_text = ''
+
+        self.write({
+            'total_hours': round(total, 2),
+            'project_breakdown': breakdown_json,
+            'ai_summary': ai_summary_html,
+            'ai_highlights': highlights_text,
+            'ai_concerns': concerns_text,
+            'state': 'generated',
+        })
 
     # ------------------------------------------------------------------
     # Send Summary
@@ -246,8 +328,12 @@ Respond ONLY with the JSON object, no additional text."""
     def generate_weekly_summaries(self):
         """Generate weekly summaries for all active employees with timesheets.
 
-        Called by the weekly cron job. Creates summary records for the
-        previous week (Monday to Sunday) for each employee that logged time.
+        Called by the weekly cron job. Aggregates the previous week (Monday
+        to Sunday) in one grouped query, creates one summary per employee
+        that logged time with its hours filled in, and queues the AI texts
+        as ``ollama.job`` records: they run in the job runner's bounded
+        thread pool, each committed on its own, so the cron itself only
+        costs a few queries whatever the number of employees.
         """
         today = fields.Date.context_today(self)
         # Calculate previous week: Monday to Sunday
@@ -261,55 +347,17 @@ Respond ONLY with the JSON object, no additional text."""
             last_monday, last_sunday,
         )
 
-        # Find all employees who logged time last week
-        timesheet_lines = self.env['account.analytic.line'].search([
-            ('date', '>=', last_monday),
-            ('date', '<=', last_sunday),
-            ('project_id', '!=', False),
-            ('employee_id', '!=', False),
-        ])
-
-        employee_ids = timesheet_lines.mapped('employee_id').ids
-        if not employee_ids:
-            _logger.info("No timesheet entries found for the previous week.")
+        summaries = self._prepare_week_summaries(last_monday, last_sunday)
+        if not summaries:
+            _logger.info("No new timesheet summaries for the previous week.")
             return True
 
-        employees = self.env['hr.employee'].browse(employee_ids)
-        created = 0
-        errors = 0
-
-        for employee in employees:
-            # Check if summary already exists
-            existing = self.search([
-                ('employee_id', '=', employee.id),
-                ('week_start', '=', last_monday),
-            ], limit=1)
-
-            if existing:
-                _logger.info(
-                    "Summary already exists for %s week %s, skipping.",
-                    employee.name, last_monday,
-                )
-                continue
-
-            try:
-                summary = self.create({
-                    'employee_id': employee.id,
-                    'week_start': last_monday,
-                    'week_end': last_sunday,
-                    'state': 'draft',
-                })
-                summary.action_generate_summary()
-                created += 1
-            except Exception as e:
-                _logger.error(
-                    "Failed to generate summary for %s: %s",
-                    employee.name, e,
-                )
-                errors += 1
-
+        # AI generation runs in the background job queue
+        summaries._ollama_enqueue(
+            '_job_generate_summary', batch_ref='timesheet-%s' % last_monday,
+        )
         _logger.info(
-            "Weekly summary generation complete. Created: %d, Errors: %d",
-            created, errors,
+            "Weekly summaries: %d created and queued for AI generation.",
+            len(summaries),
         )
         return True
@@ -6,6 +6,9 @@ from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
+# Syncs in which an order may fail before the cursor moves past it
+ORDER_MAX_ATTEMPTS = 3
+
 
 class PrestaShopInstance(models.Model):
     _name = 'prestashop.instance'
@@ -19,7 +22,27 @@ class PrestaShopInstance(models.Model):
     company_id = fields.Many2one('res.company', string='Company', default=lambda self: self.env.company)
     last_sync_date = fields.Datetime(string='Last Sync Date', readonly=True)
     sync_interval = fields.Integer(string='Sync Interval (min)', default=5, help="Auto-sync interval in minutes. Set to 0 to disable auto-sync.")
-    order_limit = fields.Integer(string='Orders to Fetch', default=50, help="Number of recent orders to fetch per sync.")
+    order_limit = fields.Integer(
+        string='Orders to Fetch', default=50,
+        help="Orders fetched per API page: the number of recent orders of the "
+             "first sync, then the page size of incremental syncs.",
+    )
+    order_max_per_sync = fields.Integer(
+        string='Max Orders per Sync', default=500,
+        help="Incremental syncs stop after this many orders; the next sync "
+             "continues from there. 0 = no limit.",
+    )
+    order_sync_cursor = fields.Char(
+        string='Order Sync Cursor', readonly=True, copy=False,
+        help="PrestaShop date_upd of the most recently synced order. Only orders "
+             "updated since this date are fetched. Empty = fetch the last orders.",
+    )
+    order_sync_failures = fields.Json(
+        string='Failed Orders', readonly=True, copy=False,
+        help="PrestaShop orders that could not be imported: "
+             "{order id: [failed attempts, date_upd]}. An order is retried by the "
+             "next syncs, then skipped after %d attempts." % ORDER_MAX_ATTEMPTS,
+    )
     order_ids = fields.One2many('sale.order', 'prestashop_instance_id', string='Synchronized Orders')
     order_count = fields.Integer(string='Order Count', compute='_compute_order_count')
 
@@ -93,6 +116,39 @@ class PrestaShopInstance(models.Model):
             raise UserError(_("Invalid API response (not JSON). URL: %s\nResponse: %s") % (
                 url, response.text[:300]))
 
+    def _api_get_cached(self, cache, resource, singular, resource_id):
+        """_api_get for a single resource, memoized in a per-run cache dict."""
+        bucket = cache.setdefault(resource, {})
+        key = str(resource_id)
+        if key not in bucket:
+            data = self._api_get(resource, key)
+            bucket[key] = data.get(singular, {}) or {}
+        return bucket[key]
+
+    def _api_prefetch(self, cache, resource, resource_ids):
+        """Load several resources in one list call (filter[id]=[1|2|3]).
+
+        Fills the same cache as _api_get_cached. Failures are ignored;
+        missing entries are then fetched one by one.
+        """
+        bucket = cache.setdefault(resource, {})
+        missing = sorted({str(r) for r in resource_ids if r and str(r) != '0'} - set(bucket))
+        if not missing:
+            return
+        try:
+            data = self._api_get(resource, params={
+                'display': 'full',
+                'filter[id]': '[%s]' % '|'.join(missing),
+            })
+            items = data.get(resource, [])
+            if isinstance(items, dict):
+                items = [items]
+            for item in items:
+                if isinstance(item, dict) and item.get('id'):
+                    bucket[str(item['id'])] = item
+        except Exception as e:
+            _logger.warning("Prefetch of %s failed: %s", resource, str(e))
+
     def action_check_permissions(self):
         """Check which resources are available on the PrestaShop API"""
         self.ensure_one()
@@ -118,9 +174,10 @@ class PrestaShopInstance(models.Model):
 
     # ---- Customer & Address sync ----
 
-    def _find_or_create_customer(self, customer_id):
+    def _find_or_create_customer(self, customer_id, cache=None):
         """Find or create customer from PrestaShop with full details"""
         self.ensure_one()
+        cache = {} if cache is None else cache
         try:
             partner = self.env['res.partner'].search([
                 ('comment', 'ilike', f'PrestaShop ID: {customer_id}')
@@ -128,8 +185,7 @@ class PrestaShopInstance(models.Model):
             if partner:
                 return partner
 
-            data = self._api_get('customers', customer_id)
-            customer = data.get('customer', {})
+            customer = self._api_get_cached(cache, 'customers', 'customer', customer_id)
 
             firstname = customer.get('firstname', '')
             lastname = customer.get('lastname', '')
@@ -190,17 +246,17 @@ class PrestaShopInstance(models.Model):
             _logger.error("Error creating customer %s: %s", customer_id, str(e))
             return None
 
-    def _find_or_create_address(self, address_id, parent_partner, address_type):
+    def _find_or_create_address(self, address_id, parent_partner, address_type, cache=None):
         """Fetch address from PrestaShop and create/find partner address.
         address_type: 'invoice' or 'delivery'
         """
         self.ensure_one()
+        cache = {} if cache is None else cache
         try:
             if not address_id or str(address_id) == '0':
                 return parent_partner
 
-            data = self._api_get('addresses', str(address_id))
-            addr = data.get('address', {})
+            addr = self._api_get_cached(cache, 'addresses', 'address', address_id)
 
             firstname = addr.get('firstname', '')
             lastname = addr.get('lastname', '')
@@ -218,8 +274,9 @@ class PrestaShopInstance(models.Model):
             country_id_ps = str(addr.get('id_country', ''))
             if country_id_ps and country_id_ps != '0':
                 try:
-                    country_data = self._api_get('countries', country_id_ps)
-                    iso_code = country_data.get('country', {}).get('iso_code', '')
+                    iso_code = self._api_get_cached(
+                        cache, 'countries', 'country', country_id_ps,
+                    ).get('iso_code', '')
                     if iso_code:
                         country = self.env['res.country'].search([
                             ('code', '=', iso_code.upper())
@@ -232,8 +289,9 @@ class PrestaShopInstance(models.Model):
             state_id_ps = str(addr.get('id_state', ''))
             if state_id_ps and state_id_ps != '0':
                 try:
-                    state_data = self._api_get('states', state_id_ps)
-                    state_iso = state_data.get('state', {}).get('iso_code', '')
+                    state_iso = self._api_get_cached(
+                        cache, 'states', 'state', state_id_ps,
+                    ).get('iso_code', '')
                     if state_iso and country:
                         state = self.env['res.country.state'].search([
                             ('code', '=', state_iso),
@@ -350,29 +408,26 @@ class PrestaShopInstance(models.Model):
 
     # ---- Carrier & Status sync ----
 
-    def _get_carrier_name(self, carrier_id):
+    def _get_carrier_name(self, carrier_id, cache=None):
         """Fetch carrier name from PrestaShop"""
+        cache = {} if cache is None else cache
         try:
             if not carrier_id or str(carrier_id) == '0':
                 return ''
-            data = self._api_get('carriers', str(carrier_id))
-            carrier = data.get('carrier', {})
+            carrier = self._api_get_cached(cache, 'carriers', 'carrier', carrier_id)
             return carrier.get('name', '') or ''
         except Exception:
             return ''
 
-    def _get_order_status_name(self, status_id):
+    def _get_order_status_name(self, status_id, cache=None):
         """Fetch order status name from PrestaShop"""
+        cache = {} if cache is None else cache
         try:
             if not status_id or str(status_id) == '0':
                 return ''
-            data = self._api_get('order_histories', params={
-                'filter[id_order_state]': str(status_id),
-            })
-            # Try direct order_states endpoint
+            # Direct order_states endpoint
             try:
-                data = self._api_get('order_states', str(status_id))
-                state = data.get('order_state', {})
+                state = self._api_get_cached(cache, 'order_states', 'order_state', status_id)
                 name = state.get('name', '')
                 if isinstance(name, dict):
                     return name.get('1', '') or name.get(list(name.keys())[0], '') if name else ''
@@ -382,17 +437,16 @@ class PrestaShopInstance(models.Model):
         except Exception:
             return ''
 
-    def _get_delivery_country(self, address_id):
+    def _get_delivery_country(self, address_id, cache=None):
         """Get delivery country name from address"""
+        cache = {} if cache is None else cache
         try:
             if not address_id or str(address_id) == '0':
                 return ''
-            data = self._api_get('addresses', str(address_id))
-            addr = data.get('address', {})
+            addr = self._api_get_cached(cache, 'addresses', 'address', address_id)
             country_id_ps = str(addr.get('id_country', ''))
             if country_id_ps and country_id_ps != '0':
-                country_data = self._api_get('countries', country_id_ps)
-                country = country_data.get('country', {})
+                country = self._api_get_cached(cache, 'countries', 'country', country_id_ps)
                 name = country.get('name', '')
                 if isinstance(name, dict):
                     return name.get('1', '') or name.get(list(name.keys())[0], '') if name else ''
@@ -410,23 +464,250 @@ class PrestaShopInstance(models.Model):
 
     # ---- Order sync ----
 
-    def action_sync_orders(self):
-        """Synchronize orders from PrestaShop (last 50 orders)"""
-        self.ensure_one()
+    def _fetch_orders_page(self, offset, page_size):
+        """Fetch one page of orders, incrementally when a cursor is set.
 
-        try:
-            limit = self.order_limit or 50
-            data = self._api_get('orders', params={
+        With a cursor: orders whose date_upd >= cursor, oldest first.
+        Without: the last ``order_limit`` orders (initial sync).
+        """
+        self.ensure_one()
+        if self.order_sync_cursor:
+            params = {
+                'display': 'full',
+                'date': '1',
+                'filter[date_upd]': '[%s,9999-12-31 23:59:59]' % self.order_sync_cursor,
+                'sort': '[date_upd_ASC,id_ASC]',
+                'limit': '%d,%d' % (offset, page_size),
+            }
+        else:
+            params = {
                 'display': 'full',
-                'limit': limit,
+                'limit': page_size,
                 'sort': '[id_DESC]',
+            }
+        data = self._api_get('orders', params=params)
+        orders = data.get('orders', []) if isinstance(data, dict) else []
+        if isinstance(orders, dict):
+            orders = [orders]
+        return orders
+
+    def _import_ps_order(self, order, cache):
+        """Create a sale.order from a PrestaShop order dict (display=full)."""
+        self.ensure_one()
+        order_id = str(order.get('id', ''))
+        order_reference = order.get('reference', f'PS-{order_id}')
+        customer_id = str(order.get('id_customer', ''))
+        date_add = order.get('date_add', '')
+        id_address_delivery = str(order.get('id_address_delivery', ''))
+        id_address_invoice = str(order.get('id_address_invoice', ''))
+        id_carrier = str(order.get('id_carrier', ''))
+        current_state = str(order.get('current_state', ''))
+        payment_method = order.get('payment', '')
+        total_shipping = float(order.get('total_shipping_tax_excl', 0) or order.get('total_shipping', 0) or 0)
+
+        # Check if new customer before creating
+        is_new = self._is_new_customer(customer_id)
+
+        # Find or create customer
+        partner = self._find_or_create_customer(customer_id, cache)
+        if not partner:
+            _logger.warning("Could not create customer for order %s", order_id)
+            return None
+
+        # Find or create addresses
+        invoice_partner = self._find_or_create_address(id_address_invoice, partner, 'invoice', cache)
+        delivery_partner = self._find_or_create_address(id_address_delivery, partner, 'delivery', cache)
+
+        # Get carrier name and order status
+        carrier_name = self._get_carrier_name(id_carrier, cache)
+        status_name = self._get_order_status_name(current_state, cache)
+        delivery_country = self._get_delivery_country(id_address_delivery, cache)
+
+        sale_order = self.env['sale.order'].create({
+            'partner_id': partner.id,
+            'partner_invoice_id': invoice_partner.id,
+            'partner_shipping_id': delivery_partner.id,
+            'date_order': date_add,
+            'warehouse_id': self.warehouse_id.id,
+            'company_id': self.company_id.id,
+            'prestashop_instance_id': self.id,
+            'prestashop_order_id': order_id,
+            'prestashop_reference': order_reference,
+            'prestashop_source': 'prestashop',
+            'prestashop_carrier': carrier_name,
+            'prestashop_payment': payment_method,
+            'prestashop_status': status_name,
+            'prestashop_delivery_country': delivery_country,
+            'prestashop_new_customer': is_new,
+            'origin': order_reference,
+        })
+
+        # Process order lines from associations
+        associations = order.get('associations', {})
+        order_rows = associations.get('order_rows', [])
+        if isinstance(order_rows, dict):
+            order_rows = [order_rows]
+
+        for row in order_rows:
+            product_id = str(row.get('product_id', ''))
+            product_name = row.get('product_name', 'Unknown Product')
+            product_reference = row.get('product_reference', '')
+            quantity = int(row.get('product_quantity', 1))
+            unit_price = float(row.get('product_price', 0))
+            ecotax = float(row.get('product_ean13_ecotax', 0) or row.get('ecotax', 0) or 0)
+
+            product = self._find_or_create_product(product_id, product_name, product_reference)
+
+            self.env['sale.order.line'].create({
+                'order_id': sale_order.id,
+                'product_id': product.id,
+                'name': product_name,
+                'product_uom_qty': quantity,
+                'price_unit': unit_price,
+                'prestashop_ecotax': ecotax,
             })
 
-            orders = data.get('orders', [])
-            if isinstance(orders, dict):
-                orders = [orders]
+        # Add shipping cost line if > 0
+        if total_shipping > 0:
+            shipping_product = self._get_shipping_product()
+            self.env['sale.order.line'].create({
+                'order_id': sale_order.id,
+                'product_id': shipping_product.id,
+                'name': f'Frais de port - {carrier_name}' if carrier_name else 'Frais de port',
+                'product_uom_qty': 1,
+                'price_unit': total_shipping,
+            })
 
-            if not orders:
+        # Add eco-tax informational line if total eco-tax > 0
+        total_ecotax = sum(
+            float(row.get('product_ean13_ecotax', 0) or row.get('ecotax', 0) or 0)
+            * int(row.get('product_quantity', 1))
+            for row in order_rows
+        )
+        if total_ecotax > 0:
+            ecotax_product = self._get_ecotax_product()
+            self.env['sale.order.line'].create({
+                'order_id': sale_order.id,
+                'product_id': ecotax_product.id,
+                'name': 'Eco-taxe (incluse dans les prix)',
+                'product_uom_qty': 1,
+                'price_unit': total_ecotax,
+                'tax_id': [(5, 0, 0)],
+            })
+
+        _logger.info("Imported PrestaShop order %s as %s", order_id, sale_order.name)
+        return sale_order
+
+    def action_sync_orders(self):
+        """Synchronize new/updated orders from PrestaShop.
+
+        The first run imports the last ``order_limit`` orders; later runs
+        page through orders updated since ``order_sync_cursor``, at most
+        ``order_max_per_sync`` of them. Existing orders are resolved with
+        one query per page, and customers, addresses, carriers, order
+        states and countries are cached for the run.
+
+        An order that cannot be imported (e.g. its customer was deleted in
+        PrestaShop) does not stop the sync: the other orders are imported,
+        and the cursor stays on the failed order so the next sync retries
+        it, up to ``ORDER_MAX_ATTEMPTS`` times. The cursor then moves past
+        it and it is reported as skipped (see ``order_sync_failures``).
+        """
+        self.ensure_one()
+
+        try:
+            page_size = self.order_limit or 50
+            max_orders = self.order_max_per_sync
+            incremental = bool(self.order_sync_cursor)
+            cache = {}
+            cursor = self.order_sync_cursor or ''
+            failures = dict(self.order_sync_failures or {})
+            imported_count = 0
+            skipped_count = 0
+            ignored_count = 0
+            fetched = 0
+            offset = 0
+            retried = []        # failed orders the next sync retries
+            given_up = []       # failed orders skipped from now on
+            hold = None         # date_upd of the first order to retry
+
+            while True:
+                orders = self._fetch_orders_page(offset, page_size)
+                if not orders:
+                    break
+                fetched += len(orders)
+
+                order_ids = [str(o.get('id', '')) for o in orders if o.get('id')]
+                existing = {
+                    so.prestashop_order_id: so
+                    for so in self.env['sale.order'].search([
+                        ('prestashop_order_id', 'in', order_ids),
+                        ('prestashop_instance_id', '=', self.id),
+                    ])
+                }
+                new_orders = [
+                    o for o in orders if str(o.get('id', '')) not in existing
+                    and (failures.get(str(o.get('id', ''))) or [0])[0] < ORDER_MAX_ATTEMPTS
+                ]
+                self._api_prefetch(cache, 'customers', [o.get('id_customer') for o in new_orders])
+                self._api_prefetch(cache, 'addresses', [
+                    addr_id for o in new_orders
+                    for addr_id in (o.get('id_address_delivery'), o.get('id_address_invoice'))
+                ])
+
+                for order in orders:
+                    order_id = str(order.get('id', ''))
+                    date_upd = order.get('date_upd', '') or ''
+
+                    sale_order = existing.get(order_id)
+                    attempts = (failures.get(order_id) or [0])[0]
+                    if sale_order:
+                        # Refresh the PS status of orders updated since last run
+                        status_name = self._get_order_status_name(
+                            str(order.get('current_state', '')), cache,
+                        )
+                        if status_name and sale_order.prestashop_status != status_name:
+                            sale_order.prestashop_status = status_name
+                        skipped_count += 1
+                    elif attempts >= ORDER_MAX_ATTEMPTS:
+                        # Given up by a previous sync
+                        ignored_count += 1
+                    else:
+                        try:
+                            with self.env.cr.savepoint():
+                                sale_order = self._import_ps_order(order, cache)
+                        except Exception as e:
+                            _logger.error("PrestaShop order %s could not be imported: %s",
+                                          order_id, e)
+                            sale_order = None
+                        if sale_order:
+                            failures.pop(order_id, None)
+                            imported_count += 1
+                        else:
+                            attempts += 1
+                            failures[order_id] = [attempts, date_upd]
+                            if attempts < ORDER_MAX_ATTEMPTS:
+                                retried.append(order_id)
+                                # The cursor filter is inclusive: staying on
+                                # this order makes the next sync fetch it again
+                                if date_upd and (hold is None or date_upd < hold):
+                                    hold = date_upd
+                            else:
+                                _logger.warning(
+                                    "PrestaShop order %s skipped after %d failed attempts.",
+                                    order_id, attempts)
+                                given_up.append(order_id)
+                    if date_upd > cursor:
+                        cursor = date_upd
+
+                if not incremental or len(orders) < page_size:
+                    break
+                if max_orders and fetched >= max_orders:
+                    _logger.info("Order sync: %d orders fetched, continuing next run.", fetched)
+                    break
+                offset += page_size
+
+            if not fetched:
                 return {
                     'type': 'ir.actions.client',
                     'tag': 'display_notification',
@@ -438,134 +719,38 @@ class PrestaShopInstance(models.Model):
                     }
                 }
 
-            imported_count = 0
-            skipped_count = 0
-
-            for order in orders:
-                order_id = str(order.get('id', ''))
-
-                existing = self.env['sale.order'].search([
-                    ('prestashop_order_id', '=', order_id),
-                    ('prestashop_instance_id', '=', self.id)
-                ], limit=1)
-
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                order_reference = order.get('reference', f'PS-{order_id}')
-                customer_id = str(order.get('id_customer', ''))
-                date_add = order.get('date_add', '')
-                id_address_delivery = str(order.get('id_address_delivery', ''))
-                id_address_invoice = str(order.get('id_address_invoice', ''))
-                id_carrier = str(order.get('id_carrier', ''))
-                current_state = str(order.get('current_state', ''))
-                payment_method = order.get('payment', '')
-                total_shipping = float(order.get('total_shipping_tax_excl', 0) or order.get('total_shipping', 0) or 0)
-
-                # Check if new customer before creating
-                is_new = self._is_new_customer(customer_id)
-
-                # Find or create customer
-                partner = self._find_or_create_customer(customer_id)
-                if not partner:
-                    _logger.warning("Could not create customer for order %s", order_id)
-                    continue
-
-                # Find or create addresses
-                invoice_partner = self._find_or_create_address(id_address_invoice, partner, 'invoice')
-                delivery_partner = self._find_or_create_address(id_address_delivery, partner, 'delivery')
-
-                # Get carrier name and order status
-                carrier_name = self._get_carrier_name(id_carrier)
-                status_name = self._get_order_status_name(current_state)
-                delivery_country = self._get_delivery_country(id_address_delivery)
-
-                sale_order = self.env['sale.order'].create({
-                    'partner_id': partner.id,
-                    'partner_invoice_id': invoice_partner.id,
-                    'partner_shipping_id': delivery_partner.id,
-                    'date_order': date_add,
-                    'warehouse_id': self.warehouse_id.id,
-                    'company_id': self.company_id.id,
-                    'prestashop_instance_id': self.id,
-                    'prestashop_order_id': order_id,
-                    'prestashop_reference': order_reference,
-                    'prestashop_source': 'prestashop',
-                    'prestashop_carrier': carrier_name,
-                    'prestashop_payment': payment_method,
-                    'prestashop_status': status_name,
-                    'prestashop_delivery_country': delivery_country,
-                    'prestashop_new_customer': is_new,
-                    'origin': order_reference,
-                })
-
-                # Process order lines from associations
-                associations = order.get('associations', {})
-                order_rows = associations.get('order_rows', [])
-                if isinstance(order_rows, dict):
-                    order_rows = [order_rows]
-
-                for row in order_rows:
-                    product_id = str(row.get('product_id', ''))
-                    product_name = row.get('product_name', 'Unknown Product')
-                    product_reference = row.get('product_reference', '')
-                    quantity = int(row.get('product_quantity', 1))
-                    unit_price = float(row.get('product_price', 0))
-                    ecotax = float(row.get('product_ean13_ecotax', 0) or row.get('ecotax', 0) or 0)
-
-                    product = self._find_or_create_product(product_id, product_name, product_reference)
-
-                    self.env['sale.order.line'].create({
-                        'order_id': sale_order.id,
-                        'product_id': product.id,
-                        'name': product_name,
-                        'product_uom_qty': quantity,
-                        'price_unit': unit_price,
-                        'prestashop_ecotax': ecotax,
-                    })
-
-                # Add shipping cost line if > 0
-                if total_shipping > 0:
-                    shipping_product = self._get_shipping_product()
-                    self.env['sale.order.line'].create({
-                        'order_id': sale_order.id,
-                        'product_id': shipping_product.id,
-                        'name': f'Frais de port - {carrier_name}' if carrier_name else 'Frais de port',
-                        'product_uom_qty': 1,
-                        'price_unit': total_shipping,
-                    })
-
-                # Add eco-tax informational line if total eco-tax > 0
-                total_ecotax = sum(
-                    float(row.get('product_ean13_ecotax', 0) or row.get('ecotax', 0) or 0)
-                    * int(row.get('product_quantity', 1))
-                    for row in order_rows
-                )
-                if total_ecotax > 0:
-                    ecotax_product = self._get_ecotax_product()
-                    self.env['sale.order.line'].create({
-                        'order_id': sale_order.id,
-                        'product_id': ecotax_product.id,
-                        'name': 'Eco-taxe (incluse dans les prix)',
-                        'product_uom_qty': 1,
-                        'price_unit': total_ecotax,
-                        'tax_id': [(5, 0, 0)],
-                    })
-
-                imported_count += 1
-                _logger.info("Imported PrestaShop order %s as %s", order_id, sale_order.name)
-
-            self.last_sync_date = fields.Datetime.now()
+            if hold is not None and hold < cursor:
+                cursor = hold
+            # Orders behind the cursor are not fetched again: forget them
+            failures = {
+                order_id: value for order_id, value in failures.items()
+                if not value[1] or value[1] >= (cursor or '')
+            }
+            self.write({
+                'last_sync_date': fields.Datetime.now(),
+                'order_sync_cursor': cursor or False,
+                'order_sync_failures': failures or False,
+            })
 
+            message = _('Imported: %d orders, Skipped: %d already imported') % (imported_count, skipped_count)
+            if retried:
+                message += '\n' + _('%d order(s) could not be imported (%s); '
+                                    'the next sync retries them.') % (len(retried), ', '.join(retried))
+            if ignored_count:
+                message += '\n' + _('%d order(s) that failed %d times were ignored.') % (
+                    ignored_count, ORDER_MAX_ATTEMPTS)
+            if given_up:
+                message += '\n' + _('%d order(s) skipped after %d failed attempts: %s') % (
+                    len(given_up), ORDER_MAX_ATTEMPTS, ', '.join(given_up))
+            failed = retried or given_up
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('Synchronization Complete'),
-                    'message': _('Imported: %d orders, Skipped: %d already imported') % (imported_count, skipped_count),
-                    'type': 'success',
-                    'sticky': False,
+                    'message': message,
+                    'type': 'warning' if failed else 'success',
+                    'sticky': bool(failed),
                 }
             }
 
@@ -593,7 +778,11 @@ class PrestaShopInstance(models.Model):
                 }
             }
         orders.unlink()
-        self.last_sync_date = False
+        self.write({
+            'last_sync_date': False,
+            'order_sync_cursor': False,
+            'order_sync_failures': False,
+        })
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
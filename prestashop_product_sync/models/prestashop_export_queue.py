@@ -68,7 +68,7 @@ class PrestaShopExportQueue(models.Model):
             if self.operation in ('create', 'update'):
                 result = instance._export_single_product(product)
             elif self.operation == 'price':
-                instance._push_price_to_ps(product)
+                instance._push_price_to_ps(product, force=True)
                 result = {'success': True}
             elif self.operation == 'stock':
                 instance._push_stock_to_ps(product)
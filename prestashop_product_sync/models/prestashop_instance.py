@@ -1,10 +1,12 @@
 import base64
+import hashlib
 import json
 import logging
 import re
 import threading
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 import xml.sax.saxutils as saxutils
 
@@ -29,6 +31,10 @@ class PrestaShopInstance(models.Model):
         help="Max products per sync run. 0 = all active products.",
     )
     sync_product_images = fields.Boolean('Sync Images', default=True)
+    image_download_workers = fields.Integer(
+        'Parallel Image Downloads', default=4,
+        help="Number of images downloaded concurrently per product.",
+    )
     sync_product_features = fields.Boolean('Sync Features / Characteristics', default=True)
     sync_product_categories = fields.Boolean('Sync Categories', default=True)
     sync_product_stock = fields.Boolean('Sync Stock Quantities', default=True)
@@ -331,6 +337,28 @@ class PrestaShopInstance(models.Model):
         except Exception:
             raise UserError(_("Invalid API response (not JSON). URL: %s") % url)
 
+    def _api_get_paginated(self, resource, params=None, page_size=1000, timeout=120):
+        """Iterate over a PS list endpoint page by page.
+
+        Uses the PS ``limit=offset,count`` syntax and stops on the first
+        short or empty page. Yields lists of item dicts.
+        """
+        self.ensure_one()
+        offset = 0
+        while True:
+            page_params = dict(params or {})
+            page_params['limit'] = '%d,%d' % (offset, page_size)
+            data = self._api_get_long(resource, params=page_params, timeout=timeout)
+            items = data.get(resource, []) if isinstance(data, dict) else []
+            if isinstance(items, dict):
+                items = [items]
+            if not items:
+                return
+            yield items
+            if len(items) < page_size:
+                return
+            offset += page_size
+
     # ------------------------------------
     # Helpers – image download
     # ------------------------------------
@@ -350,6 +378,41 @@ class PrestaShopInstance(models.Model):
             )
         return False
 
+    @staticmethod
+    def _download_image_worker(session, url, timeout=60):
+        """Thread worker: download raw image bytes (pure HTTP, no ORM)."""
+        try:
+            resp = session.get(url, timeout=timeout)
+            if resp.status_code == 200 and resp.content:
+                return resp.content
+            _logger.warning("Image download failed (%s): status %s", url, resp.status_code)
+        except Exception as exc:
+            _logger.warning("Image download failed (%s): %s", url, exc)
+        return None
+
+    def _download_images_parallel(self, ps_product_id, image_ids):
+        """Download several images of one PS product concurrently.
+
+        :returns: dict {image_id: raw bytes} for successful downloads only
+        """
+        self.ensure_one()
+        if not image_ids:
+            return {}
+        base_url = self._get_base_url()
+        max_workers = max(1, min(self.image_download_workers or 4, len(image_ids)))
+        with requests.Session() as session:
+            session.auth = (self.api_key, '')
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    img_id: executor.submit(
+                        self._download_image_worker, session,
+                        f"{base_url}/images/products/{ps_product_id}/{img_id}",
+                    )
+                    for img_id in image_ids
+                }
+                results = {img_id: fut.result() for img_id, fut in futures.items()}
+        return {img_id: data for img_id, data in results.items() if data}
+
     # ------------------------------------
     # Helpers – categories
     # ------------------------------------
@@ -544,39 +607,106 @@ class PrestaShopInstance(models.Model):
     # ------------------------------------
     # Helpers – product images
     # ------------------------------------
-    def _sync_product_images_to_odoo(self, product_tmpl, ps_product_id, image_ids):
-        """Download images from PrestaShop and attach them to the product."""
+    def _sync_product_images_to_odoo(self, product_tmpl, ps_product_id, image_ids,
+                                     force=False):
+        """Download images from PrestaShop and attach them to the product.
+
+        Images already present are not downloaded again: the main image
+        when ``prestashop_image_tag`` names it and image_1920 is set, the
+        gallery images by product.image name. PrestaShop can replace the
+        file behind an image id; ``force`` (the re-import wizard's "Force
+        Image Refresh") downloads every image and rewrites the ones whose
+        bytes changed (SHA-1 of the download).
+
+        Downloads run in parallel. Identical files of different products
+        are downloaded separately; Odoo's attachment storage keeps one copy
+        of identical bytes.
+        """
         if not image_ids:
             return
 
         if isinstance(image_ids, dict):
             image_ids = [image_ids]
 
-        first = True
+        img_ids = []
         for img in image_ids:
             img_id = str(img.get('id', '')) if isinstance(img, dict) else str(img)
-            if not img_id:
-                continue
+            if img_id and img_id not in img_ids:
+                img_ids.append(img_id)
+        if not img_ids:
+            return
 
-            b64 = self._download_image(ps_product_id, img_id)
-            if not b64:
-                continue
+        def _tag(img_id):
+            return f'PS-{ps_product_id}-{img_id}'
 
-            if first:
-                product_tmpl.write({'image_1920': b64})
-                first = False
-            else:
-                tag = f'PS-{ps_product_id}-{img_id}'
-                existing = self.env['product.image'].search([
-                    ('product_tmpl_id', '=', product_tmpl.id),
-                    ('name', '=', tag),
-                ], limit=1)
-                if not existing:
-                    self.env['product.image'].create({
-                        'product_tmpl_id': product_tmpl.id,
-                        'name': tag,
-                        'image_1920': b64,
-                    })
+        main_id, extra_ids = img_ids[0], img_ids[1:]
+        existing = {}
+        if extra_ids:
+            existing = {image.name: image for image in self.env['product.image'].search([
+                ('product_tmpl_id', '=', product_tmpl.id),
+                ('name', 'in', [_tag(i) for i in extra_ids]),
+            ])}
+        has_image = bool(product_tmpl.with_context(bin_size=True).image_1920)
+        main_present = has_image and product_tmpl.prestashop_image_tag == _tag(main_id)
+
+        to_download = [main_id] if force or not main_present else []
+        to_download += [i for i in extra_ids if force or _tag(i) not in existing]
+        if not to_download:
+            return
+        downloaded = self._download_images_parallel(ps_product_id, to_download)
+        payloads = {}
+
+        def _b64(digest, data):
+            if digest not in payloads:
+                payloads[digest] = base64.b64encode(data)
+            return payloads[digest]
+
+        if main_id in downloaded:
+            data = downloaded[main_id]
+            digest = hashlib.sha1(data).hexdigest()
+            vals = {}
+            if product_tmpl.prestashop_image_tag != _tag(main_id):
+                vals['prestashop_image_tag'] = _tag(main_id)
+            if digest != product_tmpl.prestashop_image_hash or not has_image:
+                # Writing image_1920 regenerates every resized variant
+                vals.update({
+                    'image_1920': _b64(digest, data),
+                    'prestashop_image_hash': digest,
+                })
+            if vals:
+                product_tmpl.write(vals)
+
+        # Checksum (SHA-1) of the gallery images downloaded again
+        checksums = {}
+        refreshed = [existing[_tag(i)] for i in extra_ids if _tag(i) in existing and i in downloaded]
+        if refreshed:
+            checksums = {
+                attachment.res_id: attachment.checksum
+                for attachment in self.env['ir.attachment'].sudo().search([
+                    ('res_model', '=', 'product.image'),
+                    ('res_field', '=', 'image_1920'),
+                    ('res_id', 'in', [image.id for image in refreshed]),
+                ])
+            }
+
+        image_vals = []
+        for img_id in extra_ids:
+            data = downloaded.get(img_id)
+            if not data:
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+            image = existing.get(_tag(img_id))
+            if image:
+                if checksums.get(image.id) != digest:
+                    image.write({'image_1920': _b64(digest, data)})
+                continue
+            image_vals.append({
+                'product_tmpl_id': product_tmpl.id,
+                'name': _tag(img_id),
+                'image_1920': _b64(digest, data),
+            })
+        if image_vals:
+            self.env['product.image'].create(image_vals)
 
     # ------------------------------------
     # Helpers – stock quantity
@@ -826,29 +956,107 @@ class PrestaShopInstance(models.Model):
 
         This is a fast, lightweight call that creates preview records so
         the user can SEE what's in PrestaShop before importing.
+
+        The PS list is read page by page; each page is reconciled in bulk
+        against the existing previews and imported templates (loaded once
+        in two queries), then new rows are batch-created and changed rows
+        batch-written.
         """
         self.ensure_one()
+        Preview = self.env['prestashop.product.preview']
+
+        # Step 1 – load what we already know for this instance (2 queries)
+        existing = {
+            rec['prestashop_id']: rec
+            for rec in Preview.search_read(
+                [('instance_id', '=', self.id)],
+                ['prestashop_id', 'name', 'reference', 'price'],
+            )
+        }
+        imported = {
+            rec['prestashop_id']: rec['id']
+            for rec in self.env['product.template'].search_read([
+                ('prestashop_instance_id', '=', self.id),
+                ('prestashop_id', '!=', False),
+            ], ['prestashop_id'])
+        }
+
+        # Step 2 – page through the lightweight product list
+        params = {
+            'display': '[id,name,reference,price,ean13,active]',
+            'filter[active]': '[1]',
+            'sort': '[id_ASC]',
+        }
+        limit = self.product_sync_limit if self.product_sync_limit > 0 else 0
+        page_size = min(limit, 1000) if limit else 1000
+        created = skipped = fetched = 0
 
-        # Step 1 – fetch lightweight product list with basic fields
         try:
-            params = {
-                'display': '[id,name,reference,price,ean13,active]',
-                'filter[active]': '[1]',
-                'sort': '[id_ASC]',
-            }
-            if self.product_sync_limit and self.product_sync_limit > 0:
-                params['limit'] = self.product_sync_limit
+            for products in self._api_get_paginated(
+                    'products', params=params, page_size=page_size, timeout=60):
+                if limit:
+                    products = products[:limit - fetched]
+                fetched += len(products)
+
+                create_vals = []
+                write_groups = {}
+                for ps_prod in products:
+                    ps_id = str(ps_prod.get('id', ''))
+                    if not ps_id:
+                        continue
+                    name = self._get_ps_text(ps_prod.get('name', ''))
+                    # Validate — lightweight fetch can return raw JSON for multi-lang
+                    if name and (name.startswith('{') or name.startswith('[') or len(name) > 500):
+                        name = ''  # Will be corrected during full import (display=full)
+                    reference = ps_prod.get('reference', '') or ''
+                    price = float(ps_prod.get('price', 0) or 0)
+
+                    current = existing.get(ps_id)
+                    if current and not current['id']:
+                        # Already created earlier in this fetch: nothing to do
+                        continue
+                    if current:
+                        skipped += 1
+                        # Update name/price if changed
+                        if name and current['name'] != name:
+                            key = (name, reference, price)
+                            write_groups.setdefault(key, []).append(current['id'])
+                        continue
+
+                    odoo_product_id = imported.get(ps_id)
+                    create_vals.append({
+                        'instance_id': self.id,
+                        'prestashop_id': ps_id,
+                        'name': name or f'PS-{ps_id}',
+                        'reference': reference,
+                        'price': price,
+                        'ean13': ps_prod.get('ean13', '') or '',
+                        'active_in_ps': str(ps_prod.get('active', '1')) == '1',
+                        'state': 'imported' if odoo_product_id else 'pending',
+                        'imported_product_id': odoo_product_id or False,
+                    })
+                    # Guard against the same ID showing up on two pages
+                    existing[ps_id] = {'id': False, 'name': name}
+
+                if create_vals:
+                    Preview.create(create_vals)
+                    created += len(create_vals)
+                for (name, reference, price), ids in write_groups.items():
+                    Preview.browse(ids).write({
+                        'name': name,
+                        'reference': reference,
+                        'price': price,
+                    })
+                self.env.cr.commit()
 
-            data = self._api_get_long('products', params=params, timeout=60)
-            products = data.get('products', [])
-            if isinstance(products, dict):
-                products = [products]
+                if limit and fetched >= limit:
+                    break
         except Exception as exc:
             raise UserError(
                 _("Failed to fetch products from PrestaShop: %s") % exc
             )
 
-        if not products:
+        if not fetched:
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -860,69 +1068,6 @@ class PrestaShopInstance(models.Model):
                 },
             }
 
-        Preview = self.env['prestashop.product.preview']
-        created = skipped = 0
-
-        for ps_prod in products:
-            ps_id = str(ps_prod.get('id', ''))
-            if not ps_id:
-                continue
-
-            # Already in preview?
-            existing_preview = Preview.search([
-                ('instance_id', '=', self.id),
-                ('prestashop_id', '=', ps_id),
-            ], limit=1)
-            if existing_preview:
-                # Update name/price if changed
-                name = self._get_ps_text(ps_prod.get('name', ''))
-                # Validate — lightweight fetch can return raw JSON
-                if name and (name.startswith('{') or name.startswith('[') or len(name) > 500):
-                    name = ''
-                ref = ps_prod.get('reference', '') or ''
-                price = float(ps_prod.get('price', 0) or 0)
-                if name and existing_preview.name != name:
-                    existing_preview.write({
-                        'name': name,
-                        'reference': ref,
-                        'price': price,
-                    })
-                skipped += 1
-                continue
-
-            name = self._get_ps_text(ps_prod.get('name', ''))
-            # Validate — lightweight fetch can return raw JSON for multi-lang
-            if not name or name.startswith('{') or name.startswith('[') or len(name) > 500:
-                name = ''  # Will be corrected during full import (display=full)
-            reference = ps_prod.get('reference', '') or ''
-            price = float(ps_prod.get('price', 0) or 0)
-            ean13 = ps_prod.get('ean13', '') or ''
-            active_in_ps = str(ps_prod.get('active', '1')) == '1'
-
-            # Check if already imported in Odoo
-            odoo_product = self.env['product.template'].search([
-                ('prestashop_id', '=', ps_id),
-                ('prestashop_instance_id', '=', self.id),
-            ], limit=1)
-
-            Preview.create({
-                'instance_id': self.id,
-                'prestashop_id': ps_id,
-                'name': name or f'PS-{ps_id}',
-                'reference': reference,
-                'price': price,
-                'ean13': ean13,
-                'active_in_ps': active_in_ps,
-                'state': 'imported' if odoo_product else 'pending',
-                'imported_product_id': odoo_product.id if odoo_product else False,
-            })
-            created += 1
-
-            if created % 20 == 0:
-                self.env.cr.commit()
-
-        self.env.cr.commit()
-
         # Open the preview list
         return {
             'type': 'ir.actions.act_window',
@@ -1629,17 +1774,31 @@ class PrestaShopInstance(models.Model):
         text = re.sub(r'[-\s]+', '-', text).strip('-')
         return text or 'product'
 
-    # Module-level cache for PS language IDs per instance
+    # Process-wide cache of PS language IDs and blank schema per instance:
+    # {key: (monotonic time, value)}, entries expire after _PS_LANG_CACHE_TTL
     _PS_LANG_CACHE = {}
+    _PS_LANG_CACHE_TTL = 300
+
+    def _ps_lang_cache_get(self, cache_key):
+        entry = self._PS_LANG_CACHE.get(cache_key)
+        if entry and time.monotonic() - entry[0] < self._PS_LANG_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def _ps_lang_cache_set(self, cache_key, value):
+        self._PS_LANG_CACHE[cache_key] = (time.monotonic(), value)
 
     def _get_ps_language_ids(self):
         """Fetch all active language IDs from PrestaShop.
         Falls back to export_default_ps_lang_id or [1] on error.
-        Cached per instance ID (cleared via _clear_ps_lang_cache)."""
+        Cached per instance ID for _PS_LANG_CACHE_TTL seconds, so single
+        exports pick up language changes too; batch entry points also
+        clear it at the start of a run via _clear_ps_lang_cache."""
         self.ensure_one()
         cache_key = self.id
-        if cache_key in self._PS_LANG_CACHE:
-            return self._PS_LANG_CACHE[cache_key]
+        cached = self._ps_lang_cache_get(cache_key)
+        if cached is not None:
+            return cached
         try:
             data = self._api_get('languages', params={'display': '[id]', 'filter[active]': '1'})
             langs = data.get('languages', {}).get('language', [])
@@ -1647,7 +1806,7 @@ class PrestaShopInstance(models.Model):
                 langs = [langs]
             ids = [int(l['id']) for l in langs if l.get('id')]
             if ids:
-                self._PS_LANG_CACHE[cache_key] = ids
+                self._ps_lang_cache_set(cache_key, ids)
                 return ids
         except Exception:
             _logger.warning("Could not fetch PS languages, using default")
@@ -1657,6 +1816,7 @@ class PrestaShopInstance(models.Model):
     def _clear_ps_lang_cache(self):
         """Clear the language cache for this instance."""
         self._PS_LANG_CACHE.pop(self.id, None)
+        self._PS_LANG_CACHE.pop('blank_%s' % self.id, None)
 
     def _build_ps_language_xml(self, value, tag_name, lang_id=None):
         """Build multi-language XML element for PrestaShop.
@@ -1705,12 +1865,13 @@ class PrestaShopInstance(models.Model):
 
         Returns the raw XML string from /api/products?schema=blank.
         This is the canonical product structure that PS expects.
-        Cached per instance to avoid repeated API calls.
+        Cached per instance (with the languages) to avoid repeated API calls.
         """
         self.ensure_one()
         cache_key = 'blank_%s' % self.id
-        if cache_key in self._PS_LANG_CACHE:
-            return self._PS_LANG_CACHE[cache_key]
+        cached = self._ps_lang_cache_get(cache_key)
+        if cached is not None:
+            return cached
         try:
             base_url = self._get_base_url()
             url = f"{base_url}/products"
@@ -1724,7 +1885,7 @@ class PrestaShopInstance(models.Model):
                 _logger.error("Could not fetch blank product schema: %s", resp.status_code)
                 return None
             raw_xml = resp.text
-            self._PS_LANG_CACHE[cache_key] = raw_xml
+            self._ps_lang_cache_set(cache_key, raw_xml)
             return raw_xml
         except Exception as exc:
             _logger.warning("Could not fetch PS blank product schema: %s", exc)
@@ -1780,9 +1941,6 @@ class PrestaShopInstance(models.Model):
         :returns: XML string
         """
         self.ensure_one()
-        # Clear cached language IDs for this build session
-        self._clear_ps_lang_cache()
-
         # --- Step 1: Get blank schema XML from PS ---
         blank_xml = self._get_ps_blank_product()
         if not blank_xml:
@@ -1900,10 +2058,7 @@ class PrestaShopInstance(models.Model):
                             product_tmpl.default_code or '')
 
         # EAN13
-        ean = product_tmpl.barcode or product_tmpl.prestashop_ean13 or ''
-        if ean and (len(ean) != 13 or not ean.isdigit()):
-            ean = ''  # skip invalid EAN to avoid PS validation error
-        self._set_xml_field(product_node, 'ean13', ean)
+        self._set_xml_field(product_node, 'ean13', self._get_export_ean13(product_tmpl))
 
         # Weight
         self._set_xml_field(product_node, 'weight',
@@ -1988,13 +2143,76 @@ class PrestaShopInstance(models.Model):
     # EXPORT: Anti-Duplicate System (Triple Key)
     # =============================================
 
-    def _find_ps_product_by_keys(self, product_tmpl):
+    # Below this many products, per-product live lookups are cheaper than
+    # scanning the whole PS catalog into a local index
+    _PS_INDEX_MIN_PRODUCTS = 20
+
+    def _load_ps_product_index(self, product_count=None):
+        """Build a local anti-duplicate index with one paginated PS scan.
+
+        The index mirrors PS (id, reference, ean13) for one export run; the
+        caller passes it down to ``_export_single_product``, so it never
+        outlives the run. Returns None when ``product_count`` is too small
+        to pay for the scan, or when the scan failed (callers then fall
+        back to live lookups).
+        """
+        self.ensure_one()
+        if product_count is not None and product_count < self._PS_INDEX_MIN_PRODUCTS:
+            return None
+        index = {'ids': {}, 'reference': {}, 'ean13': {}}
+        try:
+            for page in self._api_get_paginated('products', params={
+                'display': '[id,reference,ean13]',
+                'sort': '[id_ASC]',
+            }):
+                for item in page:
+                    ps_id = str(item.get('id', '') or '')
+                    if ps_id:
+                        self._index_ps_product(
+                            index, ps_id,
+                            str(item.get('reference', '') or ''),
+                            str(item.get('ean13', '') or ''),
+                        )
+        except Exception as exc:
+            _logger.warning("Anti-dup index scan failed, using live lookups: %s", exc)
+            return None
+        _logger.info(
+            "Anti-dup index loaded for %s: %d PS products",
+            self.name, len(index['ids']),
+        )
+        return index
+
+    @staticmethod
+    def _index_ps_product(index, ps_id, reference, ean13):
+        """Insert or refresh one PS product in an anti-duplicate index."""
+        if index is None or not ps_id:
+            return
+        ps_id = str(ps_id)
+        reference = reference or ''
+        ean13 = ean13 or ''
+        old_ref, old_ean = index['ids'].get(ps_id, ('', ''))
+        if old_ref and index['reference'].get(old_ref) == ps_id:
+            del index['reference'][old_ref]
+        if old_ean and index['ean13'].get(old_ean) == ps_id:
+            del index['ean13'][old_ean]
+        index['ids'][ps_id] = (reference, ean13)
+        # Keep the lowest PS ID per key, like the live filter lookup
+        if reference:
+            index['reference'].setdefault(reference, ps_id)
+        if ean13:
+            index['ean13'].setdefault(ean13, ps_id)
+
+    def _find_ps_product_by_keys(self, product_tmpl, ps_index=None):
         """Find an existing PrestaShop product using multi-key matching.
 
         Priority: 1) prestashop_id → 2) reference → 3) EAN13
+        Uses ``ps_index`` (see ``_load_ps_product_index``) when given,
+        otherwise queries the PS API for each key.
         Returns: PS product ID (string) or None.
         """
         self.ensure_one()
+        if ps_index is not None:
+            return self._find_ps_product_in_index(ps_index, product_tmpl)
 
         # Key 1: Direct PS ID
         if product_tmpl.prestashop_id:
@@ -2057,15 +2275,49 @@ class PrestaShopInstance(models.Model):
 
         return None
 
+    def _find_ps_product_in_index(self, index, product_tmpl):
+        """In-memory equivalent of the three live anti-dup lookups."""
+        if product_tmpl.prestashop_id and product_tmpl.prestashop_id in index['ids']:
+            return product_tmpl.prestashop_id
+
+        ref = product_tmpl.default_code
+        if ref and ref in index['reference']:
+            ps_id = index['reference'][ref]
+            _logger.info(
+                "Anti-dup: matched '%s' by reference '%s' -> PS-%s",
+                product_tmpl.name, ref, ps_id,
+            )
+            return ps_id
+
+        ean = product_tmpl.barcode or product_tmpl.prestashop_ean13
+        if ean and len(ean) in (8, 12, 13, 14) and ean in index['ean13']:
+            ps_id = index['ean13'][ean]
+            _logger.info(
+                "Anti-dup: matched '%s' by EAN13 '%s' -> PS-%s",
+                product_tmpl.name, ean, ps_id,
+            )
+            return ps_id
+
+        return None
+
+    def _get_export_ean13(self, product_tmpl):
+        """EAN13 as sent to PS (invalid codes are dropped)."""
+        ean = product_tmpl.barcode or product_tmpl.prestashop_ean13 or ''
+        if ean and (len(ean) != 13 or not ean.isdigit()):
+            ean = ''  # skip invalid EAN to avoid PS validation error
+        return ean
+
     # =============================================
     # EXPORT: Single Product Export
     # =============================================
 
-    def _export_single_product(self, product_tmpl, dry_run=False):
+    def _export_single_product(self, product_tmpl, dry_run=False, ps_index=None):
         """Export a single product to PrestaShop (create or update).
 
         :param product_tmpl: product.template record
         :param dry_run: if True, return XML without sending
+        :param ps_index: anti-duplicate index of the current export run,
+            kept up to date with the created/updated product
         :returns: dict with keys: success, ps_id, operation, xml, error
         """
         self.ensure_one()
@@ -2090,7 +2342,7 @@ class PrestaShopInstance(models.Model):
                 return result
 
             # Anti-duplicate detection
-            existing_ps_id = self._find_ps_product_by_keys(product_tmpl)
+            existing_ps_id = self._find_ps_product_by_keys(product_tmpl, ps_index)
 
             if existing_ps_id:
                 # UPDATE existing
@@ -2109,6 +2361,9 @@ class PrestaShopInstance(models.Model):
                     'ps_last_export': fields.Datetime.now(),
                     'ps_export_state': 'exported',
                     'ps_export_error': False,
+                    'ps_last_price_hash': self._get_price_push_hash(
+                        product_tmpl, existing_ps_id,
+                    ),
                 })
             else:
                 # CREATE new
@@ -2127,8 +2382,18 @@ class PrestaShopInstance(models.Model):
                     'ps_last_export': fields.Datetime.now(),
                     'ps_export_state': 'exported',
                     'ps_export_error': False,
+                    'ps_last_price_hash': self._get_price_push_hash(
+                        product_tmpl, new_ps_id,
+                    ),
                 })
 
+            self._index_ps_product(
+                ps_index,
+                result['ps_id'],
+                product_tmpl.default_code,
+                self._get_export_ean13(product_tmpl),
+            )
+
             # Handle variants
             if (self.export_variants
                     and result['ps_id']
@@ -2196,6 +2461,10 @@ class PrestaShopInstance(models.Model):
                     env = odoo.api.Environment(cr, uid, {})
                     instance = env['prestashop.instance'].browse(instance_id)
                     products = env['product.template'].browse(product_ids).exists()
+                    # Fetch PS languages once for the whole run
+                    instance._clear_ps_lang_cache()
+                    # One paginated scan replaces per-product anti-dup lookups
+                    ps_index = instance._load_ps_product_index(len(products))
 
                     total = len(products)
                     created = updated = errors = 0
@@ -2214,7 +2483,9 @@ class PrestaShopInstance(models.Model):
                             )
                             cr.commit()
 
-                            result = instance._export_single_product(product)
+                            result = instance._export_single_product(
+                                product, ps_index=ps_index,
+                            )
 
                             if result['success']:
                                 if result['operation'] == 'create':
@@ -2587,16 +2858,39 @@ class PrestaShopInstance(models.Model):
     # EXPORT: Price Sync
     # =============================================
 
-    def _push_price_to_ps(self, product_tmpl):
-        """Push price update to PrestaShop for a single product."""
+    def _get_price_push_hash(self, product_tmpl, ps_id=None):
+        """Fingerprint of the values sent by _push_price_to_ps.
+
+        Covers everything in the price PUT payload (PS ID, prices, name),
+        so any change that would alter the request changes the hash.
+        """
+        payload = '|'.join([
+            str(ps_id or product_tmpl.prestashop_id or ''),
+            '%.6f' % self._get_export_price(product_tmpl),
+            '%.6f' % (product_tmpl.standard_price or 0.0),
+            product_tmpl.name or '',
+        ])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _push_price_to_ps(self, product_tmpl, force=False):
+        """Push price update to PrestaShop for a single product.
+
+        Skipped when the payload fingerprint matches the last pushed one,
+        unless ``force`` is set.
+
+        :returns: True if a PUT was sent, False if skipped
+        """
         self.ensure_one()
         ps_id = product_tmpl.prestashop_id
         if not ps_id:
-            return
+            return False
+
+        price_hash = self._get_price_push_hash(product_tmpl)
+        if not force and product_tmpl.ps_last_price_hash == price_hash:
+            return False
 
         price = self._get_export_price(product_tmpl)
         # PS requires name and link_rewrite for PUT even when only updating price
-        self._clear_ps_lang_cache()
         xml = (
             '<?xml version="1.0" encoding="UTF-8"?>\n'
             '<prestashop xmlns:xlink="http://www.w3.org/1999/xlink">\n'
@@ -2619,6 +2913,9 @@ class PrestaShopInstance(models.Model):
         )
 
         self._api_put('products', ps_id, xml)
+        product_tmpl.with_context(skip_export_tracking=True).write({
+            'ps_last_price_hash': price_hash,
+        })
 
         self.env['prestashop.export.log'].create({
             'instance_id': self.id,
@@ -2629,6 +2926,7 @@ class PrestaShopInstance(models.Model):
             'request_xml': xml,
             'field_changes': json.dumps({'price': price}),
         })
+        return True
 
     # =============================================
     # EXPORT: Category Export
@@ -2820,7 +3118,11 @@ class PrestaShopInstance(models.Model):
 
     @api.model
     def _cron_push_prices(self):
-        """Cron: push prices for export-enabled products."""
+        """Cron: push changed prices for export-enabled products.
+
+        Products whose price fingerprint matches the last push are skipped
+        without any API call.
+        """
         for instance in self.search([
             ('active', '=', True),
             ('price_sync_mode', '!=', 'disabled'),
@@ -2830,12 +3132,22 @@ class PrestaShopInstance(models.Model):
                 ('ps_export_enabled', '=', True),
                 ('prestashop_id', '!=', False),
             ])
+            # Fetch PS languages once for the whole run
+            instance._clear_ps_lang_cache()
+            pushed = skipped = 0
             for product in products:
                 try:
-                    instance._push_price_to_ps(product)
+                    if instance._push_price_to_ps(product):
+                        pushed += 1
+                    else:
+                        skipped += 1
                 except Exception as exc:
                     _logger.error("Price push failed for %s: %s", product.name, exc)
             instance.last_price_export_date = fields.Datetime.now()
+            _logger.info(
+                "Price push for %s: %d pushed, %d unchanged",
+                instance.name, pushed, skipped,
+            )
 
     @api.model
     def _cron_process_export_queue(self):
@@ -2859,7 +3171,7 @@ class PrestaShopInstance(models.Model):
                 if item.operation in ('create', 'update'):
                     result = instance._export_single_product(product)
                 elif item.operation == 'price':
-                    instance._push_price_to_ps(product)
+                    instance._push_price_to_ps(product, force=True)
                     result = {'success': True}
                 elif item.operation == 'stock':
                     instance._push_stock_to_ps(product)
@@ -453,11 +453,14 @@ class PrestaShopProductDashboard(models.TransientModel):
         ])
         if not products:
             raise UserError(_("No exported products found to push prices."))
-        ok = err = 0
+        instance._clear_ps_lang_cache()
+        ok = unchanged = err = 0
         for product in products:
             try:
-                instance._push_price_to_ps(product)
-                ok += 1
+                if instance._push_price_to_ps(product):
+                    ok += 1
+                else:
+                    unchanged += 1
             except Exception as exc:
                 err += 1
                 _logger.error("Price push failed %s: %s", product.name, exc)
@@ -467,7 +470,7 @@ class PrestaShopProductDashboard(models.TransientModel):
             'tag': 'display_notification',
             'params': {
                 'title': _('Price Push Complete'),
-                'message': _('%d OK, %d errors.') % (ok, err),
+                'message': _('%d pushed, %d unchanged, %d errors.') % (ok, unchanged, err),
                 'type': 'success' if not err else 'warning',
                 'sticky': True,
             },
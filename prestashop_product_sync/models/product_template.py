@@ -24,6 +24,14 @@ class ProductTemplate(models.Model):
     prestashop_meta_description = fields.Text('PS Meta Description', readonly=True)
     prestashop_manufacturer = fields.Char('PS Manufacturer', readonly=True)
     prestashop_ean13 = fields.Char('PS EAN13', readonly=True)
+    prestashop_image_tag = fields.Char(
+        'PS Main Image', readonly=True, copy=False,
+        help="Tag (PS-<product>-<image>) of the PrestaShop image stored as main image.",
+    )
+    prestashop_image_hash = fields.Char(
+        'PS Main Image Hash', readonly=True, copy=False,
+        help="SHA-1 of the downloaded main image bytes.",
+    )
     prestashop_active = fields.Boolean(
         'Active in PrestaShop', readonly=True, default=True,
         help="Whether this product is currently active in PrestaShop.",
@@ -76,6 +84,11 @@ class ProductTemplate(models.Model):
         'PS Combination IDs (JSON)', readonly=True,
         help="JSON mapping of product.product IDs to PS combination IDs.",
     )
+    ps_last_price_hash = fields.Char(
+        'PS Last Pushed Price Hash', readonly=True, copy=False,
+        help="Fingerprint of the price payload last pushed to PrestaShop. "
+             "Unchanged products are skipped by the price push.",
+    )
 
     # Fields that trigger 'modified' state when changed after export
     _PS_EXPORT_TRIGGER_FIELDS = {
@@ -102,8 +102,11 @@ class PrestaShopExportWizard(models.TransientModel):
             if self.dry_run:
                 # Dry run: generate XML preview
                 log_lines = []
+                ps_index = instance._load_ps_product_index(len(products))
                 for product in products:
-                    result = instance._export_single_product(product, dry_run=True)
+                    result = instance._export_single_product(
+                        product, dry_run=True, ps_index=ps_index,
+                    )
                     xml_preview = (result.get('xml') or '')[:2000]
                     op = result.get('operation', '?')
                     log_lines.append(
@@ -127,7 +130,7 @@ class PrestaShopExportWizard(models.TransientModel):
             ok = err = 0
             for product in products:
                 try:
-                    instance._push_price_to_ps(product)
+                    instance._push_price_to_ps(product, force=True)
                     ok += 1
                 except Exception as exc:
                     err += 1
@@ -153,7 +156,7 @@ class PrestaShopExportWizard(models.TransientModel):
             ok = err = 0
             for product in products:
                 try:
-                    instance._push_price_to_ps(product)
+                    instance._push_price_to_ps(product, force=True)
                     instance._push_stock_to_ps(product)
                     ok += 1
                 except Exception as exc:
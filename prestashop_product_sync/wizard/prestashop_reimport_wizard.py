@@ -25,6 +25,11 @@ class PrestaShopReimportWizard(models.TransientModel):
     sync_price = fields.Boolean('Price', default=True)
     sync_description = fields.Boolean('HTML Descriptions', default=False)
     sync_images = fields.Boolean('Images', default=False)
+    force_image_refresh = fields.Boolean(
+        'Force Image Refresh', default=False,
+        help="Download every image again, even the ones already imported, and "
+             "replace those whose file changed in PrestaShop.",
+    )
     sync_features = fields.Boolean('Characteristics', default=False)
     sync_stock = fields.Boolean('Stock', default=True)
     sync_ecotax = fields.Boolean('Eco-Tax', default=True)
@@ -99,7 +104,9 @@ class PrestaShopReimportWizard(models.TransientModel):
                 associations = ps_product.get('associations', {}) or {}
                 if self.sync_images and instance.sync_product_images:
                     img_list = instance._normalize_association_list(associations, 'images', 'image')
-                    instance._sync_product_images_to_odoo(product, ps_id, img_list)
+                    instance._sync_product_images_to_odoo(
+                        product, ps_id, img_list, force=self.force_image_refresh,
+                    )
 
                 if self.sync_features and instance.sync_product_features:
                     feat_list = instance._normalize_association_list(associations, 'product_features', 'product_feature')
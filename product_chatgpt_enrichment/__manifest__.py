@@ -17,6 +17,11 @@ Features:
 * Dynamic Field Mapping for flexible data routing
 * Bulk Enrichment from product list view
 * Enrichment Queue with parallel processing
+* Optional continuous pipelined mode: web search and AI enrichment run side by side
+* SearXNG result cache with in-flight deduplication of identical searches
+* Optional adaptive worker counts: concurrency grows until latency rises, then backs off
+* Pooled keep-alive AI connections with retry on 429/5xx
+* Load balancing and failover over several Ollama hosts
 * Dashboard with real-time statistics
 * Configurable AI prompts and templates
     """,
@@ -37,6 +42,7 @@ Features:
         'views/product_template_views.xml',
         'views/product_enrichment_queue_views.xml',
         'views/batch_enrichment_wizard_views.xml',
+        'views/searxng_cache_views.xml',
         'views/res_config_settings_views.xml',
         'views/menus.xml',
     ],
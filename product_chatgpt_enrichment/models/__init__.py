@@ -2,5 +2,6 @@
 from . import chatgpt_config
 from . import product_template
 from . import product_enrichment_queue
+from . import searxng_cache
 from . import res_config_settings
 from . import product_enrichment_dashboard
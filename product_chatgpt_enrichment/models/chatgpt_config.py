@@ -3,10 +3,21 @@ from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 import requests
 import logging
+import time
+from odoo.addons.product_chatgpt_enrichment.services import endpoint_router, http_transport
 from odoo.addons.product_chatgpt_enrichment.services.searxng_client import SearXNGClient
 
 _logger = logging.getLogger(__name__)
 
+
+class AITimeoutError(UserError):
+    """The server accepted the request but the model did not answer in time.
+
+    Not an endpoint failure: routing neither fails over nor takes the
+    endpoint out of rotation.
+    """
+
+
 # Default base URLs per provider
 PROVIDER_DEFAULTS = {
     'openai': {'base_url': 'https://api.openai.com', 'endpoint': '/v1/chat/completions', 'model': 'gpt-4o-mini'},
@@ -17,6 +28,9 @@ PROVIDER_DEFAULTS = {
     'llamacpp': {'base_url': 'http://localhost:8080', 'endpoint': '/v1/chat/completions', 'model': 'default'},
 }
 
+LIVE_STATS_HELP = ("Counted by the Odoo process serving this page since it started. "
+                   "Other worker processes keep their own counters.")
+
 
 class ChatGPTConfig(models.Model):
     _name = 'chatgpt.config'
@@ -211,6 +225,16 @@ Answer in {language}.""",
         string='Delay Between Requests (s)',
         default=3.0,
         help="Pause between SearXNG requests to avoid rate limiting.")
+    searxng_cache_enabled = fields.Boolean(
+        string='Cache Search Results',
+        default=True,
+        help="Reuse the results of an identical product search (same EAN, "
+             "brand, name, engines and language) instead of querying "
+             "SearXNG again. Concurrent identical searches share one request.")
+    searxng_cache_ttl_hours = fields.Integer(
+        string='Search Cache TTL (hours)',
+        default=168,
+        help="How long cached search results stay valid. 0 = never expires.")
 
     # -------------------------------------------------------
     # Enrichment Pipeline Configuration
@@ -223,6 +247,25 @@ Answer in {language}.""",
         string='Batch Size (Enrich)',
         default=10,
         help="Number of products to enrich via AI per cron run.")
+    enrichment_mode = fields.Selection([
+        ('batch', 'Batch (collect, then enrich)'),
+        ('continuous', 'Continuous (pipelined)'),
+    ], string='Pipeline Mode', default='batch', required=True,
+        help="Batch: each cron run collects one batch, then enriches one batch.\n"
+             "Continuous: searches and AI calls run side by side, each product "
+             "moving to the AI as soon as its search is done, until the queue "
+             "is empty or the time budget is spent.")
+    enrichment_time_budget = fields.Integer(
+        string='Time Budget (s)',
+        default=60,
+        help="Continuous mode: seconds a run keeps taking new items. The run "
+             "re-triggers itself when items remain. Keep it well below the "
+             "server's cron time limit (limit_time_real_cron).")
+    enrichment_prefetch = fields.Integer(
+        string='Search Prefetch',
+        default=0,
+        help="Continuous mode: maximum number of collected products waiting "
+             "for the AI. 0 = twice the AI workers.")
     enrichment_auto_publish = fields.Boolean(
         string='Auto-Publish to Standard Fields',
         default=False,
@@ -245,6 +288,29 @@ Answer in {language}.""",
         default=2,
         help="Number of parallel threads for Ollama AI enrichment. "
              "Higher = faster but requires more RAM/GPU on Ollama server.")
+    enrichment_adaptive_workers = fields.Boolean(
+        string='Adaptive Workers',
+        default=False,
+        help="Adjust the number of SearXNG and Ollama workers from observed "
+             "latency, errors and timeouts: one more worker per round of fast "
+             "calls, 30% fewer when latency climbs or calls fail. The "
+             "parallel worker settings above are the starting point.")
+    adaptive_max_workers = fields.Integer(
+        string='Adaptive Max Workers',
+        default=16,
+        help="Upper bound per stage. With several Ollama endpoints, their "
+             "total capacity is the bound for the AI stage.")
+    adaptive_latency_tolerance = fields.Float(
+        string='Latency Tolerance',
+        default=2.0,
+        help="Workers are removed when the average latency exceeds this "
+             "multiple of the lowest latency observed (requests queueing).")
+    adaptive_searxng_workers = fields.Integer(
+        string='Current SearXNG Workers', readonly=True,
+        help="Last limit learnt by the adaptive controller.")
+    adaptive_ollama_workers = fields.Integer(
+        string='Current Ollama Workers', readonly=True,
+        help="Last limit learnt by the adaptive controller.")
     ollama_request_timeout = fields.Integer(
         string='Ollama Request Timeout (s)',
         default=180,
@@ -266,6 +332,30 @@ Answer in {language}.""",
         help="How long Ollama keeps the model in memory after a request. "
              "Examples: '5m', '10m', '1h', '0' (unload immediately). "
              "Longer = faster next request but uses more RAM.")
+    endpoint_ids = fields.One2many(
+        'chatgpt.ollama.endpoint', 'config_id',
+        string='Ollama Endpoints',
+        help="Several Ollama hosts to spread enrichment calls over. "
+             "When empty, the Base URL is used.")
+    endpoint_strategy = fields.Selection([
+        ('least_loaded', 'Least Loaded'),
+        ('round_robin', 'Weighted Round-Robin'),
+    ], string='Routing', default='least_loaded', required=True)
+    http_pool_size = fields.Integer(
+        string='Connection Pool Size',
+        default=10,
+        help="Keep-alive connections kept open per AI server. "
+             "Should be at least the number of Ollama parallel workers.")
+    http_max_retries = fields.Integer(
+        string='Max Retries',
+        default=2,
+        help="Retries with exponential backoff on connection errors, "
+             "HTTP 429 and 5xx. 0 = no retry.")
+    http_connect_timeout = fields.Integer(
+        string='Connect Timeout (s)',
+        default=10,
+        help="Timeout to open a connection to the AI server. "
+             "The read timeout is the request timeout.")
     enrichment_prompt_template = fields.Text(
         string='Enrichment Prompt Template',
         default="""Tu es un expert e-commerce SEO francophone. Tu dois enrichir une fiche produit à partir de données web fraîches.
@@ -701,6 +791,22 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
     # -------------------------------------------------------
     # SearXNG Search
     # -------------------------------------------------------
+    def action_clear_searxng_cache(self):
+        """Delete all cached SearXNG search results."""
+        cache = self.env['searxng.search.cache'].sudo().search([])
+        count = len(cache)
+        cache.unlink()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Cache Cleared'),
+                'message': _('%d cached searches removed.') % count,
+                'type': 'success',
+                'sticky': False,
+            }
+        }
+
     def _get_searxng_client(self):
         """Factory: create a SearXNGClient from current config."""
         self.ensure_one()
@@ -788,6 +894,61 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
                 'active': self.auto_enrich_enabled,
             })
 
+    # -------------------------------------------------------
+    # HTTP transport (pooled keep-alive sessions)
+    # -------------------------------------------------------
+    def _get_transport_options(self):
+        """Pool settings for ``services.http_transport`` (plain dict, thread-safe)."""
+        return {
+            'pool_size': max(self.http_pool_size or 0, self.ollama_parallel_workers or 0) or None,
+            'max_retries': self.http_max_retries,
+            'connect_timeout': self.http_connect_timeout or None,
+        }
+
+    def _http_post(self, url, timeout, **kwargs):
+        """POST through the pooled transport of this config."""
+        return http_transport.post(
+            url, credentials=self.api_key, timeout=timeout,
+            **self._get_transport_options(), **kwargs,
+        )
+
+    # -------------------------------------------------------
+    # Load balancing over several Ollama hosts
+    # -------------------------------------------------------
+    def _get_endpoint_router(self):
+        """Router over the active endpoints, or None for a single-host config."""
+        if self.provider != 'ollama' or not self.endpoint_ids:
+            return None
+        return endpoint_router.get_router(
+            ('chatgpt.config', self.id), self.endpoint_ids._get_router_specs())
+
+    def _route_ollama(self, router, send):
+        """Run ``send(base_url)`` on a leased endpoint, failing over to the next
+        one on error. Raises the last error when every endpoint failed.
+
+        A read timeout is raised at once: the endpoint is alive, only slow.
+        """
+        last_error = timed_out = None
+        for _attempt in range(router.size()):
+            try:
+                with router.lease(self.endpoint_strategy,
+                                  self.ollama_request_timeout or 180) as lease:
+                    try:
+                        return send(lease.url)
+                    except AITimeoutError as e:
+                        timed_out = e
+                    except UserError as e:
+                        lease.failed()
+                        last_error = e
+                        _logger.warning("Ollama endpoint %s failed, trying next: %s",
+                                        lease.url, str(e)[:200])
+            except TimeoutError:
+                raise UserError(_("All Ollama endpoints are busy, try again later."))
+            if timed_out:
+                # Raised outside the lease so the endpoint is not counted as failed
+                raise timed_out
+        raise last_error
+
     # -------------------------------------------------------
     # Main AI dispatcher
     # -------------------------------------------------------
@@ -855,7 +1016,7 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
         }
         _logger.info("OpenAI-compatible POST %s (model=%s)", url, data['model'])
         try:
-            resp = requests.post(url, headers=headers, json=data, timeout=120)
+            resp = self._http_post(url, 120, headers=headers, json=data)
             if resp.status_code != 200:
                 raise UserError(_(
                     "%s API error.\nURL: %s\nStatus: %s\nResponse: %s"
@@ -867,6 +1028,10 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
             return self._format_response(res['choices'][0]['message']['content'])
         except UserError:
             raise
+        except requests.exceptions.ReadTimeout:
+            raise AITimeoutError(_(
+                "%(provider)s at %(url)s timed out after %(timeout)s s.",
+                provider=self.provider, url=url, timeout=120))
         except requests.exceptions.ConnectionError:
             raise UserError(_(
                 "Cannot connect to %s\nURL: %s\n\n"
@@ -882,12 +1047,16 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
     # -------------------------------------------------------
     def _call_ollama(self, prompt, max_tokens, temperature, model_override=None):
         """Call Ollama using native /api/chat or OpenAI-compatible mode."""
+        router = self._get_endpoint_router()
         if self.ollama_api_mode == 'openai':
-            return self._call_openai_compatible(prompt, max_tokens, temperature)
+            if not router:
+                return self._call_openai_compatible(prompt, max_tokens, temperature)
+            return self._route_ollama(router, lambda base: self._call_openai_compatible(
+                prompt, max_tokens, temperature,
+                base_url=base, endpoint=self.api_endpoint or None,
+            ))
 
         # Native Ollama /api/chat
-        base = self._get_base_url()
-        url = f"{base}/api/chat"
         model = model_override or self._get_model_name()
 
         data = {
@@ -902,9 +1071,18 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
                 'temperature': temperature if temperature is not None else self.temperature,
             },
         }
+        if router:
+            return self._route_ollama(router, lambda base: self._ollama_chat(base, data))
+        return self._ollama_chat(self._get_base_url(), data)
+
+    def _ollama_chat(self, base, data):
+        """POST a native /api/chat payload to ``base`` and return the text."""
+        url = f"{base}/api/chat"
+        model = data['model']
         _logger.info("Ollama native POST %s (model=%s)", url, model)
         try:
-            resp = requests.post(url, json=data, timeout=180)
+            timeout = self.ollama_request_timeout or 180
+            resp = self._http_post(url, timeout, json=data)
             if resp.status_code != 200:
                 raise UserError(_(
                     "Ollama error.\nURL: %s\nStatus: %s\nResponse: %s\n\n"
@@ -925,6 +1103,10 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
             return self._format_response(content)
         except UserError:
             raise
+        except requests.exceptions.ReadTimeout:
+            raise AITimeoutError(_(
+                "Ollama at %(url)s timed out after %(timeout)s s.",
+                url=base, timeout=timeout))
         except requests.exceptions.ConnectionError:
             raise UserError(_(
                 "Cannot connect to Ollama at %s\n\n"
@@ -952,7 +1134,7 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
             }
         }
         try:
-            resp = requests.post(url, json=data, timeout=60)
+            resp = self._http_post(url, 60, json=data)
             if resp.status_code != 200:
                 raise UserError(_(
                     "Gemini error.\nStatus: %s\nResponse: %s"
@@ -979,7 +1161,7 @@ Ne fabrique JAMAIS de fausses informations techniques (poids, dimensions, specs)
             'messages': [{'role': 'user', 'content': prompt}],
         }
         try:
-            resp = requests.post(url, headers=headers, json=data, timeout=60)
+            resp = self._http_post(url, 60, headers=headers, json=data)
             if resp.status_code != 200:
                 raise UserError(_(
                     "Anthropic error.\nStatus: %s\nResponse: %s"
@@ -1050,3 +1232,118 @@ class ChatGPTModel(models.Model):
     _sql_constraints = [
         ('code_provider_unique', 'unique(code, provider)', 'Model code must be unique per provider!')
     ]
+
+
+class ChatGPTOllamaEndpoint(models.Model):
+    """One Ollama host of a load-balanced enrichment configuration."""
+    _name = 'chatgpt.ollama.endpoint'
+    _description = 'Ollama Endpoint'
+    _order = 'sequence, id'
+
+    config_id = fields.Many2one('chatgpt.config', string='Config',
+                                required=True, ondelete='cascade')
+    sequence = fields.Integer(default=10)
+    name = fields.Char(string='Name')
+    base_url = fields.Char(string='URL', required=True,
+                           help="Ollama server, e.g. http://192.168.1.20:11434")
+    weight = fields.Integer(string='Weight', default=1,
+                            help="Relative share of the traffic. A host twice as fast gets 2.")
+    max_inflight = fields.Integer(
+        string='Max In-Flight', default=2,
+        help="Concurrent requests sent to this host. "
+             "Match it to OLLAMA_NUM_PARALLEL on the server.")
+    active = fields.Boolean(default=True)
+
+    state = fields.Selection([
+        ('unknown', 'Unknown'),
+        ('up', 'Up'),
+        ('down', 'Down'),
+    ], string='Health', default='unknown', readonly=True)
+    last_check_date = fields.Datetime(string='Last Check', readonly=True)
+    last_check_ms = fields.Float(string='Check Latency (ms)', digits=(10, 0), readonly=True)
+    last_error = fields.Char(string='Last Error', readonly=True)
+
+    # Live counters of this Odoo process (not stored): every worker process
+    # routes its own requests and keeps its own counters
+    inflight = fields.Integer(
+        string='In Flight (this process)', compute='_compute_live_stats',
+        help=LIVE_STATS_HELP,
+    )
+    avg_latency_ms = fields.Float(
+        string='Avg Latency (ms, this process)', digits=(10, 0),
+        compute='_compute_live_stats', help=LIVE_STATS_HELP,
+    )
+    request_count = fields.Integer(
+        string='Requests (this process)', compute='_compute_live_stats',
+        help=LIVE_STATS_HELP,
+    )
+    error_count = fields.Integer(
+        string='Errors (this process)', compute='_compute_live_stats',
+        help=LIVE_STATS_HELP,
+    )
+
+    def _get_url(self):
+        return (self.base_url or '').strip().rstrip('/')
+
+    def _get_router_specs(self):
+        return [{
+            'url': ep._get_url(),
+            'weight': ep.weight,
+            'max_inflight': ep.max_inflight,
+            'up': ep.state != 'down',
+        } for ep in self if ep.base_url]
+
+    @api.depends('base_url', 'config_id')
+    def _compute_live_stats(self):
+        snapshots = {}
+        for ep in self:
+            key = ep.config_id.id
+            if key not in snapshots:
+                snapshots[key] = endpoint_router.get_router(
+                    ('chatgpt.config', key)).snapshot() if key else {}
+            stats = snapshots[key].get(ep._get_url(), {})
+            ep.inflight = stats.get('inflight', 0)
+            ep.avg_latency_ms = stats.get('latency_ms') or 0.0
+            ep.request_count = stats.get('requests', 0)
+            ep.error_count = stats.get('errors', 0)
+
+    def _check_health(self):
+        """Ping /api/tags on each endpoint and update router rotation."""
+        now = fields.Datetime.now()
+        for ep in self:
+            url = ep._get_url()
+            t0 = time.monotonic()
+            error = False
+            try:
+                resp = http_transport.get(f"{url}/api/tags", timeout=5,
+                                          connect_timeout=5, max_retries=0)
+                if resp.status_code != 200:
+                    error = f"HTTP {resp.status_code}"
+            except Exception as e:
+                error = str(e)[:200]
+            healthy = not error
+            router = endpoint_router.get_router(
+                ('chatgpt.config', ep.config_id.id), ep.config_id.endpoint_ids._get_router_specs())
+            router.set_health(url, healthy)
+            if not healthy and ep.state != 'down':
+                _logger.warning("Ollama endpoint %s is down: %s", url, error)
+            ep.write({
+                'state': 'up' if healthy else 'down',
+                'last_check_date': now,
+                'last_check_ms': (time.monotonic() - t0) * 1000.0 if healthy else 0.0,
+                'last_error': error,
+            })
+
+    def action_check_health(self):
+        self._check_health()
+        down = self.filtered(lambda ep: ep.state == 'down')
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Endpoint Health'),
+                'message': _('%d up, %d down.') % (len(self) - len(down), len(down)),
+                'type': 'warning' if down else 'success',
+                'sticky': False,
+            },
+        }
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
+from datetime import timedelta
+
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
 
+THROUGHPUT_MINUTES = 15
+
 
 class ProductEnrichmentDashboard(models.TransientModel):
     _name = 'product.enrichment.dashboard'
@@ -28,6 +32,13 @@ class ProductEnrichmentDashboard(models.TransientModel):
     current_provider = fields.Char(string='Provider', readonly=True)
     current_model = fields.Char(string='Modèle', readonly=True)
 
+    # --- Concurrency ---
+    adaptive_workers = fields.Boolean(string='Workers adaptatifs', readonly=True)
+    current_searxng_workers = fields.Integer(string='SearXNG Workers (actuels)', readonly=True)
+    current_ollama_workers = fields.Integer(string='Ollama Workers (actuels)', readonly=True)
+    throughput_collect = fields.Float(string='Collecte / min', readonly=True)
+    throughput_enrich = fields.Float(string='Enrichissement / min', readonly=True)
+
     # --- Tuning: Ollama ---
     ollama_request_timeout = fields.Integer(string='Ollama Timeout (s)')
     ollama_num_ctx = fields.Integer(string='Context Window')
@@ -89,6 +100,15 @@ class ProductEnrichmentDashboard(models.TransientModel):
             ('product_id.ai_confidence', '=', 'low'),
         ])
 
+        # Throughput over the last minutes
+        since = fields.Datetime.now() - timedelta(minutes=THROUGHPUT_MINUTES)
+        res['throughput_collect'] = round(Queue.search_count([
+            ('date_collected', '>=', since),
+        ]) / THROUGHPUT_MINUTES, 1)
+        res['throughput_enrich'] = round(Queue.search_count([
+            ('date_enriched', '>=', since),
+        ]) / THROUGHPUT_MINUTES, 1)
+
         # Config values
         config = self._get_config()
         if config:
@@ -105,6 +125,13 @@ class ProductEnrichmentDashboard(models.TransientModel):
             res['cfg_batch_size_enrich'] = config.enrichment_batch_size_enrich or 10
             res['cfg_max_tokens'] = config.max_tokens or 4000
             res['cfg_temperature'] = config.temperature if config.temperature is not None else 0.3
+            res['adaptive_workers'] = config.enrichment_adaptive_workers
+            res['current_searxng_workers'] = (
+                config.enrichment_adaptive_workers and config.adaptive_searxng_workers
+                or config.searxng_parallel_workers or 4)
+            res['current_ollama_workers'] = (
+                config.enrichment_adaptive_workers and config.adaptive_ollama_workers
+                or config.ollama_parallel_workers or 2)
 
         return res
 
@@ -3,10 +3,11 @@ import json
 import time
 import re
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import requests as http_requests
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.addons.product_chatgpt_enrichment.services import adaptive_concurrency, http_transport
 
 _logger = logging.getLogger(__name__)
 
@@ -311,6 +312,10 @@ class ProductEnrichmentQueue(models.Model):
             _logger.info("Pipeline: PAUSED, skipping this cycle.")
             return
 
+        if config.enrichment_mode == 'continuous':
+            self._process_pipeline_continuous(config)
+            return
+
         _logger.info("Pipeline: starting cycle...")
 
         # Phase 1: Collect pending items via SearXNG (parallel)
@@ -321,6 +326,174 @@ class ProductEnrichmentQueue(models.Model):
 
         _logger.info("Pipeline: cycle complete.")
 
+    # -------------------------------------------------------
+    # Continuous Pipeline (collect → enrich, producer/consumer)
+    # -------------------------------------------------------
+    def _process_pipeline_continuous(self, config):
+        """Run collection and enrichment as two connected stages.
+
+        The main thread (the only one touching the ORM) keeps both thread
+        pools busy: every free Ollama slot gets the next collected item as
+        soon as its search finished, and searches run ahead of enrichment
+        by at most ``enrichment_prefetch`` items, so the model never waits
+        for a whole search batch and the backlog of collected items stays
+        bounded. Each result is committed as it arrives.
+
+        Runs until both stages are idle or ``enrichment_time_budget`` is
+        spent; in-flight calls are then drained and the cron re-triggered
+        if work remains.
+        """
+        enrich_context = self._prepare_enrich_context(config)
+        if not enrich_context:
+            return
+        router = enrich_context['router']
+        collect_workers = self._get_collect_workers(config)
+        enrich_workers = self._get_enrich_workers(config, router)
+        collect_limiter = self._get_stage_limiter(config, 'searxng', collect_workers)
+        enrich_limiter = self._get_stage_limiter(
+            config, 'ollama', enrich_workers, cap=router.capacity() if router else None)
+        deadline = time.monotonic() + (config.enrichment_time_budget or 60)
+        _logger.info("Pipeline: continuous run, %d search / %d AI workers%s, model=%s",
+                     collect_limiter.limit if collect_limiter else collect_workers,
+                     enrich_limiter.limit if enrich_limiter else enrich_workers,
+                     ' (adaptive)' if enrich_limiter else '', enrich_context['model'])
+
+        collecting = {}   # future -> item id
+        enriching = {}
+        collected = enriched = 0
+        with ThreadPoolExecutor(max_workers=max(collect_workers, collect_limiter.maximum
+                                                if collect_limiter else 0)) as collect_pool, \
+                ThreadPoolExecutor(max_workers=max(enrich_workers, enrich_limiter.maximum
+                                                   if enrich_limiter else 0)) as enrich_pool:
+            while True:
+                cache_hits = 0
+                if enrich_limiter:
+                    enrich_workers = enrich_limiter.limit
+                if collect_limiter:
+                    collect_workers = collect_limiter.limit
+                prefetch = config.enrichment_prefetch or 2 * enrich_workers
+                if time.monotonic() < deadline and not self._is_pipeline_paused(config):
+                    # Consumer stage first: keep every AI slot busy
+                    free = enrich_workers - len(enriching)
+                    if free > 0:
+                        for item in self._claim_items('collected', 'enriching', free):
+                            task = self._prepare_enrich_task(item, enrich_context)
+                            enriching[enrich_pool.submit(self._ollama_worker, task)] = item.id
+                    # Producer stage: search ahead, within the prefetch bound
+                    backlog = self.search_count([('state', '=', 'collected')]) + len(collecting)
+                    free = min(collect_workers - len(collecting), prefetch - backlog)
+                    if free > 0:
+                        for item in self._claim_items('pending', 'collecting', free):
+                            task = self._prepare_collect_task(item, config)
+                            cached = self._collect_from_cache(task)
+                            if cached:
+                                item._write_collect_result(cached, config)
+                                cache_hits += 1
+                            else:
+                                collecting[collect_pool.submit(self._searxng_worker, task)] = item.id
+                    self.env.cr.commit()
+
+                collected += cache_hits
+                if cache_hits:
+                    # Items collected from the cache: hand them to the AI now
+                    continue
+                running = set(collecting) | set(enriching)
+                if not running:
+                    break
+                done, _pending = wait(running, timeout=5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if future in collecting:
+                        item = self.browse(collecting.pop(future))
+                        self._record_outcome(collect_limiter, result, config.searxng_timeout or 15)
+                        item._write_collect_result(result, config)
+                        collected += 1
+                    else:
+                        item = self.browse(enriching.pop(future))
+                        self._record_outcome(enrich_limiter, result, enrich_context['timeout'])
+                        item._write_enrich_result(result, config)
+                        enriched += 1
+                    self.env.cr.commit()
+
+        _logger.info("Pipeline: continuous run done, %d collected, %d enriched.",
+                     collected, enriched)
+        self._save_learnt_limits(config, collect_limiter, enrich_limiter)
+        if time.monotonic() >= deadline and self.search_count(
+                [('state', 'in', ('pending', 'collected'))]):
+            cron = self.env.ref('product_chatgpt_enrichment.ir_cron_ai_pipeline',
+                                raise_if_not_found=False)
+            if cron:
+                cron._trigger()
+
+    @api.model
+    def _claim_items(self, from_state, to_state, limit):
+        """Move up to ``limit`` items from ``from_state`` to ``to_state``
+        (best priority first) and return them."""
+        order = 'priority desc, date_collected asc' if from_state == 'collected' \
+            else 'priority desc, date_queued asc'
+        items = self.search([('state', '=', from_state)], limit=limit, order=order)
+        if items:
+            items.write({'state': to_state})
+        return items
+
+    @api.model
+    def _is_pipeline_paused(self, config):
+        """Re-read the pause flag, which the STOP button commits meanwhile."""
+        config.invalidate_recordset(['enrichment_paused'])
+        return config.enrichment_paused
+
+    # -------------------------------------------------------
+    # Worker counts (fixed or adaptive)
+    # -------------------------------------------------------
+    @api.model
+    def _get_collect_workers(self, config):
+        return max(1, config.searxng_parallel_workers or 4)
+
+    @api.model
+    def _get_enrich_workers(self, config, router=None):
+        workers = max(1, config.ollama_parallel_workers or 2)
+        if router:
+            # Enough threads to fill every endpoint; the router caps per-host load
+            workers = max(workers, router.capacity())
+        return workers
+
+    @api.model
+    def _get_stage_limiter(self, config, stage, workers, cap=None):
+        """Adaptive limiter of ``stage`` ('searxng' or 'ollama'), or None
+        when adaptive workers are disabled. It starts from the last learnt
+        limit, else from ``workers``."""
+        if not config.enrichment_adaptive_workers:
+            return None
+        learnt = config['adaptive_%s_workers' % stage]
+        return adaptive_concurrency.get_limiter(
+            (self.env.cr.dbname, config.id, stage),
+            initial=learnt or workers,
+            maximum=cap or config.adaptive_max_workers or 16,
+            tolerance=config.adaptive_latency_tolerance or 2.0,
+        )
+
+    @staticmethod
+    def _record_outcome(limiter, result, timeout):
+        """Feed a worker result to ``limiter`` (cache hits say nothing about load)."""
+        if limiter is None or result.get('cached'):
+            return
+        error = (result.get('error') or '').lower()
+        timed_out = 'timed out' in error or 'timeout' in error
+        limiter.record(result.get('elapsed') or (timeout if timed_out else 0.0),
+                       ok=not error, timeout=timed_out)
+
+    @api.model
+    def _save_learnt_limits(self, config, collect_limiter=None, enrich_limiter=None):
+        """Persist the learnt limits (next run's starting point, dashboard)."""
+        vals = {}
+        if collect_limiter and collect_limiter.limit != config.adaptive_searxng_workers:
+            vals['adaptive_searxng_workers'] = collect_limiter.limit
+        if enrich_limiter and enrich_limiter.limit != config.adaptive_ollama_workers:
+            vals['adaptive_ollama_workers'] = enrich_limiter.limit
+        if vals:
+            config.sudo().write(vals)
+            self.env.cr.commit()
+
     # -------------------------------------------------------
     # Parallel SearXNG Collection (ThreadPoolExecutor)
     # -------------------------------------------------------
@@ -329,11 +502,13 @@ class ProductEnrichmentQueue(models.Model):
 
         Args:
             searxng_params: dict with base_url, engines, language, max_results,
-                            timeout, delay, product_name, ean, brand, item_id
+                            timeout, delay, product_name, ean, brand, item_id,
+                            cache_key (optional, enables in-flight dedup)
         Returns:
-            dict with item_id, results, query_tech, elapsed, error
+            dict with item_id, results, query_tech, elapsed, error, cache_key
         """
         from odoo.addons.product_chatgpt_enrichment.services.searxng_client import SearXNGClient
+        from odoo.addons.product_chatgpt_enrichment.services import searxng_client
         item_id = searxng_params['item_id']
         try:
             client = SearXNGClient(
@@ -345,11 +520,20 @@ class ProductEnrichmentQueue(models.Model):
                 delay_between_requests=searxng_params['delay'],
             )
             t0 = time.time()
-            result = client.search_product(
-                product_name=searxng_params['product_name'],
-                ean=searxng_params['ean'],
-                brand=searxng_params['brand'],
-            )
+
+            def _search():
+                return client.search_product(
+                    product_name=searxng_params['product_name'],
+                    ean=searxng_params['ean'],
+                    brand=searxng_params['brand'],
+                )
+
+            cache_key = searxng_params.get('cache_key')
+            if cache_key:
+                # Identical searches running in other workers share one request
+                result = searxng_client.shared_call(cache_key, _search)
+            else:
+                result = _search()
             elapsed = time.time() - t0
             return {
                 'item_id': item_id,
@@ -357,6 +541,7 @@ class ProductEnrichmentQueue(models.Model):
                 'query_tech': result.get('query_tech', ''),
                 'elapsed': round(elapsed, 2),
                 'error': None,
+                'cache_key': cache_key,
             }
         except Exception as e:
             return {
@@ -382,30 +567,24 @@ class ProductEnrichmentQueue(models.Model):
         items.write({'state': 'collecting'})
         self.env.cr.commit()
 
-        # Prepare search parameters (read ORM data in main thread)
+        # Prepare search parameters (read ORM data in main thread);
+        # cached searches are written at once
         tasks = []
         for item in items:
-            product = item.product_id
-            ean = ''
-            if hasattr(product, 'barcode') and product.barcode:
-                ean = product.barcode
-            brand = ''
-            if hasattr(product, 'product_brand_id') and product.product_brand_id:
-                brand = product.product_brand_id.name
-            tasks.append({
-                'item_id': item.id,
-                'product_name': product.name or '',
-                'ean': ean,
-                'brand': brand,
-                'base_url': config.searxng_base_url or 'http://searxng:8080',
-                'engines': config.searxng_engines or 'google,duckduckgo',
-                'language': config.searxng_language or 'fr-FR',
-                'max_results': config.searxng_max_results or 8,
-                'timeout': config.searxng_timeout or 15,
-                'delay': config.searxng_delay or 3.0,
-            })
-
-        max_workers = max(1, config.searxng_parallel_workers or 4)
+            task = self._prepare_collect_task(item, config)
+            cached = self._collect_from_cache(task)
+            if cached:
+                item._write_collect_result(cached, config)
+            else:
+                tasks.append(task)
+        self.env.cr.commit()
+        if not tasks:
+            return
+
+        max_workers = self._get_collect_workers(config)
+        limiter = self._get_stage_limiter(config, 'searxng', max_workers)
+        if limiter:
+            max_workers = limiter.limit
         _logger.info("Pipeline Collect: processing %d items with %d parallel workers...",
                       len(tasks), max_workers)
 
@@ -415,40 +594,94 @@ class ProductEnrichmentQueue(models.Model):
             futures = {executor.submit(self._searxng_worker, t): t['item_id'] for t in tasks}
             for future in as_completed(futures):
                 result = future.result()
+                self._record_outcome(limiter, result, config.searxng_timeout or 15)
                 results_map[result['item_id']] = result
 
         # Write results back in main thread (ORM-safe)
         for item in items:
             result = results_map.get(item.id)
-            if not result:
-                continue
-            try:
-                if result['error']:
-                    attempt = item.attempt_count + 1
-                    new_state = 'skipped' if attempt >= item.max_attempts else 'error'
-                    item.write({
-                        'state': new_state,
-                        'error_message': result['error'],
-                        'attempt_count': attempt,
-                    })
-                    _logger.error("Pipeline Collect FAIL: %s: %s",
-                                  item.product_id.name, result['error'][:200])
-                else:
-                    item.write({
-                        'search_query_used': result['query_tech'],
-                        'raw_web_data': json.dumps(result['results'],
-                                                   ensure_ascii=False, indent=2),
-                        'processing_time_search': result['elapsed'],
-                        'date_collected': fields.Datetime.now(),
-                        'state': 'collected',
-                        'error_message': False,
-                    })
-                    _logger.info("Pipeline Collect OK: %s (%d results, %.1fs)",
-                                 item.product_id.name, len(result['results']),
-                                 result['elapsed'])
-            except Exception as e:
-                _logger.error("Pipeline Collect write error for item %s: %s", item.id, e)
+            if result:
+                item._write_collect_result(result, config)
         self.env.cr.commit()
+        self._save_learnt_limits(config, collect_limiter=limiter)
+
+    def _prepare_collect_task(self, item, config):
+        """SearXNG worker parameters for ``item`` (main thread, reads the ORM)."""
+        product = item.product_id
+        ean = ''
+        if hasattr(product, 'barcode') and product.barcode:
+            ean = product.barcode
+        brand = ''
+        if hasattr(product, 'product_brand_id') and product.product_brand_id:
+            brand = product.product_brand_id.name
+        cache_key = False
+        if config.searxng_cache_enabled:
+            cache_key = self.env['searxng.search.cache']._make_key(
+                product.name or '', ean, brand, config)
+        return {
+            'item_id': item.id,
+            'product_name': product.name or '',
+            'ean': ean,
+            'brand': brand,
+            'cache_key': cache_key,
+            'base_url': config.searxng_base_url or 'http://searxng:8080',
+            'engines': config.searxng_engines or 'google,duckduckgo',
+            'language': config.searxng_language or 'fr-FR',
+            'max_results': config.searxng_max_results or 8,
+            'timeout': config.searxng_timeout or 15,
+            'delay': config.searxng_delay or 3.0,
+        }
+
+    @api.model
+    def _collect_from_cache(self, task):
+        """Worker-like result for ``task`` from the search cache, or None."""
+        if not task.get('cache_key'):
+            return None
+        cached = self.env['searxng.search.cache']._lookup(task['cache_key'])
+        if cached is None:
+            return None
+        return {
+            'item_id': task['item_id'],
+            'results': cached['results'],
+            'query_tech': cached['query_tech'],
+            'elapsed': 0,
+            'error': None,
+            'cached': True,
+        }
+
+    def _write_collect_result(self, result, config):
+        """Store a SearXNG worker result on this item (main thread) and
+        cache fresh results."""
+        item = self
+        if not result['error'] and result.get('cache_key') and not result.get('cached'):
+            self.env['searxng.search.cache']._store(
+                result['cache_key'], result, config, product_name=item.product_id.name)
+        try:
+            if result['error']:
+                attempt = item.attempt_count + 1
+                new_state = 'skipped' if attempt >= item.max_attempts else 'error'
+                item.write({
+                    'state': new_state,
+                    'error_message': result['error'],
+                    'attempt_count': attempt,
+                })
+                _logger.error("Pipeline Collect FAIL: %s: %s",
+                              item.product_id.name, result['error'][:200])
+            else:
+                item.write({
+                    'search_query_used': result['query_tech'],
+                    'raw_web_data': json.dumps(result['results'],
+                                               ensure_ascii=False, indent=2),
+                    'processing_time_search': result['elapsed'],
+                    'date_collected': fields.Datetime.now(),
+                    'state': 'collected',
+                    'error_message': False,
+                })
+                _logger.info("Pipeline Collect OK: %s (%d results, %.1fs%s)",
+                             item.product_id.name, len(result['results']),
+                             result['elapsed'], ', cached' if result.get('cached') else '')
+        except Exception as e:
+            _logger.error("Pipeline Collect write error for item %s: %s", item.id, e)
 
     # -------------------------------------------------------
     # Parallel Ollama Enrichment (ThreadPoolExecutor)
@@ -458,13 +691,39 @@ class ProductEnrichmentQueue(models.Model):
 
         Args:
             ollama_params: dict with base_url, model, prompt, max_tokens,
-                           temperature, item_id
+                           temperature, item_id, transport (pool settings),
+                           router/strategy (optional endpoint load balancing)
         Returns:
             dict with item_id, response, elapsed, error
         """
+        router = ollama_params.get('router')
+        if not router:
+            return self._ollama_worker_call(ollama_params, ollama_params['base_url'])
+        # Load-balanced: lease the least loaded endpoint, fail over on error
+        result = None
+        for _attempt in range(router.size()):
+            try:
+                with router.lease(ollama_params.get('strategy', 'least_loaded'),
+                                  ollama_params.get('timeout', 180)) as lease:
+                    result = self._ollama_worker_call(ollama_params, lease.url)
+                    if not result['error'] or result.get('timed_out'):
+                        # A timeout is a slow model, not a dead host: no failover
+                        return result
+                    lease.failed()
+            except TimeoutError:
+                break
+        return result or {
+            'item_id': ollama_params['item_id'],
+            'response': '',
+            'elapsed': 0,
+            'error': 'All Ollama endpoints are busy.',
+        }
+
+    def _ollama_worker_call(self, ollama_params, base_url):
+        """Single /api/chat call to ``base_url`` (pure HTTP, no ORM)."""
         item_id = ollama_params['item_id']
         try:
-            url = f"{ollama_params['base_url']}/api/chat"
+            url = f"{base_url}/api/chat"
             data = {
                 'model': ollama_params['model'],
                 'messages': [
@@ -482,7 +741,8 @@ class ProductEnrichmentQueue(models.Model):
             }
             timeout = ollama_params.get('timeout', 180)
             t0 = time.time()
-            resp = http_requests.post(url, json=data, timeout=timeout)
+            resp = http_transport.post(url, json=data, timeout=timeout,
+                                       **ollama_params.get('transport', {}))
             elapsed = time.time() - t0
 
             if resp.status_code != 200:
@@ -515,6 +775,14 @@ class ProductEnrichmentQueue(models.Model):
                 'elapsed': round(elapsed, 2),
                 'error': None,
             }
+        except http_requests.exceptions.ReadTimeout:
+            return {
+                'item_id': item_id,
+                'response': '',
+                'elapsed': round(time.time() - t0, 2),
+                'error': f"Ollama timed out after {timeout}s",
+                'timed_out': True,
+            }
         except Exception as e:
             return {
                 'item_id': item_id,
@@ -525,24 +793,10 @@ class ProductEnrichmentQueue(models.Model):
 
     def _process_enrich_parallel(self, config):
         """Enrich collected items using parallel Ollama workers."""
-        # Safety check: detect and fix wrong model for Ollama
-        resolved_model = config._get_model_name()
-        model_override = None
-
-        OPENAI_MODELS = {'gpt-4o-mini', 'gpt-4o', 'gpt-3.5-turbo', 'gpt-4', 'gpt-4-turbo'}
-        if config.provider == 'ollama' and resolved_model in OPENAI_MODELS:
-            _logger.warning("Pipeline Enrich: model '%s' invalid for Ollama, auto-detecting...",
-                            resolved_model)
-            model_override = self._auto_detect_ollama_model(config)
-            if model_override:
-                config.sudo().write({'ai_model_name': model_override, 'model_id': False})
-                self.env.cr.commit()
-                _logger.info("Pipeline Enrich: fixed config → model='%s'", model_override)
-            else:
-                _logger.error("Pipeline Enrich: no Ollama models found! Aborting.")
-                return
-
-        effective_model = model_override or resolved_model
+        enrich_context = self._prepare_enrich_context(config)
+        if not enrich_context:
+            return
+        effective_model = enrich_context['model']
         batch_size = config.enrichment_batch_size_enrich or 10
         items = self.search([
             ('state', '=', 'collected'),
@@ -557,55 +811,14 @@ class ProductEnrichmentQueue(models.Model):
         self.env.cr.commit()
 
         # Build prompts in main thread (needs ORM)
-        prompt_template = config.enrichment_prompt_template or ''
-        base_url = config._get_base_url()
-        tasks = []
-        for item in items:
-            product = item.product_id
-            # Build web context
-            web_results = json.loads(item.raw_web_data or '[]')
-            web_context_parts = []
-            for r in web_results[:10]:
-                title = r.get('title', '')
-                content = r.get('content', '')[:500]
-                url = r.get('url', '')
-                web_context_parts.append(f"[{title}]({url}): {content}")
-            web_context = "\n\n".join(web_context_parts) or "Aucune donnée web disponible."
-
-            # Build product context
-            ean = getattr(product, 'barcode', '') or ''
-            brand = ''
-            if hasattr(product, 'product_brand_id') and product.product_brand_id:
-                brand = product.product_brand_id.name
-            categ_name = product.categ_id.complete_name if product.categ_id else ''
-            current_desc = ''
-            if product.description_sale:
-                current_desc = product.description_sale[:300]
-
-            prompt = prompt_template.format(
-                product_name=product.name or '',
-                ean=ean,
-                default_code=product.default_code or '',
-                brand=brand,
-                categ_name=categ_name,
-                current_description=current_desc,
-                list_price=product.list_price or 0,
-                web_context=web_context,
-            )
-            tasks.append({
-                'item_id': item.id,
-                'prompt': prompt,
-                'base_url': base_url,
-                'model': effective_model,
-                'max_tokens': config.max_tokens or 4000,
-                'temperature': config.temperature if config.temperature is not None else 0.3,
-                'timeout': config.ollama_request_timeout or 180,
-                'num_ctx': config.ollama_num_ctx or 4096,
-                'num_gpu': config.ollama_num_gpu if config.ollama_num_gpu is not None else 99,
-                'keep_alive': config.ollama_keep_alive or '10m',
-            })
-
-        max_workers = max(1, config.ollama_parallel_workers or 2)
+        tasks = [self._prepare_enrich_task(item, enrich_context) for item in items]
+        router = enrich_context['router']
+
+        max_workers = self._get_enrich_workers(config, router)
+        limiter = self._get_stage_limiter(
+            config, 'ollama', max_workers, cap=router.capacity() if router else None)
+        if limiter:
+            max_workers = limiter.limit
         _logger.info("Pipeline Enrich: processing %d items with %d parallel workers (model=%s)...",
                       len(tasks), max_workers, effective_model)
 
@@ -615,42 +828,131 @@ class ProductEnrichmentQueue(models.Model):
             futures = {executor.submit(self._ollama_worker, t): t['item_id'] for t in tasks}
             for future in as_completed(futures):
                 result = future.result()
+                self._record_outcome(limiter, result, enrich_context['timeout'])
                 results_map[result['item_id']] = result
 
         # Write results back in main thread (ORM-safe)
         for item in items:
             result = results_map.get(item.id)
-            if not result:
-                continue
-            try:
-                if result['error']:
-                    attempt = item.attempt_count + 1
-                    new_state = 'skipped' if attempt >= item.max_attempts else 'error'
-                    item.write({
-                        'state': new_state,
-                        'error_message': result['error'],
-                        'attempt_count': attempt,
-                    })
-                    _logger.error("Pipeline Enrich FAIL: %s: %s",
-                                  item.product_id.name, result['error'][:200])
-                else:
-                    parsed = self._parse_ai_response(result['response'])
-                    item.write({
-                        'raw_ollama_response': result['response'][:50000],
-                        'enriched_data': json.dumps(parsed, ensure_ascii=False, indent=2) if parsed else '',
-                        'processing_time_ollama': result['elapsed'],
-                        'date_enriched': fields.Datetime.now(),
-                        'state': 'done',
-                        'error_message': False,
-                    })
-                    if parsed:
-                        self._apply_enrichment(item, parsed, config)
-                    confidence = parsed.get('confiance', '?') if parsed else '?'
-                    _logger.info("Pipeline Enrich OK: %s (confidence=%s, %.1fs)",
-                                 item.product_id.name, confidence, result['elapsed'])
-            except Exception as e:
-                _logger.error("Pipeline Enrich write error for item %s: %s", item.id, e)
+            if result:
+                item._write_enrich_result(result, config)
         self.env.cr.commit()
+        self._save_learnt_limits(config, enrich_limiter=limiter)
+
+    def _prepare_enrich_context(self, config):
+        """Settings shared by every enrichment task of a run (main thread).
+
+        Checks the model (auto-detected when an OpenAI model name is set on
+        an Ollama config) and the endpoints' health.
+
+        :returns: dict, or None when no usable model was found
+        """
+        # Safety check: detect and fix wrong model for Ollama
+        resolved_model = config._get_model_name()
+        model_override = None
+
+        OPENAI_MODELS = {'gpt-4o-mini', 'gpt-4o', 'gpt-3.5-turbo', 'gpt-4', 'gpt-4-turbo'}
+        if config.provider == 'ollama' and resolved_model in OPENAI_MODELS:
+            _logger.warning("Pipeline Enrich: model '%s' invalid for Ollama, auto-detecting...",
+                            resolved_model)
+            model_override = self._auto_detect_ollama_model(config)
+            if model_override:
+                config.sudo().write({'ai_model_name': model_override, 'model_id': False})
+                self.env.cr.commit()
+                _logger.info("Pipeline Enrich: fixed config → model='%s'", model_override)
+            else:
+                _logger.error("Pipeline Enrich: no Ollama models found! Aborting.")
+                return None
+
+        if config.provider == 'ollama' and config.endpoint_ids:
+            config.endpoint_ids._check_health()
+            self.env.cr.commit()
+        return {
+            'model': model_override or resolved_model,
+            'prompt_template': config.enrichment_prompt_template or '',
+            'base_url': config._get_base_url(),
+            'transport': config._get_transport_options(),
+            'router': config._get_endpoint_router(),
+            'strategy': config.endpoint_strategy,
+            'max_tokens': config.max_tokens or 4000,
+            'temperature': config.temperature if config.temperature is not None else 0.3,
+            'timeout': config.ollama_request_timeout or 180,
+            'num_ctx': config.ollama_num_ctx or 4096,
+            'num_gpu': config.ollama_num_gpu if config.ollama_num_gpu is not None else 99,
+            'keep_alive': config.ollama_keep_alive or '10m',
+        }
+
+    def _prepare_enrich_task(self, item, enrich_context):
+        """Ollama worker parameters for ``item`` (main thread, reads the ORM)."""
+        product = item.product_id
+        # Build web context
+        web_results = json.loads(item.raw_web_data or '[]')
+        web_context_parts = []
+        for r in web_results[:10]:
+            title = r.get('title', '')
+            content = r.get('content', '')[:500]
+            url = r.get('url', '')
+            web_context_parts.append(f"[{title}]({url}): {content}")
+        web_context = "\n\n".join(web_context_parts) or "Aucune donnée web disponible."
+
+        # Build product context
+        ean = getattr(product, 'barcode', '') or ''
+        brand = ''
+        if hasattr(product, 'product_brand_id') and product.product_brand_id:
+            brand = product.product_brand_id.name
+        categ_name = product.categ_id.complete_name if product.categ_id else ''
+        current_desc = ''
+        if product.description_sale:
+            current_desc = product.description_sale[:300]
+
+        prompt = enrich_context['prompt_template'].format(
+            product_name=product.name or '',
+            ean=ean,
+            default_code=product.default_code or '',
+            brand=brand,
+            categ_name=categ_name,
+            current_description=current_desc,
+            list_price=product.list_price or 0,
+            web_context=web_context,
+        )
+        task = {key: enrich_context[key] for key in (
+            'base_url', 'model', 'max_tokens', 'temperature', 'timeout', 'num_ctx',
+            'num_gpu', 'keep_alive', 'transport', 'router', 'strategy')}
+        task.update({'item_id': item.id, 'prompt': prompt})
+        return task
+
+    def _write_enrich_result(self, result, config):
+        """Store an Ollama worker result on this item and apply it to the
+        product (main thread)."""
+        item = self
+        try:
+            if result['error']:
+                attempt = item.attempt_count + 1
+                new_state = 'skipped' if attempt >= item.max_attempts else 'error'
+                item.write({
+                    'state': new_state,
+                    'error_message': result['error'],
+                    'attempt_count': attempt,
+                })
+                _logger.error("Pipeline Enrich FAIL: %s: %s",
+                              item.product_id.name, result['error'][:200])
+            else:
+                parsed = self._parse_ai_response(result['response'])
+                item.write({
+                    'raw_ollama_response': result['response'][:50000],
+                    'enriched_data': json.dumps(parsed, ensure_ascii=False, indent=2) if parsed else '',
+                    'processing_time_ollama': result['elapsed'],
+                    'date_enriched': fields.Datetime.now(),
+                    'state': 'done',
+                    'error_message': False,
+                })
+                if parsed:
+                    self._apply_enrichment(item, parsed, config)
+                confidence = parsed.get('confiance', '?') if parsed else '?'
+                _logger.info("Pipeline Enrich OK: %s (confidence=%s, %.1fs)",
+                             item.product_id.name, confidence, result['elapsed'])
+        except Exception as e:
+            _logger.error("Pipeline Enrich write error for item %s: %s", item.id, e)
 
     # -------------------------------------------------------
     # Legacy Cron 1: SearXNG Web Data Collection (kept as fallback)
@@ -1034,10 +1336,13 @@ class ProductEnrichmentQueue(models.Model):
             config = self.env['chatgpt.config'].get_searxng_config()
         except Exception:
             raise UserError(_("No SearXNG configuration found."))
-        # Phase 1: Collect pending items via SearXNG (parallel)
-        self._process_collect_parallel(config)
-        # Phase 2: Enrich collected items via Ollama (parallel)
-        self._process_enrich_parallel(config)
+        if config.enrichment_mode == 'continuous':
+            self._process_pipeline_continuous(config)
+        else:
+            # Phase 1: Collect pending items via SearXNG (parallel)
+            self._process_collect_parallel(config)
+            # Phase 2: Enrich collected items via Ollama (parallel)
+            self._process_enrich_parallel(config)
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+from odoo.addons.product_chatgpt_enrichment.services import searxng_client
+
+_logger = logging.getLogger(__name__)
+
+
+class SearxngSearchCache(models.Model):
+    """Persistent SearXNG search results.
+
+    The key is a hash of the normalized (EAN, brand, name, engines,
+    language) of a product search, so retried or reset queue items,
+    variants and templates sharing an EAN reuse the same results instead
+    of querying SearXNG again.
+    """
+    _name = 'searxng.search.cache'
+    _description = 'SearXNG Search Cache'
+    _order = 'last_hit_date desc'
+    _rec_name = 'product_name'
+
+    key = fields.Char(string='Key', required=True, index=True, readonly=True)
+    product_name = fields.Char(string='Product', readonly=True)
+    query_tech = fields.Char(string='Search Query', readonly=True)
+    results = fields.Text(string='Results (JSON)', readonly=True)
+    result_count = fields.Integer(string='Results', readonly=True)
+    hit_count = fields.Integer(string='Hits', default=0, readonly=True)
+    last_hit_date = fields.Datetime(
+        string='Last Used', default=fields.Datetime.now, readonly=True,
+    )
+    expire_date = fields.Datetime(string='Expires', index=True, readonly=True)
+
+    _sql_constraints = [
+        ('key_unique', 'unique(key)', 'Cache key must be unique!'),
+    ]
+
+    # Hits are counted in memory and written at most once per entry every
+    # _HIT_WRITE_INTERVAL seconds, so concurrent queue runs sharing an EAN
+    # do not rewrite (and lock) the same row on every lookup
+    _HIT_WRITE_INTERVAL = 600
+    _pending_hits = {}
+
+    @api.model
+    def _make_key(self, product_name, ean, brand, config):
+        return searxng_client.make_cache_key(
+            product_name, ean, brand,
+            config.searxng_engines or 'google,duckduckgo',
+            config.searxng_language or 'fr-FR',
+        )
+
+    @api.model
+    def _lookup(self, key):
+        """Return ``{'query_tech', 'results'}`` for ``key``, or None if missing/expired."""
+        entry = self.sudo().search([('key', '=', key)], limit=1)
+        if not entry:
+            return None
+        now = fields.Datetime.now()
+        if entry.expire_date and entry.expire_date < now:
+            return None
+        pending = type(self)._pending_hits
+        hits = pending.pop(entry.id, 0) + 1
+        if entry.last_hit_date and \
+                now - entry.last_hit_date < timedelta(seconds=self._HIT_WRITE_INTERVAL):
+            pending[entry.id] = hits
+        else:
+            entry.write({
+                'hit_count': entry.hit_count + hits,
+                'last_hit_date': now,
+            })
+        return {
+            'query_tech': entry.query_tech or '',
+            'results': json.loads(entry.results or '[]'),
+        }
+
+    @api.model
+    def _store(self, key, result, config, product_name=''):
+        """Insert or refresh an entry. Empty result lists are not cached. Never raises."""
+        if not result.get('results'):
+            return
+        ttl = config.searxng_cache_ttl_hours
+        now = fields.Datetime.now()
+        vals = {
+            'query_tech': result.get('query_tech', ''),
+            'results': json.dumps(result['results'], ensure_ascii=False),
+            'result_count': len(result['results']),
+            'last_hit_date': now,
+            'expire_date': fields.Datetime.add(now, hours=ttl) if ttl > 0 else False,
+        }
+        Cache = self.sudo()
+        try:
+            with self.env.cr.savepoint():
+                entry = Cache.search([('key', '=', key)], limit=1)
+                if entry:
+                    entry.write(vals)
+                else:
+                    vals.update({'key': key, 'product_name': (product_name or '')[:200]})
+                    Cache.create(vals)
+        except Exception as e:
+            # Another worker stored the same key first: nothing to do
+            _logger.debug("SearXNG cache store skipped: %s", e)
+
+    @api.autovacuum
+    def _gc_cache(self):
+        """Drop expired entries."""
+        self.env.cr.execute(
+            "DELETE FROM searxng_search_cache WHERE expire_date < (now() at time zone 'UTC')"
+        )
+        if self.env.cr.rowcount:
+            _logger.info("SearXNG cache cleanup: %d expired.", self.env.cr.rowcount)
+        # Bound the in-memory counters: entries deleted meanwhile never
+        # flush theirs (live entries lose at most one interval of hits)
+        type(self)._pending_hits.clear()
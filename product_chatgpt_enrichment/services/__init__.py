@@ -1,2 +1,5 @@
 # -*- coding: utf-8 -*-
+from . import adaptive_concurrency
+from . import endpoint_router
+from . import http_transport
 from . import searxng_client
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Adaptive concurrency limit for one pipeline stage (no ORM).
+
+AIMD driven by latency, in the spirit of TCP congestion control:
+
+* every successful call adds ``1 / limit`` to the limit, i.e. +1 worker
+  per full round of calls (additive increase);
+* an error, a timeout, or an average latency above ``tolerance`` times
+  the uncongested baseline multiplies the limit by ``backoff``
+  (multiplicative decrease), at most once per ``cooldown`` so one burst of
+  failures counts once.
+
+The baseline is the lowest latency observed, slowly pulled towards the
+average so that a slower model or longer prompts do not pin the limit at
+its minimum. When Ollama starts queueing requests internally, latency
+rises well above the baseline long before the 180 s timeout, and the
+limit shrinks back to what the hardware serves in parallel.
+
+Limiters are shared by the pipeline threads and kept per process, so the
+learnt limit survives between cron runs.
+"""
+import threading
+import time
+from collections import deque
+
+LATENCY_ALPHA = 0.3         # EWMA smoothing of latencies
+BASELINE_DRIFT = 0.02       # how fast the baseline follows the average
+THROUGHPUT_WINDOW = 300     # seconds of completions kept for throughput
+
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+class AdaptiveLimiter:
+
+    def __init__(self, initial, minimum=1, maximum=16, tolerance=2.0, backoff=0.7):
+        self._lock = threading.Lock()
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.tolerance = max(1.1, tolerance)
+        self.backoff = backoff
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency = None
+        self.baseline = None
+        self.successes = 0
+        self.failures = 0
+        self._last_decrease = 0.0
+        self._completions = deque()
+
+    def configure(self, minimum=None, maximum=None, tolerance=None):
+        with self._lock:
+            if minimum is not None:
+                self.minimum = max(1, minimum)
+            if maximum is not None:
+                self.maximum = max(self.minimum, maximum)
+            if tolerance is not None:
+                self.tolerance = max(1.1, tolerance)
+            self._limit = min(max(self._limit, self.minimum), self.maximum)
+
+    @property
+    def limit(self):
+        """Current number of workers allowed."""
+        return int(self._limit)
+
+    def record(self, latency, ok=True, timeout=False):
+        """Feed the outcome of one call (``latency`` in seconds)."""
+        now = time.monotonic()
+        with self._lock:
+            self._completions.append(now)
+            while self._completions and self._completions[0] < now - THROUGHPUT_WINDOW:
+                self._completions.popleft()
+            if not ok or timeout:
+                self.failures += 1
+                self._decrease(now)
+                return
+            self.successes += 1
+            self.latency = latency if self.latency is None else (
+                LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency)
+            if self.baseline is None or latency < self.baseline:
+                self.baseline = latency
+            else:
+                self.baseline += (self.latency - self.baseline) * BASELINE_DRIFT
+            if self.baseline and self.latency > self.baseline * self.tolerance:
+                self._decrease(now)
+            else:
+                self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+
+    def _decrease(self, now):
+        # One decrease per round trip: the calls already in flight were
+        # started under the old limit and would otherwise count again
+        cooldown = max(1.0, self.latency or 0.0)
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.minimum), self._limit * self.backoff)
+
+    def throughput(self, window=60):
+        """Completed calls per minute over the last ``window`` seconds."""
+        since = time.monotonic() - window
+        with self._lock:
+            count = sum(1 for t in self._completions if t >= since)
+        return count * 60.0 / window
+
+    def snapshot(self):
+        return {
+            'limit': self.limit,
+            'latency': self.latency,
+            'baseline': self.baseline,
+            'successes': self.successes,
+            'failures': self.failures,
+            'throughput': self.throughput(),
+        }
+
+
+def get_limiter(key, initial, minimum=1, maximum=16, tolerance=2.0):
+    """Return the process-wide limiter for ``key``, created at ``initial``."""
+    limiter = _LIMITERS.get(key)
+    if limiter is None:
+        with _LIMITERS_LOCK:
+            limiter = _LIMITERS.get(key)
+            if limiter is None:
+                limiter = AdaptiveLimiter(initial, minimum, maximum, tolerance)
+                _LIMITERS[key] = limiter
+                return limiter
+    limiter.configure(minimum, maximum, tolerance)
+    return limiter
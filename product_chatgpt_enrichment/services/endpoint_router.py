@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""In-process load balancer over several Ollama endpoints.
+
+A router holds, per endpoint URL, the number of in-flight requests, an
+exponentially weighted latency average and a health flag. Callers lease an
+endpoint for the duration of one request::
+
+    with router.lease('least_loaded') as lease:
+        resp = post(f"{lease.url}/api/chat", ...)
+        if resp.status_code >= 500:
+            lease.failed()
+
+Leasing blocks while every healthy endpoint is at its ``max_inflight``, so
+the total parallelism is bounded by the sum of endpoint capacities.
+Consecutive failures take an endpoint out of rotation for a cooldown; the
+health-check cron puts it back as soon as it answers again, and its result
+is stored on the endpoint so every Odoo process follows it.
+
+Routers are plain Python and thread-safe: they are shared between the ORM
+path and ``ThreadPoolExecutor`` workers. Counters are per Odoo process.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+STRATEGIES = ('least_loaded', 'round_robin')
+FAILURES_BEFORE_DOWN = 3
+DOWN_COOLDOWN = 60          # seconds before a failed endpoint is retried
+LATENCY_ALPHA = 0.2         # EWMA smoothing factor
+DEFAULT_LEASE_TIMEOUT = 600
+
+_ROUTERS = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+class _Endpoint:
+    __slots__ = ('url', 'weight', 'max_inflight', 'inflight', 'current',
+                 'latency_ms', 'requests', 'errors', 'failures', 'down_until')
+
+    def __init__(self, url, weight, max_inflight):
+        self.url = url
+        self.weight = weight
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.current = 0            # smooth weighted round-robin state
+        self.latency_ms = None
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0
+        self.down_until = 0.0
+
+    def is_up(self, now):
+        return self.down_until <= now
+
+    def has_slot(self):
+        return self.inflight < self.max_inflight
+
+
+class Lease:
+    """One request routed to ``url``; call :meth:`failed` on error."""
+    __slots__ = ('url', 'ok')
+
+    def __init__(self, url):
+        self.url = url
+        self.ok = True
+
+    def failed(self):
+        self.ok = False
+
+
+class EndpointRouter:
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._endpoints = {}
+
+    def configure(self, specs):
+        """(Re)load endpoints from a list of dicts (url, weight, max_inflight,
+        up).
+
+        Counters of endpoints that are kept are preserved. ``up=False`` is
+        the health recorded in the database by another process: the
+        endpoint stays out of rotation until a health check reports it up.
+        """
+        now = time.monotonic()
+        with self._cond:
+            endpoints = {}
+            for spec in specs:
+                url = spec['url'].rstrip('/')
+                ep = self._endpoints.get(url) or _Endpoint(url, 1, 1)
+                ep.weight = max(1, int(spec.get('weight') or 1))
+                ep.max_inflight = max(1, int(spec.get('max_inflight') or 1))
+                if spec.get('up') is False:
+                    ep.down_until = max(ep.down_until, now + DOWN_COOLDOWN)
+                endpoints[url] = ep
+            self._endpoints = endpoints
+            self._cond.notify_all()
+
+    def size(self):
+        return len(self._endpoints)
+
+    def capacity(self):
+        """Total number of concurrent requests the endpoints accept."""
+        return sum(ep.max_inflight for ep in self._endpoints.values())
+
+    # -------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------
+    def _candidates(self):
+        now = time.monotonic()
+        endpoints = list(self._endpoints.values())
+        up = [ep for ep in endpoints if ep.is_up(now)]
+        if not up:
+            # Everything is down: fail open rather than stall all callers
+            up = endpoints
+        return [ep for ep in up if ep.has_slot()]
+
+    @staticmethod
+    def _pick_least_loaded(candidates):
+        return min(candidates, key=lambda ep: (
+            (ep.inflight + 1) / ep.weight,
+            ep.latency_ms if ep.latency_ms is not None else 0.0,
+        ))
+
+    @staticmethod
+    def _pick_round_robin(candidates):
+        # Smooth weighted round-robin (same as nginx upstreams)
+        total = 0
+        best = None
+        for ep in candidates:
+            ep.current += ep.weight
+            total += ep.weight
+            if best is None or ep.current > best.current:
+                best = ep
+        best.current -= total
+        return best
+
+    def acquire(self, strategy='least_loaded', timeout=DEFAULT_LEASE_TIMEOUT):
+        deadline = time.monotonic() + (timeout or DEFAULT_LEASE_TIMEOUT)
+        with self._cond:
+            while True:
+                if not self._endpoints:
+                    raise RuntimeError("No AI endpoint configured.")
+                candidates = self._candidates()
+                if candidates:
+                    if strategy == 'round_robin':
+                        ep = self._pick_round_robin(candidates)
+                    else:
+                        ep = self._pick_least_loaded(candidates)
+                    ep.inflight += 1
+                    return ep.url
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("All AI endpoints are busy.")
+                self._cond.wait(remaining)
+
+    def release(self, url, elapsed, ok=True):
+        with self._cond:
+            ep = self._endpoints.get(url)
+            if ep is not None:
+                ep.inflight = max(0, ep.inflight - 1)
+                ep.requests += 1
+                if ok:
+                    ms = elapsed * 1000.0
+                    ep.latency_ms = ms if ep.latency_ms is None else (
+                        LATENCY_ALPHA * ms + (1 - LATENCY_ALPHA) * ep.latency_ms)
+                    ep.failures = 0
+                else:
+                    ep.errors += 1
+                    ep.failures += 1
+                    if ep.failures >= FAILURES_BEFORE_DOWN and ep.is_up(time.monotonic()):
+                        ep.down_until = time.monotonic() + DOWN_COOLDOWN
+                        _logger.warning("AI endpoint %s taken out of rotation "
+                                        "after %d failures.", url, ep.failures)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, strategy='least_loaded', timeout=DEFAULT_LEASE_TIMEOUT):
+        lease = Lease(self.acquire(strategy, timeout))
+        t0 = time.monotonic()
+        try:
+            yield lease
+        except GeneratorExit:
+            # A streaming consumer stopped reading: not the endpoint's fault
+            raise
+        except BaseException:
+            lease.ok = False
+            raise
+        finally:
+            self.release(lease.url, time.monotonic() - t0, lease.ok)
+
+    # -------------------------------------------------------
+    # Health & reporting
+    # -------------------------------------------------------
+    def set_health(self, url, healthy):
+        """Record a health-check result for ``url``."""
+        with self._cond:
+            ep = self._endpoints.get(url.rstrip('/'))
+            if ep is None:
+                return
+            if healthy:
+                ep.down_until = 0.0
+                ep.failures = 0
+            else:
+                ep.down_until = time.monotonic() + DOWN_COOLDOWN
+            self._cond.notify_all()
+
+    def snapshot(self):
+        """Per-endpoint counters: {url: {inflight, latency_ms, requests, errors, up}}."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                ep.url: {
+                    'inflight': ep.inflight,
+                    'latency_ms': ep.latency_ms,
+                    'requests': ep.requests,
+                    'errors': ep.errors,
+                    'up': ep.is_up(now),
+                }
+                for ep in self._endpoints.values()
+            }
+
+
+def get_router(key, specs=None):
+    """Return the process-wide router for ``key``, reconfigured from ``specs``."""
+    router = _ROUTERS.get(key)
+    if router is None:
+        with _ROUTERS_LOCK:
+            router = _ROUTERS.get(key)
+            if router is None:
+                router = EndpointRouter()
+                _ROUTERS[key] = router
+    if specs is not None:
+        router.configure(specs)
+    return router
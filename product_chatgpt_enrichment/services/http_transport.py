@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Pooled, thread-safe HTTP transport for AI providers.
+
+One ``requests.Session`` is kept per (origin, credentials, pool settings),
+so consecutive calls reuse the same keep-alive TCP/TLS connections instead
+of opening a new one per request. Sessions are shared between the ORM
+path and ``ThreadPoolExecutor`` workers; the underlying urllib3 pool is
+thread-safe.
+
+Transient failures (connection errors, HTTP 429 and 5xx) are retried with
+exponential backoff, honouring ``Retry-After``. Read timeouts are never
+retried: a model that took the full read timeout would only take it again,
+and ``requests.exceptions.ReadTimeout`` reaches the caller as such instead
+of being wrapped into a connection error.
+"""
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_SESSIONS = {}
+_LOCK = threading.Lock()
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _fingerprint(credentials):
+    """Hash credentials so API keys are never kept as plain dict keys."""
+    if not credentials:
+        return ''
+    return hashlib.sha1(str(credentials).encode('utf-8')).hexdigest()
+
+
+def _build_session(pool_size, max_retries):
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=False,
+        status=max_retries,
+        backoff_factor=DEFAULT_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET', 'POST'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size,
+        max_retries=retry, pool_block=True,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(url, credentials=None, pool_size=None, max_retries=None):
+    """Return the shared session for ``url``'s origin and ``credentials``."""
+    pool_size = max(1, pool_size or DEFAULT_POOL_SIZE)
+    max_retries = DEFAULT_MAX_RETRIES if max_retries is None else max(0, max_retries)
+    key = (_origin(url), _fingerprint(credentials), pool_size, max_retries)
+    session = _SESSIONS.get(key)
+    if session is None:
+        with _LOCK:
+            session = _SESSIONS.get(key)
+            if session is None:
+                session = _build_session(pool_size, max_retries)
+                _SESSIONS[key] = session
+                _logger.debug("HTTP pool created for %s (size=%d, retries=%d)",
+                              key[0], pool_size, max_retries)
+    return session
+
+
+def request(method, url, credentials=None, timeout=120, connect_timeout=None,
+            pool_size=None, max_retries=None, **kwargs):
+    """Send a request through the pooled session.
+
+    :param timeout: read timeout in seconds
+    :param connect_timeout: connect timeout in seconds
+    :param kwargs: forwarded to ``requests.Session.request`` (json, headers...)
+    """
+    session = get_session(url, credentials, pool_size, max_retries)
+    connect_timeout = connect_timeout or DEFAULT_CONNECT_TIMEOUT
+    return session.request(method, url, timeout=(connect_timeout, timeout), **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def close_all():
+    """Close every pooled session (e.g. after changing a server URL)."""
+    with _LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception:
+            pass
@@ -1,10 +1,67 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import re
+import threading
 import time
 import logging
+from concurrent.futures import Future
+
 import requests
 
 _logger = logging.getLogger(__name__)
 
+# Searches currently running in this process, by cache key
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def make_cache_key(product_name, ean='', brand='', engines='', language=''):
+    """Cache key of a product search: SHA-256 of the normalized inputs.
+
+    Case, surrounding whitespace and engine order do not matter, and only
+    the digits of the EAN are kept, so variants and duplicate templates
+    share one entry.
+    """
+    def _norm(value):
+        return re.sub(r'\s+', ' ', (value or '').strip().lower())
+
+    payload = json.dumps([
+        re.sub(r'\D', '', ean or ''),
+        _norm(brand),
+        _norm(product_name),
+        sorted(e.strip().lower() for e in (engines or '').split(',') if e.strip()),
+        _norm(language),
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def shared_call(key, func):
+    """Run ``func()`` once per ``key`` at a time in this process.
+
+    Threads asking for a key that is already being fetched wait for that
+    call and get its result (or exception) instead of sending the same
+    request again.
+    """
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _INFLIGHT[key] = future
+    if not owner:
+        return future.result()
+    try:
+        result = func()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
 
 class SearXNGClient:
     """Client for querying a self-hosted SearXNG instance."""
@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+"""Deterministic mock LLM server for offline benchmarks (standard library only).
+
+Speaks enough of the Ollama and OpenAI-compatible APIs for the AI modules::
+
+    GET  /api/tags, /api/version, /v1/models
+    POST /api/chat, /api/generate                 NDJSON stream or one object
+    POST /api/embed, /api/embeddings
+    POST /v1/chat/completions, /chat/completions  SSE stream or one object
+    POST /v1/embeddings
+
+A completion waits for one of ``slots`` generation slots (like
+``OLLAMA_NUM_PARALLEL``), then ``latency`` seconds of prompt processing,
+then emits its tokens at ``tokens_per_second``. Answers only depend on the
+prompt: a prompt showing a JSON sample (``"key": value``) gets a JSON
+object with the same keys, any other prompt gets ``completion_tokens``
+words. Embeddings are hashed bags of words, so texts sharing words are
+close to each other.
+
+Standalone, e.g. to point a development database at it::
+
+    python3 scripts/ai_benchmark/mock_llm_server.py --port 11434 --latency 0.5
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    'product', 'quality', 'design', 'premium', 'compact', 'durable', 'light',
+    'wireless', 'battery', 'fast', 'comfortable', 'modern', 'classic', 'steel',
+    'cotton', 'outdoor', 'kitchen', 'office', 'garden', 'sport', 'travel',
+    'ideal', 'reliable', 'elegant', 'practical', 'efficient', 'robust', 'soft',
+    'waterproof', 'portable', 'adjustable', 'natural', 'handmade', 'smart',
+    'silent', 'powerful', 'versatile', 'stylish', 'sustainable', 'warranty',
+)
+
+_JSON_KEY_RE = re.compile(r'"(\w+)"\s*:\s*(\[|\{|null|true|false|-?\d|")')
+_WORD_RE = re.compile(r'\w+')
+_PIECE_RE = re.compile(r'\S+\s*')
+
+
+def estimate_tokens(text):
+    """Rough token count of ``text`` (4 characters per token)."""
+    return max(1, len(text or '') // 4)
+
+
+def _rng(*texts):
+    return random.Random(hashlib.sha1('\n'.join(texts).encode('utf-8')).digest())
+
+
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for __ in range(max(1, count)))
+
+
+def default_responder(system_prompt, prompt, max_tokens, completion_tokens):
+    """Deterministic answer to ``prompt``.
+
+    When the prompt shows a JSON sample, the answer is a JSON object with
+    the sample's keys and values of the same kind, so the modules parsing
+    JSON get something to parse.
+    """
+    rng = _rng(system_prompt or '', prompt or '')
+    keys = {}
+    for key, start in _JSON_KEY_RE.findall(prompt or ''):
+        keys.setdefault(key, start)
+    if not keys:
+        return _words(rng, min(completion_tokens, max_tokens or completion_tokens))
+    answer = {}
+    for key, start in keys.items():
+        if start == '[':
+            answer[key] = [_words(rng, 3) for __ in range(3)]
+        elif start == '{':
+            answer[key] = {'detail': _words(rng, 2)}
+        elif start == 'null':
+            answer[key] = None
+        elif start in ('true', 'false'):
+            answer[key] = rng.random() < 0.5
+        elif start != '"':
+            answer[key] = rng.randint(1, 100)
+        else:
+            answer[key] = _words(rng, 8)
+    return json.dumps(answer, ensure_ascii=False)
+
+
+def embed(text, dim):
+    """Hashed bag-of-words vector of ``text``, normalized."""
+    vector = [0.0] * dim
+    for word in _WORD_RE.findall((text or '').lower()):
+        digest = hashlib.md5(word.encode('utf-8')).digest()
+        index = int.from_bytes(digest[:4], 'little') % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [round(v / norm, 6) for v in vector]
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class MockLLMServer:
+    """Threaded HTTP server simulating a model host.
+
+    Usable as a context manager::
+
+        with MockLLMServer(latency=0.2, slots=4) as server:
+            ...  # point the AI configuration at server.url
+            print(server.stats())
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.2, tokens_per_second=50.0,
+                 completion_tokens=64, slots=4, embedding_dim=256, embedding_latency=0.01,
+                 model='mock-model', embedding_model='mock-embed', responder=None):
+        self.host = host
+        self.port = port
+        self.latency = max(0.0, latency)
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.embedding_dim = embedding_dim
+        self.embedding_latency = max(0.0, embedding_latency)
+        self.model = model
+        self.embedding_model = embedding_model
+        self.responder = responder or default_responder
+        self._slots = threading.BoundedSemaphore(slots) if slots > 0 else None
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        handler = type('MockLLMHandler', (_Handler,), {'mock': self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='mock-llm-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {
+                'requests': {},
+                'completions': 0,
+                'embedding_requests': 0,
+                'embedded_texts': 0,
+                'prompt_tokens': 0,
+                'completion_tokens': 0,
+                'active': 0,
+                'peak_active': 0,
+                'slot_waits': [],
+            }
+
+    def stats(self):
+        """Counters since the last ``reset_stats()``; ``slot_wait_*`` is the
+        time completions waited for a free generation slot."""
+        with self._lock:
+            stats = dict(self._stats, requests=dict(self._stats['requests']))
+            waits = stats.pop('slot_waits')
+        stats.pop('active')
+        stats.update({
+            'slot_wait_avg': sum(waits) / len(waits) if waits else 0.0,
+            'slot_wait_p95': _percentile(waits, 95),
+            'slot_wait_max': max(waits) if waits else 0.0,
+        })
+        return stats
+
+    def _count(self, path):
+        with self._lock:
+            self._stats['requests'][path] = self._stats['requests'].get(path, 0) + 1
+
+    @contextmanager
+    def _generation_slot(self):
+        t0 = time.perf_counter()
+        if self._slots:
+            self._slots.acquire()
+        waited = time.perf_counter() - t0
+        with self._lock:
+            self._stats['active'] += 1
+            self._stats['peak_active'] = max(self._stats['peak_active'], self._stats['active'])
+            self._stats['slot_waits'].append(waited)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._stats['active'] -= 1
+            if self._slots:
+                self._slots.release()
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+    def _answer(self, system_prompt, prompt, max_tokens):
+        """The answer split in tokens, and the prompt token count."""
+        text = self.responder(system_prompt, prompt, max_tokens, self.completion_tokens)
+        pieces = _PIECE_RE.findall(text) or ['']
+        prompt_tokens = estimate_tokens((system_prompt or '') + (prompt or ''))
+        with self._lock:
+            self._stats['completions'] += 1
+            self._stats['prompt_tokens'] += prompt_tokens
+            self._stats['completion_tokens'] += len(pieces)
+        return pieces, prompt_tokens
+
+    def _token_delay(self):
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _embed(self, texts):
+        with self._lock:
+            self._stats['embedding_requests'] += 1
+            self._stats['embedded_texts'] += len(texts)
+        time.sleep(self.embedding_latency)
+        return [embed(text, self.embedding_dim) for text in texts]
+
+
+def _split_messages(messages):
+    """(system prompt, prompt) of a chat request."""
+    system, prompt = [], []
+    for message in messages or []:
+        content = message.get('content') or ''
+        if isinstance(content, list):
+            content = ' '.join(part.get('text', '') for part in content if isinstance(part, dict))
+        (system if message.get('role') == 'system' else prompt).append(content)
+    return '\n'.join(system), '\n'.join(prompt)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    mock = None
+
+    def log_message(self, format, *args):
+        pass
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        self.mock._count(path or '/')
+        mock = self.mock
+        if not path:
+            self._send(200, b'Ollama is running', 'text/plain')
+        elif path == '/api/tags':
+            self._send_json(200, {'models': [
+                {'name': name, 'model': name, 'size': 0, 'details': {'family': 'mock'}}
+                for name in (mock.model, mock.embedding_model)
+            ]})
+        elif path == '/api/version':
+            self._send_json(200, {'version': '0.0.0-mock'})
+        elif path in ('/v1/models', '/models'):
+            self._send_json(200, {'object': 'list', 'data': [
+                {'id': name, 'object': 'model', 'owned_by': 'mock'}
+                for name in (mock.model, mock.embedding_model)
+            ]})
+        else:
+            self._send_json(404, {'error': f'unknown path {path}'})
+
+    def do_POST(self):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._send_json(400, {'error': 'invalid JSON body'})
+        route = _ROUTES.get(path)
+        if not route:
+            return self._send_json(404, {'error': f'unknown path {path}'})
+        self.mock._count(path)
+        try:
+            route(self, body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (timeout, cancelled stream)
+            pass
+
+    # ------------------------------------------------------------------
+    # Ollama
+    # ------------------------------------------------------------------
+    def _ollama_chat(self, body):
+        system, prompt = _split_messages(body.get('messages'))
+        self._ollama_complete(body, system, prompt, chat=True)
+
+    def _ollama_generate(self, body):
+        self._ollama_complete(body, body.get('system') or '', body.get('prompt') or '', chat=False)
+
+    def _ollama_complete(self, body, system, prompt, chat):
+        mock = self.mock
+        options = body.get('options') or {}
+        model = body.get('model') or mock.model
+        # Ollama streams unless told otherwise
+        stream = body.get('stream', True)
+
+        def event(text, done, **extra):
+            event = {'model': model, 'created_at': _now(), 'done': done}
+            if chat:
+                event['message'] = {'role': 'assistant', 'content': text}
+            else:
+                event['response'] = text
+            event.update(extra)
+            return event
+
+        t0 = time.perf_counter()
+        with mock._generation_slot():
+            pieces, prompt_tokens = mock._answer(system, prompt, options.get('num_predict'))
+            time.sleep(mock.latency)
+            if stream:
+                self._start_chunked('application/x-ndjson')
+                for piece in pieces:
+                    time.sleep(mock._token_delay())
+                    self._write_chunk(json.dumps(event(piece, False)).encode('utf-8') + b'\n')
+            else:
+                time.sleep(mock._token_delay() * len(pieces))
+        final = event('' if stream else ''.join(pieces), True,
+                      done_reason='stop',
+                      total_duration=int((time.perf_counter() - t0) * 1e9),
+                      prompt_eval_count=prompt_tokens,
+                      eval_count=len(pieces))
+        if stream:
+            self._write_chunk(json.dumps(final).encode('utf-8') + b'\n')
+            self._end_chunked()
+        else:
+            self._send_json(200, final)
+
+    def _ollama_embed(self, body):
+        texts = body.get('input')
+        if isinstance(texts, str):
+            texts = [texts]
+        self._send_json(200, {
+            'model': body.get('model') or self.mock.embedding_model,
+            'embeddings': self.mock._embed(texts or []),
+        })
+
+    def _ollama_embeddings(self, body):
+        self._send_json(200, {'embedding': self.mock._embed([body.get('prompt') or ''])[0]})
+
+    # ------------------------------------------------------------------
+    # OpenAI-compatible
+    # ------------------------------------------------------------------
+    def _openai_chat(self, body):
+        mock = self.mock
+        system, prompt = _split_messages(body.get('messages'))
+        model = body.get('model') or mock.model
+        completion_id = 'chatcmpl-mock-%d' % threading.get_ident()
+        created = int(time.time())
+
+        with mock._generation_slot():
+            pieces, prompt_tokens = mock._answer(system, prompt, body.get('max_tokens'))
+            time.sleep(mock.latency)
+            if body.get('stream'):
+                self._start_chunked('text/event-stream')
+                for piece in pieces:
+                    time.sleep(mock._token_delay())
+                    self._write_sse({
+                        'id': completion_id, 'object': 'chat.completion.chunk',
+                        'created': created, 'model': model,
+                        'choices': [{'index': 0, 'delta': {'content': piece},
+                                     'finish_reason': None}],
+                    })
+            else:
+                time.sleep(mock._token_delay() * len(pieces))
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(pieces),
+            'total_tokens': prompt_tokens + len(pieces),
+        }
+        if body.get('stream'):
+            self._write_sse({
+                'id': completion_id, 'object': 'chat.completion.chunk',
+                'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                'usage': usage,
+            })
+            self._write_chunk(b'data: [DONE]\n\n')
+            self._end_chunked()
+            return
+        self._send_json(200, {
+            'id': completion_id, 'object': 'chat.completion',
+            'created': created, 'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': ''.join(pieces)},
+                'finish_reason': 'stop',
+            }],
+            'usage': usage,
+        })
+
+    def _openai_embeddings(self, body):
+        texts = body.get('input')
+        if isinstance(texts, str):
+            texts = [texts]
+        vectors = self.mock._embed(texts or [])
+        self._send_json(200, {
+            'object': 'list',
+            'model': body.get('model') or self.mock.embedding_model,
+            'data': [{'object': 'embedding', 'index': i, 'embedding': vector}
+                     for i, vector in enumerate(vectors)],
+            'usage': {'prompt_tokens': sum(estimate_tokens(t) for t in texts or []),
+                      'total_tokens': sum(estimate_tokens(t) for t in texts or [])},
+        })
+
+    # ------------------------------------------------------------------
+    # Responses
+    # ------------------------------------------------------------------
+    def _send(self, status, payload, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, status, data):
+        self._send(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type + '; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def _write_chunk(self, data):
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+        self.wfile.flush()
+
+    def _write_sse(self, data):
+        self._write_chunk(b'data: ' + json.dumps(data).encode('utf-8') + b'\n\n')
+
+    def _end_chunked(self):
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+
+_ROUTES = {
+    '/api/chat': _Handler._ollama_chat,
+    '/api/generate': _Handler._ollama_generate,
+    '/api/embed': _Handler._ollama_embed,
+    '/api/embeddings': _Handler._ollama_embeddings,
+    '/v1/chat/completions': _Handler._openai_chat,
+    '/chat/completions': _Handler._openai_chat,
+    '/v1/embeddings': _Handler._openai_embeddings,
+}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def add_server_arguments(parser):
+    """Simulation options, shared with ``run_benchmark.py``."""
+    group = parser.add_argument_group('mock server')
+    group.add_argument('--latency', type=float, default=0.2,
+                       help='seconds of prompt processing per completion (default: 0.2)')
+    group.add_argument('--tokens-per-second', type=float, default=50.0,
+                       help='generation speed of each slot (default: 50)')
+    group.add_argument('--completion-tokens', type=int, default=64,
+                       help='length of the plain text answers (default: 64)')
+    group.add_argument('--slots', type=int, default=4,
+                       help='completions generated at the same time, 0 = unlimited (default: 4)')
+    group.add_argument('--embedding-dim', type=int, default=256)
+    group.add_argument('--embedding-latency', type=float, default=0.01,
+                       help='seconds per embedding request (default: 0.01)')
+    return group
+
+
+def server_from_arguments(args, host='127.0.0.1', port=0):
+    return MockLLMServer(
+        host=host, port=port,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        slots=args.slots,
+        embedding_dim=args.embedding_dim,
+        embedding_latency=args.embedding_latency,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11434)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    server = server_from_arguments(args, host=args.host, port=args.port).start()
+    print(f'Mock LLM server listening on {server.url} (Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats(), indent=2))
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
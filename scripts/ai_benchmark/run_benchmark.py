@@ -0,0 +1,625 @@
+# -*- coding: utf-8 -*-
+"""Offline benchmark of the AI modules against the mock LLM server.
+
+Starts ``mock_llm_server.MockLLMServer`` on a free local port, points a
+dedicated AI configuration at it and drives the real code paths at scale:
+
+    call     ollama.config.call_ai_api() from concurrent request threads
+    jobs     ollama.job queue: jobs run by _cron_run_jobs() (queue latency)
+    enrich   product.enrichment.queue._process_enrich_parallel()
+    reindex  product.rag.index.reindex_catalog(), cold then without changes
+    rag      product.rag.conversation.ask_question(), with follow-up turns
+
+Each scenario reports throughput, latency percentiles, queue latency where
+there is a queue, database time and query count (the per-thread counters
+Odoo keeps), and what the mock server saw (completions, embedding requests,
+time waited for a generation slot). Scenarios of modules not installed are
+skipped.
+
+The scenarios commit, like the crons and requests they simulate: run on
+a disposable database. Benchmark data (products named "Benchmark ...",
+configurations, jobs, conversations) is removed at the end unless
+``--keep-data``.
+
+    python3 scripts/ai_benchmark/run_benchmark.py -c odoo.conf -d bench \\
+        --scenarios call,rag --requests 200 --concurrency 8 --output run.json
+
+    # Fail (exit code 1) when a scenario lost more than 20% throughput or
+    # runs 20% more queries per operation than in a previous run
+    python3 scripts/ai_benchmark/run_benchmark.py -c odoo.conf -d bench \\
+        --baseline run.json --tolerance 0.2
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+from mock_llm_server import add_server_arguments, server_from_arguments
+
+SCENARIOS = ('call', 'jobs', 'enrich', 'reindex', 'rag')
+SCENARIO_MODULES = {
+    'call': 'ollama_base',
+    'jobs': 'ollama_base',
+    'enrich': 'product_chatgpt_enrichment',
+    'reindex': 'ollama_product_rag',
+    'rag': 'ollama_product_rag',
+}
+BENCH_PREFIX = 'Benchmark'
+BENCH_CODE = 'BENCH-'
+
+NOUNS = ('laptop', 'charger', 'headphones', 'backpack', 'jacket', 'kettle', 'lamp',
+         'chair', 'speaker', 'watch', 'camera', 'bicycle', 'tent', 'blender', 'mouse')
+ADJECTIVES = ('wireless', 'compact', 'waterproof', 'premium', 'portable', 'ergonomic',
+              'stainless', 'foldable', 'smart', 'lightweight')
+FOLLOW_UPS = (
+    'How much does the second one cost?',
+    'Is it still in stock?',
+)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class Result:
+    """Measurements of one scenario; thread-safe."""
+
+    def __init__(self, name):
+        self.name = name
+        self.ops = 0
+        self.errors = 0
+        self.wall = 0.0
+        self.latencies = []
+        self.queue_waits = []
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.server = {}
+        self.extra = {}
+        self._lock = threading.Lock()
+
+    def record(self, latency=None, queue_wait=None, error=False):
+        with self._lock:
+            self.ops += 1
+            self.errors += bool(error)
+            if latency is not None:
+                self.latencies.append(latency)
+            if queue_wait is not None:
+                self.queue_waits.append(queue_wait)
+
+    def add_db(self, queries, seconds):
+        with self._lock:
+            self.db_queries += queries
+            self.db_time += seconds
+
+    def summary(self):
+        ops = max(self.ops, 1)
+        return {
+            'ops': self.ops,
+            'errors': self.errors,
+            'wall': round(self.wall, 3),
+            'throughput': round(self.ops / self.wall, 3) if self.wall else 0.0,
+            'latency_p50': round(percentile(self.latencies, 50), 4),
+            'latency_p95': round(percentile(self.latencies, 95), 4),
+            'latency_max': round(max(self.latencies), 4) if self.latencies else 0.0,
+            'queue_p50': round(percentile(self.queue_waits, 50), 4),
+            'queue_p95': round(percentile(self.queue_waits, 95), 4),
+            'db_time': round(self.db_time, 3),
+            'db_queries': self.db_queries,
+            'queries_per_op': round(self.db_queries / ops, 2),
+            'completions': self.server.get('completions', 0),
+            'embedding_requests': self.server.get('embedding_requests', 0),
+            'peak_active': self.server.get('peak_active', 0),
+            'slot_wait_avg': round(self.server.get('slot_wait_avg', 0.0), 4),
+            **self.extra,
+        }
+
+
+class DbProbe:
+    """Database time and query count of the current thread.
+
+    Odoo adds the duration of each query to ``query_time`` of the running
+    thread when the thread defines these counters (the HTTP server does it
+    for its request log).
+    """
+
+    def __init__(self, result):
+        self.result = result
+
+    def __enter__(self):
+        thread = threading.current_thread()
+        thread.query_count = 0
+        thread.query_time = 0.0
+        return self
+
+    def __exit__(self, *exc_info):
+        thread = threading.current_thread()
+        self.result.add_db(thread.query_count, thread.query_time)
+        del thread.query_count, thread.query_time
+
+
+class Bench:
+
+    def __init__(self, args, registry, server):
+        self.args = args
+        self.registry = registry
+        self.server = server
+        self.config_id = None
+        self.previous_defaults = []
+        self.product_ids = []
+        self.cleanup_models = {}    # model -> ids
+
+    # ------------------------------------------------------------------
+    # Environment
+    # ------------------------------------------------------------------
+    def env(self, cr):
+        from odoo import api, SUPERUSER_ID
+        return api.Environment(cr, SUPERUSER_ID, {})
+
+    def installed(self, module):
+        with self.registry.cursor() as cr:
+            return bool(self.env(cr)['ir.module.module'].search_count([
+                ('name', '=', module), ('state', '=', 'installed'),
+            ]))
+
+    def track(self, records):
+        self.cleanup_models.setdefault(records._name, []).extend(records.ids)
+
+    def setup_config(self):
+        """Default ``ollama.config`` pointing at the mock server."""
+        args = self.args
+        with self.registry.cursor() as cr:
+            env = self.env(cr)
+            Config = env['ollama.config']
+            previous = Config.search([('is_default', '=', True)])
+            self.previous_defaults = previous.ids
+            previous.write({'is_default': False})
+            openai = args.api == 'openai'
+            vals = {
+                'name': f'{BENCH_PREFIX} (mock LLM server)',
+                'provider': 'ollama',
+                'base_url': self.server.url,
+                'ollama_api_mode': 'openai' if openai else 'native',
+                'api_endpoint': '/v1/chat/completions' if openai else '/api/chat',
+                'ai_model_name': self.server.model,
+                'embedding_model': self.server.embedding_model,
+                'response_cache_enabled': args.cache,
+                'ollama_parallel_workers': args.concurrency,
+                'job_workers': args.concurrency,
+                'http_max_retries': 0,
+                'is_default': True,
+            }
+            if 'rag_search_mode' in Config._fields:
+                vals['rag_search_mode'] = args.rag_mode
+            config = Config.create(vals)
+            self.config_id = config.id
+            cr.commit()
+
+    def create_products(self, count, label):
+        """``count`` saleable, published products with varied words."""
+        with self.registry.cursor() as cr:
+            env = self.env(cr)
+            Product = env['product.template']
+            vals_list = []
+            for i in range(count):
+                noun = NOUNS[i % len(NOUNS)]
+                adjective = ADJECTIVES[(i // len(NOUNS)) % len(ADJECTIVES)]
+                vals = {
+                    'name': f'{BENCH_PREFIX} {adjective} {noun} {label}{i}',
+                    'default_code': f'{BENCH_CODE}{label}{i}',
+                    'sale_ok': True,
+                    'list_price': 10.0 + (i * 7) % 490,
+                    'description_sale': f'A {adjective} {noun} for everyday use. '
+                                        f'Reference {label}{i}, {noun}s of this range '
+                                        f'come with a two-year warranty.',
+                }
+                if 'is_published' in Product._fields:
+                    vals['is_published'] = True
+                vals_list.append(vals)
+            products = Product.create(vals_list)
+            cr.commit()
+        self.product_ids.extend(products.ids)
+        return products.ids
+
+    def run_threads(self, items, work, result):
+        """Run ``work(env, item)`` for every item from ``--concurrency``
+        threads, each with its own cursor, committing after each item."""
+        chunks = [items[i::self.args.concurrency] for i in range(self.args.concurrency)]
+
+        def _thread(chunk):
+            with self.registry.cursor() as cr, DbProbe(result):
+                env = self.env(cr)
+                for item in chunk:
+                    t0 = time.perf_counter()
+                    try:
+                        work(env, item)
+                        cr.commit()
+                        result.record(time.perf_counter() - t0)
+                    except Exception as e:
+                        cr.rollback()
+                        result.record(time.perf_counter() - t0, error=True)
+                        print(f'  {result.name}: {type(e).__name__}: {e}', file=sys.stderr)
+
+        threads = [threading.Thread(target=_thread, args=(chunk,), name=f'bench-{n}')
+                   for n, chunk in enumerate(chunks) if chunk]
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        result.wall = time.perf_counter() - t0
+
+    def measure(self, name, run):
+        """Run ``run(result)`` with fresh server statistics."""
+        result = Result(name)
+        self.server.reset_stats()
+        run(result)
+        result.server = self.server.stats()
+        return result
+
+    # ------------------------------------------------------------------
+    # Scenarios
+    # ------------------------------------------------------------------
+    def scenario_call(self):
+        prompts = [f'Benchmark request {i}: describe product number {i} in two sentences.'
+                   for i in range(self.args.requests)]
+
+        def work(env, prompt):
+            env['ollama.config'].browse(self.config_id).call_ai_api(prompt)
+
+        return [self.measure('call_ai_api', lambda result: self.run_threads(prompts, work, result))]
+
+    def scenario_jobs(self):
+        """Jobs are created directly: ``_enqueue`` keeps one pending job per
+        record and method, and these all target the benchmark config."""
+        batch_ref = f'benchmark-{int(time.time())}'
+        with self.registry.cursor() as cr:
+            jobs = self.env(cr)['ollama.job'].create([{
+                'name': f'{BENCH_PREFIX} job {i}',
+                'res_model': 'ollama.config',
+                'res_id': self.config_id,
+                'method': 'call_ai_api',
+                'params': json.dumps({'prompt': f'Benchmark job {i}: write a product tagline.'}),
+                'batch_ref': batch_ref,
+                'max_attempts': 1,
+            } for i in range(self.args.requests)])
+            self.track(jobs)
+            cr.commit()
+
+        def run(result):
+            Job = self.registry['ollama.job']
+            run_job_thread = Job._run_job_thread
+
+            def probed(db_name, job_id):
+                with DbProbe(result):
+                    run_job_thread(db_name, job_id)
+
+            t0 = time.perf_counter()
+            with patch.object(Job, '_run_job_thread', staticmethod(probed)), \
+                    self.registry.cursor() as cr, DbProbe(result):
+                env = self.env(cr)
+                while env['ollama.job'].search_count([
+                        ('batch_ref', '=', batch_ref), ('state', '=', 'pending')]):
+                    env['ollama.job']._cron_run_jobs()
+                    cr.commit()
+                result.wall = time.perf_counter() - t0
+                cr.execute("""
+                    SELECT EXTRACT(EPOCH FROM date_started - create_date), duration, state
+                      FROM ollama_job
+                     WHERE batch_ref = %s
+                """, (batch_ref,))
+                for queue_wait, duration, state in cr.fetchall():
+                    result.record(duration or 0.0, float(queue_wait or 0.0), error=state != 'done')
+
+        return [self.measure('ollama.job queue', run)]
+
+    def scenario_enrich(self):
+        count = self.args.requests
+        product_ids = self.create_products(count, 'E')
+        with self.registry.cursor() as cr:
+            env = self.env(cr)
+            config = env['chatgpt.config'].create({
+                'name': f'{BENCH_PREFIX} enrichment (mock LLM server)',
+                'provider': 'ollama',
+                'base_url': self.server.url,
+                'ollama_api_mode': 'native',
+                'api_endpoint': '/api/chat',
+                'ai_model_name': self.server.model,
+                'ollama_parallel_workers': self.args.concurrency,
+                'enrichment_batch_size_enrich': count,
+                'enrichment_adaptive_workers': False,
+                'active': False,
+            })
+            self.track(config)
+            web_data = json.dumps([
+                {'title': f'Result {n}', 'url': f'https://example.com/{n}',
+                 'content': 'Specifications, reviews and prices of the product.'}
+                for n in range(3)
+            ])
+            items = env['product.enrichment.queue'].create([{
+                'product_id': product_id,
+                'state': 'collected',
+                'raw_web_data': web_data,
+                'date_collected': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
+            } for product_id in product_ids])
+            config_id, item_ids = config.id, items.ids
+            cr.commit()
+
+        def run(result):
+            Queue = self.registry['product.enrichment.queue']
+            ollama_worker = Queue._ollama_worker
+            starts = []
+
+            def timed_worker(queue, params):
+                starts.append(time.perf_counter())
+                return ollama_worker(queue, params)
+
+            with patch.object(Queue, '_ollama_worker', timed_worker), \
+                    self.registry.cursor() as cr, DbProbe(result):
+                env = self.env(cr)
+                t0 = time.perf_counter()
+                env['product.enrichment.queue']._process_enrich_parallel(
+                    env['chatgpt.config'].browse(config_id))
+                result.wall = time.perf_counter() - t0
+                first = min(starts) if starts else t0
+                for item in env['product.enrichment.queue'].browse(item_ids):
+                    result.record(item.processing_time_ollama, error=item.state != 'done')
+                result.queue_waits = [start - first for start in starts]
+
+        return [self.measure('enrichment (parallel)', run)]
+
+    def scenario_reindex(self):
+        self.create_products(self.args.products, 'R')
+
+        def run(result):
+            with self.registry.cursor() as cr, DbProbe(result):
+                env = self.env(cr)
+                t0 = time.perf_counter()
+                counts = env['product.rag.index'].reindex_catalog()
+                cr.commit()
+                result.wall = time.perf_counter() - t0
+                result.ops = counts['created'] + counts['updated'] + counts['unchanged']
+                result.extra.update(counts)
+
+        return [
+            self.measure('reindex_catalog (cold)', run),
+            self.measure('reindex_catalog (no change)', run),
+        ]
+
+    def scenario_rag(self):
+        if not any(result.name.startswith('reindex_catalog') for result in self.results):
+            # Products to talk about
+            self.create_products(len(NOUNS) * 2, 'Q')
+            with self.registry.cursor() as cr:
+                self.env(cr)['product.rag.index'].reindex_catalog()
+                cr.commit()
+        turns = 1 + len(FOLLOW_UPS)
+        conversations = max(1, self.args.requests // turns)
+        with self.registry.cursor() as cr:
+            convs = self.env(cr)['product.rag.conversation'].create([
+                {'session_id': f'benchmark-{int(time.time())}-{i}'} for i in range(conversations)
+            ])
+            self.track(convs)
+            conv_ids = convs.ids
+            cr.commit()
+        # One thread per conversation at a time: turns of a conversation
+        # stay in order, like a customer waiting for each answer
+        scripts = [(conv_id, [
+            f'Do you have a {ADJECTIVES[i % len(ADJECTIVES)]} {NOUNS[i % len(NOUNS)]}?',
+            *FOLLOW_UPS,
+        ]) for i, conv_id in enumerate(conv_ids)]
+
+        def work(env, script):
+            conv_id, questions = script
+            conv = env['product.rag.conversation'].browse(conv_id)
+            for question in questions:
+                conv.ask_question(question)
+                env.cr.commit()
+
+        def run(result):
+            self.run_threads(scripts, work, result)
+            result.ops = len(scripts) * turns
+            # run_threads timed whole conversations
+            result.latencies = [latency / turns for latency in result.latencies]
+
+        return [self.measure('ask_question', run)]
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+    def cleanup(self):
+        with self.registry.cursor() as cr:
+            env = self.env(cr)
+            for model, ids in self.cleanup_models.items():
+                # Jobs queued on the records, e.g. conversation summaries
+                env['ollama.job'].search([('res_model', '=', model), ('res_id', 'in', ids)]).unlink()
+                env[model].browse(ids).exists().unlink()
+            products = env['product.template'].browse(self.product_ids).exists()
+            index = env['product.rag.index'] if 'product.rag.index' in env else None
+            if index is not None:
+                index.search([('product_id', 'in', products.ids)]).unlink()
+            products.unlink()
+            config = env['ollama.config'].browse(self.config_id).exists()
+            env['ollama.job'].search([
+                ('res_model', '=', 'ollama.config'), ('res_id', '=', self.config_id),
+            ]).unlink()
+            config.unlink()
+            env['ollama.config'].browse(self.previous_defaults).exists().write({'is_default': True})
+            cr.commit()
+
+    def restore_default(self):
+        """Leave the benchmark config archived and the previous default back
+        (``--keep-data``)."""
+        with self.registry.cursor() as cr:
+            env = self.env(cr)
+            env['ollama.config'].browse(self.config_id).write({'is_default': False, 'active': False})
+            env['ollama.config'].browse(self.previous_defaults).exists().write({'is_default': True})
+            cr.commit()
+
+    def run(self, scenarios):
+        self.results = []
+        self.setup_config()
+        try:
+            for name in scenarios:
+                module = SCENARIO_MODULES[name]
+                if not self.installed(module):
+                    print(f'- {name}: skipped ({module} is not installed)')
+                    continue
+                print(f'- {name}...', flush=True)
+                self.results.extend(getattr(self, f'scenario_{name}')())
+        finally:
+            try:
+                if self.args.keep_data:
+                    self.restore_default()
+                else:
+                    self.cleanup()
+            except Exception as e:
+                print(f'Cleanup failed, remove the "{BENCH_PREFIX}" records by hand: {e}',
+                      file=sys.stderr)
+        return self.results
+
+
+# ----------------------------------------------------------------------
+# Report
+# ----------------------------------------------------------------------
+COLUMNS = (
+    ('scenario', 28, '{}'),
+    ('ops', 6, '{}'),
+    ('errors', 6, '{}'),
+    ('wall', 8, '{:.2f}'),
+    ('throughput', 10, '{:.2f}'),
+    ('latency_p50', 11, '{:.3f}'),
+    ('latency_p95', 11, '{:.3f}'),
+    ('queue_p95', 9, '{:.3f}'),
+    ('db_time', 8, '{:.2f}'),
+    ('queries_per_op', 14, '{:.1f}'),
+    ('completions', 11, '{}'),
+    ('embedding_requests', 18, '{}'),
+    ('slot_wait_avg', 13, '{:.3f}'),
+)
+
+
+def print_report(summaries):
+    print()
+    print(' '.join(name.rjust(width) if i else name.ljust(width)
+                   for i, (name, width, __) in enumerate(COLUMNS)))
+    for name, summary in summaries.items():
+        row = dict(summary, scenario=name)
+        print(' '.join(fmt.format(row[key]).rjust(width) if i else fmt.format(row[key]).ljust(width)
+                       for i, (key, width, fmt) in enumerate(COLUMNS)))
+    print()
+    print('wall, latency, queue and db_time in seconds; throughput in operations per second;')
+    print('queue_p95: wait before a worker picked the operation; slot_wait_avg: wait for a')
+    print('generation slot on the mock server.')
+
+
+def compare(summaries, baseline, tolerance):
+    """Regressions of ``summaries`` against ``baseline`` (both by scenario)."""
+    regressions = []
+    for name, summary in summaries.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if before.get('throughput'):
+            if summary['throughput'] < before['throughput'] * (1 - tolerance):
+                regressions.append(f"{name}: throughput {summary['throughput']:.2f}/s, "
+                                   f"was {before['throughput']:.2f}/s")
+        elif before.get('wall') and summary['wall'] > before['wall'] * (1 + tolerance):
+            # Nothing to process (e.g. reindex without changes): the time matters
+            regressions.append(f"{name}: {summary['wall']:.2f}s, was {before['wall']:.2f}s")
+        if before.get('queries_per_op') and \
+                summary['queries_per_op'] > before['queries_per_op'] * (1 + tolerance):
+            regressions.append(f"{name}: {summary['queries_per_op']:.1f} queries per operation, "
+                               f"was {before['queries_per_op']:.1f}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split('\n\n', 1)[1],
+    )
+    parser.add_argument('-c', '--config', help='Odoo configuration file')
+    parser.add_argument('-d', '--database', required=True, help='disposable database to run on')
+    parser.add_argument('--addons-path', help='if not set in the configuration file')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help='comma-separated, among: %s' % ', '.join(SCENARIOS))
+    parser.add_argument('--requests', type=int, default=100,
+                        help='calls, jobs, products to enrich or questions per scenario (default: 100)')
+    parser.add_argument('--products', type=int, default=1000,
+                        help='products created for the reindex scenario (default: 1000)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='client threads, parallel workers and job workers (default: 8)')
+    parser.add_argument('--api', choices=('ollama', 'openai'), default='ollama',
+                        help='API of the benchmark configuration (default: ollama)')
+    parser.add_argument('--rag-mode', choices=('keyword', 'vector', 'hybrid'), default='hybrid',
+                        help='product search of the RAG scenarios (default: hybrid)')
+    parser.add_argument('--cache', action='store_true', help='enable the AI response cache')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed relative regression against the baseline (default: 0.2)')
+    parser.add_argument('--keep-data', action='store_true',
+                        help='keep the benchmark records (the configuration is archived)')
+    parser.add_argument('--log-level', default='warn', help='Odoo log level (default: warn)')
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+    args.concurrency = max(1, args.concurrency)
+    args.scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error('unknown scenarios: %s' % ', '.join(sorted(unknown)))
+    return args
+
+
+def load_registry(args):
+    import odoo
+    from odoo.tools import config
+
+    odoo_args = ['-d', args.database, f'--log-level={args.log_level}']
+    if args.config:
+        odoo_args += ['-c', args.config]
+    if args.addons_path:
+        odoo_args += ['--addons-path', args.addons_path]
+    config.parse_config(odoo_args)
+    odoo.modules.module.initialize_sys_path()
+    return odoo.registry(args.database)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    registry = load_registry(args)
+    with server_from_arguments(args) as server:
+        print(f'Mock LLM server on {server.url}: latency {args.latency}s, '
+              f'{args.tokens_per_second} tokens/s, {args.slots or "unlimited"} slots')
+        results = Bench(args, registry, server).run(args.scenarios)
+    summaries = {result.name: result.summary() for result in results}
+    print_report(summaries)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'settings': {k: v for k, v in vars(args).items()
+                                    if k not in ('config', 'baseline', 'output')},
+                       'results': summaries}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('results', {})
+        regressions = compare(summaries, baseline, args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            return 1
+        print(f'No regression against {args.baseline} (tolerance {args.tolerance:.0%}).')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())